@@ -7,7 +7,7 @@ API CRUD endpoints.
 
 import hashlib
 import hmac
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 from cryptography.fernet import InvalidToken
 from django.contrib.auth.models import User
@@ -537,16 +537,38 @@ class UserApiKeyAPITests(TestCase):
 
     # --- Models endpoint ----------------------------------------------------
 
-    @patch("accounts.views._list_models_for_key")
-    def test_models_endpoint_returns_model_list(self, mock_list_models):
-        m = MagicMock(provider="openai", type="cloud")
-        m.name = "gpt-4o"
-        mock_list_models.return_value = [m]
+    @patch("llm.providers.model_listing._fetch_model_ids", new_callable=AsyncMock)
+    def test_models_endpoint_returns_model_list(self, mock_fetch):
+        mock_fetch.return_value = ["gpt-4o"]
         self._create_key_in_db()
         _login_and_store_key(self.client, self.user)
         resp = self.client.get(self.list_url + "models/")
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertIn("keys", resp.data)
+        self.assertEqual(resp.data["keys"][0]["models"][0]["name"], "gpt-4o")
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "model-listing-tests",
+            }
+        }
+    )
+    @patch("llm.providers.model_listing._fetch_model_ids", new_callable=AsyncMock)
+    def test_models_endpoint_caches_listing_until_refresh(self, mock_fetch):
+        mock_fetch.return_value = ["gpt-4o"]
+        self._create_key_in_db()
+        _login_and_store_key(self.client, self.user)
+
+        self.client.get(self.list_url + "models/")
+        self.client.get(self.list_url + "models/")
+        self.assertEqual(mock_fetch.call_count, 1)
+
+        mock_fetch.return_value = ["gpt-4o", "gpt-5.2"]
+        resp = self.client.get(self.list_url + "models/?refresh=1")
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(len(resp.data["keys"][0]["models"]), 2)
 
 
 class UserLLMOrchestratorMixinTests(TestCase):
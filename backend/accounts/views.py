@@ -18,6 +18,7 @@ from rest_framework.views import APIView
 
 from accounts.constants import PROVIDER_DEFAULT_BASE_URLS
 from accounts.serializers import UserSerializer
+from llm.providers.model_listing import listing_key, prefetch_model_ids
 
 from .encryption import (
     clear_key_from_session,
@@ -208,8 +209,14 @@ class ApiKeyViewSet(viewsets.ModelViewSet):
         throttle_classes=[UserRateThrottle],
     )
     def list_models(self, request):
+        """
+        Models available to each active key.
+
+        Listings are cached per key fingerprint (see
+        llm.providers.model_listing); ?refresh=1 re-lists every key.
+        """
         api_keys = self.get_queryset().filter(is_active=True)
-        result = []
+        refresh = request.query_params.get("refresh", "").lower() in ("1", "true")
 
         enc_key = get_encryption_key_from_session(request.session)
         if not enc_key:
@@ -218,6 +225,7 @@ class ApiKeyViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
+        listings = []
         for key_record in api_keys:
             try:
                 raw_key = decrypt_api_key(key_record.encrypted_key, enc_key)
@@ -227,67 +235,34 @@ class ApiKeyViewSet(viewsets.ModelViewSet):
             effective_base_url = key_record.base_url or PROVIDER_DEFAULT_BASE_URLS.get(
                 key_record.provider, ""
             )
-            models = _list_models_for_key(
-                key_record.provider, raw_key, effective_base_url
+            listings.append(
+                (
+                    key_record,
+                    listing_key(key_record.provider, raw_key, effective_base_url),
+                )
             )
-            model_entries = [
-                {"name": m.name, "provider": m.provider, "type": m.type} for m in models
-            ]
 
+        # Cache misses are listed concurrently
+        model_ids = prefetch_model_ids([key for _, key in listings], refresh=refresh)
+
+        result = []
+        for key_record, key in listings:
             result.append(
                 {
                     "id": str(key_record.id),
                     "label": key_record.label,
                     "provider": key_record.provider,
-                    "models": model_entries,
+                    "models": _model_entries(
+                        key_record.provider, model_ids.get(key.fingerprint) or []
+                    ),
                 }
             )
 
         return Response({"keys": result})
 
 
-def _list_models_for_key(provider: str, api_key: str, base_url: str = ""):
-    try:
-        if provider in ("openai", "custom", "morpheus"):
-            from openai import OpenAI
-
-            from llm.types import ModelCapabilities, ModelDetails
-
-            client = OpenAI(api_key=api_key, base_url=base_url or None, timeout=10)
-            response = client.models.list()
-            models = []
-            for model in response.data:
-                name = model.id
-                if not name:
-                    continue
-                models.append(
-                    ModelDetails(
-                        name=name,
-                        provider=provider,
-                        type="cloud",
-                        capabilities=ModelCapabilities(),
-                    )
-                )
-            return models
-
-        elif provider == "gemini":
-            from llm.providers.gemini_provider import GeminiProvider
-
-            provider_instance = GeminiProvider(
-                {
-                    "api_key": api_key,
-                    "timeout": 10,
-                }
-            )
-            return provider_instance.list_models()
-
-        else:
-            return []
-
-    except Exception:
-        logger.warning(
-            "Failed to list models for provider=%s",
-            provider,
-            exc_info=True,
-        )
-        return []
+def _model_entries(provider: str, model_ids):
+    if provider == "gemini":
+        # Same filter as GeminiProvider: skip Imagen and other non-chat models
+        model_ids = [name for name in model_ids if name.startswith("gemini")]
+    return [{"name": name, "provider": provider, "type": "cloud"} for name in model_ids]
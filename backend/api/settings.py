@@ -13,15 +13,13 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import hashlib
 import os
 import sys
-import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 from llm.logfire_config import configure_logfire
 
-from corsheaders.defaults import default_headers
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -36,7 +34,14 @@ load_dotenv(BASE_DIR / "infra" / ".env")
 # Load environment variables from .env file
 load_dotenv(BASE_DIR.parent / "infra" / ".env")
 
-configure_logfire()
+# True when running under pytest
+TESTING = "pytest" in sys.modules
+
+# logfire's argument inspection parses a file's source the first time that file
+# logs. Tests log from worker threads, and on Python 3.11 concurrent ast.parse
+# calls can fail with "AST constructor recursion depth mismatch", which logfire
+# re-raises under pytest. Tests don't need the argument names.
+configure_logfire(inspect_arguments=False if TESTING else None)
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -235,6 +240,42 @@ DOCUMENT_MAX_SIZE_MB = 10
 # Stored separately from main SQLite database
 VECTOR_DB_PATH = BASE_DIR / "vectors.db"
 
+# Embedding backend for context strategies: "openai", "ollama" or "hashing".
+# EMBEDDING_MODEL overrides the backend's default model when set.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL") or None
+
+# Persistent embedding cache keyed by (model, sha256(text))
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = VECTOR_DB_PATH
+
+# Optional quantized companion index for new vec0 tables: "int8" or "binary".
+# KNN runs on the quantized vectors first and re-ranks with float distance.
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION") or None
+
+# Max nodes evaluated in parallel by chart-wide coherence evaluation
+CONTEXT_EVALUATION_CONCURRENCY = int(os.getenv("CONTEXT_EVALUATION_CONCURRENCY", "4"))
+
+# Threads running ORM-bound context preparation for async coherence workflows
+CONTEXT_WORKER_THREADS = int(os.getenv("CONTEXT_WORKER_THREADS", "16"))
+
+# Dataset explorer: TTL of cached result totals, and the cap at which
+# count=approx stops counting (reported as "cap+" results)
+DATASET_EXPLORER_COUNT_CACHE_SECONDS = 60
+DATASET_EXPLORER_APPROX_COUNT_CAP = 10000
+
+# Player expectations compare dashboard: TTL of cached combined responses
+DASHBOARD_CACHE_SECONDS = 300
+
+# Provider model listings, cached per API key fingerprint
+LLM_MODEL_LIST_CACHE_SECONDS = int(os.getenv("LLM_MODEL_LIST_CACHE_SECONDS", "600"))
+
+# LLM call ledger (llm.ledger): rows are written in background batches of up
+# to LLM_LEDGER_BATCH_SIZE, at most LLM_LEDGER_FLUSH_SECONDS apart
+LLM_LEDGER_ENABLED = os.getenv("LLM_LEDGER_ENABLED", "true").lower() == "true"
+LLM_LEDGER_BATCH_SIZE = int(os.getenv("LLM_LEDGER_BATCH_SIZE", "200"))
+LLM_LEDGER_FLUSH_SECONDS = float(os.getenv("LLM_LEDGER_FLUSH_SECONDS", "2"))
+
 # === API Key Encryption ===
 # Keys are encrypted with a Fernet key derived from the user's login password
 # and stored ONLY in the server-side session. No global encryption key needed.
@@ -0,0 +1,17 @@
+"""
+Pytest configuration shared by every test suite.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disable_llm_ledger(settings):
+    """
+    Keep ModelManager calls from writing LLM ledger rows.
+
+    The ledger writes from a background thread over its own connection,
+    outside the test's transaction. llm/tests/test_ledger.py turns it back on
+    and writes synchronously.
+    """
+    settings.LLM_LEDGER_ENABLED = False
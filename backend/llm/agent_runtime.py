@@ -7,6 +7,7 @@ from typing import Any, Dict, Optional, Type
 from pydantic import BaseModel, ValidationError
 
 from llm.exceptions import AgentFailureError
+from llm.ledger import current_call_context, llm_call_context
 from llm.logfire_config import get_logfire
 from llm.providers.base import StructuredResult
 from llm.providers.manager import ModelManager
@@ -21,6 +22,8 @@ class BaseAgent(ABC):
 
     capability_requirements: Optional[CapabilityRequirements] = None
     temperature: float = 0
+    # Ledger feature; defaults to the agent's top-level package
+    feature: str = ""
 
     def __init__(self) -> None:
         """Initialize agent."""
@@ -53,6 +56,15 @@ class BaseAgent(ABC):
         model_name = self._select_model(model_manager, context)
         return model_manager, data, prompt, model_name
 
+    def _ledger_context(self):
+        """Attribute this agent's LLM calls in the ledger (llm.ledger)."""
+        feature = (
+            current_call_context().get("feature")
+            or self.feature
+            or type(self).__module__.split(".")[0]
+        )
+        return llm_call_context(feature=feature, operation=self.name)
+
     def _select_model(
         self, model_manager: ModelManager, context: Dict[str, Any]
     ) -> str:
@@ -160,7 +172,7 @@ class BaseAgent(ABC):
                 f"{self.name}",
                 agent_name=self.name,
                 model=model_name,
-            ):
+            ), self._ledger_context():
                 result = model_manager.generate_structured_with_model(
                     model_name=model_name,
                     prompt=prompt,
@@ -188,7 +200,7 @@ class BaseAgent(ABC):
                 f"{self.name}",
                 agent_name=self.name,
                 model=model_name,
-            ):
+            ), self._ledger_context():
                 # Use async method for true parallel execution
                 result = await model_manager.generate_structured_with_model_async(
                     model_name=model_name,
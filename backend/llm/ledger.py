@@ -0,0 +1,273 @@
+"""
+Append-only ledger of LLM calls.
+
+ModelManager records every generation request through record_llm_call():
+feature, operation, model, provider, latency, tokens, estimated cost, and
+whether it failed. Entries go onto an in-memory queue and a background
+thread inserts them with one bulk_create per batch, so the request path
+never waits on the database. If the ledger is down, rows are dropped and
+a warning is logged; the calls themselves never fail because of it.
+
+Callers attribute calls with llm_call_context(), which sets the feature,
+operation and retry attempt for every call made inside it, including
+calls made in asyncio tasks and worker threads started from it:
+
+    with llm_call_context(feature="pxnodes.coherence", operation="evaluate"):
+        ...
+
+latency_report() and spend_report() aggregate the ledger per feature and
+model. See the llm_ledger_report management command.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Avg, Count, F, FloatField, Q, Sum, Window
+from django.db.models.functions import Cast, Ceil
+from django.db.models.functions.window import RowNumber
+from django.utils import timezone
+
+from llm.cost_tracking import calculate_cost_eur
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEDGER_BATCH_SIZE = 200
+DEFAULT_LEDGER_FLUSH_SECONDS = 2.0
+DEFAULT_LEDGER_MAX_PENDING = 10000
+
+_call_context: ContextVar[Dict[str, Any]] = ContextVar("llm_call_context", default={})
+
+
+@contextmanager
+def llm_call_context(
+    feature: Optional[str] = None,
+    operation: Optional[str] = None,
+    retry_count: Optional[int] = None,
+) -> Iterator[None]:
+    """Attribute LLM calls made inside the block; None keeps the outer value."""
+    fields = {
+        "feature": feature,
+        "operation": operation,
+        "retry_count": retry_count,
+    }
+    token = _call_context.set(
+        {
+            **_call_context.get(),
+            **{name: value for name, value in fields.items() if value is not None},
+        }
+    )
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+
+def current_call_context() -> Dict[str, Any]:
+    return dict(_call_context.get())
+
+
+class LedgerWriter:
+    """Queue of pending ledger rows, drained by one daemon thread."""
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_LEDGER_BATCH_SIZE,
+        flush_seconds: float = DEFAULT_LEDGER_FLUSH_SECONDS,
+        max_pending: int = DEFAULT_LEDGER_MAX_PENDING,
+    ):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, entry: Dict[str, Any]) -> None:
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            logger.warning("LLM ledger queue is full; dropping an entry")
+
+    def flush(self) -> None:
+        """Block until every submitted entry has been written (or dropped)."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="llm-ledger", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                close_old_connections()
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        from llm.models import LLMCall
+
+        try:
+            LLMCall.objects.bulk_create([LLMCall(**entry) for entry in batch])
+        except Exception as e:
+            logger.warning("Failed to write %d LLM ledger rows: %s", len(batch), e)
+
+
+_writer: Optional[LedgerWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_ledger_writer() -> LedgerWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = LedgerWriter(
+                    batch_size=getattr(
+                        settings, "LLM_LEDGER_BATCH_SIZE", DEFAULT_LEDGER_BATCH_SIZE
+                    ),
+                    flush_seconds=getattr(
+                        settings,
+                        "LLM_LEDGER_FLUSH_SECONDS",
+                        DEFAULT_LEDGER_FLUSH_SECONDS,
+                    ),
+                )
+                atexit.register(_writer.flush)
+    return _writer
+
+
+def record_llm_call(
+    *,
+    model: str = "",
+    provider: str = "",
+    latency_ms: int = 0,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    cache_hit: bool = False,
+    error: Optional[BaseException] = None,
+    user_id: Optional[int] = None,
+    feature: Optional[str] = None,
+    operation: Optional[str] = None,
+) -> None:
+    """Queue a ledger row; feature/operation default to llm_call_context()."""
+    if not getattr(settings, "LLM_LEDGER_ENABLED", True):
+        return
+
+    context = _call_context.get()
+    get_ledger_writer().submit(
+        {
+            "created_at": timezone.now(),
+            "user_id": user_id,
+            "feature": (feature or context.get("feature") or "")[:64],
+            "operation": (operation or context.get("operation") or "")[:100],
+            "model": model[:100],
+            "provider": provider[:32],
+            "latency_ms": latency_ms,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "estimated_cost_eur": calculate_cost_eur(
+                model, prompt_tokens, completion_tokens
+            ),
+            "cache_hit": cache_hit,
+            "retry_count": context.get("retry_count", 0),
+            "success": error is None,
+            "error_type": type(error).__name__ if error is not None else "",
+        }
+    )
+
+
+def record_cache_hit(feature: str, operation: str) -> None:
+    """Record a result served from a cache instead of an LLM call."""
+    record_llm_call(feature=feature, operation=operation, cache_hit=True)
+
+
+# Aggregates
+
+
+def latency_report(
+    queryset, group_by: Sequence[str] = ("feature", "model"), percentiles=(50, 95)
+) -> List[Dict[str, Any]]:
+    """
+    Nearest-rank latency percentiles of LLM requests per group.
+
+    Each group's rows are ranked by latency with a window function, and
+    only the rows at the requested ranks are read back.
+    """
+    group_by = list(group_by)
+    partition = [F(name) for name in group_by]
+    ranked = queryset.filter(cache_hit=False).annotate(
+        rank=Window(RowNumber(), partition_by=partition, order_by=["latency_ms", "pk"]),
+        group_size=Window(Count("pk"), partition_by=partition),
+    )
+    wanted = Q()
+    for percentile in percentiles:
+        wanted |= Q(rank=Ceil(Cast(F("group_size"), FloatField()) * (percentile / 100)))
+
+    report: Dict[tuple, Dict[str, Any]] = {}
+    for row in ranked.filter(wanted).values(
+        *group_by, "rank", "group_size", "latency_ms"
+    ):
+        key = tuple(row[name] for name in group_by)
+        entry = report.setdefault(
+            key,
+            {**{name: row[name] for name in group_by}, "calls": row["group_size"]},
+        )
+        for percentile in percentiles:
+            if row["rank"] == _nearest_rank(row["group_size"], percentile):
+                entry[f"p{percentile}_ms"] = row["latency_ms"]
+    return sorted(report.values(), key=lambda e: [str(e[n]) for n in group_by])
+
+
+def _nearest_rank(size: int, percentile: float) -> int:
+    rank = size * percentile / 100
+    return max(int(rank) + (rank > int(rank)), 1)
+
+
+def spend_report(
+    queryset, group_by: Sequence[str] = ("feature", "model")
+) -> List[Dict[str, Any]]:
+    """Calls, failures, cache hits, tokens, spend and mean latency per group."""
+    group_by = list(group_by)
+    rows = (
+        queryset.values(*group_by)
+        .annotate(
+            calls=Count("pk", filter=Q(cache_hit=False)),
+            failures=Count("pk", filter=Q(success=False)),
+            cache_hits=Count("pk", filter=Q(cache_hit=True)),
+            retries=Count("pk", filter=Q(retry_count__gt=0)),
+            prompt_tokens=Sum("prompt_tokens"),
+            completion_tokens=Sum("completion_tokens"),
+            cost_eur=Sum("estimated_cost_eur"),
+            mean_latency_ms=Avg("latency_ms", filter=Q(cache_hit=False)),
+        )
+        .order_by(*group_by)
+    )
+    return [{**row, "cost_eur": row["cost_eur"] or Decimal("0")} for row in rows]
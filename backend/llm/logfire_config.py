@@ -68,7 +68,9 @@ except ImportError:
 _configured = False
 
 
-def configure_logfire(service_name: str = "pix-e-backend") -> None:
+def configure_logfire(
+    service_name: str = "pix-e-backend", inspect_arguments: bool | None = None
+) -> None:
     """
     Configure Logfire with provider instrumentation.
 
@@ -77,6 +79,8 @@ def configure_logfire(service_name: str = "pix-e-backend") -> None:
 
     Args:
         service_name: Name of the service for Logfire tracking
+        inspect_arguments: Whether logfire parses the caller's source to name
+            f-string arguments (None keeps logfire's default)
     """
     global _configured
 
@@ -91,6 +95,7 @@ def configure_logfire(service_name: str = "pix-e-backend") -> None:
         logfire.configure(
             service_name=service_name,
             console=False,
+            inspect_arguments=inspect_arguments,
         )
 
         logfire.instrument_openai()
@@ -0,0 +1,76 @@
+"""Management command to report LLM latency percentiles and spend."""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from llm.ledger import latency_report, spend_report
+from llm.models import LLMCall
+
+GROUP_FIELDS = ("feature", "operation", "model", "provider")
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarise the LLM call ledger: p50/p95 latency, calls, failures, "
+        "cache hits, retries, tokens and estimated spend per feature and model."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument(
+            "--group-by",
+            default="feature,model",
+            help=f"Comma separated fields, from {', '.join(GROUP_FIELDS)}",
+        )
+        parser.add_argument(
+            "--feature", default="", help="Only report calls for this feature"
+        )
+
+    def handle(self, *args, **options):
+        group_by = [f.strip() for f in options["group_by"].split(",") if f.strip()]
+        unknown = sorted(set(group_by) - set(GROUP_FIELDS))
+        if not group_by or unknown:
+            raise CommandError(
+                f"--group-by must name fields from {', '.join(GROUP_FIELDS)}"
+            )
+
+        since = timezone.now() - timedelta(days=options["days"])
+        calls = LLMCall.objects.filter(created_at__gte=since)
+        if options["feature"]:
+            calls = calls.filter(feature=options["feature"])
+
+        latencies = {
+            tuple(row[name] for name in group_by): row
+            for row in latency_report(calls, group_by)
+        }
+        rows = spend_report(calls, group_by)
+        if not rows:
+            self.stdout.write(f"No LLM calls in the last {options['days']} day(s).")
+            return
+
+        header = " / ".join(group_by)
+        self.stdout.write(
+            f"{header:<48}{'calls':>7}{'fail':>6}{'cache':>7}{'retry':>7}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'tokens':>10}{'EUR':>11}"
+        )
+        for row in rows:
+            key = tuple(row[name] for name in group_by)
+            latency = latencies.get(key, {})
+            label = " / ".join(str(value or "-") for value in key)
+            tokens = (row["prompt_tokens"] or 0) + (row["completion_tokens"] or 0)
+            self.stdout.write(
+                f"{label[:47]:<48}{row['calls']:>7}{row['failures']:>6}"
+                f"{row['cache_hits']:>7}{row['retries']:>7}"
+                f"{latency.get('p50_ms', '-')!s:>9}{latency.get('p95_ms', '-')!s:>9}"
+                f"{tokens:>10}{row['cost_eur']:>11.4f}"
+            )
+
+        total = sum(row["cost_eur"] for row in rows)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{sum(row['calls'] for row in rows)} call(s) in the last "
+                f"{options['days']} day(s), estimated spend EUR {total:.4f}."
+            )
+        )
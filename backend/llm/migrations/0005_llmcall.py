@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # llm 0001-0004 are names of the pillars migrations that replaced them
+    # (pillars.0001-0004); this app's own migrations start after them.
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LLMCall",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("feature", models.CharField(blank=True, max_length=64)),
+                ("operation", models.CharField(blank=True, max_length=100)),
+                ("model", models.CharField(blank=True, max_length=100)),
+                ("provider", models.CharField(blank=True, max_length=32)),
+                ("latency_ms", models.IntegerField(default=0)),
+                ("prompt_tokens", models.IntegerField(default=0)),
+                ("completion_tokens", models.IntegerField(default=0)),
+                ("total_tokens", models.IntegerField(default=0)),
+                (
+                    "estimated_cost_eur",
+                    models.DecimalField(decimal_places=8, default=0, max_digits=10),
+                ),
+                ("cache_hit", models.BooleanField(default=False)),
+                ("retry_count", models.PositiveSmallIntegerField(default=0)),
+                ("success", models.BooleanField(default=True)),
+                ("error_type", models.CharField(blank=True, max_length=100)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="llm_calls",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "LLM call",
+                "verbose_name_plural": "LLM calls",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["feature", "model", "created_at"],
+                        name="llm_llmcall_feature_d6bc41_idx",
+                    )
+                ],
+            },
+        ),
+    ]
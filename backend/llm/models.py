@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.utils import timezone
+
+User = get_user_model()
+
+
+class LLMCall(models.Model):
+    """
+    One LLM request made through ModelManager (see llm.ledger).
+
+    The ledger is append-only: rows are inserted in batches off the request
+    path and never updated. Cache hits that avoided a request are recorded
+    too, with cache_hit set and no tokens.
+    """
+
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="llm_calls",
+    )
+
+    feature = models.CharField(max_length=64, blank=True)
+    operation = models.CharField(max_length=100, blank=True)
+    model = models.CharField(max_length=100, blank=True)
+    provider = models.CharField(max_length=32, blank=True)
+
+    latency_ms = models.IntegerField(default=0)
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    total_tokens = models.IntegerField(default=0)
+    estimated_cost_eur = models.DecimalField(
+        max_digits=10,
+        decimal_places=8,
+        default=0,
+    )
+
+    cache_hit = models.BooleanField(default=False)
+    retry_count = models.PositiveSmallIntegerField(default=0)
+    success = models.BooleanField(default=True)
+    error_type = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "LLM call"
+        verbose_name_plural = "LLM calls"
+        indexes = [
+            models.Index(fields=["feature", "model", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.feature}/{self.operation} - {self.model} ({self.latency_ms} ms)"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("LLM ledger rows are append-only.")
+        super().save(*args, **kwargs)
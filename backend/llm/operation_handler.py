@@ -13,6 +13,7 @@ from typing import Any, Dict, Optional, Type
 
 from pydantic import BaseModel
 
+from llm.ledger import llm_call_context
 from llm.providers.manager import ModelManager
 from llm.types import CapabilityRequirements
 
@@ -105,14 +106,17 @@ class BaseOperationHandler(ABC):
         prompt = self.build_prompt(data)
 
         # Execute with model manager
-        result = self.model_manager.generate_structured_with_model(
-            model_name=model_name,
-            prompt=prompt,
-            response_schema=self.response_schema,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **kwargs,
-        )
+        with llm_call_context(
+            feature=self.feature_id or None, operation=self.operation_name
+        ):
+            result = self.model_manager.generate_structured_with_model(
+                model_name=model_name,
+                prompt=prompt,
+                response_schema=self.response_schema,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
 
         return result
 
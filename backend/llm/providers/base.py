@@ -6,6 +6,7 @@ All provider implementations (Ollama, OpenAI, Gemini) inherit from this.
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
+from llm.providers.model_listing import ModelListingKey
 from llm.types import ModelDetails, ProviderType
 
 
@@ -17,6 +18,9 @@ class BaseProvider(ABC):
     (Ollama, OpenAI, Gemini, etc.) and abstract away their differences.
     """
 
+    # Set by providers whose model listing is cached per API key
+    listing_key: Optional[ModelListingKey] = None
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize provider with configuration.
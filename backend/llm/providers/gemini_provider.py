@@ -18,6 +18,7 @@ from llm.exceptions import (
     RateLimitError,
 )
 from llm.providers.base import BaseProvider, StructuredResult
+from llm.providers.model_listing import ModelListingKey, get_model_ids
 from llm.types import ModelCapabilities, ModelDetails, ProviderType
 
 
@@ -33,6 +34,8 @@ class GeminiProvider(BaseProvider):
     - Native Pydantic structured outputs
     """
 
+    listing_key: ModelListingKey
+
     # Model families for capability detection
     GEMINI_2_MODELS = {
         "gemini-2.0-flash-exp",
@@ -80,6 +83,7 @@ class GeminiProvider(BaseProvider):
 
         # Initialize client (timeout will be handled per-request if needed)
         self.client = genai.Client(api_key=api_key)
+        self.listing_key = ModelListingKey("gemini", api_key)
 
     @property
     def provider_name(self) -> str:
@@ -104,36 +108,36 @@ class GeminiProvider(BaseProvider):
             return False
 
     def list_models(self) -> List[ModelDetails]:
-        """List available Gemini models."""
+        """List available Gemini models (cached per API key)."""
         try:
-            models = []
-
-            for model in self.client.models.list():
-                model_name = model.name
-                # Skip if name is None
-                if not model_name:
-                    continue
-
-                # Extract just the model ID (remove 'models/' prefix if present)
-                if "/" in model_name:
-                    model_name = model_name.split("/")[-1]
-
-                # Only include Gemini models (filter out others like Imagen, etc.)
-                if model_name.startswith("gemini"):
-                    models.append(
-                        ModelDetails(
-                            name=model_name,
-                            provider=self.provider_name,
-                            type=self.provider_type,
-                            capabilities=self._get_model_capabilities(model_name),
-                        )
-                    )
-
-            return models
+            model_ids = get_model_ids(self.listing_key, self._fetch_model_ids)
         except (ClientError, GeminiAPIError) as e:
             raise ProviderError(
                 provider="gemini", message=f"Failed to list models: {str(e)}"
             )
+        return self.models_from_ids(model_ids)
+
+    def _fetch_model_ids(self) -> List[str]:
+        # Extract just the model ID (remove 'models/' prefix if present)
+        return [
+            model.name.split("/")[-1]
+            for model in self.client.models.list()
+            if model.name
+        ]
+
+    def models_from_ids(self, model_ids: List[str]) -> List[ModelDetails]:
+        """ModelDetails for the Gemini models among a listing's model ids."""
+        # Only include Gemini models (filter out others like Imagen, etc.)
+        return [
+            ModelDetails(
+                name=model_id,
+                provider=self.provider_name,
+                type=self.provider_type,
+                capabilities=self._get_model_capabilities(model_id),
+            )
+            for model_id in model_ids
+            if model_id.startswith("gemini")
+        ]
 
     def get_model_info(self, model_name: str) -> ModelDetails:
         """Get information about a specific Gemini model."""
@@ -12,19 +12,22 @@ Central manager that handles:
 
 import logging
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from llm.config import Config, get_config
 from llm.exceptions import (
     ModelUnavailableError,
     ProviderError,
 )
+from llm.ledger import current_call_context, record_llm_call
 from llm.providers.base import BaseProvider, GenerationResult
 from llm.providers.capabilities import (
     filter_by_capabilities,
     find_best_model,
 )
 from llm.providers.gemini_provider import GeminiProvider
+from llm.providers.model_listing import prefetch_model_ids
 from llm.providers.ollama_provider import OllamaProvider
 from llm.providers.openai_provider import OpenAIProvider
 from llm.types import (
@@ -62,6 +65,7 @@ class ModelManager:
         self._registry_built: bool = False
         self._model_cache: Optional[List[ModelDetails]] = None
         self._cache_timestamp: Optional[float] = None
+        self._user_id: Optional[int] = None
 
         self._init_env_providers()
 
@@ -133,6 +137,7 @@ class ModelManager:
         manager._provider_list = {}
         manager._model_cache = None
         manager._cache_timestamp = None
+        manager._user_id = user.id
 
         user_providers = create_providers_for_user(user, enc_key)
         manager._provider_list.update(user_providers)
@@ -205,6 +210,7 @@ class ModelManager:
         manager._provider_list = {}
         manager._model_cache = None
         manager._cache_timestamp = None
+        manager._user_id = user.id
 
         provider = _create_provider(api_key_obj.provider, raw_key, api_key_obj.base_url)
         if provider:
@@ -232,8 +238,20 @@ class ModelManager:
             self._rebuild_model_registry()
             self._registry_built = True
 
+    def _prefetch_model_listings(self, refresh: bool = False) -> None:
+        """List the models of every keyed provider concurrently into the cache."""
+        keys = [
+            provider.listing_key
+            for provider_list in self._provider_list.values()
+            for provider in provider_list
+            if provider.listing_key is not None
+        ]
+        if keys:
+            prefetch_model_ids(keys, refresh=refresh)
+
     def _rebuild_model_registry(self) -> None:
         self._model_registry = {}
+        self._prefetch_model_listings()
         for provider_name, provider_list in self._provider_list.items():
             for provider in provider_list:
                 try:
@@ -262,6 +280,7 @@ class ModelManager:
         ):
             return self._model_cache
 
+        self._prefetch_model_listings(refresh=refresh)
         all_models = []
         seen_model_names = set()
         for provider_name, provider_list in self._provider_list.items():
@@ -301,6 +320,36 @@ class ModelManager:
         models = self.list_models(refresh=refresh)
         return ModelInventory(models=models)
 
+    @contextmanager
+    def _ledger_call(self, model_name: str, operation: str) -> Iterator[Dict[str, Any]]:
+        """
+        Record the LLM call made inside the block in the ledger (llm.ledger).
+
+        The block fills in call["provider"] and call["result"]; tokens are
+        read from the result when it carries them.
+        """
+        call: Dict[str, Any] = {"model": model_name, "provider": "", "result": None}
+        started = time.perf_counter()
+        error: Optional[BaseException] = None
+        try:
+            yield call
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            result = call["result"]
+            record_llm_call(
+                model=call["model"],
+                provider=call["provider"],
+                latency_ms=int((time.perf_counter() - started) * 1000),
+                prompt_tokens=getattr(result, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(result, "completion_tokens", 0) or 0,
+                error=error,
+                user_id=self._user_id,
+                # An operation set by the caller (e.g. the agent) wins
+                operation=current_call_context().get("operation") or operation,
+            )
+
     def _find_model_by_name(self, model_name: str) -> Tuple[ModelDetails, BaseProvider]:
         self._ensure_registry()
         provider = self._model_registry.get(model_name)
@@ -332,44 +381,24 @@ class ModelManager:
         max_tokens: Optional[int] = None,
         **kwargs: Any,
     ) -> GenerationResult:
-        model_details, provider = self._find_model_by_name(model_name)
-
-        text = provider.generate_text(
-            model_name=model_details.name,
-            prompt=prompt,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **kwargs,
-        )
+        with self._ledger_call(model_name, "generate_text") as call:
+            model_details, provider = self._find_model_by_name(model_name)
+            call["provider"] = provider.provider_name
 
-        return GenerationResult(
-            text=text, model=model_details.name, provider=provider.provider_name
-        )
+            text = provider.generate_text(
+                model_name=model_details.name,
+                prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
 
-    def generate_structured_with_model(
-        self,
-        model_name: str,
-        prompt: str,
-        response_schema: type,
-        temperature: float = 0,
-        max_tokens: Optional[int] = None,
-        **kwargs: Any,
-    ) -> Any:
-        model_details, provider = self._find_model_by_name(model_name)
-
-        if not model_details.capabilities.json_strict:
-            logger.warning(f"Model {model_name} may not have strict JSON support")
-
-        return provider.generate_structured(
-            model_name=model_details.name,
-            prompt=prompt,
-            response_schema=response_schema,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **kwargs,
-        )
+            call["result"] = GenerationResult(
+                text=text, model=model_details.name, provider=provider.provider_name
+            )
+        return call["result"]
 
-    async def generate_structured_with_model_async(
+    def generate_structured_with_model(
         self,
         model_name: str,
         prompt: str,
@@ -378,13 +407,14 @@ class ModelManager:
         max_tokens: Optional[int] = None,
         **kwargs: Any,
     ) -> Any:
-        model_details, provider = self._find_model_by_name(model_name)
+        with self._ledger_call(model_name, "generate_structured") as call:
+            model_details, provider = self._find_model_by_name(model_name)
+            call["provider"] = provider.provider_name
 
-        if not model_details.capabilities.json_strict:
-            logger.warning(f"Model {model_name} may not have strict JSON support")
+            if not model_details.capabilities.json_strict:
+                logger.warning(f"Model {model_name} may not have strict JSON support")
 
-        if hasattr(provider, "generate_structured_async"):
-            return await provider.generate_structured_async(
+            call["result"] = provider.generate_structured(
                 model_name=model_details.name,
                 prompt=prompt,
                 response_schema=response_schema,
@@ -392,18 +422,46 @@ class ModelManager:
                 max_tokens=max_tokens,
                 **kwargs,
             )
-        else:
-            import asyncio
+        return call["result"]
 
-            return await asyncio.to_thread(
-                provider.generate_structured,
-                model_name=model_details.name,
-                prompt=prompt,
-                response_schema=response_schema,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs,
-            )
+    async def generate_structured_with_model_async(
+        self,
+        model_name: str,
+        prompt: str,
+        response_schema: type,
+        temperature: float = 0,
+        max_tokens: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        with self._ledger_call(model_name, "generate_structured") as call:
+            model_details, provider = self._find_model_by_name(model_name)
+            call["provider"] = provider.provider_name
+
+            if not model_details.capabilities.json_strict:
+                logger.warning(f"Model {model_name} may not have strict JSON support")
+
+            if hasattr(provider, "generate_structured_async"):
+                call["result"] = await provider.generate_structured_async(
+                    model_name=model_details.name,
+                    prompt=prompt,
+                    response_schema=response_schema,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs,
+                )
+            else:
+                import asyncio
+
+                call["result"] = await asyncio.to_thread(
+                    provider.generate_structured,
+                    model_name=model_details.name,
+                    prompt=prompt,
+                    response_schema=response_schema,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs,
+                )
+        return call["result"]
 
     def auto_select_model(
         self,
@@ -472,17 +530,19 @@ class ModelManager:
                 provider="unknown",
             )
 
-        text = provider_info.generate_text(
-            model_name=model.name,
-            prompt=prompt,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **kwargs,
-        )
-
-        return GenerationResult(
-            text=text, model=model.name, provider=provider_info.provider_name
-        )
+        with self._ledger_call(model.name, "generate_auto") as call:
+            call["provider"] = provider_info.provider_name
+            text = provider_info.generate_text(
+                model_name=model.name,
+                prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
+            call["result"] = GenerationResult(
+                text=text, model=model.name, provider=provider_info.provider_name
+            )
+        return call["result"]
 
     def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
         status = {}
@@ -0,0 +1,170 @@
+"""
+Cached model listings per API key.
+
+Listing a provider's models costs a network round trip per key, and the
+settings page, every ModelManager registry build and every model lookup
+need it. Listings are cached in Django's cache under the key's fingerprint
+(API family, base URL and an HMAC of the key) for
+LLM_MODEL_LIST_CACHE_SECONDS. Only raw model ids are cached; each consumer
+filters and annotates them itself, so the settings page and the providers
+share entries.
+
+prefetch_model_ids() fills the cache for several keys at once, fetching
+the misses concurrently over one shared httpx.AsyncClient.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+MODEL_LIST_CACHE_PREFIX = "llm:models:"
+DEFAULT_MODEL_LIST_CACHE_SECONDS = 600
+MODEL_LIST_TIMEOUT_SECONDS = 10
+GEMINI_MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+
+@dataclass(frozen=True)
+class ModelListingKey:
+    """Everything a model listing depends on."""
+
+    # "openai" for any OpenAI-compatible API, or "gemini"
+    api: str
+    api_key: str = field(repr=False)
+    base_url: str = ""
+
+    @property
+    def fingerprint(self) -> str:
+        pepper = getattr(settings, "API_KEY_FINGERPRINT_PEPPER", "") or ""
+        key_hmac = hmac.new(
+            pepper.encode("utf-8"), self.api_key.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        raw = f"{self.api}|{self.base_url.rstrip('/')}|{key_hmac}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def cache_key(self) -> str:
+        return MODEL_LIST_CACHE_PREFIX + self.fingerprint
+
+
+def listing_key(provider: str, api_key: str, base_url: str = "") -> ModelListingKey:
+    """Listing key for a UserApiKey provider type (openai, gemini, custom...)."""
+    if provider == "gemini":
+        return ModelListingKey("gemini", api_key)
+    return ModelListingKey("openai", api_key, base_url)
+
+
+def _ttl() -> int:
+    return getattr(
+        settings, "LLM_MODEL_LIST_CACHE_SECONDS", DEFAULT_MODEL_LIST_CACHE_SECONDS
+    )
+
+
+def get_model_ids(
+    key: ModelListingKey, fetch: Callable[[], List[str]], refresh: bool = False
+) -> List[str]:
+    """
+    Model ids for key, calling fetch() on a cache miss.
+
+    Errors raised by fetch() propagate and nothing is cached.
+    """
+    model_ids = None if refresh else cache.get(key.cache_key)
+    if model_ids is None:
+        model_ids = fetch()
+        cache.set(key.cache_key, model_ids, _ttl())
+    return model_ids
+
+
+async def _fetch_model_ids(
+    client: httpx.AsyncClient, key: ModelListingKey
+) -> List[str]:
+    if key.api == "gemini":
+        model_ids: List[str] = []
+        params: Dict[str, str | int] = {"pageSize": 1000}
+        while True:
+            response = await client.get(
+                GEMINI_MODELS_URL,
+                params=params,
+                headers={"x-goog-api-key": key.api_key},
+            )
+            response.raise_for_status()
+            data = response.json()
+            model_ids += [
+                model["name"].split("/")[-1]
+                for model in data.get("models", [])
+                if model.get("name")
+            ]
+            if not data.get("nextPageToken"):
+                return model_ids
+            params["pageToken"] = data["nextPageToken"]
+
+    openai = AsyncOpenAI(
+        api_key=key.api_key, base_url=key.base_url or None, http_client=client
+    )
+    page = await openai.models.list()
+    return [model.id for model in page.data if model.id]
+
+
+async def prefetch_model_ids_async(
+    keys: Iterable[ModelListingKey], refresh: bool = False
+) -> Dict[str, Optional[List[str]]]:
+    """
+    Model ids per key fingerprint, fetching cache misses concurrently.
+
+    Keys whose listing fails map to None; failures are logged, not cached.
+    """
+    results: Dict[str, Optional[List[str]]] = {}
+    missing: Dict[str, ModelListingKey] = {}
+    for key in keys:
+        fingerprint = key.fingerprint
+        if fingerprint in results or fingerprint in missing:
+            continue
+        model_ids = None if refresh else await cache.aget(key.cache_key)
+        if model_ids is None:
+            missing[fingerprint] = key
+        else:
+            results[fingerprint] = model_ids
+
+    if not missing:
+        return results
+
+    async with httpx.AsyncClient(timeout=MODEL_LIST_TIMEOUT_SECONDS) as client:
+        fetched = await asyncio.gather(
+            *(_fetch_model_ids(client, key) for key in missing.values()),
+            return_exceptions=True,
+        )
+
+    for (fingerprint, key), outcome in zip(missing.items(), fetched):
+        if isinstance(outcome, BaseException):
+            logger.warning("Failed to list models for api=%s: %s", key.api, outcome)
+            results[fingerprint] = None
+            continue
+        await cache.aset(key.cache_key, outcome, _ttl())
+        results[fingerprint] = outcome
+    return results
+
+
+def prefetch_model_ids(
+    keys: Iterable[ModelListingKey], refresh: bool = False
+) -> Dict[str, Optional[List[str]]]:
+    """
+    Synchronous prefetch_model_ids_async().
+
+    Called from inside an event loop it does nothing and returns {}; the
+    caller's per-provider listing then fills the cache one key at a time.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return async_to_sync(prefetch_model_ids_async)(list(keys), refresh)
+    return {}
@@ -29,6 +29,7 @@ from llm.providers.json_utils import (
     schema_to_string,
     strip_markdown_json,
 )
+from llm.providers.model_listing import ModelListingKey, get_model_ids
 from llm.types import ModelCapabilities, ModelDetails, ProviderType
 
 
@@ -43,6 +44,8 @@ class OpenAIProvider(BaseProvider):
     - Structured outputs with JSON schema
     """
 
+    listing_key: ModelListingKey
+
     # Models with native JSON schema support (strict mode)
     JSON_SCHEMA_MODELS = {
         "gpt-4o-mini",
@@ -96,6 +99,9 @@ class OpenAIProvider(BaseProvider):
             timeout=config.get("timeout", 60),
             base_url=config.get("base_url"),  # Allow custom base URL
         )
+        self.listing_key = ModelListingKey(
+            "openai", api_key, config.get("base_url") or ""
+        )
 
         # Async client for parallel execution
         self.async_client = AsyncOpenAI(
@@ -128,30 +134,31 @@ class OpenAIProvider(BaseProvider):
             return False
 
     def list_models(self) -> List[ModelDetails]:
-        """List available OpenAI models."""
+        """List available OpenAI models (cached per API key)."""
         try:
-            response = self.client.models.list()
-            models = []
-
-            for model in response.data:
-                model_id = model.id
-                if self.include_all_models or model_id.startswith(
-                    ("gpt-5", "gpt-4", "gpt-3.5")
-                ):
-                    models.append(
-                        ModelDetails(
-                            name=model_id,
-                            provider=self.provider_name,
-                            type=self.provider_type,
-                            capabilities=self._get_model_capabilities(model_id),
-                        )
-                    )
-
-            return models
+            model_ids = get_model_ids(self.listing_key, self._fetch_model_ids)
         except APIError as e:
             raise ProviderError(
                 provider="openai", message=f"Failed to list models: {str(e)}"
             )
+        return self.models_from_ids(model_ids)
+
+    def _fetch_model_ids(self) -> List[str]:
+        return [model.id for model in self.client.models.list().data]
+
+    def models_from_ids(self, model_ids: List[str]) -> List[ModelDetails]:
+        """ModelDetails for the chat models among a listing's model ids."""
+        return [
+            ModelDetails(
+                name=model_id,
+                provider=self.provider_name,
+                type=self.provider_type,
+                capabilities=self._get_model_capabilities(model_id),
+            )
+            for model_id in model_ids
+            if self.include_all_models
+            or model_id.startswith(("gpt-5", "gpt-4", "gpt-3.5"))
+        ]
 
     def get_model_info(self, model_name: str) -> ModelDetails:
         """Get information about a specific OpenAI model."""
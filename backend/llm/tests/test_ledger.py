@@ -0,0 +1,223 @@
+"""
+Tests for the LLM call ledger.
+
+Covers what record_llm_call() and ModelManager queue, call context
+attribution, the batch write and the latency/spend reports.
+"""
+
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+
+from llm.ledger import (
+    LedgerWriter,
+    latency_report,
+    llm_call_context,
+    record_cache_hit,
+    record_llm_call,
+    spend_report,
+)
+from llm.models import LLMCall
+from llm.providers.base import GenerationResult
+from llm.providers.manager import ModelManager
+
+
+@pytest.fixture
+def writer(settings):
+    settings.LLM_LEDGER_ENABLED = True
+    ledger_writer = Mock(spec=LedgerWriter)
+    with patch("llm.ledger.get_ledger_writer", return_value=ledger_writer):
+        yield ledger_writer
+
+
+def _submitted(writer):
+    return [c.args[0] for c in writer.submit.call_args_list]
+
+
+@pytest.fixture
+def manager():
+    with patch.object(ModelManager, "_init_env_providers"):
+        manager = ModelManager()
+    manager._user_id = None
+    provider = Mock(provider_name="openai")
+    details = Mock()
+    details.name = "gpt-4o"
+    manager._find_model_by_name = Mock(return_value=(details, provider))
+    return manager, provider
+
+
+class TestRecordLLMCall:
+    def test_disabled_ledger_records_nothing(self, settings):
+        settings.LLM_LEDGER_ENABLED = False
+        with patch("llm.ledger.get_ledger_writer") as get_writer:
+            record_llm_call(model="gpt-4o", latency_ms=5)
+        get_writer.assert_not_called()
+
+    def test_entry_fields_and_cost(self, writer):
+        with llm_call_context(feature="pillars", operation="validate"):
+            record_llm_call(
+                model="gpt-4o",
+                provider="openai",
+                latency_ms=120,
+                prompt_tokens=1000,
+                completion_tokens=500,
+                user_id=None,
+            )
+
+        (entry,) = _submitted(writer)
+        assert entry["feature"] == "pillars"
+        assert entry["operation"] == "validate"
+        assert entry["latency_ms"] == 120
+        assert entry["total_tokens"] == 1500
+        assert entry["estimated_cost_eur"] == Decimal("0.00675000")
+        assert entry["retry_count"] == 0
+        assert entry["success"] is True
+        assert entry["error_type"] == ""
+
+    def test_nested_contexts_keep_outer_values(self, writer):
+        with llm_call_context(feature="sparc", operation="router"):
+            with llm_call_context(retry_count=2):
+                record_llm_call(model="m")
+            record_llm_call(model="m", operation="explicit")
+
+        inner, outer = _submitted(writer)
+        assert (inner["feature"], inner["operation"], inner["retry_count"]) == (
+            "sparc",
+            "router",
+            2,
+        )
+        assert (outer["operation"], outer["retry_count"]) == ("explicit", 0)
+
+    def test_cache_hit(self, writer):
+        record_cache_hit("pxnodes.structural_memory", "summary")
+
+        (entry,) = _submitted(writer)
+        assert entry["cache_hit"] is True
+        assert entry["feature"] == "pxnodes.structural_memory"
+        assert entry["total_tokens"] == 0
+
+
+class TestModelManagerLedger:
+    def test_success_is_recorded(self, writer, manager):
+        manager, provider = manager
+        provider.generate_text.return_value = "hello"
+
+        with llm_call_context(feature="pillars", operation="improve"):
+            result = manager.generate_with_model("gpt-4o", "prompt")
+
+        assert isinstance(result, GenerationResult)
+        (entry,) = _submitted(writer)
+        assert entry["model"] == "gpt-4o"
+        assert entry["provider"] == "openai"
+        assert entry["feature"] == "pillars"
+        assert entry["operation"] == "improve"
+        assert entry["success"] is True
+
+    def test_failure_is_recorded_and_reraised(self, writer, manager):
+        manager, provider = manager
+        provider.generate_structured.side_effect = TimeoutError("slow")
+
+        with pytest.raises(TimeoutError):
+            manager.generate_structured_with_model("gpt-4o", "prompt", dict)
+
+        (entry,) = _submitted(writer)
+        assert entry["operation"] == "generate_structured"
+        assert entry["success"] is False
+        assert entry["error_type"] == "TimeoutError"
+
+    def test_structured_usage_is_recorded(self, writer, manager):
+        manager, provider = manager
+        provider.generate_structured.return_value = Mock(
+            prompt_tokens=200, completion_tokens=50
+        )
+
+        manager.generate_structured_with_model("gpt-4o", "prompt", dict)
+
+        (entry,) = _submitted(writer)
+        assert (entry["prompt_tokens"], entry["completion_tokens"]) == (200, 50)
+        assert entry["estimated_cost_eur"] > 0
+
+
+@pytest.mark.django_db
+class TestLedgerWrite:
+    def test_write_inserts_batch(self, writer):
+        record_llm_call(model="gpt-4o", provider="openai", latency_ms=10)
+        record_llm_call(model="gpt-4o", error=ValueError("bad"))
+
+        LedgerWriter()._write(_submitted(writer))
+
+        rows = list(LLMCall.objects.order_by("id").values("success", "error_type"))
+        assert rows == [
+            {"success": True, "error_type": ""},
+            {"success": False, "error_type": "ValueError"},
+        ]
+
+    def test_rows_cannot_be_updated(self):
+        call = LLMCall.objects.create(model="gpt-4o")
+        call.latency_ms = 1
+        with pytest.raises(ValueError):
+            call.save()
+
+
+@pytest.mark.django_db
+class TestReports:
+    @pytest.fixture(autouse=True)
+    def calls(self):
+        LLMCall.objects.bulk_create(
+            [
+                LLMCall(
+                    feature="pillars",
+                    model="gpt-4o",
+                    latency_ms=ms,
+                    prompt_tokens=10,
+                    completion_tokens=5,
+                    total_tokens=15,
+                    estimated_cost_eur=Decimal("0.001"),
+                    success=ms % 10 != 0,
+                    retry_count=1 if ms <= 3 else 0,
+                )
+                for ms in range(100, 0, -1)
+            ]
+            + [
+                LLMCall(feature="sparc", model="gpt-4o", latency_ms=ms)
+                for ms in (30, 10, 20)
+            ]
+            + [LLMCall(feature="sparc", model="gpt-4o", cache_hit=True)]
+        )
+
+    def test_latency_percentiles_use_nearest_rank(self):
+        report = latency_report(LLMCall.objects.all())
+
+        assert report == [
+            {
+                "feature": "pillars",
+                "model": "gpt-4o",
+                "calls": 100,
+                "p50_ms": 50,
+                "p95_ms": 95,
+            },
+            # ranks ceil(1.5) = 2 and ceil(2.85) = 3 of [10, 20, 30]
+            {
+                "feature": "sparc",
+                "model": "gpt-4o",
+                "calls": 3,
+                "p50_ms": 20,
+                "p95_ms": 30,
+            },
+        ]
+
+    def test_spend_report(self):
+        pillars, sparc = spend_report(LLMCall.objects.all())
+
+        assert pillars["calls"] == 100
+        assert pillars["failures"] == 10
+        assert pillars["retries"] == 3
+        assert pillars["prompt_tokens"] == 1000
+        assert pillars["completion_tokens"] == 500
+        assert pillars["cost_eur"] == Decimal("0.1")
+        assert pillars["mean_latency_ms"] == 50.5
+        assert sparc["calls"] == 3
+        assert sparc["cache_hits"] == 1
+        assert sparc["cost_eur"] == Decimal("0")
+        assert sparc["mean_latency_ms"] == 20
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:06
+
+import datetime
+
+from django.db import migrations, models
+
+RELEASE_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%Y/%m/%d")
+
+
+def _parse(value):
+    if not value:
+        return None
+    v = value.strip()
+    for fmt in RELEASE_DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(v, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_release_dates(apps, schema_editor):
+    PlayerExpectationsAbsa = apps.get_model(
+        "player_expectations", "PlayerExpectationsAbsa"
+    )
+    batch = []
+    for obj in PlayerExpectationsAbsa.objects.only("id", "release_date").iterator():
+        obj.release_date_parsed = _parse(obj.release_date)
+        if obj.release_date_parsed is not None:
+            batch.append(obj)
+        if len(batch) >= 1000:
+            PlayerExpectationsAbsa.objects.bulk_update(batch, ["release_date_parsed"])
+            batch = []
+    if batch:
+        PlayerExpectationsAbsa.objects.bulk_update(batch, ["release_date_parsed"])
+
+
+# One version row per table; every write to the table bumps it
+VERSION_SQL = (
+    "INSERT INTO player_expectations_table_version (table_name, version) "
+    "VALUES ('player_expectations_absa', 0);",
+    *[
+        f"""
+        CREATE TRIGGER IF NOT EXISTS player_expectations_absa_version_{op[0]}
+        AFTER {op.upper()} ON player_expectations_absa BEGIN
+            UPDATE player_expectations_table_version
+            SET version = version + 1
+            WHERE table_name = 'player_expectations_absa';
+        END;
+        """
+        for op in ("insert", "update", "delete")
+    ],
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("player_expectations", "0002_seed_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerExpectationsTableVersion",
+            fields=[
+                ("table_name", models.TextField(primary_key=True, serialize=False)),
+                ("version", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "player_expectations_table_version",
+                "managed": True,
+            },
+        ),
+        migrations.AddField(
+            model_name="playerexpectationsabsa",
+            name="release_date_parsed",
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(parse_release_dates, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql=VERSION_SQL,
+            reverse_sql=tuple(
+                f"DROP TRIGGER IF EXISTS player_expectations_absa_version_{op};"
+                for op in ("i", "u", "d")
+            ),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:12
+
+import re
+from itertools import product
+
+from django.db import migrations, models
+
+# release_date_parsed is derived by triggers, so bulk_create, QuerySet.update
+# and raw SQL writes keep it current too. The SQL accepts what the Python
+# parser of migration 0003 did: these strptime formats, with one or two
+# digit fields, surrounded by whitespace, and only real calendar dates.
+RELEASE_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%Y/%m/%d")
+
+TABLE = "player_expectations_absa"
+TRIMMED = "trim(release_date, char(32, 9, 10, 11, 12, 13))"
+
+
+def _branches(fmt):
+    # one "WHEN <glob> THEN <'YYYY-MM-DD HH:MM:SS'>" per digit width combination
+    fields, seps = zip(*re.findall(r"%(\w)([^%]*)", fmt))
+    widths = [(4,) if f == "Y" else (1, 2) for f in fields]
+    for combo in product(*widths):
+        pattern, start, parts = "", 1, {}
+        for field, sep, width in zip(fields, seps, combo):
+            pattern += "[0-9]" * width + sep
+            parts[field] = f"CAST(substr({TRIMMED}, {start}, {width}) AS INTEGER)"
+            start += width + len(sep)
+        value = (
+            "printf('%04d-%02d-%02d %02d:%02d:%02d', "
+            + ", ".join(parts.get(f, "0") for f in "YmdHMS")
+            + ")"
+        )
+        yield f"WHEN {TRIMMED} GLOB '{pattern}' THEN {value}"
+
+
+PARSE_SQL = (
+    "CASE "
+    + " ".join(b for fmt in RELEASE_DATE_FORMATS for b in _branches(fmt))
+    + " END"
+)
+# keep the date only if the timestamp survives normalization, i.e. it exists
+# ('2021-02-29' would become '2021-03-01')
+VALIDATE_SQL = """
+    CASE WHEN substr(release_date_parsed, 1, 4) <> '0000'
+        AND datetime(release_date_parsed, '+0 days') = release_date_parsed
+    THEN date(release_date_parsed) END
+"""
+
+
+def _derive(where):
+    return (
+        f"UPDATE {TABLE} SET release_date_parsed = {PARSE_SQL} {where};",
+        f"UPDATE {TABLE} SET release_date_parsed = {VALIDATE_SQL} {where};",
+    )
+
+
+TRIGGER_SQL = (
+    *_derive(""),
+    *[
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE}_release_date_{suffix}
+        AFTER {event} ON {TABLE} BEGIN
+            {" ".join(_derive("WHERE id = NEW.id"))}
+        END;
+        """
+        for suffix, event in (
+            ("ai", "INSERT"),
+            ("au", "UPDATE OF release_date, release_date_parsed"),
+        )
+    ],
+)
+REVERSE_SQL = tuple(
+    f"DROP TRIGGER IF EXISTS {TABLE}_release_date_{suffix};" for suffix in ("au", "ai")
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("player_expectations", "0003_release_date_parsed"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="playerexpectationsabsa",
+            name="release_date_parsed",
+            field=models.DateField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.RunSQL(sql=TRIGGER_SQL, reverse_sql=REVERSE_SQL),
+    ]
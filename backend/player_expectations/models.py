@@ -35,6 +35,12 @@ class PlayerExpectationsAbsa(models.Model):
     )  # Field name made lowercase.
     dominant_aspect = models.TextField(blank=True, null=True)
     dominant_sentiment = models.TextField(blank=True, null=True)
+    # release_date as a date, so charts can group by it in SQL. Derived by
+    # triggers (see migration 0004) on every insert and update, including
+    # bulk_create and QuerySet.update; NULL when release_date doesn't parse
+    release_date_parsed = models.DateField(
+        blank=True, null=True, db_index=True, editable=False
+    )
 
     class Meta:
         managed = True
@@ -51,3 +57,18 @@ class PlayerExpectationsConfusions(models.Model):
     class Meta:
         managed = True
         db_table = "player_expectations_confusions"
+
+
+class PlayerExpectationsTableVersion(models.Model):
+    """
+    Change counter per table, bumped by SQLite triggers (see migration 0003)
+    on every insert/update/delete. Views use it to invalidate memoized
+    aggregates without re-reading the table.
+    """
+
+    table_name = models.TextField(primary_key=True)
+    version = models.IntegerField(default=0)
+
+    class Meta:
+        managed = True
+        db_table = "player_expectations_table_version"
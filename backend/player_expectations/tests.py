@@ -1,3 +1,294 @@
-# from django.test import TestCase
+"""
+Tests for the sentiments endpoint's streamed output and the chart aggregates.
+"""
 
-# Create your tests here.
+import datetime
+import json
+from collections import Counter, defaultdict
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from player_expectations import views
+from player_expectations.models import PlayerExpectationsAbsa
+from player_expectations.views import SENTIMENT_ORDER, SentimentData
+
+
+class SentimentStreamTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        PlayerExpectationsAbsa.objects.all().delete()
+        PlayerExpectationsAbsa.objects.bulk_create(
+            PlayerExpectationsAbsa(
+                appid=i,
+                name=f"game {i}",
+                has_explicit="true" if i % 2 else "false",
+                explicit_expectations=f"explicit {i}",
+                expectations=f"implicit {i}",
+            )
+            for i in range(7)
+        )
+
+    def _get(self, output):
+        return self.client.get(
+            reverse("sentiment-data"),
+            {"type": "all", "output": output, "fields": "appid"},
+        )
+
+    @staticmethod
+    def _read(response):
+        async def read():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        return async_to_sync(read)().decode()
+
+    @patch.object(SentimentData, "STREAM_CHUNK_SIZE", 3)
+    def test_stream_matches_json_output(self):
+        expected = self._get("json").json()
+
+        response = self._get("stream")
+        self.assertTrue(response.is_async)
+        self.assertEqual(json.loads(self._read(response)), expected)
+
+        response = self._get("ndjson")
+        self.assertTrue(response.is_async)
+        lines = self._read(response).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], expected["data"])
+
+    @patch.object(SentimentData, "STREAM_CHUNK_SIZE", 3)
+    def test_rows_are_fetched_one_chunk_at_a_time(self):
+        fetched = []
+        serialized_chunk = SentimentData._serialized_chunk
+
+        def counting_chunk(view, *args):
+            lines, after = serialized_chunk(view, *args)
+            fetched.append(len(lines))
+            return lines, after
+
+        with patch.object(SentimentData, "_serialized_chunk", counting_chunk):
+            response = self._get("ndjson")
+
+            async def read_first_line():
+                content = response.streaming_content
+                first = await content.__anext__()
+                fetched_before_rest = list(fetched)
+                rest = [chunk async for chunk in content]
+                return first, fetched_before_rest, rest
+
+            first, fetched_before_rest, rest = async_to_sync(read_first_line)()
+
+        self.assertEqual(json.loads(first), {"appid": 0})
+        self.assertEqual(fetched_before_rest, [3])
+        self.assertEqual(fetched, [3, 3, 1])
+        self.assertEqual(len(rest), 6)
+
+
+# The chart views before they aggregated in SQL: parse every release_date in
+# Python and count the normalized rows with Counter
+def _legacy_parse_date(value):
+    if not value:
+        return None
+    v = value.strip()
+    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%Y/%m/%d"):
+        try:
+            return datetime.datetime.strptime(v, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _legacy_rows():
+    rows = []
+    for r in PlayerExpectationsAbsa.objects.values(
+        "dominant_aspect", "dominant_sentiment", "release_date"
+    ):
+        aspect = (r["dominant_aspect"] or "").strip()
+        sentiment = (r["dominant_sentiment"] or "").strip().lower()
+        date = _legacy_parse_date(r["release_date"])
+        if aspect and sentiment:
+            rows.append({"aspect": aspect, "sentiment": sentiment, "date": date})
+    return rows
+
+
+def _legacy_charts():
+    rows = _legacy_rows()
+    counts = Counter(r["aspect"] for r in rows).most_common(10)
+    top_aspects = [a for a, _ in counts]
+
+    pairs = Counter((r["aspect"], r["sentiment"]) for r in rows)
+    aspect_sentiment = [
+        {"dominant_aspect": a, "dominant_sentiment": s, "count": c}
+        for (a, s), c in pairs.items()
+        if a in top_aspects
+    ]
+    aspect_sentiment.sort(
+        key=lambda x: (
+            top_aspects.index(x["dominant_aspect"]),
+            (
+                SENTIMENT_ORDER.index(x["dominant_sentiment"])
+                if x["dominant_sentiment"] in SENTIMENT_ORDER
+                else 99
+            ),
+        )
+    )
+
+    trend = defaultdict(lambda: {s: 0 for s in SENTIMENT_ORDER})
+    for r in rows:
+        if r["date"] and r["sentiment"] in SENTIMENT_ORDER:
+            trend[r["date"].strftime("%Y-%m")][r["sentiment"]] += 1
+
+    sentiments = Counter(r["sentiment"] for r in rows)
+
+    heat = defaultdict(dict)
+    aspects, years = set(), set()
+    for r in rows:
+        if r["sentiment"] == "positive":
+            year = r["date"].year if r["date"] else "Unknown"
+            aspects.add(r["aspect"])
+            years.add(year)
+            heat[year][r["aspect"]] = heat[year].get(r["aspect"], 0) + 1
+    for year in years:
+        for aspect in aspects:
+            heat[year].setdefault(aspect, 0)
+
+    # through JSON, like the responses (heatmap years become string keys)
+    return json.loads(
+        json.dumps(
+            {
+                "aspect-frequency": dict(counts),
+                "aspect-sentiment": aspect_sentiment,
+                "trend-over-time": [{"month": m, **trend[m]} for m in sorted(trend)],
+                "sentiment-pie": {k: sentiments.get(k, 0) for k in SENTIMENT_ORDER},
+                "heatmap": heat,
+            }
+        )
+    )
+
+
+RELEASE_DATES = [
+    "2021-03-04",
+    " 2021-3-4\t",
+    "2022-12-31 23:59:59",
+    "2022-1-2 3:04:05",
+    "2022-01-02 24:00:00",
+    "04/03/2021",
+    "4/3/2021",
+    "2020/02/29",
+    "2021/02/29",
+    "2021-13-01",
+    "0000-01-01",
+    "2021-03-04x",
+    "March 2021",
+    "",
+    None,
+]
+
+
+class ReleaseDateParsedTests(TestCase):
+    def setUp(self):
+        PlayerExpectationsAbsa.objects.all().delete()
+
+    def _assert_parsed(self):
+        rows = PlayerExpectationsAbsa.objects.values_list(
+            "release_date", "release_date_parsed"
+        )
+        for release_date, parsed in rows:
+            with self.subTest(release_date=release_date):
+                self.assertEqual(parsed, _legacy_parse_date(release_date))
+
+    def test_bulk_create_parses_release_dates(self):
+        PlayerExpectationsAbsa.objects.bulk_create(
+            PlayerExpectationsAbsa(release_date=d) for d in RELEASE_DATES
+        )
+
+        self._assert_parsed()
+        self.assertEqual(
+            PlayerExpectationsAbsa.objects.filter(
+                release_date_parsed__isnull=False
+            ).count(),
+            7,
+        )
+
+    def test_updates_reparse_release_dates(self):
+        rows = PlayerExpectationsAbsa.objects.bulk_create(
+            PlayerExpectationsAbsa(release_date="2021-03-04") for _ in RELEASE_DATES
+        )
+        for row, release_date in zip(rows, RELEASE_DATES):
+            PlayerExpectationsAbsa.objects.filter(pk=row.pk).update(
+                release_date=release_date
+            )
+        self._assert_parsed()
+
+        PlayerExpectationsAbsa.objects.update(
+            release_date="1/2/2003", release_date_parsed=None
+        )
+        self._assert_parsed()
+
+        row = PlayerExpectationsAbsa.objects.first()
+        row.release_date = "2004/05/06"
+        row.save()
+        row.refresh_from_db()
+        self.assertEqual(row.release_date_parsed, datetime.date(2004, 5, 6))
+
+
+class ChartAggregationTests(TestCase):
+    CHARTS = [
+        "aspect-frequency",
+        "aspect-sentiment",
+        "trend-over-time",
+        "sentiment-pie",
+        "heatmap",
+    ]
+
+    def setUp(self):
+        self.client = APIClient()
+        views._MEMO.clear()
+        PlayerExpectationsAbsa.objects.all().delete()
+        sentiments = ["positive", " Neutral", "NEGATIVE ", "positive", "mixed"]
+        aspects = [f"aspect {i}" for i in range(12)]
+        rows = []
+        for i, aspect in enumerate(aspects):
+            # aspect i appears 13 - i times, so the top 10 has no ties
+            for j in range(13 - i):
+                rows.append(
+                    PlayerExpectationsAbsa(
+                        dominant_aspect=f" {aspect} " if j % 4 == 0 else aspect,
+                        dominant_sentiment=sentiments[j % len(sentiments)],
+                        release_date=RELEASE_DATES[(i + j) % len(RELEASE_DATES)],
+                    )
+                )
+        rows += [
+            PlayerExpectationsAbsa(dominant_aspect="", dominant_sentiment="positive"),
+            PlayerExpectationsAbsa(dominant_aspect="aspect 0", dominant_sentiment=" "),
+            PlayerExpectationsAbsa(dominant_aspect=None, dominant_sentiment=None),
+        ]
+        PlayerExpectationsAbsa.objects.bulk_create(rows)
+
+    def _charts(self):
+        return {
+            name: self.client.get(reverse(name)).json()["data"] for name in self.CHARTS
+        }
+
+    def test_sql_aggregates_match_the_legacy_counters(self):
+        charts = self._charts()
+
+        self.assertEqual(charts, _legacy_charts())
+        self.assertEqual(len(charts["aspect-frequency"]), 10)
+        self.assertIn("Unknown", charts["heatmap"])
+
+    def test_writes_refresh_memoized_charts(self):
+        self._charts()
+        PlayerExpectationsAbsa.objects.filter(dominant_aspect="aspect 11").update(
+            release_date="2030-01-01", dominant_sentiment="positive"
+        )
+        PlayerExpectationsAbsa.objects.create(
+            dominant_aspect="aspect 11", dominant_sentiment="negative"
+        )
+
+        charts = self._charts()
+
+        self.assertEqual(charts, _legacy_charts())
+        self.assertEqual(charts["heatmap"]["2030"]["aspect 11"], 1)
@@ -1,84 +1,116 @@
 from __future__ import annotations
 
-import datetime
-from collections import Counter, defaultdict
-
-from django.db.models import Case, CharField, Count, F, Q, TextField, Value, When
+import json
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, Tuple
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    F,
+    Q,
+    QuerySet,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import ExtractYear, Lower, Trim, TruncMonth
 
 # -----------------------------
 # views.py
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_GET
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import PlayerExpectationsAbsa, PlayerExpectationsConfusions
+from .models import (
+    PlayerExpectationsAbsa,
+    PlayerExpectationsConfusions,
+    PlayerExpectationsTableVersion,
+)
 
 SENTIMENT_ORDER = ["positive", "neutral", "negative"]
 
 # ---------- shared helpers ----------
 
 
-def _parse_date_safe(value: str | None):
-    if not value:
-        return None
-    v = value.strip()
-    # try several common formats; add more if your data needs it
-    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%Y/%m/%d"):
-        try:
-            return datetime.datetime.strptime(v, fmt).date()
-        except ValueError:
-            continue
-    return None
-
-
-def _base_rows():
+def _base_rows() -> QuerySet:
     """
-    Load only the fields we need and normalize (lowercase sentiment, trim aspect).
-    We keep this small so each view can reuse it.
+    Normalized rows (trimmed aspect, lowercase sentiment) with both set.
+    Every chart aggregates this queryset with GROUP BY in SQL.
     """
-    qs = PlayerExpectationsAbsa.objects.values(
-        "dominant_aspect", "dominant_sentiment", "release_date"
+    return PlayerExpectationsAbsa.objects.annotate(
+        aspect=Trim("dominant_aspect"),
+        sentiment=Lower(Trim("dominant_sentiment")),
+    ).filter(aspect__gt="", sentiment__gt="")
+
+
+# Per-process memo of chart payloads, keyed by view name and valid while the
+# table's version stamp (bumped by triggers on every write) is unchanged
+_MEMO: Dict[str, Tuple[int, Any]] = {}
+
+
+def _table_version() -> int:
+    row = (
+        PlayerExpectationsTableVersion.objects.filter(
+            table_name=PlayerExpectationsAbsa._meta.db_table
+        )
+        .values_list("version", flat=True)
+        .first()
     )
-    rows = []
-    for r in qs:
-        aspect = (r["dominant_aspect"] or "").strip()
-        sentiment = (r["dominant_sentiment"] or "").strip().lower()
-        date = _parse_date_safe(r["release_date"])
-        if aspect and sentiment:
-            rows.append({"aspect": aspect, "sentiment": sentiment, "date": date})
-    return rows
+    return int(row or 0)
+
+
+def _memoized(name: str, compute: Callable[[], Any]) -> Any:
+    version = _table_version()
+    hit = _MEMO.get(name)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    data = compute()
+    _MEMO[name] = (version, data)
+    return data
+
+
+def _top_aspects(limit: int = 10) -> list[tuple[str, int]]:
+    qs = (
+        _base_rows()
+        .values("aspect")
+        .annotate(n=Count("id"))
+        .order_by("-n", "aspect")[:limit]
+    )
+    return [(r["aspect"], r["n"]) for r in qs]
 
 
 # ---------- 1) Aspect frequency (top 10 overall) ----------
 @require_GET
 def aspect_frequency_view(request):
-    rows = _base_rows()
-    counts = Counter(r["aspect"] for r in rows).most_common(10)
-    data = dict(counts)
+    data = _memoized("aspect_frequency", lambda: dict(_top_aspects(10)))
     return JsonResponse({"data": data})
 
 
 # -------- 2) Aspect + sentiment breakdown (top 10 aspects by positive count) --------
-@require_GET
-def aspect_sentiment_view(request):
-    rows = _base_rows()
-
+def _aspect_sentiment_data() -> list[dict[str, Any]]:
     # Get top aspects based on overall frequency (same as aspect_frequency_view)
-    overall_counts = Counter(r["aspect"] for r in rows).most_common(10)
-    top_aspects = [a for a, _ in overall_counts]
+    top_aspects = [a for a, _ in _top_aspects(10)]
 
     # Count aspect + sentiment pairs
-    aspect_sentiment_counts = Counter((r["aspect"], r["sentiment"]) for r in rows)
-
-    # Build list and sort according to top_aspects order + sentiment order
     items = [
-        {"dominant_aspect": a, "dominant_sentiment": s, "count": c}
-        for (a, s), c in aspect_sentiment_counts.items()
-        if a in top_aspects
+        {
+            "dominant_aspect": r["aspect"],
+            "dominant_sentiment": r["sentiment"],
+            "count": r["n"],
+        }
+        for r in _base_rows()
+        .filter(aspect__in=top_aspects)
+        .values("aspect", "sentiment")
+        .annotate(n=Count("id"))
     ]
 
+    # sort according to top_aspects order + sentiment order
     items.sort(
         key=lambda x: (
             top_aspects.index(x["dominant_aspect"]),
@@ -89,59 +121,85 @@ def aspect_sentiment_view(request):
             ),
         )
     )
-    return JsonResponse({"data": items})
+    return items
 
 
-# ---------- 3) Trend over time (month × sentiment) ----------
 @require_GET
-def trend_over_time_view(request):
-    rows = _base_rows()
-    trend = defaultdict(lambda: {s: 0 for s in SENTIMENT_ORDER})
+def aspect_sentiment_view(request):
+    data = _memoized("aspect_sentiment", _aspect_sentiment_data)
+    return JsonResponse({"data": data})
+
+
+# ---------- 3) Trend over time (month × sentiment) ----------
+def _trend_data() -> list[dict[str, Any]]:
+    trend: Dict[str, Dict[str, int]] = defaultdict(
+        lambda: {s: 0 for s in SENTIMENT_ORDER}
+    )
+    rows = (
+        _base_rows()
+        .filter(release_date_parsed__isnull=False, sentiment__in=SENTIMENT_ORDER)
+        .annotate(month=TruncMonth("release_date_parsed"))
+        .values("month", "sentiment")
+        .annotate(n=Count("id"))
+    )
     for r in rows:
-        if not r["date"]:
-            continue
-        month_key = r["date"].strftime("%Y-%m")  # "YYYY-MM"
-        if r["sentiment"] in SENTIMENT_ORDER:
-            trend[month_key][r["sentiment"]] += 1
+        trend[r["month"].strftime("%Y-%m")][r["sentiment"]] += r["n"]  # "YYYY-MM"
 
-    data = [{"month": m, **trend[m]} for m in sorted(trend.keys())]
+    return [{"month": m, **trend[m]} for m in sorted(trend.keys())]
+
+
+@require_GET
+def trend_over_time_view(request):
+    data = _memoized("trend_over_time", _trend_data)
     return JsonResponse({"data": data})
 
 
 # ---------- 4) Sentiment pie (overall distribution) ----------
+def _sentiment_pie_data() -> dict[str, int]:
+    counts = {
+        r["sentiment"]: r["n"]
+        for r in _base_rows().values("sentiment").annotate(n=Count("id"))
+    }
+    # stable order if needed on client
+    return {k: counts.get(k, 0) for k in SENTIMENT_ORDER}
+
+
 @require_GET
 def sentiment_pie_view(request):
-    rows = _base_rows()
-    counts = Counter(r["sentiment"] for r in rows)
-    data = {
-        k: counts.get(k, 0) for k in SENTIMENT_ORDER
-    }  # stable order if needed on client
+    data = _memoized("sentiment_pie", _sentiment_pie_data)
     return JsonResponse({"data": data})
 
 
 # ---------- 5) Heatmap: positive counts per aspect per year ----------
-@require_GET
-def heatmap_view(request):
-    rows = _base_rows()
-    heat = defaultdict(dict)  # {year: {aspect: count}}
-
+def _heatmap_data() -> dict[Any, dict[str, int]]:
+    heat: Dict[Any, Dict[str, int]] = defaultdict(dict)  # {year: {aspect: count}}
+
+    rows = (
+        _base_rows()
+        .filter(sentiment="positive")
+        .annotate(year=ExtractYear("release_date_parsed"))
+        .values("year", "aspect")
+        .annotate(n=Count("id"))
+    )
     # collect all aspects & years (including None)
     all_aspects = set()
-    all_years = set()
-
     for r in rows:
-        if r["sentiment"] == "positive":
-            all_aspects.add(r["aspect"])
-            year = r["date"].year if r["date"] else "Unknown"
-            all_years.add(year)
-            heat[year][r["aspect"]] = heat[year].get(r["aspect"], 0) + 1
+        year = r["year"] if r["year"] is not None else "Unknown"
+        all_aspects.add(r["aspect"])
+        heat[year][r["aspect"]] = heat[year].get(r["aspect"], 0) + r["n"]
 
     # fill zeros for missing aspect-year combos
-    for year in all_years:
+    for year in heat:
         for aspect in all_aspects:
             heat[year].setdefault(aspect, 0)
 
-    return JsonResponse({"data": heat})
+    return dict(heat)
+
+
+@require_GET
+def heatmap_view(request):
+    data = _memoized("heatmap", _heatmap_data)
+    return JsonResponse({"data": data})
 
 
 # ---------- (Optional) 6) Top confusions -------------
@@ -190,8 +248,24 @@ def top_confusions_view(request):
 class SentimentData(APIView):
     """
     GET /api/sentiments?type=explicit|implicit|all|not_assigned  (default: explicit)
+
+    Optional parameters:
+      fields=name,appid,...     only return these columns (e.g. drop review_text)
+      page_size=N&cursor=ID     keyset pages ordered by id; the response carries
+                                next_cursor until the last page
+      output=json|stream|ndjson stream/ndjson serialize rows while they are
+                                fetched instead of building one big list
+                                (not "format": DRF reserves that parameter)
     """
 
+    # public names of the annotated columns
+    ANNOTATED = {
+        "expectations": "expectations_out",
+        "expectation_type": "expectation_type_out",
+    }
+    MAX_PAGE_SIZE = 1000
+    STREAM_CHUNK_SIZE = 500
+
     COMMON = [
         "unnamed_0",
         "appid",
@@ -213,6 +287,22 @@ class SentimentData(APIView):
 
     def get(self, request):
         t = (request.query_params.get("type") or "explicit").lower()
+        fmt = (request.query_params.get("output") or "json").lower()
+        if fmt not in ("json", "stream", "ndjson"):
+            return Response(
+                {"error": "Invalid output. Use 'json', 'stream' or 'ndjson'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fields = self._requested_fields(request.query_params.get("fields"))
+        if fields is None:
+            return Response(
+                {
+                    "error": "Invalid fields. Choose from: "
+                    + ", ".join([*self.COMMON, *self.ANNOTATED])
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         # 1) One base queryset with NON-colliding annotations
         base = PlayerExpectationsAbsa.objects.annotate(
@@ -255,11 +345,95 @@ class SentimentData(APIView):
             )
 
         # 4) Select fields + the safe annotation names
-        rows = list(qs.values(*self.COMMON, "expectations_out", "expectation_type_out"))
-
-        # 5) Rename keys to the public API names (avoid ORM conflicts entirely)
-        for r in rows:
-            r["expectations"] = r.pop("expectations_out")
-            r["expectation_type"] = r.pop("expectation_type_out")
-
-        return Response({"data": rows})
+        columns = [self.ANNOTATED.get(f, f) for f in fields]
+
+        # 5) Optional keyset page: id > cursor, one extra row tells us if more exist
+        page_size = request.query_params.get("page_size")
+        cursor = request.query_params.get("cursor")
+        if page_size or cursor:
+            try:
+                size = min(max(1, int(page_size or 100)), self.MAX_PAGE_SIZE)
+                after = int(cursor) if cursor else None
+            except ValueError:
+                return Response(
+                    {"error": "page_size and cursor must be integers."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            qs = qs.order_by("id")
+            if after is not None:
+                qs = qs.filter(id__gt=after)
+            page = list(qs.values("id", *columns)[: size + 1])
+            next_cursor = page[size - 1]["id"] if len(page) > size else None
+            rows = [self._public_row(r) for r in page[:size]]
+            return Response({"data": rows, "next_cursor": next_cursor})
+
+        if fmt == "json":
+            rows = [self._public_row(r) for r in qs.values(*columns)]
+            return Response({"data": rows})
+
+        # 6) Streaming: one keyset chunk at a time, each fetched and
+        # serialized in a worker thread; async so ASGI sends it as it goes
+        lines = self._stream_lines(qs, columns)
+        if fmt == "ndjson":
+            response = StreamingHttpResponse(
+                (line + "\n" async for line in lines),
+                content_type="application/x-ndjson",
+            )
+        else:
+            response = StreamingHttpResponse(
+                self._stream_json_array(lines), content_type="application/json"
+            )
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def _requested_fields(self, raw: str | None) -> list[str] | None:
+        """Validated field list (default: everything), None if unknown names."""
+        allowed = [*self.COMMON, *self.ANNOTATED]
+        if not raw:
+            return allowed
+        fields = [f.strip() for f in raw.split(",") if f.strip()]
+        if not fields or any(f not in allowed for f in fields):
+            return None
+        return fields
+
+    def _public_row(self, row: dict[str, Any]) -> dict[str, Any]:
+        # Rename keys to the public API names (avoid ORM conflicts entirely)
+        row.pop("id", None)
+        for public, column in self.ANNOTATED.items():
+            if column in row:
+                row[public] = row.pop(column)
+        return row
+
+    def _serialized_chunk(
+        self, qs: QuerySet, columns: list[str], after: int | None
+    ) -> tuple[list[str], int | None]:
+        """JSON-encoded rows after id `after`, and the cursor of the next chunk."""
+        qs = qs.order_by("id")
+        if after is not None:
+            qs = qs.filter(id__gt=after)
+        rows = list(qs.values("id", *columns)[: self.STREAM_CHUNK_SIZE])
+        next_after = rows[-1]["id"] if len(rows) == self.STREAM_CHUNK_SIZE else None
+        lines = [json.dumps(self._public_row(r), cls=DjangoJSONEncoder) for r in rows]
+        return lines, next_after
+
+    async def _stream_lines(
+        self, qs: QuerySet, columns: list[str]
+    ) -> AsyncIterator[str]:
+        serialized_chunk = sync_to_async(self._serialized_chunk)
+        after = None
+        while True:
+            lines, after = await serialized_chunk(qs, columns, after)
+            for line in lines:
+                yield line
+            if after is None:
+                return
+
+    @staticmethod
+    async def _stream_json_array(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+        # same document shape as output=json: {"data": [...]}
+        yield '{"data": ['
+        first = True
+        async for line in lines:
+            yield line if first else "," + line
+            first = False
+        yield "]}"
@@ -0,0 +1,145 @@
+#   backend/player_expectations_new/dashboard/rollups.py
+"""
+Pre-aggregated rollups for the compare dashboard.
+
+Every dashboard filter (app_ids, languages, polarity) and grouping (month,
+code, sentiment) is a column of these tables, so chart queries become a few
+index lookups over a small table instead of GROUP BYs over
+thesis_dataset JOIN review_quotes JOIN quote_code_sentiment:
+
+dashboard_review_rollup   (app_id, ym, language, voted_up) -> reviews
+dashboard_mention_rollup  (app_id, ym, language, voted_up,
+                           coarse_category, code_int, sentiment_v2) -> mentions
+
+Columns hold the same normalized expressions the raw queries filter on
+(LOWER(COALESCE(language,'')), COALESCE(voted_up,0)), so results match.
+Rebuild with `python manage.py refresh_dashboard_rollups`; pass --app-ids to
+refresh only the games whose reviews changed.
+
+Triggers on thesis_dataset, review_quotes and quote_code_sentiment (see
+migration 0009) record every game whose rows change in
+dashboard_rollup_dirty and bump dashboard_rollup_state.version. Queries
+that touch a dirty game read the raw tables instead, so imported reviews
+show up immediately and the rollups only speed up games they are current
+for. The version changes with every write and refresh, which makes it the
+dashboard's cache/ETag stamp.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+from django.db import connection, transaction
+
+REVIEW_ROLLUP_TABLE = "dashboard_review_rollup"
+MENTION_ROLLUP_TABLE = "dashboard_mention_rollup"
+DIRTY_TABLE = "dashboard_rollup_dirty"
+STATE_TABLE = "dashboard_rollup_state"
+
+YM_SQL = "strftime('%%Y-%%m', datetime(COALESCE(t.timestamp_created,0), 'unixepoch'))"
+
+
+def _language_sql() -> str:
+    with connection.cursor() as cur:
+        cur.execute("PRAGMA table_info(thesis_dataset)")
+        has_language = any(r[1] == "language" for r in cur.fetchall())
+    return "LOWER(COALESCE(t.language,''))" if has_language else "''"
+
+
+def refresh_rollups(app_ids: Optional[Sequence[int]] = None) -> Tuple[int, int]:
+    """
+    Rebuild the rollups, for all games or only `app_ids`.
+
+    Returns:
+        (review rollup rows, mention rollup rows) written
+    """
+    app_sql = ""
+    app_params: List[int] = []
+    if app_ids:
+        app_sql = f"app_id IN ({','.join(['%s'] * len(app_ids))})"
+        app_params = [int(a) for a in app_ids]
+
+    lang_sql = _language_sql()
+    review_where = f"WHERE t.{app_sql}" if app_sql else ""
+    mention_where = "WHERE qcs.sentiment_v2 IS NOT NULL"
+    if app_sql:
+        mention_where += f" AND t.{app_sql}"
+
+    with transaction.atomic(), connection.cursor() as cur:
+        for table in (REVIEW_ROLLUP_TABLE, MENTION_ROLLUP_TABLE, DIRTY_TABLE):
+            cur.execute(
+                f"DELETE FROM {table} {'WHERE ' + app_sql if app_sql else ''}",
+                app_params,
+            )
+
+        cur.execute(
+            f"""
+            INSERT INTO {REVIEW_ROLLUP_TABLE}
+                (app_id, ym, language, voted_up, reviews)
+            SELECT
+                t.app_id,
+                {YM_SQL} AS ym,
+                {lang_sql} AS language,
+                COALESCE(t.voted_up,0) AS voted_up,
+                COUNT(1)
+            FROM thesis_dataset t
+            {review_where}
+            GROUP BY 1, 2, 3, 4
+            """,
+            app_params,
+        )
+        review_rows = cur.rowcount
+
+        cur.execute(
+            f"""
+            INSERT INTO {MENTION_ROLLUP_TABLE}
+                (app_id, ym, language, voted_up,
+                 coarse_category, code_int, sentiment_v2, mentions)
+            SELECT
+                t.app_id,
+                {YM_SQL} AS ym,
+                {lang_sql} AS language,
+                COALESCE(t.voted_up,0) AS voted_up,
+                qcs.coarse_category,
+                qcs.code_int,
+                qcs.sentiment_v2,
+                COUNT(1)
+            FROM thesis_dataset t
+            JOIN review_quotes rq ON rq.recommendation_id = t.recommendation_id
+            JOIN quote_code_sentiment qcs ON qcs.quote_id = rq.quote_id
+            {mention_where}
+            GROUP BY 1, 2, 3, 4, 5, 6, 7
+            """,
+            app_params,
+        )
+        mention_rows = cur.rowcount
+
+        cur.execute(f"UPDATE {STATE_TABLE} SET version = version + 1")
+
+    return review_rows, mention_rows
+
+
+def rollup_state(app_ids: Sequence[int] = ()) -> Tuple[bool, int]:
+    """
+    Whether the rollups are current for `app_ids` (all games if empty).
+
+    Returns:
+        (rollups current, data version)
+    """
+    dirty_sql = f"SELECT 1 FROM {DIRTY_TABLE}"
+    params: List[int] = []
+    if app_ids:
+        dirty_sql += f" WHERE app_id IN ({','.join(['%s'] * len(app_ids))})"
+        params = [int(a) for a in app_ids]
+    with connection.cursor() as cur:
+        cur.execute(
+            f"SELECT NOT EXISTS ({dirty_sql}), "
+            f"(SELECT version FROM {STATE_TABLE} WHERE id = 1)",
+            params,
+        )
+        current, version = cur.fetchone()
+    return bool(current), int(version or 0)
+
+
+def rollups_current(app_ids: Sequence[int] = ()) -> bool:
+    return rollup_state(app_ids)[0]
@@ -12,12 +12,16 @@ Returns the results as JSON for the frontend charts
 
 from __future__ import annotations
 
+import hashlib
+import json
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import connection
 from django.http import JsonResponse
-from django.views.decorators.http import require_GET
+from django.views.decorators.http import condition, require_GET
 
 from player_expectations_new.constants import (
     AESTHETIC_CODE_TO_TEXT,
@@ -28,18 +32,30 @@ from player_expectations_new.constants import (
     POSITIVE_LABELS,
 )
 
+from .rollups import (
+    MENTION_ROLLUP_TABLE,
+    REVIEW_ROLLUP_TABLE,
+    YM_SQL,
+    rollup_state,
+    rollups_current,
+)
+
 DashboardPolarity = str  # "any" | "rec" | "nrec"
 DashboardLanguage = str  # "all" | "english" | "schinese"
 
 
-# Checks whether a DB table has a given column.
+# Column names of a DB table, introspected once per process and table.
 # cache the result because i dont change my tables
-@lru_cache(maxsize=128)
-def _table_has_column(table: str, col: str) -> bool:
+@lru_cache(maxsize=32)
+def _table_columns(table: str) -> FrozenSet[str]:
     with connection.cursor() as cur:
         cur.execute(f"PRAGMA table_info({table})")
-        cols = [r[1] for r in cur.fetchall()]
-    return col in cols
+        return frozenset(r[1] for r in cur.fetchall())
+
+
+# Checks whether a DB table has a given column.
+def _table_has_column(table: str, col: str) -> bool:
+    return col in _table_columns(table)
 
 
 # input:string, output: int
@@ -175,6 +191,132 @@ def _base_mentions_where(
     return where_sql, params
 
 
+# Same filters as _base_review_where/_base_mentions_where, but on the rollup
+# columns (r.language and r.voted_up are already normalized there)
+def _rollup_where(
+    app_ids: List[int],
+    languages: List[str],
+    polarity: DashboardPolarity,
+) -> Tuple[str, List[Any]]:
+    where_sql = "WHERE 1=1"
+    params: List[Any] = []
+
+    if app_ids:
+        clause, p = _in_clause(app_ids)
+        where_sql += f" AND r.app_id {clause}"
+        params.extend(p)
+
+    if languages:
+        if _table_has_column("thesis_dataset", "language"):
+            clause, p = _in_clause([x.lower() for x in languages])
+            where_sql += f" AND r.language {clause}"
+            params.extend(p)
+
+    pol = (polarity or "any").strip().lower()
+    if pol == "rec":
+        where_sql += " AND r.voted_up = 1"
+    elif pol == "nrec":
+        where_sql += " AND r.voted_up = 0"
+
+    return where_sql, params
+
+
+"""
+Aggregation helpers used by every endpoint.
+They read the pre-aggregated rollups (see rollups.py) when those are
+current for the requested games and fall back to the raw join otherwise;
+both paths return rows of the same shape. Pass `rollups` when the caller
+has already checked.
+"""
+
+_RAW_MENTION_COLUMNS = {
+    "ym": YM_SQL,
+    "coarse_category": "qcs.coarse_category",
+    "code_int": "qcs.code_int",
+    "sentiment_v2": "qcs.sentiment_v2",
+}
+
+
+# rows of ([ym,] reviews, recommended)
+def _review_counts(
+    app_ids: List[int],
+    languages: List[str],
+    polarity: DashboardPolarity,
+    by_month: bool = False,
+    rollups: Optional[bool] = None,
+) -> List[Tuple[Any, ...]]:
+    if rollups is None:
+        rollups = rollups_current(app_ids)
+    if rollups:
+        where_sql, params = _rollup_where(app_ids, languages, polarity)
+        cols = ["r.ym"] if by_month else []
+        measures = [
+            "SUM(r.reviews)",
+            "SUM(CASE WHEN r.voted_up=1 THEN r.reviews ELSE 0 END)",
+        ]
+        source = f"FROM {REVIEW_ROLLUP_TABLE} r"
+    else:
+        where_sql, params = _base_review_where(app_ids, languages, polarity)
+        cols = [YM_SQL] if by_month else []
+        measures = [
+            "COUNT(1)",
+            "SUM(CASE WHEN COALESCE(t.voted_up,0)=1 THEN 1 ELSE 0 END)",
+        ]
+        source = "FROM thesis_dataset t"
+
+    group_sql = "GROUP BY 1 ORDER BY 1 ASC" if by_month else ""
+    with connection.cursor() as cur:
+        cur.execute(
+            f"SELECT {', '.join([*cols, *measures])} {source} {where_sql} {group_sql}",
+            params,
+        )
+        return cur.fetchall()
+
+
+# rows of (*group_by, mentions); only mentions with a sentiment_v2
+def _mention_counts(
+    app_ids: List[int],
+    languages: List[str],
+    polarity: DashboardPolarity,
+    group_by: Sequence[str] = (),
+    coarse: Optional[str] = None,
+    rollups: Optional[bool] = None,
+) -> List[Tuple[Any, ...]]:
+    if rollups is None:
+        rollups = rollups_current(app_ids)
+    if rollups:
+        where_sql, params = _rollup_where(app_ids, languages, polarity)
+        cols = [f"r.{c}" for c in group_by]
+        measure = "SUM(r.mentions)"
+        source = f"FROM {MENTION_ROLLUP_TABLE} r"
+        coarse_col = "r.coarse_category"
+    else:
+        where_sql, params = _base_mentions_where(app_ids, languages, polarity)
+        where_sql += " AND qcs.sentiment_v2 IS NOT NULL"
+        cols = [_RAW_MENTION_COLUMNS[c] for c in group_by]
+        measure = "COUNT(1)"
+        source = """
+            FROM thesis_dataset t
+            JOIN review_quotes rq ON rq.recommendation_id = t.recommendation_id
+            JOIN quote_code_sentiment qcs ON qcs.quote_id = rq.quote_id
+        """
+        coarse_col = "qcs.coarse_category"
+
+    if coarse is not None:
+        where_sql += f" AND {coarse_col} = %s"
+        params.append(coarse)
+
+    group_sql = ""
+    if cols:
+        group_sql = "GROUP BY " + ", ".join(str(i + 1) for i in range(len(cols)))
+    with connection.cursor() as cur:
+        cur.execute(
+            f"SELECT {', '.join([*cols, measure])} {source} {where_sql} {group_sql}",
+            params,
+        )
+        return cur.fetchall()
+
+
 # converts a numeric code into a human freindly label using the right lookup table.
 def _code_text(coarse: str, code_int: int) -> str:
     if coarse == "Game Features":
@@ -212,90 +354,38 @@ def _parent_code_int(coarse: str, code_int: int) -> int:
     return code_int
 
 
-# Returns basic KPI numbers for the selected filters..needed for kpi row
-@require_GET
-def compare_kpis(request):
-    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
-    languages = _parse_csv_str(request.GET.get("languages"))
-    polarity = (request.GET.get("polarity") or "any").strip().lower()
+"""
+Payload builders shared by the single-chart endpoints and compare_dashboard.
+They only reshape already aggregated rows, so the same numbers come out no
+matter whether the rows were grouped in SQL or re-summed in Python.
+"""
 
-    where_sql, params = _base_review_where(app_ids, languages, polarity)
 
-    # 1) Reviews + recommended count
-    with connection.cursor() as cur:
-        cur.execute(
-            f"""
-            SELECT
-                COUNT(1) AS reviews,
-                SUM(CASE WHEN COALESCE(t.voted_up,0)=1 THEN 1 ELSE 0 END) AS recommended
-            FROM thesis_dataset t
-            {where_sql}
-            """,
-            params,
-        )
-        row = cur.fetchone() or (0, 0)
-        reviews = int(row[0] or 0)
-        recommended = int(row[1] or 0)
+def _empty_buckets() -> Dict[str, int]:
+    return {"positive": 0, "neutral": 0, "negative": 0, "missing": 0}
 
-    # Recommended rate is recommended / reviews (avoid divide by zero)
-    rec_rate = (recommended / reviews) if reviews else 0.0
 
-    # 2) Mentions total (join-level query)
-    m_where, m_params = _base_mentions_where(app_ids, languages, polarity)
-    with connection.cursor() as cur:
-        cur.execute(
-            f"""
-            SELECT COUNT(1)
-            FROM thesis_dataset t
-            JOIN review_quotes rq ON rq.recommendation_id = t.recommendation_id
-            JOIN quote_code_sentiment qcs ON qcs.quote_id = rq.quote_id
-            {m_where}
-            AND qcs.sentiment_v2 IS NOT NULL
-            """,
-            m_params,
-        )
-        mentions_total = int((cur.fetchone() or [0])[0] or 0)
+# review_row = (reviews, recommended); mentions_total = number of mentions
+def _kpis_payload(review_row: Sequence[Any], mentions_total: int) -> Dict[str, Any]:
+    reviews = int(review_row[0] or 0)
+    recommended = int(review_row[1] or 0)
 
+    # Recommended rate is recommended / reviews (avoid divide by zero)
+    rec_rate = (recommended / reviews) if reviews else 0.0
     mentions_per_review = (mentions_total / reviews) if reviews else 0.0
 
-    return JsonResponse(
-        {
-            "reviews": reviews,
-            "recommended_rate": rec_rate,
-            "mentions_total": mentions_total,
-            "mentions_per_review": mentions_per_review,
-        }
-    )
+    return {
+        "reviews": reviews,
+        "recommended_rate": rec_rate,
+        "mentions_total": mentions_total,
+        "mentions_per_review": mentions_per_review,
+    }
 
 
-# Returns how many mentions fall into each sentiment bucket
-@require_GET
-def compare_sentiment_distribution(request):
-    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
-    languages = _parse_csv_str(request.GET.get("languages"))
-    polarity = (request.GET.get("polarity") or "any").strip().lower()
-
-    where_sql, params = _base_mentions_where(app_ids, languages, polarity)
-
-    with connection.cursor() as cur:
-        cur.execute(
-            f"""
-            SELECT
-              qcs.sentiment_v2,
-              COUNT(1) AS n
-            FROM thesis_dataset t
-            JOIN review_quotes rq ON rq.recommendation_id = t.recommendation_id
-            JOIN quote_code_sentiment qcs ON qcs.quote_id = rq.quote_id
-            {where_sql}
-            AND qcs.sentiment_v2 IS NOT NULL
-            GROUP BY qcs.sentiment_v2
-            """,
-            params,
-        )
-        rows = cur.fetchall()
-
+# rows of (sentiment_v2, n)
+def _sentiments_payload(rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
     detailed: Dict[str, int] = {}
-    buckets = {"positive": 0, "neutral": 0, "negative": 0, "missing": 0}
+    buckets = _empty_buckets()
 
     for sentiment_v2, n in rows:
         key = (sentiment_v2 or "").strip() or "missing"
@@ -306,53 +396,19 @@ def compare_sentiment_distribution(request):
     total = sum(buckets.values()) or 0
     shares = {k: (v / total if total else 0.0) for k, v in buckets.items()}
 
-    return JsonResponse(
-        {
-            "total": total,
-            "buckets": buckets,
-            "shares": shares,
-            "detailed": detailed,
-        }
-    )
+    return {
+        "total": total,
+        "buckets": buckets,
+        "shares": shares,
+        "detailed": detailed,
+    }
 
 
-"""
-Returns monthly time series data:
-  - review count and recommended_rate by month
-  - mentions sentiment buckets by month
-
-fix note:
-- write '%%Y-%%m' instead of '%Y-%m' because Django
-debug formatting can treat % as formatting tokens.
-    """
-
-
-@require_GET
-def compare_timeseries(request):
-    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
-    languages = _parse_csv_str(request.GET.get("languages"))
-    polarity = (request.GET.get("polarity") or "any").strip().lower()
-
-    r_where, r_params = _base_review_where(app_ids, languages, polarity)
-
-    with connection.cursor() as cur:
-        cur.execute(
-            f"""
-            SELECT
-              strftime('%%Y-%%m', datetime(COALESCE(t.timestamp_created,0),
-               'unixepoch'))
-               AS ym,
-                COUNT(1) AS reviews,
-                SUM(CASE WHEN COALESCE(t.voted_up,0)=1 THEN 1 ELSE 0 END) AS recommended
-            FROM thesis_dataset t
-            {r_where}
-            GROUP BY ym
-            ORDER BY ym ASC
-            """,
-            r_params,
-        )
-        review_rows = cur.fetchall()
-
+# review_rows of (ym, reviews, recommended), mention_rows of (ym, sentiment_v2, n)
+def _timeseries_payload(
+    review_rows: Sequence[Sequence[Any]],
+    mention_rows: Sequence[Sequence[Any]],
+) -> Dict[str, Any]:
     # Convert rows into a dictionary for easy merging later
     review_by_month: Dict[str, Dict[str, Any]] = {}
     for ym, reviews, recommended in review_rows:
@@ -364,39 +420,11 @@ def compare_timeseries(request):
             "recommended_rate": (rec / rv if rv else 0.0),
         }
 
-    m_where, m_params = _base_mentions_where(app_ids, languages, polarity)
-
-    with connection.cursor() as cur:
-        cur.execute(
-            f"""
-            SELECT
-              strftime('%%Y-%%m', datetime(COALESCE(t.timestamp_created,0),
-               'unixepoch'))
-              AS ym,
-              qcs.sentiment_v2,
-              COUNT(1) AS n
-            FROM thesis_dataset t
-            JOIN review_quotes rq ON rq.recommendation_id = t.recommendation_id
-            JOIN quote_code_sentiment qcs ON qcs.quote_id = rq.quote_id
-            {m_where}
-            AND qcs.sentiment_v2 IS NOT NULL
-            GROUP BY ym, qcs.sentiment_v2
-            ORDER BY ym ASC
-            """,
-            m_params,
-        )
-        mention_rows = cur.fetchall()
-
     mentions_by_month: Dict[str, Dict[str, int]] = {}
     for ym, sentiment_v2, n in mention_rows:
         key = str(ym or "unknown")
         if key not in mentions_by_month:
-            mentions_by_month[key] = {
-                "positive": 0,
-                "neutral": 0,
-                "negative": 0,
-                "missing": 0,
-            }
+            mentions_by_month[key] = _empty_buckets()
         mentions_by_month[key][_sentiment_bucket(sentiment_v2)] += int(n or 0)
 
     months = sorted(set(review_by_month.keys()) | set(mentions_by_month.keys()))
@@ -404,9 +432,7 @@ def compare_timeseries(request):
     data: List[Dict[str, Any]] = []
     for m in months:
         r = review_by_month.get(m, {"reviews": 0, "recommended_rate": 0.0})
-        s = mentions_by_month.get(
-            m, {"positive": 0, "neutral": 0, "negative": 0, "missing": 0}
-        )
+        s = mentions_by_month.get(m, _empty_buckets())
         data.append(
             {
                 "month": m,
@@ -416,41 +442,13 @@ def compare_timeseries(request):
             }
         )
 
-    return JsonResponse({"data": data})
-
-
-# Returns the "top codes" table (most frequent/mentioned codes),
-# optionally filtered to top-level codes.
-@require_GET
-def compare_top_codes(request):
-    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
-    languages = _parse_csv_str(request.GET.get("languages"))
-    polarity = (request.GET.get("polarity") or "any").strip().lower()
-    level = (request.GET.get("level") or "top").strip().lower()
-    limit = max(5, min(_parse_int(request.GET.get("limit"), 20) or 20, 100))
+    return {"data": data}
 
-    m_where, m_params = _base_mentions_where(app_ids, languages, polarity)
-
-    # This query gives us counts per (coarse_category, code_int, sentiment_v2)
-    with connection.cursor() as cur:
-        cur.execute(
-            f"""
-            SELECT
-              qcs.coarse_category,
-              qcs.code_int,
-              qcs.sentiment_v2,
-              COUNT(1) AS n
-            FROM thesis_dataset t
-            JOIN review_quotes rq ON rq.recommendation_id = t.recommendation_id
-            JOIN quote_code_sentiment qcs ON qcs.quote_id = rq.quote_id
-            {m_where}
-            AND qcs.sentiment_v2 IS NOT NULL
-            GROUP BY qcs.coarse_category, qcs.code_int, qcs.sentiment_v2
-            """,
-            m_params,
-        )
-        rows = cur.fetchall()
 
+# rows of (coarse_category, code_int, sentiment_v2, n)
+def _top_codes_payload(
+    rows: Sequence[Sequence[Any]], level: str, limit: int
+) -> Dict[str, Any]:
     agg: Dict[Tuple[str, int], Dict[str, Any]] = {}
 
     for coarse, code_int, sentiment_v2, n in rows:
@@ -469,10 +467,7 @@ def compare_top_codes(request):
                 "code_int": code_i,
                 "code_text": _code_text(coarse_s, code_i),
                 "total": 0,
-                "positive": 0,
-                "neutral": 0,
-                "negative": 0,
-                "missing": 0,
+                **_empty_buckets(),
             }
 
         cnt = int(n or 0)
@@ -500,69 +495,27 @@ def compare_top_codes(request):
     )[:15]
     top_negative = sorted(candidates, key=lambda x: (x["net"], -x["total"]))[:15]
 
-    return JsonResponse(
-        {
-            "level": level,
-            "limit": limit,
-            "table": table,
-            "top_positive": top_positive,
-            "top_negative": top_negative,
-        }
-    )
+    return {
+        "level": level,
+        "limit": limit,
+        "table": table,
+        "top_positive": top_positive,
+        "top_negative": top_negative,
+    }
 
 
-# Returns a row for every code in a dimension,
-# so the frontend can build a “heatmap grid”.
-# Even if a code has 0 mentions, we still return it (so the grid is stable).
-@require_GET
-def compare_heatmap_codes(request):
-    dimension = (request.GET.get("dimension") or "").strip().lower()
-    if dimension not in ("aesthetics", "features", "pain"):
-        return JsonResponse(
-            {"detail": "dimension must be one of: aesthetics, features, pain"},
-            status=400,
-        )
-
-    coarse = {
-        "aesthetics": "Game Aesthetics",
-        "features": "Game Features",
-        "pain": "Pain Points",
-    }[dimension]
-
-    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
-    languages = _parse_csv_str(request.GET.get("languages"))
-    polarity = (request.GET.get("polarity") or "any").strip().lower()
+HEATMAP_DIMENSIONS: Dict[str, Tuple[str, Dict[int, str]]] = {
+    "aesthetics": ("Game Aesthetics", AESTHETIC_CODE_TO_TEXT),
+    "features": ("Game Features", FEATURE_CODE_TO_TEXT),
+    "pain": ("Pain Points", PAIN_CODE_TO_TEXT),
+}
 
-    if dimension == "aesthetics":
-        codebook = AESTHETIC_CODE_TO_TEXT
-    elif dimension == "features":
-        codebook = FEATURE_CODE_TO_TEXT
-    else:
-        codebook = PAIN_CODE_TO_TEXT
 
+# rows of (code_int, sentiment_v2, n) for the dimension's coarse category
+def _heatmap_payload(dimension: str, rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    _, codebook = HEATMAP_DIMENSIONS[dimension]
     all_codes = sorted(int(k) for k in codebook.keys())
 
-    m_where, m_params = _base_mentions_where(app_ids, languages, polarity)
-
-    with connection.cursor() as cur:
-        cur.execute(
-            f"""
-            SELECT
-              qcs.code_int,
-              qcs.sentiment_v2,
-              COUNT(1) AS n
-            FROM thesis_dataset t
-            JOIN review_quotes rq ON rq.recommendation_id = t.recommendation_id
-            JOIN quote_code_sentiment qcs ON qcs.quote_id = rq.quote_id
-            {m_where}
-                AND qcs.coarse_category = %s
-                AND qcs.sentiment_v2 IS NOT NULL
-            GROUP BY qcs.code_int, qcs.sentiment_v2
-            """,
-            m_params + [coarse],
-        )
-        rows = cur.fetchall()
-
     agg: Dict[int, Dict[str, Any]] = {}
     for code_int, sentiment_v2, n in rows:
         if code_int is None:
@@ -576,7 +529,7 @@ def compare_heatmap_codes(request):
                 "code_int": code_i,
                 "code_text": codebook.get(code_i, "UNKNOWN"),
                 "total": 0,
-                "buckets": {"positive": 0, "neutral": 0, "negative": 0, "missing": 0},
+                "buckets": _empty_buckets(),
             }
 
         cnt = int(n or 0)
@@ -592,7 +545,7 @@ def compare_heatmap_codes(request):
                 "code_int": code_i,
                 "code_text": codebook.get(code_i, "UNKNOWN"),
                 "total": 0,
-                "buckets": {"positive": 0, "neutral": 0, "negative": 0, "missing": 0},
+                "buckets": _empty_buckets(),
             },
         )
         total = int(v["total"]) or 0
@@ -611,4 +564,223 @@ def compare_heatmap_codes(request):
             }
         )
 
-    return JsonResponse({"dimension": dimension, "rows": out_rows})
+    return {"dimension": dimension, "rows": out_rows}
+
+
+# Re-sums finer grained rows onto a subset of their key columns.
+# rows are (*key, n); keep selects the key positions to group by
+def _regroup(
+    rows: Sequence[Sequence[Any]], keep: Sequence[int]
+) -> List[Tuple[Any, ...]]:
+    sums: Dict[Tuple[Any, ...], int] = {}
+    for row in rows:
+        key = tuple(row[i] for i in keep)
+        sums[key] = sums.get(key, 0) + int(row[-1] or 0)
+    return [(*key, n) for key, n in sums.items()]
+
+
+# Returns basic KPI numbers for the selected filters..needed for kpi row
+@require_GET
+def compare_kpis(request):
+    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
+    languages = _parse_csv_str(request.GET.get("languages"))
+    polarity = (request.GET.get("polarity") or "any").strip().lower()
+
+    # 1) Reviews + recommended count
+    row = (_review_counts(app_ids, languages, polarity) or [(0, 0)])[0]
+
+    # 2) Mentions total (join-level query)
+    mentions_total = int(
+        (_mention_counts(app_ids, languages, polarity) or [(0,)])[0][0] or 0
+    )
+
+    return JsonResponse(_kpis_payload(row, mentions_total))
+
+
+# Returns how many mentions fall into each sentiment bucket
+@require_GET
+def compare_sentiment_distribution(request):
+    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
+    languages = _parse_csv_str(request.GET.get("languages"))
+    polarity = (request.GET.get("polarity") or "any").strip().lower()
+
+    rows = _mention_counts(app_ids, languages, polarity, group_by=["sentiment_v2"])
+
+    return JsonResponse(_sentiments_payload(rows))
+
+
+"""
+Returns monthly time series data:
+  - review count and recommended_rate by month
+  - mentions sentiment buckets by month
+
+fix note:
+- write '%%Y-%%m' instead of '%Y-%m' because Django
+debug formatting can treat % as formatting tokens.
+    """
+
+
+@require_GET
+def compare_timeseries(request):
+    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
+    languages = _parse_csv_str(request.GET.get("languages"))
+    polarity = (request.GET.get("polarity") or "any").strip().lower()
+
+    review_rows = _review_counts(app_ids, languages, polarity, by_month=True)
+    mention_rows = _mention_counts(
+        app_ids, languages, polarity, group_by=["ym", "sentiment_v2"]
+    )
+
+    return JsonResponse(_timeseries_payload(review_rows, mention_rows))
+
+
+# Returns the "top codes" table (most frequent/mentioned codes),
+# optionally filtered to top-level codes.
+@require_GET
+def compare_top_codes(request):
+    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
+    languages = _parse_csv_str(request.GET.get("languages"))
+    polarity = (request.GET.get("polarity") or "any").strip().lower()
+    level = (request.GET.get("level") or "top").strip().lower()
+    limit = max(5, min(_parse_int(request.GET.get("limit"), 20) or 20, 100))
+
+    # counts per (coarse_category, code_int, sentiment_v2)
+    rows = _mention_counts(
+        app_ids,
+        languages,
+        polarity,
+        group_by=["coarse_category", "code_int", "sentiment_v2"],
+    )
+
+    return JsonResponse(_top_codes_payload(rows, level, limit))
+
+
+# Returns a row for every code in a dimension,
+# so the frontend can build a “heatmap grid”.
+# Even if a code has 0 mentions, we still return it (so the grid is stable).
+@require_GET
+def compare_heatmap_codes(request):
+    dimension = (request.GET.get("dimension") or "").strip().lower()
+    if dimension not in HEATMAP_DIMENSIONS:
+        return JsonResponse(
+            {"detail": "dimension must be one of: aesthetics, features, pain"},
+            status=400,
+        )
+
+    coarse, _ = HEATMAP_DIMENSIONS[dimension]
+
+    app_ids = _parse_csv_ints(request.GET.get("app_ids"))
+    languages = _parse_csv_str(request.GET.get("languages"))
+    polarity = (request.GET.get("polarity") or "any").strip().lower()
+
+    rows = _mention_counts(
+        app_ids,
+        languages,
+        polarity,
+        group_by=["code_int", "sentiment_v2"],
+        coarse=coarse,
+    )
+
+    return JsonResponse(_heatmap_payload(dimension, rows))
+
+
+"""
+Combined dashboard endpoint: everything the compare page renders, computed
+from ONE review query grouped by month and ONE mention query grouped by
+(month, code, sentiment). The smaller groupings are re-summed in Python.
+
+Responses are cached per normalized filter set for DASHBOARD_CACHE_SECONDS
+and carry an ETag, so unchanged dashboards answer 304 Not Modified. Both
+include the rollup data version, which changes whenever the rollups are
+refreshed or the review tables are written to.
+"""
+
+DASHBOARD_CACHE_PREFIX = "pe_new:dashboard:compare:"
+DEFAULT_DASHBOARD_CACHE_SECONDS = 300
+
+
+def _dashboard_filters(request) -> Dict[str, Any]:
+    return {
+        "app_ids": sorted(set(_parse_csv_ints(request.GET.get("app_ids")))),
+        "languages": sorted(
+            {x.lower() for x in _parse_csv_str(request.GET.get("languages"))}
+        ),
+        "polarity": (request.GET.get("polarity") or "any").strip().lower(),
+        "level": (request.GET.get("level") or "top").strip().lower(),
+        "limit": max(5, min(_parse_int(request.GET.get("limit"), 20) or 20, 100)),
+    }
+
+
+# (filters, rollups current for them, cache key), computed once per request;
+# the key includes the rollup data version, which changes with every write
+# to the review tables and every refresh
+def _dashboard_state(request) -> Tuple[Dict[str, Any], bool, str]:
+    state = getattr(request, "_compare_dashboard_state", None)
+    if state is None:
+        filters = _dashboard_filters(request)
+        current, version = rollup_state(filters["app_ids"])
+        payload = json.dumps([filters, version], sort_keys=True)
+        key = DASHBOARD_CACHE_PREFIX + hashlib.sha256(payload.encode()).hexdigest()
+        state = request._compare_dashboard_state = (filters, current, key)
+    return state
+
+
+def _dashboard_etag(request) -> str:
+    return _dashboard_state(request)[2][len(DASHBOARD_CACHE_PREFIX) :][:32]
+
+
+def _compare_dashboard_payload(
+    filters: Dict[str, Any], rollups: bool
+) -> Dict[str, Any]:
+    app_ids = filters["app_ids"]
+    languages = filters["languages"]
+    polarity = filters["polarity"]
+
+    # (ym, reviews, recommended)
+    review_rows = _review_counts(
+        app_ids, languages, polarity, by_month=True, rollups=rollups
+    )
+    # (ym, coarse_category, code_int, sentiment_v2, n)
+    mention_rows = _mention_counts(
+        app_ids,
+        languages,
+        polarity,
+        group_by=["ym", "coarse_category", "code_int", "sentiment_v2"],
+        rollups=rollups,
+    )
+
+    totals = (
+        sum(int(r[1] or 0) for r in review_rows),
+        sum(int(r[2] or 0) for r in review_rows),
+    )
+    mentions_total = sum(int(r[-1] or 0) for r in mention_rows)
+
+    heatmaps = {}
+    for dimension, (coarse, _) in HEATMAP_DIMENSIONS.items():
+        rows = _regroup([r for r in mention_rows if r[1] == coarse], [2, 3])
+        heatmaps[dimension] = _heatmap_payload(dimension, rows)
+
+    return {
+        "kpis": _kpis_payload(totals, mentions_total),
+        "sentiments": _sentiments_payload(_regroup(mention_rows, [3])),
+        "timeseries": _timeseries_payload(review_rows, _regroup(mention_rows, [0, 3])),
+        "top_codes": _top_codes_payload(
+            _regroup(mention_rows, [1, 2, 3]), filters["level"], filters["limit"]
+        ),
+        "heatmaps": heatmaps,
+    }
+
+
+# Returns kpis, sentiments, timeseries, top_codes and all three heatmaps at once
+@require_GET
+@condition(etag_func=_dashboard_etag)
+def compare_dashboard(request):
+    filters, rollups, key = _dashboard_state(request)
+    payload = cache.get(key)
+    if payload is None:
+        payload = _compare_dashboard_payload(filters, rollups)
+        ttl = getattr(
+            settings, "DASHBOARD_CACHE_SECONDS", DEFAULT_DASHBOARD_CACHE_SECONDS
+        )
+        cache.set(key, payload, ttl)
+    return JsonResponse(payload)
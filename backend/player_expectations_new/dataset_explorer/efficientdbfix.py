@@ -7,6 +7,9 @@ SQLITE_DATASET_EXPLORER_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_td_rec_id ON thesis_dataset(recommendation_id)",
     "CREATE INDEX IF NOT EXISTS idx_td_ts_created ON thesis_dataset(timestamp_created)",
     "CREATE INDEX IF NOT EXISTS idx_td_voted_up ON thesis_dataset(voted_up)",
+    # keyset pagination: matches ORDER BY COALESCE(timestamp_created, 0), rec_id
+    "CREATE INDEX IF NOT EXISTS idx_td_ts_rec "
+    "ON thesis_dataset(COALESCE(timestamp_created, 0), recommendation_id)",
     # attach quotes to selected page of reviews
     "CREATE INDEX IF NOT EXISTS idx_rq_rec_id ON review_quotes(recommendation_id)",
     "CREATE INDEX IF NOT EXISTS idx_rq_app_id ON review_quotes(app_id)",
@@ -0,0 +1,107 @@
+# backend/player_expectations_new/dataset_explorer/pagination.py
+"""
+Keyset pagination and cached totals for the dataset explorer.
+
+Pages are addressed by an opaque cursor holding the sort key of the last
+row, (COALESCE(timestamp_created, 0), recommendation_id). The next page is
+a range seek on idx_td_ts_rec instead of skipping OFFSET rows, so page 500
+costs the same as page 1.
+
+Totals do not depend on the cursor, so they are computed once per filter
+set and cached for DATASET_EXPLORER_COUNT_CACHE_SECONDS. With count=approx
+counting stops after DATASET_EXPLORER_APPROX_COUNT_CAP matches, which keeps
+very broad filters cheap ("10000+" results).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+COUNT_CACHE_PREFIX = "pe_new:dataset_explorer:count:"
+DEFAULT_COUNT_CACHE_SECONDS = 60
+DEFAULT_APPROX_COUNT_CAP = 10000
+
+
+def encode_cursor(timestamp_created: int, recommendation_id: str) -> str:
+    raw = json.dumps([int(timestamp_created), str(recommendation_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[int, str]]:
+    """Return (timestamp_created, recommendation_id), or None if invalid."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, rec_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(ts), str(rec_id)
+    except Exception:
+        return None
+
+
+def keyset_clause(after: Tuple[int, str], descending: bool) -> Tuple[str, List[Any]]:
+    """
+    WHERE fragment selecting rows strictly after `after` in sort order.
+
+    Spelled out instead of a row-value comparison: SQLite only turns the
+    leading `ts <= x` term into a range seek on the expression index.
+    """
+    op = "<" if descending else ">"
+    ts_sql = "COALESCE(t.timestamp_created, 0)"
+    return (
+        f" AND {ts_sql} {op}= %s"
+        f" AND ({ts_sql} {op} %s OR t.recommendation_id {op} %s)",
+        [after[0], after[0], after[1]],
+    )
+
+
+def count_cache_key(sql: str, params: Sequence[Any], approximate: bool) -> str:
+    payload = json.dumps([sql, list(params), approximate], default=str)
+    return COUNT_CACHE_PREFIX + hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cached_count(
+    from_sql: str, params: Sequence[Any], approximate: bool = False
+) -> Tuple[int, bool]:
+    """
+    Count rows of `SELECT ... {from_sql}` (FROM/JOIN/WHERE, no ORDER/LIMIT).
+
+    Returns:
+        (total, exact); exact is False when an approximate count hit the cap.
+    """
+    key = count_cache_key(from_sql, params, approximate)
+    hit = cache.get(key)
+    if hit is not None:
+        return int(hit[0]), bool(hit[1])
+
+    with connection.cursor() as cur:
+        if approximate:
+            cap = int(
+                getattr(
+                    settings,
+                    "DATASET_EXPLORER_APPROX_COUNT_CAP",
+                    DEFAULT_APPROX_COUNT_CAP,
+                )
+            )
+            cur.execute(
+                f"SELECT COUNT(1) FROM (SELECT 1 {from_sql} LIMIT %s)",
+                [*params, cap + 1],
+            )
+            total = int(cur.fetchone()[0] or 0)
+            result = (min(total, cap), total <= cap)
+        else:
+            cur.execute(f"SELECT COUNT(1) {from_sql}", list(params))
+            result = (int(cur.fetchone()[0] or 0), True)
+
+    ttl = getattr(
+        settings, "DATASET_EXPLORER_COUNT_CACHE_SECONDS", DEFAULT_COUNT_CACHE_SECONDS
+    )
+    cache.set(key, result, ttl)
+    return result
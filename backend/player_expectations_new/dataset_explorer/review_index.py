@@ -0,0 +1,66 @@
+# backend/player_expectations_new/dataset_explorer/review_index.py
+"""
+Materialized review -> code index for the dataset explorer.
+
+review_code_index holds one row per (recommendation_id, coarse_category,
+code_int) where at least one quote of the review carries that code with a
+non-empty sentiment_v2. Code filters then become intersections of index
+range scans instead of a GROUP BY over review_quotes JOIN quote_code_sentiment.
+
+The table is derived data: rebuild it after importing or re-coding quotes
+with `python manage.py refresh_review_code_index`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Sequence, Tuple
+
+from django.db import connection, transaction
+
+REVIEW_CODE_INDEX_TABLE = "review_code_index"
+
+
+def refresh_review_code_index() -> int:
+    """Rebuild review_code_index from the quote tables, return the row count."""
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(f"DELETE FROM {REVIEW_CODE_INDEX_TABLE}")
+        cur.execute(
+            f"""
+            INSERT INTO {REVIEW_CODE_INDEX_TABLE}
+                (recommendation_id, coarse_category, code_int)
+            SELECT DISTINCT rq.recommendation_id, qcs.coarse_category, qcs.code_int
+            FROM review_quotes rq
+            JOIN quote_code_sentiment qcs
+              ON qcs.quote_id = rq.quote_id
+            WHERE rq.recommendation_id IS NOT NULL
+              AND qcs.sentiment_v2 IS NOT NULL
+              AND qcs.sentiment_v2 <> ''
+            """
+        )
+        cur.execute(f"SELECT COUNT(1) FROM {REVIEW_CODE_INDEX_TABLE}")
+        return int(cur.fetchone()[0] or 0)
+
+
+def review_code_index_populated() -> bool:
+    """True when the index has rows (i.e. a refresh has been run)."""
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT 1 FROM {REVIEW_CODE_INDEX_TABLE} LIMIT 1")
+        return cur.fetchone() is not None
+
+
+def code_filter_subquery(pairs: Sequence[Tuple[str, int]]) -> Tuple[str, List[Any]]:
+    """
+    SQL selecting the recommendation_ids that contain ALL given pairs.
+
+    Each pair is an index-only range scan on the (coarse_category, code_int,
+    recommendation_id) unique index; INTERSECT combines them (AND logic).
+    """
+    arms: List[str] = []
+    params: List[Any] = []
+    for coarse, code_int in pairs:
+        arms.append(
+            f"SELECT recommendation_id FROM {REVIEW_CODE_INDEX_TABLE} "
+            "WHERE coarse_category = %s AND code_int = %s"
+        )
+        params.extend([coarse, int(code_int)])
+    return " INTERSECT ".join(arms), params
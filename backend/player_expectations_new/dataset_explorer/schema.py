@@ -0,0 +1,108 @@
+# backend/player_expectations_new/dataset_explorer/schema.py
+"""
+Schema readiness and maintenance for the dataset explorer.
+
+Indexes are created by migrations (or `ensure_dataset_explorer_indexes` for
+databases that were copied in rather than migrated) and statistics are
+refreshed by `optimize_dataset_explorer_db`, so the request path never runs
+DDL or ANALYZE. The view only consults schema_status(), which inspects
+sqlite_master once per process.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from django.db import connection
+
+from .efficientdbfix import SQLITE_DATASET_EXPLORER_INDEXES
+from .search import QUOTE_FTS_TABLE, REVIEW_FTS_TABLE
+
+logger = logging.getLogger(__name__)
+
+_INDEX_NAME_RE = re.compile(r"IF NOT EXISTS (\w+)", re.IGNORECASE)
+
+EXPECTED_INDEXES: List[str] = [
+    m.group(1)
+    for m in (_INDEX_NAME_RE.search(stmt) for stmt in SQLITE_DATASET_EXPLORER_INDEXES)
+    if m
+]
+FTS_TABLES = (REVIEW_FTS_TABLE, QUOTE_FTS_TABLE)
+
+
+@dataclass
+class SchemaStatus:
+    missing_indexes: List[str] = field(default_factory=list)
+    missing_tables: List[str] = field(default_factory=list)
+
+    @property
+    def fts_ready(self) -> bool:
+        return not any(t in self.missing_tables for t in FTS_TABLES)
+
+    @property
+    def ready(self) -> bool:
+        return not self.missing_indexes and not self.missing_tables
+
+
+_STATUS: Optional[SchemaStatus] = None
+
+
+def check_schema() -> SchemaStatus:
+    """Compare sqlite_master against the indexes/tables the explorer relies on."""
+    if connection.vendor != "sqlite":
+        # FTS5 and the partial/expression indexes are SQLite-specific
+        return SchemaStatus(missing_tables=list(FTS_TABLES))
+
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'table')"
+        )
+        present = {(kind, name) for kind, name in cur.fetchall()}
+
+    return SchemaStatus(
+        missing_indexes=[n for n in EXPECTED_INDEXES if ("index", n) not in present],
+        missing_tables=[n for n in FTS_TABLES if ("table", n) not in present],
+    )
+
+
+def schema_status(refresh: bool = False) -> SchemaStatus:
+    """Cached check_schema(); logs once per process when something is missing."""
+    global _STATUS
+    if _STATUS is None or refresh:
+        _STATUS = check_schema()
+        if not _STATUS.ready:
+            logger.warning(
+                "Dataset explorer schema incomplete (indexes: %s, tables: %s); "
+                "run `python manage.py migrate` or "
+                "`python manage.py ensure_dataset_explorer_indexes`.",
+                ", ".join(_STATUS.missing_indexes) or "-",
+                ", ".join(_STATUS.missing_tables) or "-",
+            )
+    return _STATUS
+
+
+def ensure_indexes() -> List[str]:
+    """Create any missing dataset explorer indexes, return the ones created."""
+    missing = check_schema().missing_indexes
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cur:
+            for stmt in SQLITE_DATASET_EXPLORER_INDEXES:
+                cur.execute(stmt)
+    schema_status(refresh=True)
+    return missing
+
+
+def optimize_database(full: bool = False) -> None:
+    """
+    Refresh query planner statistics.
+
+    PRAGMA optimize only re-analyzes tables whose statistics are stale and is
+    cheap enough to run periodically; full=True runs a complete ANALYZE.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cur:
+        cur.execute("ANALYZE" if full else "PRAGMA optimize")
@@ -0,0 +1,90 @@
+# backend/player_expectations_new/dataset_explorer/search.py
+"""
+Full-text keyword search for the dataset explorer.
+
+thesis_dataset_fts and review_quotes_fts are FTS5 external-content indexes
+over thesis_dataset.review_text_en and review_quotes.quote_text (created in
+migration 0005 and kept in sync by triggers). They store only the inverted
+index; the text itself stays in the base tables and is joined back by rowid.
+
+Query syntax accepted from the `q` parameter:
+    castle boss         both words (any order)
+    "boss fight"        exact phrase
+    explor*             prefix
+Rebuild after bulk loads that bypass the triggers with
+`python manage.py rebuild_review_search_index`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, List, Optional, Tuple
+
+from django.db import connection
+
+REVIEW_FTS_TABLE = "thesis_dataset_fts"
+QUOTE_FTS_TABLE = "review_quotes_fts"
+
+# "quoted phrase" | word | word*
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|([^\s"]+)')
+_WORD_RE = re.compile(r"\w+")
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """
+    Translate user input into a safe FTS5 MATCH expression.
+
+    Every term is emitted as a quoted FTS5 string so operators and special
+    characters in the input can never break the query. Returns None when
+    the input contains nothing searchable.
+    """
+    terms: List[str] = []
+    for phrase, word in _QUERY_TOKEN_RE.findall(q):
+        if phrase:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                terms.append('"' + " ".join(words) + '"')
+            continue
+        prefix = word.endswith("*")
+        words = _WORD_RE.findall(word)
+        if not words:
+            continue
+        term = '"' + " ".join(words) + '"'
+        terms.append(term + "*" if prefix else term)
+    return " AND ".join(terms) or None
+
+
+def rebuild_search_index() -> None:
+    """Repopulate both FTS5 indexes from their content tables and merge segments."""
+    with connection.cursor() as cur:
+        for table in (REVIEW_FTS_TABLE, QUOTE_FTS_TABLE):
+            cur.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+            cur.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+
+
+def keyword_join(match: str) -> Tuple[str, List[Any]]:
+    """
+    JOIN clause restricting thesis_dataset t to reviews matching `match`.
+
+    A review matches when its text or any of its quotes does; the joined
+    `fts.rank` is the best (lowest) bm25 score over those hits, so it can be
+    used for relevance ordering.
+    """
+    sql = f"""
+    JOIN (
+        SELECT hit.rid, MIN(hit.rank) AS rank
+        FROM (
+            SELECT f.rowid AS rid, f.rank AS rank
+            FROM {REVIEW_FTS_TABLE} f
+            WHERE {REVIEW_FTS_TABLE} MATCH %s
+            UNION ALL
+            SELECT td.id AS rid, fq.rank AS rank
+            FROM {QUOTE_FTS_TABLE} fq
+            JOIN review_quotes rq ON rq.quote_id = fq.rowid
+            JOIN thesis_dataset td ON td.recommendation_id = rq.recommendation_id
+            WHERE {QUOTE_FTS_TABLE} MATCH %s
+        ) hit
+        GROUP BY hit.rid
+    ) fts ON fts.rid = t.id
+    """
+    return sql, [match, match]
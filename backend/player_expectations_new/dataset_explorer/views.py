@@ -22,7 +22,10 @@ from player_expectations_new.constants import (
     PAIN_CODE_TO_TEXT,
 )
 
-from .efficientdbfix import SQLITE_DATASET_EXPLORER_INDEXES
+from .pagination import cached_count, decode_cursor, encode_cursor, keyset_clause
+from .review_index import code_filter_subquery, review_code_index_populated
+from .schema import schema_status
+from .search import build_match_query, keyword_join
 
 
 # _parse_int: parse Integer from a string
@@ -60,28 +63,6 @@ def _recommended_clause(recommended: str) -> Tuple[str, List[Any]]:
     return "", []
 
 
-# SQLite index initializer..could delete however
-# if i change or add new data i want it easier repeated
-_INDEXES_READY = False
-
-
-def _ensure_sqlite_indexes() -> None:
-    global _INDEXES_READY
-    if _INDEXES_READY:
-        return
-    if connection.vendor != "sqlite":  # sanity check that wereusing sqlite
-        _INDEXES_READY = True
-        return
-
-    # Run the CREATE INDEX statements, then ANALYZE for better query plans.
-    with connection.cursor() as cur:
-        for stmt in SQLITE_DATASET_EXPLORER_INDEXES:
-            cur.execute(stmt)
-        cur.execute("ANALYZE")
-
-    _INDEXES_READY = True
-
-
 # ---------------
 # MAIN API ENDPOIINT
 # ---------------
@@ -94,19 +75,25 @@ def dataset_explorer_reviews(request):
     Returns reviews + extracted quotes with (code_int + code_text + sentiment_v2).
     """
 
-    # Ensure critical indexes exist ..performance fix
-    _ensure_sqlite_indexes()
+    # indexes are created by migrations / ensure_dataset_explorer_indexes,
+    # here we only read the per-process readiness check (see schema.py)
+    status = schema_status()
 
     # 1) read paging inputs , and ensure we dont load too much
     page = max(1, _parse_int(request.GET.get("page"), 1) or 1)
     page_size = _parse_int(request.GET.get("page_size"), 100) or 100
     page_size = min(max(1, page_size), 200)
     offset = (page - 1) * page_size
+    # keyset cursor (next_cursor of the previous response) replaces OFFSET
+    after = decode_cursor(request.GET.get("cursor"))
+    # count=approx: stop counting at DATASET_EXPLORER_APPROX_COUNT_CAP
+    approximate = (request.GET.get("count") or "").strip() == "approx"
 
     # 2) read filters from query params
     q = (request.GET.get("q") or "").strip()  # key word search
     recommended = (request.GET.get("recommended") or "all").strip()
-    app_ids = _parse_csv_ints(request.GET.get("app_ids"))  # games
+    # sorted + deduplicated so equal filter sets share one cached count
+    app_ids = sorted(set(_parse_csv_ints(request.GET.get("app_ids"))))  # games
 
     date_from = _parse_int(request.GET.get("date_from"))
     date_to = _parse_int(request.GET.get("date_to"))
@@ -121,10 +108,22 @@ def dataset_explorer_reviews(request):
     min_pr = _parse_int(request.GET.get("min_playtime_at_review"))
     max_pr = _parse_int(request.GET.get("max_playtime_at_review"))
 
+    # keyword search goes through the FTS5 index when possible (see search.py)
+    match = build_match_query(q) if q and status.fts_ready else None
+
     # forgot sort
     sort = (request.GET.get("sort") or "newest").strip()
     # Only allow known sort options (prevents SQL injection)
-    if sort == "oldest":
+    keyset = True
+    if sort == "relevance" and match:
+        # bm25: lower rank = better match; ties fall back to newest first.
+        # Ranked results are paged by OFFSET only.
+        keyset = False
+        order_sql = (
+            "ORDER BY fts.rank ASC, "
+            "COALESCE(t.timestamp_created, 0) DESC, t.recommendation_id DESC"
+        )
+    elif sort == "oldest":
         order_sql = (
             "ORDER BY COALESCE(t.timestamp_created, 0) ASC, t.recommendation_id ASC"
         )
@@ -135,10 +134,12 @@ def dataset_explorer_reviews(request):
         )
 
     # 3) Build SQL WHERE conditions, for better overview we create conditions substrings
-    feature_codes = _parse_csv_ints(request.GET.get("feature_codes"))
-    pain_codes = _parse_csv_ints(request.GET.get("pain_codes"))
-    aesthetic_codes = _parse_csv_ints(request.GET.get("aesthetic_codes"))
+    feature_codes = sorted(set(_parse_csv_ints(request.GET.get("feature_codes"))))
+    pain_codes = sorted(set(_parse_csv_ints(request.GET.get("pain_codes"))))
+    aesthetic_codes = sorted(set(_parse_csv_ints(request.GET.get("aesthetic_codes"))))
 
+    join_sql = ""
+    join_params: List[Any] = []
     where_sql = "WHERE 1=1"
     params: List[Any] = []
 
@@ -147,7 +148,10 @@ def dataset_explorer_reviews(request):
         where_sql += f" AND t.app_id IN ({placeholders})"
         params.extend(app_ids)
 
-    if q:
+    if match:
+        # rowid join against the FTS hits; the other filters stay in WHERE
+        join_sql, join_params = keyword_join(match)
+    elif q:
         where_sql += " AND t.review_text_en LIKE %s"
         params.append("%" + q + "%")
 
@@ -202,7 +206,14 @@ def dataset_explorer_reviews(request):
     for c in aesthetic_codes:
         selected_pairs.append(("Game Aesthetics", int(c)))
 
-    if selected_pairs:
+    if selected_pairs and review_code_index_populated():
+        # Fast path: intersect the per-pair recommendation_id lists of the
+        # materialized review_code_index (see review_index.py)
+        sub_sql, sub_params = code_filter_subquery(selected_pairs)
+        where_sql += f" AND t.recommendation_id IN ({sub_sql})"
+        params.extend(sub_params)
+    elif selected_pairs:
+        # Fallback while review_code_index has not been refreshed yet.
         # Build an OR list for the pairs: OR (..AND...) OR (..AND...)
         # Why? so we see how many codes a  review matches
         # and if distinct = the selected filters..it is all incldueed
@@ -247,9 +258,17 @@ def dataset_explorer_reviews(request):
         params.extend(pair_params)
         params.append(len(selected_pairs))
 
-    # 5) Fetch the CURRENT review page + total count
-    # Avoid running the heavy WHERE twice:
-    # Use COUNT(*) OVER() to get total number of matching rows ignoring LIMIT/OFFSET
+    # 5) Fetch the CURRENT review page
+    # With a cursor we seek past the last row of the previous page along
+    # (timestamp_created, recommendation_id) instead of skipping OFFSET rows
+    page_where_sql = where_sql
+    page_params = [*join_params, *params]
+    if keyset and after is not None:
+        seek_sql, seek_params = keyset_clause(after, descending=sort != "oldest")
+        page_where_sql += seek_sql
+        page_params.extend(seek_params)
+        offset = 0
+
     with connection.cursor() as cur:
         cur.execute(
             f"""
@@ -262,34 +281,27 @@ def dataset_explorer_reviews(request):
                 COALESCE(t.votes_funny, 0) AS votes_funny,
                 COALESCE(t.playtime_at_review, 0) AS playtime_at_review,
                 COALESCE(t.playtime_forever, 0) AS playtime_forever,
-                t.review_text_en,
-                COUNT(1) OVER() AS total_count
+                t.review_text_en
             FROM thesis_dataset t
-            {where_sql}
+            {join_sql}
+            {page_where_sql}
             {order_sql}
             LIMIT %s OFFSET %s
             """,
-            [*params, page_size, offset],
+            [*page_params, page_size, offset],
         )
-        review_rows_with_total = cur.fetchall()
+        review_rows = cur.fetchall()
 
-    # f return not empty, we get the total count, attatched to each row
-    if review_rows_with_total:
-        total = int(review_rows_with_total[0][-1] or 0)
-        review_rows = [r[:-1] for r in review_rows_with_total]
-    else:
-        # exact total for empty page
-        with connection.cursor() as cur:
-            cur.execute(
-                f"""
-                SELECT COUNT(1)
-                FROM thesis_dataset t
-                {where_sql}
-                """,
-                params,
-            )
-            total = int(cur.fetchone()[0] or 0)
-        review_rows = []
+    # total ignores the cursor, so it is computed once per filter set and cached
+    total, total_exact = cached_count(
+        f"FROM thesis_dataset t {join_sql} {where_sql}",
+        [*join_params, *params],
+        approximate=approximate,
+    )
+
+    next_cursor = None
+    if keyset and len(review_rows) == page_size:
+        next_cursor = encode_cursor(review_rows[-1][2], review_rows[-1][0])
 
     rec_ids = [r[0] for r in review_rows]
 
@@ -416,6 +428,8 @@ def dataset_explorer_reviews(request):
                 "page_size": page_size,
                 "total": total,
                 "total_pages": (total + page_size - 1) // page_size if page_size else 0,
+                "total_exact": total_exact,
+                "next_cursor": next_cursor,
             },
             "data": results,
         }
@@ -0,0 +1,40 @@
+"""Management command to create the dataset explorer's SQLite indexes."""
+
+from django.core.management.base import BaseCommand
+
+from player_expectations_new.dataset_explorer.schema import (
+    ensure_indexes,
+    optimize_database,
+    schema_status,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create any missing dataset explorer indexes (for databases that were "
+        "copied in rather than migrated) and optionally ANALYZE afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run a full ANALYZE after creating the indexes",
+        )
+
+    def handle(self, *args, **options):
+        created = ensure_indexes()
+        if options["analyze"]:
+            optimize_database(full=True)
+
+        if created:
+            self.stdout.write(f"Created index(es): {', '.join(created)}")
+        status = schema_status()
+        if status.missing_tables:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Missing table(s): {', '.join(status.missing_tables)}; "
+                    "run `python manage.py migrate`."
+                )
+            )
+        self.stdout.write(self.style.SUCCESS("Dataset explorer indexes are in place."))
@@ -0,0 +1,24 @@
+"""Management command to refresh SQLite query planner statistics."""
+
+from django.core.management.base import BaseCommand
+
+from player_expectations_new.dataset_explorer.schema import optimize_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh SQLite planner statistics with PRAGMA optimize. "
+        "Meant to run periodically (e.g. from cron); use --full after bulk loads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Run a complete ANALYZE instead of PRAGMA optimize",
+        )
+
+    def handle(self, *args, **options):
+        optimize_database(full=options["full"])
+        mode = "ANALYZE" if options["full"] else "PRAGMA optimize"
+        self.stdout.write(self.style.SUCCESS(f"Ran {mode}."))
@@ -0,0 +1,21 @@
+"""Management command to rebuild the dataset explorer's full-text indexes."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from player_expectations_new.dataset_explorer.schema import schema_status
+from player_expectations_new.dataset_explorer.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the FTS5 keyword indexes over review_text_en and quote_text. "
+        "Only needed after bulk loads that bypass the sync triggers."
+    )
+
+    def handle(self, *args, **kwargs):
+        if not schema_status(refresh=True).fts_ready:
+            raise CommandError(
+                "FTS5 tables are missing; run `python manage.py migrate` first."
+            )
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS("Rebuilt review full-text indexes."))
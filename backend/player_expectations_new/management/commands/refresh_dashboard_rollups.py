@@ -0,0 +1,31 @@
+"""Management command to rebuild the compare dashboard rollup tables."""
+
+from django.core.management.base import BaseCommand
+
+from player_expectations_new.dashboard.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild dashboard_review_rollup and dashboard_mention_rollup from the "
+        "review tables. Games whose reviews changed since their last refresh "
+        "are served from the raw tables until they are refreshed again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--app-ids",
+            default="",
+            help="Comma separated app ids to refresh (default: all games)",
+        )
+
+    def handle(self, *args, **options):
+        app_ids = [int(a) for a in options["app_ids"].split(",") if a.strip()]
+        review_rows, mention_rows = refresh_rollups(app_ids or None)
+        scope = f"app(s) {', '.join(map(str, app_ids))}" if app_ids else "all apps"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Refreshed rollups for {scope}: {review_rows} review row(s), "
+                f"{mention_rows} mention row(s)."
+            )
+        )
@@ -0,0 +1,22 @@
+"""Management command to rebuild the dataset explorer's review -> code index."""
+
+from django.core.management.base import BaseCommand
+
+from player_expectations_new.dataset_explorer.review_index import (
+    refresh_review_code_index,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild review_code_index from review_quotes and quote_code_sentiment. "
+        "Run after importing or re-coding quotes."
+    )
+
+    def handle(self, *args, **kwargs):
+        rows = refresh_review_code_index()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {rows} review/code pair(s) in review_code_index."
+            )
+        )
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:48
+
+from django.db import migrations, models
+
+
+def populate_review_code_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO review_code_index (recommendation_id, coarse_category, code_int)
+            SELECT DISTINCT rq.recommendation_id, qcs.coarse_category, qcs.code_int
+            FROM review_quotes rq
+            JOIN quote_code_sentiment qcs
+              ON qcs.quote_id = rq.quote_id
+            WHERE rq.recommendation_id IS NOT NULL
+              AND qcs.sentiment_v2 IS NOT NULL
+              AND qcs.sentiment_v2 <> ''
+            """
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("player_expectations_new", "0003_sqlite_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReviewCodeIndex",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("recommendation_id", models.TextField()),
+                ("coarse_category", models.TextField()),
+                ("code_int", models.IntegerField()),
+            ],
+            options={
+                "db_table": "review_code_index",
+                "managed": True,
+                "indexes": [
+                    models.Index(fields=["recommendation_id"], name="idx_rci_rec_id")
+                ],
+                "unique_together": {
+                    ("coarse_category", "code_int", "recommendation_id")
+                },
+            },
+        ),
+        migrations.RunPython(populate_review_code_index, migrations.RunPython.noop),
+    ]
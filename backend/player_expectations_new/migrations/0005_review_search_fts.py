@@ -0,0 +1,94 @@
+from django.db import migrations
+
+# FTS5 external-content indexes: only the inverted index is stored, rows are
+# read back from thesis_dataset / review_quotes by rowid. Triggers keep them
+# in sync with the content tables.
+FTS_SQL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS thesis_dataset_fts USING fts5(
+        review_text_en,
+        content='thesis_dataset',
+        content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    );
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS thesis_dataset_fts_ai
+    AFTER INSERT ON thesis_dataset BEGIN
+        INSERT INTO thesis_dataset_fts(rowid, review_text_en)
+        VALUES (new.id, new.review_text_en);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS thesis_dataset_fts_ad
+    AFTER DELETE ON thesis_dataset BEGIN
+        INSERT INTO thesis_dataset_fts(thesis_dataset_fts, rowid, review_text_en)
+        VALUES ('delete', old.id, old.review_text_en);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS thesis_dataset_fts_au
+    AFTER UPDATE OF review_text_en ON thesis_dataset BEGIN
+        INSERT INTO thesis_dataset_fts(thesis_dataset_fts, rowid, review_text_en)
+        VALUES ('delete', old.id, old.review_text_en);
+        INSERT INTO thesis_dataset_fts(rowid, review_text_en)
+        VALUES (new.id, new.review_text_en);
+    END;
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS review_quotes_fts USING fts5(
+        quote_text,
+        content='review_quotes',
+        content_rowid='quote_id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    );
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS review_quotes_fts_ai
+    AFTER INSERT ON review_quotes BEGIN
+        INSERT INTO review_quotes_fts(rowid, quote_text)
+        VALUES (new.quote_id, new.quote_text);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS review_quotes_fts_ad
+    AFTER DELETE ON review_quotes BEGIN
+        INSERT INTO review_quotes_fts(review_quotes_fts, rowid, quote_text)
+        VALUES ('delete', old.quote_id, old.quote_text);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS review_quotes_fts_au
+    AFTER UPDATE OF quote_text ON review_quotes BEGIN
+        INSERT INTO review_quotes_fts(review_quotes_fts, rowid, quote_text)
+        VALUES ('delete', old.quote_id, old.quote_text);
+        INSERT INTO review_quotes_fts(rowid, quote_text)
+        VALUES (new.quote_id, new.quote_text);
+    END;
+    """,
+    # index rows that were seeded before the triggers existed
+    "INSERT INTO thesis_dataset_fts(thesis_dataset_fts) VALUES ('rebuild');",
+    "INSERT INTO review_quotes_fts(review_quotes_fts) VALUES ('rebuild');",
+)
+
+REVERSE_SQL = (
+    "DROP TRIGGER IF EXISTS review_quotes_fts_au;",
+    "DROP TRIGGER IF EXISTS review_quotes_fts_ad;",
+    "DROP TRIGGER IF EXISTS review_quotes_fts_ai;",
+    "DROP TABLE IF EXISTS review_quotes_fts;",
+    "DROP TRIGGER IF EXISTS thesis_dataset_fts_au;",
+    "DROP TRIGGER IF EXISTS thesis_dataset_fts_ad;",
+    "DROP TRIGGER IF EXISTS thesis_dataset_fts_ai;",
+    "DROP TABLE IF EXISTS thesis_dataset_fts;",
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("player_expectations_new", "0004_review_code_index"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=FTS_SQL, reverse_sql=REVERSE_SQL),
+    ]
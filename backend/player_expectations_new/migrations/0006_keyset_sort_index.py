@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("player_expectations_new", "0005_review_search_fts"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE INDEX IF NOT EXISTS idx_td_ts_rec
+            ON thesis_dataset(COALESCE(timestamp_created, 0), recommendation_id);
+            """,
+            reverse_sql="DROP INDEX IF EXISTS idx_td_ts_rec;",
+        )
+    ]
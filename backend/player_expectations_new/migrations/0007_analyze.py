@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Gather planner statistics once the explorer indexes exist. This used to
+    happen on the first dataset explorer request; keep them fresh with
+    `python manage.py optimize_dataset_explorer_db`.
+    """
+
+    dependencies = [
+        ("player_expectations_new", "0006_keyset_sort_index"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql="ANALYZE;", reverse_sql=migrations.RunSQL.noop),
+    ]
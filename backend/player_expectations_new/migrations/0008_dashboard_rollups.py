@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("player_expectations_new", "0007_analyze"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardMentionRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("app_id", models.IntegerField(blank=True, null=True)),
+                ("ym", models.TextField()),
+                ("language", models.TextField()),
+                ("voted_up", models.IntegerField()),
+                ("coarse_category", models.TextField()),
+                ("code_int", models.IntegerField()),
+                ("sentiment_v2", models.TextField()),
+                ("mentions", models.IntegerField()),
+            ],
+            options={
+                "db_table": "dashboard_mention_rollup",
+                "managed": True,
+                "indexes": [
+                    models.Index(
+                        fields=["coarse_category", "app_id"], name="idx_dmr_coarse_app"
+                    )
+                ],
+                "unique_together": {
+                    (
+                        "app_id",
+                        "language",
+                        "voted_up",
+                        "ym",
+                        "coarse_category",
+                        "code_int",
+                        "sentiment_v2",
+                    )
+                },
+            },
+        ),
+        migrations.CreateModel(
+            name="DashboardReviewRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("app_id", models.IntegerField(blank=True, null=True)),
+                ("ym", models.TextField()),
+                ("language", models.TextField()),
+                ("voted_up", models.IntegerField()),
+                ("reviews", models.IntegerField()),
+            ],
+            options={
+                "db_table": "dashboard_review_rollup",
+                "managed": True,
+                "unique_together": {("app_id", "language", "voted_up", "ym")},
+            },
+        ),
+    ]
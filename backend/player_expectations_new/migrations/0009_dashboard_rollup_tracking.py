@@ -0,0 +1,113 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:26
+
+from django.db import migrations, models
+
+# Triggers on the review tables mark the games whose dashboard rollups are
+# out of date and bump the data version. The dashboard reads the raw tables
+# for those games until refresh_rollups() covers them again.
+BUMP_SQL = "UPDATE dashboard_rollup_state SET version = version + 1;"
+
+# app_id of a review, of a quote's review, and of a code sentiment's review
+REVIEW_APP = "SELECT COALESCE({row}.app_id, -1)"
+QUOTE_APP = """
+    SELECT COALESCE(t.app_id, -1) FROM thesis_dataset t
+    WHERE t.recommendation_id = {row}.recommendation_id
+"""
+SENTIMENT_APP = """
+    SELECT COALESCE(t.app_id, -1) FROM review_quotes rq
+    JOIN thesis_dataset t ON t.recommendation_id = rq.recommendation_id
+    WHERE rq.quote_id = {row}.quote_id
+"""
+
+TRIGGERED = (
+    # (table, columns the rollups read, app_id query)
+    (
+        "thesis_dataset",
+        "app_id, recommendation_id, timestamp_created, language, voted_up",
+        REVIEW_APP,
+    ),
+    ("review_quotes", "recommendation_id", QUOTE_APP),
+    (
+        "quote_code_sentiment",
+        "quote_id, coarse_category, code_int, sentiment_v2",
+        SENTIMENT_APP,
+    ),
+)
+
+
+def _mark(app_sql, rows):
+    selects = " UNION ".join(app_sql.format(row=row) for row in rows)
+    return f"INSERT OR IGNORE INTO dashboard_rollup_dirty (app_id) {selects};"
+
+
+EVENTS = (
+    ("ai", "INSERT", ["new"]),
+    ("ad", "DELETE", ["old"]),
+    ("au", "UPDATE OF {columns}", ["old", "new"]),
+)
+TRIGGERS = [
+    (
+        f"{table}_rollup_{suffix}",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_rollup_{suffix}
+        AFTER {event.format(columns=columns)} ON {table} BEGIN
+            {_mark(app_sql, rows)}
+            {BUMP_SQL}
+        END;
+        """,
+    )
+    for table, columns, app_sql in TRIGGERED
+    for suffix, event, rows in EVENTS
+]
+TRIGGER_SQL = tuple(sql for _, sql in TRIGGERS)
+REVERSE_SQL = tuple(f"DROP TRIGGER IF EXISTS {name};" for name, _ in TRIGGERS[::-1])
+
+SEED_SQL = (
+    "INSERT INTO dashboard_rollup_state (id, version) VALUES (1, 0);",
+    # rollups built before tracking existed may be stale: rebuild to use them
+    """
+    INSERT OR IGNORE INTO dashboard_rollup_dirty (app_id)
+    SELECT DISTINCT COALESCE(app_id, -1) FROM thesis_dataset;
+    """,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("player_expectations_new", "0008_dashboard_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardRollupDirtyApp",
+            fields=[
+                ("app_id", models.IntegerField(primary_key=True, serialize=False)),
+            ],
+            options={
+                "db_table": "dashboard_rollup_dirty",
+                "managed": True,
+            },
+        ),
+        migrations.CreateModel(
+            name="DashboardRollupState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "dashboard_rollup_state",
+                "managed": True,
+            },
+        ),
+        migrations.RunSQL(sql=SEED_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(sql=TRIGGER_SQL, reverse_sql=REVERSE_SQL),
+    ]
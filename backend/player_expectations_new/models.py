@@ -97,3 +97,98 @@ class QuoteCodeSentiment(models.Model):
                 name="idx_qcs_coarse_code",
             ),
         ]
+
+
+# -------------------------------------------------------
+# review_code_index (materialized, see refresh_review_code_index)
+# -------------------------------------------------------
+class ReviewCodeIndex(models.Model):
+    # one row per review and (coarse_category, code_int) pair that has a
+    # non-empty sentiment_v2 on at least one of the review's quotes
+    recommendation_id = models.TextField()
+    coarse_category = models.TextField()
+    code_int = models.IntegerField()
+
+    class Meta:
+        db_table = "review_code_index"
+        managed = True
+
+        # the unique index doubles as the covering index for code filters:
+        # (coarse_category, code_int) -> recommendation_id without table lookups
+        unique_together = (("coarse_category", "code_int", "recommendation_id"),)
+
+        indexes = [
+            models.Index(fields=["recommendation_id"], name="idx_rci_rec_id"),
+        ]
+
+
+# -------------------------------------------------------
+# dashboard rollups (materialized, see refresh_dashboard_rollups)
+# -------------------------------------------------------
+class DashboardReviewRollup(models.Model):
+    # reviews per (app, month, language, voted_up)
+    app_id = models.IntegerField(null=True, blank=True)
+    ym = models.TextField()
+    language = models.TextField()
+    voted_up = models.IntegerField()
+    reviews = models.IntegerField()
+
+    class Meta:
+        db_table = "dashboard_review_rollup"
+        managed = True
+
+        unique_together = (("app_id", "language", "voted_up", "ym"),)
+
+
+class DashboardMentionRollup(models.Model):
+    # code mentions per (app, month, language, voted_up, code, sentiment_v2)
+    app_id = models.IntegerField(null=True, blank=True)
+    ym = models.TextField()
+    language = models.TextField()
+    voted_up = models.IntegerField()
+    coarse_category = models.TextField()
+    code_int = models.IntegerField()
+    sentiment_v2 = models.TextField()
+    mentions = models.IntegerField()
+
+    class Meta:
+        db_table = "dashboard_mention_rollup"
+        managed = True
+
+        unique_together = (
+            (
+                "app_id",
+                "language",
+                "voted_up",
+                "ym",
+                "coarse_category",
+                "code_int",
+                "sentiment_v2",
+            ),
+        )
+
+        indexes = [
+            models.Index(
+                fields=["coarse_category", "app_id"],
+                name="idx_dmr_coarse_app",
+            ),
+        ]
+
+
+class DashboardRollupState(models.Model):
+    # single row; version changes with every review data write and refresh
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "dashboard_rollup_state"
+        managed = True
+
+
+class DashboardRollupDirtyApp(models.Model):
+    # games whose review data changed since their rollups were last refreshed
+    # (-1 stands for reviews without an app_id)
+    app_id = models.IntegerField(primary_key=True)
+
+    class Meta:
+        db_table = "dashboard_rollup_dirty"
+        managed = True
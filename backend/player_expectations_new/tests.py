@@ -0,0 +1,211 @@
+"""
+Tests for the compare dashboard's rollups and combined endpoint.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from player_expectations_new.dashboard.rollups import refresh_rollups, rollup_state
+from player_expectations_new.dashboard.views import _compare_dashboard_payload
+from player_expectations_new.models import (
+    DashboardMentionRollup,
+    DashboardReviewRollup,
+    QuoteCodeSentiment,
+    ReviewQuotes,
+    ThesisDataset,
+)
+
+JAN_2024 = 1704067200
+FEB_2024 = 1706745600
+
+
+class DashboardTestCase(TestCase):
+    """Reviews, quotes and code sentiments for games 10 and 20."""
+
+    def setUp(self):
+        cache.clear()
+        reviews = [
+            # (app_id, language, voted_up, timestamp_created)
+            (10, "english", 1, JAN_2024),
+            (10, "English", 0, JAN_2024 + 60),
+            (10, "schinese", 1, FEB_2024),
+            (10, None, None, FEB_2024 + 60),
+            (20, "english", 0, FEB_2024),
+            (20, "english", 1, None),
+        ]
+        mentions = [
+            # (coarse_category, code_int, sentiment_v2)
+            ("Game Features", 10, "explicit_positive"),
+            ("Game Features", 11, "implicit_negative"),
+            ("Pain Points", 20, "explicit_negative"),
+            ("Game Aesthetics", 1, "neutral"),
+            ("Game Aesthetics", 2, None),
+        ]
+        for i, (app_id, language, voted_up, created) in enumerate(reviews):
+            self._review(f"r{i}", app_id, language, voted_up, created)
+            quote = ReviewQuotes.objects.create(
+                recommendation_id=f"r{i}", app_id=app_id, quote_text=f"quote {i}"
+            )
+            for coarse, code, sentiment in mentions[i % 3 : i % 3 + 3]:
+                QuoteCodeSentiment.objects.create(
+                    quote_id=quote.quote_id,
+                    code_int=code,
+                    coarse_category=coarse,
+                    sentiment_v2=sentiment,
+                )
+
+    @staticmethod
+    def _review(recommendation_id, app_id, language="english", voted_up=1, created=0):
+        return ThesisDataset.objects.create(
+            recommendation_id=recommendation_id,
+            app_id=app_id,
+            language=language,
+            voted_up=voted_up,
+            timestamp_created=created,
+        )
+
+
+class RollupTests(DashboardTestCase):
+    FILTERS = [
+        # (app_ids, languages, polarity)
+        ([], [], "any"),
+        ([10], [], "any"),
+        ([10, 20], ["english"], "rec"),
+        ([20], [], "nrec"),
+        ([10], ["english", "schinese"], "nrec"),
+    ]
+
+    def _assert_paths_match(self):
+        for app_ids, languages, polarity in self.FILTERS:
+            filters = {
+                "app_ids": app_ids,
+                "languages": languages,
+                "polarity": polarity,
+                "level": "all",
+                "limit": 20,
+            }
+            with self.subTest(filters=filters):
+                self.assertEqual(
+                    _compare_dashboard_payload(filters, rollups=True),
+                    _compare_dashboard_payload(filters, rollups=False),
+                )
+
+    def test_rollup_and_raw_payloads_match(self):
+        refresh_rollups()
+
+        self.assertTrue(rollup_state()[0])
+        self.assertTrue(DashboardReviewRollup.objects.exists())
+        self.assertTrue(DashboardMentionRollup.objects.exists())
+        self._assert_paths_match()
+
+    def test_writes_mark_the_game_dirty_and_bump_the_version(self):
+        writes = {
+            "thesis_dataset": lambda: self._review("new", 10),
+            "review_quotes": lambda: ReviewQuotes.objects.create(
+                recommendation_id="r0", app_id=10
+            ),
+            "quote_code_sentiment": lambda: QuoteCodeSentiment.objects.create(
+                quote_id=ReviewQuotes.objects.filter(app_id=10)[0].quote_id,
+                code_int=30,
+                coarse_category="Game Features",
+                sentiment_v2="neutral",
+            ),
+        }
+        for table, write in writes.items():
+            with self.subTest(table=table):
+                refresh_rollups()
+                _, version = rollup_state()
+
+                write()
+
+                self.assertEqual(rollup_state([10]), (False, version + 1))
+                self.assertEqual(rollup_state([20]), (True, version + 1))
+
+    def test_refreshing_app_ids_clears_only_their_dirty_mark(self):
+        refresh_rollups()
+        self._review("new 10", 10)
+        self._review("new 20", 20, voted_up=0)
+        _, version = rollup_state()
+
+        refresh_rollups([10])
+
+        self.assertEqual(rollup_state([10]), (True, version + 1))
+        self.assertEqual(rollup_state([20]), (False, version + 1))
+        self.assertFalse(rollup_state()[0])
+
+        refresh_rollups([20])
+
+        self.assertTrue(rollup_state()[0])
+        self._assert_paths_match()
+
+
+class CompareDashboardTests(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        refresh_rollups()
+        self.client = APIClient()
+        self.url = reverse("player_expectations_new:compare_dashboard")
+        self.params = {"app_ids": "10,20", "languages": "english", "limit": "5"}
+
+    def _get(self, **headers):
+        return self.client.get(self.url, self.params, headers=headers)
+
+    def test_payload_matches_the_raw_tables(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        filters = {
+            "app_ids": [10, 20],
+            "languages": ["english"],
+            "polarity": "any",
+            "level": "top",
+            "limit": 5,
+        }
+        self.assertEqual(
+            response.json(), _compare_dashboard_payload(filters, rollups=False)
+        )
+        self.assertEqual(response.json()["kpis"]["reviews"], 4)
+
+    def test_unchanged_dashboard_is_not_modified(self):
+        etag = self._get()["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self._get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_cached_payload_is_served_without_aggregating(self):
+        first = self._get()
+
+        with self.assertNumQueries(1):
+            second = self._get()
+
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_filter_order_does_not_change_the_etag(self):
+        etag = self._get()["ETag"]
+        self.params = {"app_ids": "20,10,10", "languages": "English", "limit": "5"}
+
+        self.assertEqual(self._get(if_none_match=etag).status_code, 304)
+
+    def test_writes_change_the_etag_and_the_payload(self):
+        etag = self._get()["ETag"]
+        self._review("new", 20)
+
+        response = self._get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["kpis"]["reviews"], 5)
+
+        etag = response["ETag"]
+        refresh_rollups([20])
+        response = self._get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["kpis"]["reviews"], 5)
@@ -4,6 +4,7 @@
 from django.urls import path
 
 from player_expectations_new.dashboard.views import (
+    compare_dashboard,
     compare_heatmap_codes,
     compare_kpis,
     compare_sentiment_distribution,
@@ -22,6 +23,7 @@ urlpatterns = [
         name="dataset_explorer_reviews",
     ),
     # Dashboard compare
+    path("dashboard/compare/", compare_dashboard, name="compare_dashboard"),
     path("dashboard/compare/kpis/", compare_kpis, name="compare_kpis"),
     path(
         "dashboard/compare/sentiments/",
@@ -0,0 +1,105 @@
+"""Management command to time project imports against a synthetic export."""
+
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from projects.models import Project
+from projects.services.import_project import import_project_data
+from projects.services.synthetic_export import (
+    build_synthetic_export,
+    build_synthetic_pxdata,
+    export_row_count,
+)
+from pximportexport.services.transfer import import_pxdata
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a synthetic project export (10k nodes by default) and report "
+        "rows imported per second. --format pxdata times the /api/pximport/ "
+        "path instead. The import is rolled back unless --keep."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--nodes", type=int, default=10000)
+        parser.add_argument("--components-per-node", type=int, default=2)
+        parser.add_argument("--charts", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=1)
+        parser.add_argument(
+            "--format",
+            choices=["project", "pxdata"],
+            default="project",
+            help="Export shape to import (project export or pxexport)",
+        )
+        parser.add_argument(
+            "--username",
+            default="",
+            help="Import as this user (default: a temporary user)",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Commit the imported project instead of rolling it back",
+        )
+
+    def handle(self, *args, **options):
+        build = (
+            build_synthetic_pxdata
+            if options["format"] == "pxdata"
+            else build_synthetic_export
+        )
+        payload = build(
+            nodes=options["nodes"],
+            components_per_node=options["components_per_node"],
+            charts=options["charts"],
+        )
+        rows = export_row_count(payload)
+        self.stdout.write(f"Synthetic export: {rows} rows, {options['nodes']} nodes")
+
+        timings = []
+        for _ in range(max(options["repeat"], 1)):
+            try:
+                with transaction.atomic():
+                    user = self._get_user(options["username"])
+                    started = time.perf_counter()
+                    self._import(payload, user, options["format"])
+                    timings.append(time.perf_counter() - started)
+                    if not options["keep"]:
+                        raise _Rollback
+            except _Rollback:
+                pass
+
+        best = min(timings)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {rows} rows in {best:.2f}s "
+                f"({rows / best:,.0f} rows/sec, best of {len(timings)})."
+            )
+        )
+
+    def _import(self, payload, user, export_format):
+        if export_format == "pxdata":
+            project = Project.objects.create(user=user, name="pxdata benchmark")
+            plan = import_pxdata(payload, user, project)
+            for label, seconds in plan.timings.items():
+                count = plan.counts.get(label, "")
+                self.stdout.write(f"  {label:<26}{count!s:>8}  {seconds:.3f}s")
+            return
+        import_project_data(
+            payload={**payload, "project": dict(payload["project"])}, user=user
+        )
+
+    def _get_user(self, username):
+        if not username:
+            return User.objects.create(username="import-benchmark")
+        try:
+            return User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{username}' does not exist")
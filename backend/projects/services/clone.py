@@ -1,10 +1,17 @@
 """
 Service helpers for game_concept operations.
+
+Projects are cloned with one bulk_create per model. New primary keys are
+generated up front and kept in old-id -> new-instance maps, so foreign keys
+between cloned rows are resolved in memory instead of by per-row saves.
+bulk_create does not send post_save, so container layouts are written here
+directly rather than by the create_node_layout signal.
 """
 
 import uuid
 
 from django.contrib.auth.models import User
+from django.db import transaction
 
 from game_concept.models import GameConcept
 from pillars.models import Pillar
@@ -17,6 +24,8 @@ from pxcharts.models import (
 )
 from pxnodes.models import PxComponent, PxComponentDefinition, PxNode
 
+from .clone_caches import CloneIdMap, copy_derived_caches
+
 
 def clone_project(
     *,
@@ -27,57 +36,97 @@ def clone_project(
     include_pillars: bool,
     include_charts: bool,
     include_nodes: bool,
+    include_derived_caches: bool = False,
 ) -> Project:
-    new_project = Project.objects.create(
-        user=user,
-        name=name,
-        description=source_project.description,
-        is_current=False,
-    )
+    """
+    Copy a project and the selected parts of its content to a new project.
 
-    def_map: dict[str, PxComponentDefinition] = {}
-    node_map: dict[str, PxNode] = {}
+    With include_derived_caches, structural memory states, context artifacts,
+    H-MEM embeddings and vector-store memories are copied as well (with ids
+    remapped), so the clone does not have to regenerate them through the LLM
+    and embedding APIs.
+    """
+    with transaction.atomic():
+        new_project = Project.objects.create(
+            user=user,
+            name=name,
+            description=source_project.description,
+            is_current=False,
+        )
 
-    if include_concept:
-        concepts = GameConcept.objects.filter(project=source_project).order_by(
-            "created_at"
+        id_map = CloneIdMap(
+            old_project_id=str(source_project.pk),
+            new_project_id=str(new_project.pk),
         )
-        for concept in concepts:
-            GameConcept.objects.create(
+        def_map: dict[str, PxComponentDefinition] = {}
+        node_map: dict[str, PxNode] = {}
+        chart_map: dict[str, PxChart] = {}
+
+        if include_concept:
+            concepts = list(
+                GameConcept.objects.filter(project=source_project).order_by(
+                    "created_at"
+                )
+            )
+            new_concepts = GameConcept.objects.bulk_create(
+                [
+                    GameConcept(
+                        user=user,
+                        project=new_project,
+                        content=concept.content,
+                        is_current=concept.is_current,
+                        last_sparc_evaluation=concept.last_sparc_evaluation,
+                    )
+                    for concept in concepts
+                ]
+            )
+            id_map.add_pairs(concepts, new_concepts, kind="concept")
+
+        if include_pillars:
+            pillars = list(Pillar.objects.filter(project=source_project).order_by("pk"))
+            new_pillars = Pillar.objects.bulk_create(
+                [
+                    Pillar(
+                        user=user,
+                        project=new_project,
+                        name=pillar.name,
+                        description=pillar.description,
+                    )
+                    for pillar in pillars
+                ]
+            )
+            id_map.add_pairs(pillars, new_pillars, kind="pillar")
+
+        if include_nodes:
+            _clone_nodes(
+                source_project=source_project,
+                new_project=new_project,
                 user=user,
-                project=new_project,
-                content=concept.content,
-                is_current=concept.is_current,
-                last_sparc_evaluation=concept.last_sparc_evaluation,
+                def_map=def_map,
+                node_map=node_map,
             )
 
-    if include_pillars:
-        pillars = Pillar.objects.filter(project=source_project)
-        for pillar in pillars:
-            Pillar.objects.create(
+        if include_charts:
+            _clone_charts(
+                source_project=source_project,
+                new_project=new_project,
                 user=user,
-                project=new_project,
-                name=pillar.name,
-                description=pillar.description,
+                include_nodes=include_nodes,
+                node_map=node_map,
+                chart_map=chart_map,
+                id_map=id_map,
             )
 
-    if include_nodes:
-        _clone_nodes(
-            source_project=source_project,
-            new_project=new_project,
-            user=user,
-            def_map=def_map,
-            node_map=node_map,
-        )
+        id_map.add_objects(def_map)
+        id_map.add_objects(node_map)
+        id_map.add_objects(chart_map)
 
-    if include_charts:
-        _clone_charts(
-            source_project=source_project,
-            new_project=new_project,
-            user=user,
-            include_nodes=include_nodes,
-            node_map=node_map,
-        )
+        if include_derived_caches:
+            copy_derived_caches(
+                node_map=node_map,
+                chart_map=chart_map,
+                id_map=id_map,
+            )
 
     return new_project
 
@@ -92,45 +141,54 @@ def _clone_nodes(
 ) -> None:
     definitions = PxComponentDefinition.objects.filter(project=source_project)
     for definition in definitions:
-        new_def = PxComponentDefinition.objects.create(
+        def_map[str(definition.id)] = PxComponentDefinition(
             id=uuid.uuid4(),
             name=definition.name,
             type=definition.type,
             owner=user,
             project=new_project,
         )
-        def_map[str(definition.id)] = new_def
 
     nodes = PxNode.objects.filter(project=source_project)
     for node in nodes:
-        new_node = PxNode.objects.create(
+        node_map[str(node.id)] = PxNode(
             id=uuid.uuid4(),
             name=node.name,
             description=node.description,
             owner=user,
             project=new_project,
         )
-        node_map[str(node.id)] = new_node
-
-        components = node.components.all()
-        for component in components:
-            comp_def = def_map.get(str(component.definition_id))
-            if not comp_def:
-                comp_def = PxComponentDefinition.objects.create(
-                    id=uuid.uuid4(),
-                    name=component.definition.name,
-                    type=component.definition.type,
-                    owner=user,
-                    project=new_project,
-                )
-                def_map[str(component.definition_id)] = comp_def
-            PxComponent.objects.create(
+
+    new_components: list[PxComponent] = []
+    components = PxComponent.objects.filter(node__project=source_project)
+    for component in components.select_related("definition"):
+        new_node = node_map.get(str(component.node_id))
+        if new_node is None:
+            continue
+        comp_def = def_map.get(str(component.definition_id))
+        if not comp_def:
+            # Definition owned by another project: give the clone its own copy
+            comp_def = PxComponentDefinition(
+                id=uuid.uuid4(),
+                name=component.definition.name,
+                type=component.definition.type,
+                owner=user,
+                project=new_project,
+            )
+            def_map[str(component.definition_id)] = comp_def
+        new_components.append(
+            PxComponent(
                 id=uuid.uuid4(),
                 node=new_node,
                 definition=comp_def,
                 value=component.value,
                 owner=user,
             )
+        )
+
+    PxComponentDefinition.objects.bulk_create(list(def_map.values()))
+    PxNode.objects.bulk_create(list(node_map.values()))
+    PxComponent.objects.bulk_create(new_components)
 
 
 def _clone_charts(
@@ -140,14 +198,16 @@ def _clone_charts(
     user: User,
     include_nodes: bool,
     node_map: dict[str, PxNode],
+    chart_map: dict[str, PxChart],
+    id_map: CloneIdMap,
 ) -> None:
     charts = PxChart.objects.filter(project=source_project)
     for chart in charts:
         new_associated_node = None
-        if include_nodes and chart.associatedNode:
+        if include_nodes and chart.associatedNode_id:
             new_associated_node = node_map.get(str(chart.associatedNode_id))
 
-        new_chart = PxChart.objects.create(
+        chart_map[str(chart.id)] = PxChart(
             id=uuid.uuid4(),
             name=chart.name,
             description=chart.description,
@@ -156,53 +216,56 @@ def _clone_charts(
             owner=user,
         )
 
-        container_map: dict[str, PxChartContainer] = {}
-        for container in chart.containers.all():
-            new_content = None
-            if include_nodes and container.content_id:
-                new_content = node_map.get(str(container.content_id))
-            new_container = PxChartContainer.objects.create(
-                id=uuid.uuid4(),
-                px_chart=new_chart,
-                name=container.name,
-                content=new_content,
-                owner=user,
-            )
-            container_map[str(container.id)] = new_container
-            _clone_container_layout(container, new_container)
+    container_map: dict[str, PxChartContainer] = {}
+    new_layouts: list[PxChartContainerLayout] = []
+    containers = PxChartContainer.objects.filter(px_chart__project=source_project)
+    for container in containers.select_related("layout"):
+        new_content = None
+        if include_nodes and container.content_id:
+            new_content = node_map.get(str(container.content_id))
+        new_container = PxChartContainer(
+            id=uuid.uuid4(),
+            px_chart=chart_map[str(container.px_chart_id)],
+            name=container.name,
+            content=new_content,
+            owner=user,
+        )
+        container_map[str(container.id)] = new_container
+        new_layouts.append(_clone_container_layout(container, new_container))
 
-        for edge in chart.edges.all():
-            new_source = container_map.get(str(edge.source_id))
-            new_target = container_map.get(str(edge.target_id))
-            PxChartEdge.objects.create(
+    new_edges: list[PxChartEdge] = []
+    edges = PxChartEdge.objects.filter(px_chart__project=source_project)
+    for edge in edges:
+        new_edges.append(
+            PxChartEdge(
                 id=uuid.uuid4(),
-                px_chart=new_chart,
-                source=new_source,
+                px_chart=chart_map[str(edge.px_chart_id)],
+                source=container_map.get(str(edge.source_id)),
                 sourceHandle=edge.sourceHandle,
-                target=new_target,
+                target=container_map.get(str(edge.target_id)),
                 targetHandle=edge.targetHandle,
                 owner=user,
             )
+        )
+
+    PxChart.objects.bulk_create(list(chart_map.values()))
+    PxChartContainer.objects.bulk_create(list(container_map.values()))
+    PxChartContainerLayout.objects.bulk_create(new_layouts)
+    PxChartEdge.objects.bulk_create(new_edges)
+    id_map.add_objects(container_map)
 
 
 def _clone_container_layout(
     container: PxChartContainer, new_container: PxChartContainer
-) -> None:
-    if not hasattr(container, "layout") or not container.layout:
-        return
-
-    layout = getattr(new_container, "layout", None)
-    if layout:
-        layout.position_x = container.layout.position_x
-        layout.position_y = container.layout.position_y
-        layout.height = container.layout.height
-        layout.width = container.layout.width
-        layout.save(update_fields=["position_x", "position_y", "height", "width"])
-    else:
-        PxChartContainerLayout.objects.create(
-            container=new_container,
-            position_x=container.layout.position_x,
-            position_y=container.layout.position_y,
-            height=container.layout.height,
-            width=container.layout.width,
-        )
+) -> PxChartContainerLayout:
+    """Layout for a cloned container: the source's, or defaults if it has none."""
+    layout = getattr(container, "layout", None)
+    if layout is None:
+        return PxChartContainerLayout(container=new_container)
+    return PxChartContainerLayout(
+        container=new_container,
+        position_x=layout.position_x,
+        position_y=layout.position_y,
+        height=layout.height,
+        width=layout.width,
+    )
@@ -0,0 +1,322 @@
+"""
+Copy LLM/embedding derived caches from a project to its clone.
+
+Structural memory states, context artifacts, H-MEM layer embeddings and
+vector-store memories are keyed by node, chart and project ids. Copying them
+with the ids remapped lets a cloned project reuse summaries and embeddings
+instead of regenerating them. Change-detection hashes that are derived from
+ids (node content hashes and path source hashes) are recomputed for the new
+ids when the source entry is still current; stale entries keep their old
+hash and are regenerated on next use as they would have been in the source.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Optional
+
+from django.db import models, transaction
+from django.db.models import Q
+
+from pxcharts.models import PxChart
+from pxnodes.llm.context.artifacts import (
+    SCOPE_CONCEPT,
+    SCOPE_NODE,
+    SCOPE_PATH,
+    SCOPE_PILLAR,
+    compute_path_source_hash,
+)
+from pxnodes.llm.context.change_detection import compute_node_content_hash
+from pxnodes.models import (
+    ArtifactEmbedding,
+    ContextArtifact,
+    HMEMLayerEmbedding,
+    PxNode,
+    StructuralMemoryState,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CloneIdMap:
+    """Old -> new id strings for everything created by a clone."""
+
+    old_project_id: str
+    new_project_id: str
+    # UUID primary keys (nodes, charts, containers, definitions) are unique
+    # across models, integer keys are tracked per kind
+    ids: dict[str, str] = field(default_factory=dict)
+    scoped: dict[tuple[str, str], str] = field(default_factory=dict)
+
+    def add_objects(self, mapping: Mapping[str, models.Model]) -> None:
+        for old_id, obj in mapping.items():
+            self.ids[old_id] = str(obj.pk)
+
+    def add_pairs(
+        self, old: Iterable[models.Model], new: Iterable[models.Model], kind: str
+    ) -> None:
+        for old_obj, new_obj in zip(old, new):
+            self.scoped[(kind, str(old_obj.pk))] = str(new_obj.pk)
+
+    def remap(self, value: Any) -> Any:
+        """Replace mapped id strings anywhere inside a JSON value."""
+        if isinstance(value, str):
+            return self.ids.get(value, value)
+        if isinstance(value, list):
+            return [self.remap(item) for item in value]
+        if isinstance(value, dict):
+            return {self.remap(k): self.remap(v) for k, v in value.items()}
+        return value
+
+    def remap_index(self, positional_index: str) -> str:
+        """Rewrite an H-MEM positional index L{layer}.{project}.{chart}...."""
+        parts = positional_index.split(".")
+        if len(parts) > 1 and parts[1] == self.old_project_id:
+            parts[1] = self.new_project_id
+        return ".".join(
+            [parts[0], *parts[1:2], *(self.ids.get(p, p) for p in parts[2:])]
+        )
+
+
+class _NodeHashes:
+    """Memoized (old, new) content hashes per (old node id, old chart id)."""
+
+    def __init__(
+        self, node_map: Mapping[str, PxNode], chart_map: Mapping[str, PxChart]
+    ) -> None:
+        self.node_map = node_map
+        self.chart_map = chart_map
+        self.old_nodes = {
+            str(n.pk): n for n in PxNode.objects.filter(id__in=list(node_map))
+        }
+        self.old_charts = {
+            str(c.pk): c for c in PxChart.objects.filter(id__in=list(chart_map))
+        }
+        self._cache: dict[tuple[str, str], tuple[str, str]] = {}
+
+    def get(self, node_id: str, chart_id: str) -> tuple[str, str]:
+        key = (node_id, chart_id)
+        if key not in self._cache:
+            self._cache[key] = (
+                compute_node_content_hash(
+                    self.old_nodes[node_id], self.old_charts[chart_id]
+                ),
+                compute_node_content_hash(
+                    self.node_map[node_id], self.chart_map[chart_id]
+                ),
+            )
+        return self._cache[key]
+
+
+def copy_derived_caches(
+    *,
+    node_map: Mapping[str, PxNode],
+    chart_map: Mapping[str, PxChart],
+    id_map: CloneIdMap,
+) -> dict[str, int]:
+    """
+    Copy the derived caches of the mapped nodes and charts onto their clones.
+
+    Must run inside the clone's transaction, after nodes and charts exist.
+    Vector-store memories live in a separate database and are copied once
+    that transaction commits.
+
+    Returns:
+        Number of rows copied per cache.
+    """
+    hashes = _NodeHashes(node_map, chart_map)
+    counts = {
+        "structural_memory_states": _copy_states(node_map, chart_map, hashes),
+        "context_artifacts": _copy_artifacts(node_map, chart_map, id_map, hashes),
+        "hmem_embeddings": _copy_hmem_embeddings(node_map, chart_map, id_map),
+    }
+
+    node_ids = {old: str(new.pk) for old, new in node_map.items()}
+    chart_ids = {old: str(new.pk) for old, new in chart_map.items()}
+    transaction.on_commit(lambda: _copy_vector_memories(node_ids, chart_ids))
+    return counts
+
+
+def _copy_states(
+    node_map: Mapping[str, PxNode],
+    chart_map: Mapping[str, PxChart],
+    hashes: _NodeHashes,
+) -> int:
+    new_states: list[StructuralMemoryState] = []
+    states = StructuralMemoryState.objects.filter(
+        node_id__in=list(node_map), chart_id__in=list(chart_map)
+    )
+    for state in states:
+        node_id, chart_id = str(state.node_id), str(state.chart_id)
+        old_hash, new_hash = hashes.get(node_id, chart_id)
+        if state.content_hash != old_hash:
+            # Out of date in the source too; let the clone regenerate it
+            continue
+        new_states.append(
+            StructuralMemoryState(
+                node=node_map[node_id],
+                chart=chart_map[chart_id],
+                content_hash=new_hash,
+                triples_count=state.triples_count,
+                facts_count=state.facts_count,
+                embeddings_count=state.embeddings_count,
+                summary_text=state.summary_text,
+                trace_summary=state.trace_summary,
+            )
+        )
+    StructuralMemoryState.objects.bulk_create(new_states)
+    return len(new_states)
+
+
+def _copy_artifacts(
+    node_map: Mapping[str, PxNode],
+    chart_map: Mapping[str, PxChart],
+    id_map: CloneIdMap,
+    hashes: _NodeHashes,
+) -> int:
+    concept_ids = [old for kind, old in id_map.scoped if kind == "concept"]
+    pillar_ids = [old for kind, old in id_map.scoped if kind == "pillar"]
+    artifacts = ContextArtifact.objects.filter(
+        Q(chart_id__in=list(chart_map))
+        | Q(node_id__in=list(node_map))
+        | Q(project_id=id_map.old_project_id)
+        | Q(scope_type=SCOPE_CONCEPT, scope_id__in=concept_ids)
+        | Q(scope_type=SCOPE_PILLAR, scope_id__in=pillar_ids)
+    ).prefetch_related("embeddings")
+
+    pairs: list[tuple[ContextArtifact, ContextArtifact]] = []
+    for artifact in artifacts:
+        chart_id = str(artifact.chart_id) if artifact.chart_id else None
+        node_id = str(artifact.node_id) if artifact.node_id else None
+        if (chart_id and chart_id not in chart_map) or (
+            node_id and node_id not in node_map
+        ):
+            continue
+
+        scope_id: Optional[str] = artifact.scope_id
+        source_hash = artifact.source_hash
+        metadata = id_map.remap(artifact.metadata or {})
+
+        if artifact.scope_type == SCOPE_NODE:
+            scope_id = id_map.ids.get(artifact.scope_id)
+            if scope_id and chart_id:
+                old_hash, new_hash = hashes.get(artifact.scope_id, chart_id)
+                if source_hash == old_hash:
+                    source_hash = new_hash
+        elif artifact.scope_type == SCOPE_PATH:
+            old_ids = [str(n) for n in (artifact.metadata or {}).get("node_ids", [])]
+            if not old_ids or any(n not in node_map for n in old_ids):
+                continue
+            new_ids = [id_map.ids[n] for n in old_ids]
+            scope_id = hashlib.sha256(">".join(new_ids).encode()).hexdigest()
+            if chart_id:
+                node_hashes = [hashes.get(n, chart_id) for n in old_ids]
+                old_source = compute_path_source_hash(
+                    chart_id, old_ids, [old for old, _new in node_hashes]
+                )
+                if source_hash == old_source:
+                    source_hash = compute_path_source_hash(
+                        id_map.ids[chart_id],
+                        new_ids,
+                        [new for _old, new in node_hashes],
+                    )
+        elif artifact.scope_type in (SCOPE_CONCEPT, SCOPE_PILLAR):
+            scope_id = id_map.scoped.get((artifact.scope_type, artifact.scope_id))
+        else:
+            scope_id = id_map.ids.get(artifact.scope_id, artifact.scope_id)
+
+        if scope_id is None:
+            continue
+
+        pairs.append(
+            (
+                artifact,
+                ContextArtifact(
+                    scope_type=artifact.scope_type,
+                    scope_id=scope_id,
+                    artifact_type=artifact.artifact_type,
+                    node=node_map[node_id] if node_id else None,
+                    chart=chart_map[chart_id] if chart_id else None,
+                    project_id=(
+                        id_map.new_project_id
+                        if artifact.project_id == id_map.old_project_id
+                        else artifact.project_id
+                    ),
+                    content=id_map.remap(artifact.content),
+                    content_hash=artifact.content_hash,
+                    source_hash=source_hash,
+                    metadata=metadata,
+                ),
+            )
+        )
+
+    ContextArtifact.objects.bulk_create([new for _old, new in pairs])
+    ArtifactEmbedding.objects.bulk_create(
+        [
+            ArtifactEmbedding(
+                artifact=new,
+                embedding_model=embedding.embedding_model,
+                embedding_dim=embedding.embedding_dim,
+                embedding_hash=embedding.embedding_hash,
+            )
+            for old, new in pairs
+            for embedding in old.embeddings.all()
+        ]
+    )
+    return len(pairs)
+
+
+def _copy_hmem_embeddings(
+    node_map: Mapping[str, PxNode],
+    chart_map: Mapping[str, PxChart],
+    id_map: CloneIdMap,
+) -> int:
+    prefix = Q()
+    for layer, _label in HMEMLayerEmbedding.LAYER_CHOICES:
+        prefix |= Q(positional_index__startswith=f"L{layer}.{id_map.old_project_id}.")
+
+    new_entries: list[HMEMLayerEmbedding] = []
+    for entry in HMEMLayerEmbedding.objects.filter(prefix):
+        chart_id = str(entry.chart_id) if entry.chart_id else None
+        node_id = str(entry.node_id) if entry.node_id else None
+        if (chart_id and chart_id not in chart_map) or (
+            node_id and node_id not in node_map
+        ):
+            continue
+        new_entries.append(
+            HMEMLayerEmbedding(
+                positional_index=id_map.remap_index(entry.positional_index),
+                layer=entry.layer,
+                content=entry.content,
+                embedding=entry.embedding,
+                embedding_model=entry.embedding_model,
+                embedding_dim=entry.embedding_dim,
+                parent_index=(
+                    id_map.remap_index(entry.parent_index)
+                    if entry.parent_index
+                    else None
+                ),
+                child_indices=[
+                    id_map.remap_index(child) for child in entry.child_indices or []
+                ],
+                node=node_map[node_id] if node_id else None,
+                chart=chart_map[chart_id] if chart_id else None,
+                content_hash=entry.content_hash,
+            )
+        )
+    HMEMLayerEmbedding.objects.bulk_create(new_entries)
+    return len(new_entries)
+
+
+def _copy_vector_memories(node_ids: dict[str, str], chart_ids: dict[str, str]) -> None:
+    from pxnodes.llm.context.shared.vector_store import VectorStore
+
+    store = VectorStore()
+    try:
+        copied = store.copy_memories(node_ids, chart_ids)
+        logger.info("Copied %d vector memories to cloned project", copied)
+    except Exception as e:
+        logger.warning(f"Failed to copy vector memories: {e}")
+    finally:
+        store.close()
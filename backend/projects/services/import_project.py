@@ -1,9 +1,11 @@
+from django.db import transaction
 from rest_framework.exceptions import ValidationError
 
 from projects.models import Project
 from projects.serializers import ProjectTransferSerializer
 from pxcharts.services.transfer import import_project_data as import_chart_data
 from pxnodes.services.transfer import import_project_data as import_node_data
+from services.transfer import ImportPlan
 
 SUPPORTED_VERSION = 1
 
@@ -26,10 +28,17 @@ def import_project_data(payload, user):
     serializer = ProjectTransferSerializer(data=project_data)
     serializer.is_valid(raise_exception=True)
 
-    project = serializer.save(user=user)
+    with transaction.atomic():
+        project = serializer.save(user=user)
 
-    node_map, lock_definitions_map = import_node_data(project, payload, user)
-    import_chart_data(project, payload, user, node_map, lock_definitions_map)
+        plan = ImportPlan()
+        node_map, lock_definitions_map = import_node_data(
+            project, payload, user, plan=plan
+        )
+        import_chart_data(
+            project, payload, user, node_map, lock_definitions_map, plan=plan
+        )
+        plan.save()
 
     return project
 
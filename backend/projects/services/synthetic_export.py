@@ -0,0 +1,183 @@
+"""
+Synthetic project exports for import benchmarks.
+
+build_synthetic_export() returns a payload in the shape produced by the
+project export endpoint (version 1), with every cross reference filled in,
+so import paths can be timed without a real project to export.
+build_synthetic_pxdata() returns the same data in the /api/pxexport/ shape.
+"""
+
+import uuid
+
+from projects.services.import_project import SUPPORTED_VERSION
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+def build_synthetic_export(
+    nodes=10000, components_per_node=2, charts=10, keys=20, locks=10
+):
+    """
+    Build an export with `nodes` nodes spread over `charts` linear charts.
+
+    Each node gets `components_per_node` components and a key assignment,
+    every node appears in one chart container with a layout, consecutive
+    containers are joined by an edge and every tenth edge carries a lock.
+    """
+    definitions = [
+        {"id": _id(), "name": f"Component {i}", "type": "number"}
+        for i in range(max(components_per_node, 1))
+    ]
+    key_definitions = [
+        {
+            "id": _id(),
+            "name": f"Key {i}",
+            "key_type": "item",
+            "consumable": False,
+            "fixed": False,
+            "unique": False,
+        }
+        for i in range(max(keys, 1))
+    ]
+    lock_definitions = [
+        {
+            "id": _id(),
+            "name": f"Lock {i}",
+            "unlocked_by": [key_definitions[i % len(key_definitions)]["id"]],
+            "soft_gate": False,
+            "unlock_mode": "permanent",
+        }
+        for i in range(max(locks, 1))
+    ]
+
+    px_nodes = [
+        {"id": _id(), "name": f"Node {i}", "description": f"Synthetic node {i}"}
+        for i in range(nodes)
+    ]
+    px_components = [
+        {
+            "id": _id(),
+            "node": node["id"],
+            "definition": definitions[c]["id"],
+            "value": c,
+        }
+        for node in px_nodes
+        for c in range(components_per_node)
+    ]
+    px_key_assignments = [
+        {
+            "id": _id(),
+            "node": node["id"],
+            "definition": key_definitions[i % len(key_definitions)]["id"],
+            "count": 1,
+        }
+        for i, node in enumerate(px_nodes)
+    ]
+
+    px_charts = [
+        {
+            "id": _id(),
+            "name": f"Chart {i}",
+            "description": "",
+            "associatedNode": None,
+        }
+        for i in range(max(charts, 1))
+    ]
+    containers = []
+    layouts = []
+    edges = []
+    lock_assignments = []
+    previous = {}
+    for i, node in enumerate(px_nodes):
+        chart = px_charts[i % len(px_charts)]
+        container = {
+            "id": _id(),
+            "px_chart": chart["id"],
+            "name": node["name"],
+            "content": node["id"],
+        }
+        containers.append(container)
+        layouts.append(
+            {
+                "id": len(layouts) + 1,
+                "container": container["id"],
+                "position_x": float(i // len(px_charts)) * 200,
+                "position_y": 0.0,
+                "height": 80.0,
+                "width": 160.0,
+            }
+        )
+        source = previous.get(chart["id"])
+        if source is not None:
+            edge = {
+                "id": _id(),
+                "px_chart": chart["id"],
+                "source": source,
+                "sourceHandle": "right",
+                "target": container["id"],
+                "targetHandle": "left",
+                "bidirectional": False,
+            }
+            edges.append(edge)
+            if len(edges) % 10 == 0:
+                lock_assignments.append(
+                    {
+                        "id": _id(),
+                        "px_chart": chart["id"],
+                        "edge": edge["id"],
+                        "definition": lock_definitions[
+                            len(lock_assignments) % len(lock_definitions)
+                        ]["id"],
+                        "count": 1,
+                    }
+                )
+        previous[chart["id"]] = container["id"]
+
+    return {
+        "version": SUPPORTED_VERSION,
+        "project": {
+            "name": "Synthetic import benchmark",
+            "description": "",
+            "genres": [],
+            "target_platforms": [],
+        },
+        "px_nodes": px_nodes,
+        "px_component_definitions": definitions,
+        "px_components": px_components,
+        "px_key_definitions": key_definitions,
+        "px_key_assignments": px_key_assignments,
+        "px_lock_definitions": lock_definitions,
+        "px_charts": px_charts,
+        "px_chart_containers": containers,
+        "px_chart_container_layouts": layouts,
+        "px_chart_edges": edges,
+        "px_lock_assignments": lock_assignments,
+    }
+
+
+# pxexport section -> project export section; pxexport has no keys/locks
+PXDATA_SECTIONS = {
+    "pxcomponentdefinitions": "px_component_definitions",
+    "pxnodes": "px_nodes",
+    "pxcomponents": "px_components",
+    "pxcharts": "px_charts",
+    "pxchartcontainers": "px_chart_containers",
+    "pxchartcontainerlayouts": "px_chart_container_layouts",
+    "pxchartedges": "px_chart_edges",
+}
+
+
+def build_synthetic_pxdata(**kwargs):
+    """Same data as build_synthetic_export(**kwargs), in /api/pxexport/ shape."""
+    export = build_synthetic_export(**kwargs)
+    pxdata = {key: export[section] for key, section in PXDATA_SECTIONS.items()}
+    for edge in pxdata["pxchartedges"]:
+        edge.pop("bidirectional")
+    return pxdata
+
+
+def export_row_count(payload):
+    """Number of exported rows (every list in the payload)."""
+    return sum(len(v) for v in payload.values() if isinstance(v, list))
@@ -1,3 +1,655 @@
-# from django.test import TestCase
+"""
+Tests for project export and cloning.
+"""
 
-# Create your tests here.
+import gzip
+import hashlib
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from game_concept.models import GameConcept
+from pillars.models import Pillar
+from projects.models import Project
+from projects.serializers import ProjectTransferSerializer
+from pxcharts.models import (
+    PxChart,
+    PxChartContainer,
+    PxChartContainerLayout,
+    PxChartEdge,
+    PxLockAssignment,
+)
+from pxnodes.llm.context.artifacts import compute_path_source_hash
+from pxnodes.llm.context.change_detection import compute_node_content_hash
+from pxnodes.llm.context.shared import vector_store as vector_store_module
+from pxnodes.models import (
+    ArtifactEmbedding,
+    ContextArtifact,
+    HMEMLayerEmbedding,
+    PxComponent,
+    PxComponentDefinition,
+    PxKeyAssignment,
+    PxKeyDefinition,
+    PxLockDefinition,
+    PxNode,
+    StructuralMemoryState,
+)
+
+
+def _serializer(model_class, field_names):
+    class Serializer(serializers.ModelSerializer):
+        class Meta:
+            model = model_class
+            fields = field_names
+
+    return Serializer
+
+
+# The serializers the export was built from before it was streamed
+OLD_SECTIONS = [
+    ("px_charts", PxChart, ["id", "name", "description", "associatedNode"]),
+    ("px_chart_containers", PxChartContainer, ["id", "px_chart", "name", "content"]),
+    (
+        "px_chart_container_layouts",
+        PxChartContainerLayout,
+        ["id", "container", "position_x", "position_y", "height", "width"],
+    ),
+    (
+        "px_chart_edges",
+        PxChartEdge,
+        [
+            "id",
+            "px_chart",
+            "source",
+            "sourceHandle",
+            "target",
+            "targetHandle",
+            "bidirectional",
+        ],
+    ),
+    (
+        "px_lock_assignments",
+        PxLockAssignment,
+        ["id", "px_chart", "edge", "definition", "count"],
+    ),
+    ("px_nodes", PxNode, ["id", "name", "description"]),
+    ("px_component_definitions", PxComponentDefinition, ["id", "name", "type"]),
+    ("px_components", PxComponent, ["id", "node", "definition", "value"]),
+    (
+        "px_key_definitions",
+        PxKeyDefinition,
+        ["id", "name", "key_type", "consumable", "fixed", "unique"],
+    ),
+    ("px_key_assignments", PxKeyAssignment, ["id", "node", "definition", "count"]),
+    (
+        "px_lock_definitions",
+        PxLockDefinition,
+        ["id", "name", "unlocked_by", "soft_gate", "unlock_mode"],
+    ),
+]
+
+
+def _read(response):
+    async def read():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    return async_to_sync(read)()
+
+
+class ProjectTransferTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            user=self.user, name="Export", genres=["rpg"], target_platforms=["pc"]
+        )
+
+        definition = PxComponentDefinition.objects.create(
+            name="hp", type="number", owner=self.user, project=self.project
+        )
+        nodes = [
+            PxNode.objects.create(
+                name=f"node {i}",
+                description="d",
+                owner=self.user,
+                project=self.project,
+            )
+            for i in range(3)
+        ]
+        for node in nodes:
+            PxComponent.objects.create(
+                node=node, definition=definition, value=10, owner=self.user
+            )
+        self.key = key = PxKeyDefinition.objects.create(
+            name="key",
+            key_type="item",
+            consumable=True,
+            fixed=False,
+            unique=False,
+            owner=self.user,
+        )
+        PxKeyAssignment.objects.create(
+            node=nodes[0], definition=key, count=1, owner=self.user
+        )
+        self.lock = lock = PxLockDefinition.objects.create(
+            name="door", soft_gate=False, unlock_mode="permanent", owner=self.user
+        )
+        lock.unlocked_by.add(key)
+
+        chart = PxChart.objects.create(
+            name="chart",
+            description="",
+            associatedNode=nodes[0],
+            project=self.project,
+            owner=self.user,
+        )
+        containers = [
+            PxChartContainer.objects.create(
+                name=node.name, px_chart=chart, content=node, owner=self.user
+            )
+            for node in nodes
+        ]
+        edge = PxChartEdge.objects.create(
+            px_chart=chart,
+            source=containers[0],
+            sourceHandle="right",
+            target=containers[1],
+            targetHandle="left",
+            owner=self.user,
+        )
+        PxLockAssignment.objects.create(
+            px_chart=chart, edge=edge, definition=lock, count=1, owner=self.user
+        )
+        layout = containers[0].layout
+        layout.position_x, layout.width = 80, 200
+        layout.save()
+
+
+class ProjectExportTests(ProjectTransferTestCase):
+    def _expected(self):
+        charts = PxChart.objects.filter(project=self.project)
+        querysets = {
+            "px_charts": charts,
+            "px_chart_containers": PxChartContainer.objects.filter(px_chart__in=charts),
+            "px_chart_container_layouts": PxChartContainerLayout.objects.filter(
+                container__px_chart__in=charts
+            ),
+            "px_chart_edges": PxChartEdge.objects.filter(px_chart__in=charts),
+            "px_lock_assignments": PxLockAssignment.objects.filter(px_chart__in=charts),
+            "px_nodes": PxNode.objects.filter(project=self.project),
+            "px_component_definitions": PxComponentDefinition.objects.filter(
+                project=self.project
+            ),
+            "px_components": PxComponent.objects.filter(node__project=self.project),
+            "px_key_definitions": PxKeyDefinition.objects.filter(owner=self.user),
+            "px_key_assignments": PxKeyAssignment.objects.filter(owner=self.user),
+            "px_lock_definitions": PxLockDefinition.objects.filter(owner=self.user),
+        }
+        data = {
+            "version": 1,
+            "project": ProjectTransferSerializer(self.project).data,
+        }
+        for key, model_class, field_names in OLD_SECTIONS:
+            serializer = _serializer(model_class, field_names)
+            data[key] = serializer(querysets[key], many=True).data
+        return json.loads(JSONRenderer().render(data))
+
+    def test_export_streams_the_serializer_output(self):
+        response = self.client.get(reverse("project-export", args=[self.project.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assertEqual(json.loads(_read(response)), self._expected())
+
+    def test_gzip_export(self):
+        response = self.client.get(
+            reverse("project-export", args=[self.project.pk]),
+            {"gzip": "1"},
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertTrue(response.is_async)
+        body = gzip.decompress(_read(response))
+        self.assertEqual(json.loads(body), self._expected())
+
+
+def _describe(project):
+    """A project's imported content, with ids replaced by names."""
+    charts = PxChart.objects.filter(project=project)
+    layouts = PxChartContainerLayout.objects.filter(container__px_chart__in=charts)
+    edges = PxChartEdge.objects.filter(px_chart__in=charts)
+    locks = PxLockAssignment.objects.filter(px_chart__in=charts)
+    return {
+        "nodes": sorted(
+            PxNode.objects.filter(project=project).values_list("name", "description")
+        ),
+        "components": sorted(
+            PxComponent.objects.filter(node__project=project).values_list(
+                "node__name", "definition__name", "definition__type", "value"
+            )
+        ),
+        "charts": sorted(charts.values_list("name", "associatedNode__name")),
+        "containers": sorted(
+            PxChartContainer.objects.filter(px_chart__in=charts).values_list(
+                "px_chart__name", "name", "content__name"
+            )
+        ),
+        "layouts": sorted(
+            layouts.values_list(
+                "container__name", "position_x", "position_y", "height", "width"
+            )
+        ),
+        "edges": sorted(
+            edges.values_list(
+                "source__name",
+                "sourceHandle",
+                "target__name",
+                "targetHandle",
+                "bidirectional",
+            )
+        ),
+        "locks": sorted(
+            locks.values_list(
+                "edge__source__name", "edge__target__name", "definition__name", "count"
+            )
+        ),
+        "keys": sorted(
+            PxKeyAssignment.objects.filter(node__project=project).values_list(
+                "node__name", "definition__name", "count"
+            )
+        ),
+    }
+
+
+class ProjectImportTests(ProjectTransferTestCase):
+    def _export(self):
+        response = self.client.get(reverse("project-export", args=[self.project.pk]))
+        return json.loads(_read(response))
+
+    def _import(self, payload, client=None):
+        return (client or self.client).post(
+            reverse("project-import-project"), payload, format="json"
+        )
+
+    def test_round_trip(self):
+        response = self._import(self._export())
+
+        self.assertEqual(response.status_code, 201)
+        imported = Project.objects.get(pk=response.data["id"])
+        self.assertEqual(imported.name, "Export (1)")
+        self.assertEqual(imported.genres, ["rpg"])
+        self.assertEqual(_describe(imported), _describe(self.project))
+        # Key and lock definitions are reused by name, not duplicated
+        self.assertEqual(PxKeyDefinition.objects.filter(owner=self.user).count(), 1)
+        self.assertEqual(PxLockDefinition.objects.filter(owner=self.user).count(), 1)
+        self.assertEqual(
+            set(PxLockAssignment.objects.values_list("definition", flat=True)),
+            {self.lock.pk},
+        )
+        self.assertEqual(list(self.lock.unlocked_by.all()), [self.key])
+
+    def test_import_for_another_user_creates_definitions(self):
+        other = User.objects.create_user(username="importer", password="pw")
+        client = APIClient()
+        client.force_authenticate(other)
+
+        response = self._import(self._export(), client)
+
+        self.assertEqual(response.status_code, 201)
+        imported = Project.objects.get(pk=response.data["id"])
+        self.assertEqual(imported.user, other)
+        self.assertEqual(_describe(imported), _describe(self.project))
+        key = PxKeyDefinition.objects.get(owner=other)
+        lock = PxLockDefinition.objects.get(owner=other)
+        self.assertEqual(
+            (key.name, key.key_type, key.consumable), ("key", "item", True)
+        )
+        self.assertEqual(list(lock.unlocked_by.all()), [key])
+        self.assertEqual(list(self.lock.unlocked_by.all()), [self.key])
+
+    def test_unlocked_by_is_replaced(self):
+        payload = self._export()
+        spare = PxKeyDefinition.objects.create(
+            name="spare",
+            key_type="item",
+            consumable=False,
+            fixed=False,
+            unique=False,
+            owner=self.user,
+        )
+        self.lock.unlocked_by.add(spare)
+
+        response = self._import(payload)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(self.lock.unlocked_by.all()), [self.key])
+
+    def test_containers_without_layout_get_the_default(self):
+        payload = self._export()
+        payload["px_chart_container_layouts"] = []
+
+        response = self._import(payload)
+
+        imported = Project.objects.get(pk=response.data["id"])
+        layouts = _describe(imported)["layouts"]
+        self.assertEqual(layouts, [(f"node {i}", 0.0, 0.0, 0.0, 0.0) for i in range(3)])
+
+    def test_unknown_reference_is_rejected(self):
+        payload = self._export()
+        payload["px_chart_containers"][0]["content"] = "missing"
+
+        response = self._import(payload)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Unknown px_node reference: missing", str(response.data))
+        self.assertEqual(Project.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(PxNode.objects.count(), 3)
+
+
+def _path_scope_id(node_ids):
+    return hashlib.sha256(">".join(node_ids).encode()).hexdigest()
+
+
+class ProjectCloneTests(TestCase):
+    def setUp(self):
+        vector_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(vector_dir.cleanup)
+        vector_path = patch.object(
+            vector_store_module, "VECTOR_DB_PATH", Path(vector_dir.name) / "v.db"
+        )
+        vector_path.start()
+        self.addCleanup(vector_path.stop)
+
+        self.user = User.objects.create_user(username="cloner", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(user=self.user, name="Source")
+        self.concept = GameConcept.objects.create(
+            user=self.user, project=self.project, content="idea", is_current=True
+        )
+        self.pillar = Pillar.objects.create(
+            user=self.user, project=self.project, name="pillar", description="d"
+        )
+
+        definition = PxComponentDefinition.objects.create(
+            name="hp", type="number", owner=self.user, project=self.project
+        )
+        self.node_a, self.node_b = [
+            PxNode.objects.create(
+                name=name, description="d", owner=self.user, project=self.project
+            )
+            for name in ("a", "b")
+        ]
+        for node in (self.node_a, self.node_b):
+            PxComponent.objects.create(
+                node=node, definition=definition, value=10, owner=self.user
+            )
+        self.chart = PxChart.objects.create(
+            name="chart",
+            description="",
+            associatedNode=self.node_a,
+            project=self.project,
+            owner=self.user,
+        )
+        self.containers = [
+            PxChartContainer.objects.create(
+                name=node.name, px_chart=self.chart, content=node, owner=self.user
+            )
+            for node in (self.node_a, self.node_b)
+        ]
+        layout = self.containers[0].layout
+        layout.position_x, layout.position_y = 120, 40
+        layout.save()
+        PxChartEdge.objects.create(
+            px_chart=self.chart,
+            source=self.containers[0],
+            sourceHandle="right",
+            target=self.containers[1],
+            targetHandle="left",
+            owner=self.user,
+        )
+        self._add_derived_caches()
+
+    def _add_derived_caches(self):
+        project_id = str(self.project.pk)
+        chart_id = str(self.chart.pk)
+        node_ids = [str(self.node_a.pk), str(self.node_b.pk)]
+        hashes = [
+            compute_node_content_hash(node, self.chart)
+            for node in (self.node_a, self.node_b)
+        ]
+
+        StructuralMemoryState.objects.create(
+            node=self.node_a, chart=self.chart, content_hash=hashes[0], summary_text="a"
+        )
+        # Out of date in the source, so not copied
+        StructuralMemoryState.objects.create(
+            node=self.node_b, chart=self.chart, content_hash="stale"
+        )
+
+        common = {"project_id": project_id, "content_hash": "c"}
+        node_artifact = ContextArtifact.objects.create(
+            scope_type="node",
+            scope_id=node_ids[0],
+            artifact_type="summary",
+            node=self.node_a,
+            chart=self.chart,
+            content={"text": "a", "node_id": node_ids[0]},
+            source_hash=hashes[0],
+            **common,
+        )
+        ArtifactEmbedding.objects.create(
+            artifact=node_artifact,
+            embedding_model="test",
+            embedding_dim=2,
+            embedding_hash="h",
+        )
+        ContextArtifact.objects.create(
+            scope_type="path",
+            scope_id=_path_scope_id(node_ids),
+            artifact_type="path_summary",
+            chart=self.chart,
+            content="a then b",
+            source_hash=compute_path_source_hash(chart_id, node_ids, hashes),
+            metadata={"node_ids": node_ids},
+            **common,
+        )
+        for scope_type, scope_id in (
+            ("concept", self.concept.pk),
+            ("pillar", self.pillar.pk),
+        ):
+            ContextArtifact.objects.create(
+                scope_type=scope_type,
+                scope_id=str(scope_id),
+                artifact_type="summary",
+                content=scope_type,
+                source_hash="s",
+                **common,
+            )
+
+        l1_index = HMEMLayerEmbedding.build_positional_index(1, project_id)
+        l4_index = HMEMLayerEmbedding.build_positional_index(
+            4, project_id, chart_id=chart_id, node_id=node_ids[0]
+        )
+        for index, layer, parent, children in (
+            (l1_index, 1, None, [l4_index]),
+            (l4_index, 4, l1_index, []),
+        ):
+            HMEMLayerEmbedding.objects.create(
+                positional_index=index,
+                layer=layer,
+                content=f"layer {layer}",
+                embedding=[0.1, 0.2],
+                embedding_dim=2,
+                content_hash="c",
+                parent_index=parent,
+                child_indices=children,
+                node=self.node_a if layer == 4 else None,
+                chart=self.chart if layer == 4 else None,
+            )
+
+        store = vector_store_module.VectorStore()
+        try:
+            store.store_memory(
+                memory_id="fact",
+                node_id=node_ids[0],
+                chart_id=chart_id,
+                memory_type="atomic_fact",
+                content="a fact",
+                embedding=[0.1, 0.2],
+                embedding_model="test",
+            )
+        finally:
+            store.close()
+
+    def _clone(self, **options):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("project-clone", args=[self.project.pk]),
+                {"name": "Clone", **options},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        return Project.objects.get(pk=response.data["id"])
+
+    def _vector_memories(self, node_id):
+        store = vector_store_module.VectorStore()
+        try:
+            return store.get_memories_by_node(str(node_id))
+        finally:
+            store.close()
+
+    def _source_ids(self):
+        ids = {str(self.chart.pk), str(self.node_a.pk), str(self.node_b.pk)}
+        ids.update(str(c.pk) for c in self.containers)
+        return ids
+
+    def _assert_content_cloned(self, clone):
+        self.assertEqual(GameConcept.objects.filter(project=clone).count(), 1)
+        self.assertEqual(Pillar.objects.filter(project=clone).count(), 1)
+        self.assertEqual(PxComponentDefinition.objects.filter(project=clone).count(), 1)
+        self.assertEqual(PxComponent.objects.filter(node__project=clone).count(), 2)
+
+        chart = PxChart.objects.get(project=clone)
+        nodes = {n.name: n for n in PxNode.objects.filter(project=clone)}
+        self.assertEqual(set(nodes), {"a", "b"})
+        self.assertEqual(chart.associatedNode, nodes["a"])
+
+        containers = {
+            c.name: c
+            for c in PxChartContainer.objects.filter(px_chart=chart).select_related(
+                "layout"
+            )
+        }
+        self.assertEqual(containers["a"].content, nodes["a"])
+        self.assertEqual(
+            (containers["a"].layout.position_x, containers["a"].layout.position_y),
+            (120, 40),
+        )
+        self.assertEqual(containers["b"].layout.position_x, 0)
+        edge = PxChartEdge.objects.get(px_chart=chart)
+        self.assertEqual((edge.source, edge.target), (containers["a"], containers["b"]))
+
+        for model, lookup in (
+            (PxNode, "project"),
+            (PxChart, "project"),
+            (PxChartContainer, "px_chart__project"),
+            (PxChartEdge, "px_chart__project"),
+        ):
+            for row in model.objects.filter(**{lookup: clone}).values():
+                self.assertFalse(
+                    self._source_ids() & {str(v) for v in row.values()}, row
+                )
+        return chart, nodes
+
+    def test_clone_without_derived_caches(self):
+        clone = self._clone()
+
+        chart, nodes = self._assert_content_cloned(clone)
+        self.assertFalse(StructuralMemoryState.objects.filter(chart=chart).exists())
+        self.assertFalse(
+            ContextArtifact.objects.filter(project_id=str(clone.pk)).exists()
+        )
+        self.assertFalse(
+            HMEMLayerEmbedding.objects.filter(
+                positional_index__contains=f".{clone.pk}."
+            ).exists()
+        )
+        self.assertEqual(self._vector_memories(nodes["a"].pk), [])
+
+    def test_clone_with_derived_caches(self):
+        clone = self._clone(include_derived_caches=True)
+
+        chart, nodes = self._assert_content_cloned(clone)
+        node_ids = [str(nodes["a"].pk), str(nodes["b"].pk)]
+        hashes = [compute_node_content_hash(nodes[n], chart) for n in ("a", "b")]
+
+        state = StructuralMemoryState.objects.get(chart=chart)
+        self.assertEqual(state.node, nodes["a"])
+        self.assertEqual(state.content_hash, hashes[0])
+
+        artifacts = {
+            a.scope_type: a
+            for a in ContextArtifact.objects.filter(project_id=str(clone.pk))
+        }
+        self.assertEqual(set(artifacts), {"node", "path", "concept", "pillar"})
+        node_artifact = artifacts["node"]
+        self.assertEqual(node_artifact.scope_id, node_ids[0])
+        self.assertEqual(node_artifact.source_hash, hashes[0])
+        self.assertEqual(node_artifact.content["node_id"], node_ids[0])
+        self.assertEqual(node_artifact.embeddings.count(), 1)
+        path_artifact = artifacts["path"]
+        self.assertEqual(path_artifact.scope_id, _path_scope_id(node_ids))
+        self.assertEqual(path_artifact.metadata["node_ids"], node_ids)
+        self.assertEqual(
+            path_artifact.source_hash,
+            compute_path_source_hash(str(chart.pk), node_ids, hashes),
+        )
+        self.assertEqual(
+            artifacts["concept"].scope_id,
+            str(GameConcept.objects.get(project=clone).pk),
+        )
+        self.assertEqual(
+            artifacts["pillar"].scope_id, str(Pillar.objects.get(project=clone).pk)
+        )
+
+        l1_index = HMEMLayerEmbedding.build_positional_index(1, str(clone.pk))
+        l4_index = HMEMLayerEmbedding.build_positional_index(
+            4, str(clone.pk), chart_id=str(chart.pk), node_id=node_ids[0]
+        )
+        l1 = HMEMLayerEmbedding.objects.get(positional_index=l1_index)
+        l4 = HMEMLayerEmbedding.objects.get(positional_index=l4_index)
+        self.assertEqual(l1.child_indices, [l4_index])
+        self.assertEqual(l4.parent_index, l1_index)
+        self.assertEqual((l4.node, l4.chart), (nodes["a"], chart))
+
+        (memory,) = self._vector_memories(nodes["a"].pk)
+        self.assertEqual(memory["chart_id"], str(chart.pk))
+        self.assertEqual(memory["content"], "a fact")
+
+        copied = [
+            *ContextArtifact.objects.filter(project_id=str(clone.pk)).values(),
+            *HMEMLayerEmbedding.objects.filter(
+                positional_index__in=[l1_index, l4_index]
+            ).values(),
+            *StructuralMemoryState.objects.filter(chart=chart).values(),
+            memory,
+        ]
+        dumped = json.dumps(copied, default=str)
+        for source_id in self._source_ids():
+            self.assertNotIn(source_id, dumped)
+        # The source keeps its own caches
+        self.assertEqual(
+            ContextArtifact.objects.filter(project_id=str(self.project.pk)).count(), 4
+        )
@@ -11,15 +11,16 @@ from rest_framework.serializers import BaseSerializer
 from rest_framework.viewsets import ModelViewSet
 
 from projects.services.clone import clone_project
-from pxcharts.services.transfer import export_project_data as export_charts
-from pxnodes.services.transfer import export_project_data as export_nodes
+from pxcharts.services.transfer import export_sections as export_chart_sections
+from pxnodes.services.transfer import export_sections as export_node_sections
+from services.export_stream import export_response
 
 from .models import Project
 from .serializers import (
     ProjectSerializer,
     ProjectTransferSerializer,
 )
-from .services.import_project import import_project_data
+from .services.import_project import SUPPORTED_VERSION, import_project_data
 from .utils import get_current_project
 
 
@@ -95,12 +96,11 @@ class ProjectViewSet(ModelViewSet):
 
         serializer = ProjectTransferSerializer(project)
 
-        data = {"version": 1, "project": serializer.data}
-
-        data.update(export_charts(project))
-        data.update(export_nodes(project))
-
-        return Response(data)
+        return export_response(
+            request,
+            {"version": SUPPORTED_VERSION, "project": serializer.data},
+            export_chart_sections(project) + export_node_sections(project),
+        )
 
     @action(detail=True, methods=["post"], url_path="clone")
     def clone(self, request: Request, pk: Optional[int] = None) -> Response:
@@ -122,6 +122,7 @@ class ProjectViewSet(ModelViewSet):
         include_pillars = bool(request.data.get("include_pillars", True))
         include_charts = bool(request.data.get("include_charts", True))
         include_nodes = bool(request.data.get("include_nodes", True))
+        include_derived_caches = bool(request.data.get("include_derived_caches", False))
 
         name = request.data.get("name") or f"{source_project.name} (Copy)"
         new_project = clone_project(
@@ -132,6 +133,7 @@ class ProjectViewSet(ModelViewSet):
             include_pillars=include_pillars,
             include_charts=include_charts,
             include_nodes=include_nodes,
+            include_derived_caches=include_derived_caches,
         )
         return Response(
             ProjectSerializer(new_project).data, status=status.HTTP_201_CREATED
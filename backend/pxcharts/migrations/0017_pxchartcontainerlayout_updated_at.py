@@ -0,0 +1,20 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pxcharts", "0016_alter_pxchart_id_alter_pxchartcontainer_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pxchartcontainerlayout",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -66,6 +66,7 @@ class PxChartContainerLayout(models.Model):
     position_y = models.FloatField(default=0)
     height = models.FloatField(default=0)
     width = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "px chart container layout"
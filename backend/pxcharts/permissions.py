@@ -8,4 +8,5 @@ class IsOwner(permissions.BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
+        # Compare ids so the check does not load the owner row
+        return obj.owner_id == request.user.id
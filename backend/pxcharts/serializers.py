@@ -140,7 +140,9 @@ class PxLockAssignmentSerializer(serializers.ModelSerializer):
 
 
 class PxChartEdgeSerializer(serializers.ModelSerializer):
-    locks = PxLockAssignmentSerializer(many=True, read_only=True)
+    locks = PxLockAssignmentSerializer(
+        source="pxlockassignment_set", many=True, read_only=True
+    )
 
     class Meta:
         model = PxChartEdge
@@ -158,7 +160,6 @@ class PxChartEdgeSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at", "updated_at"]
 
     def validate(self, data):
-        print(str(data))
         chart_id = self.context["view"].kwargs.get("px_chart_pk")
 
         if "source" in data and str(data["source"].px_chart_id) != chart_id:
@@ -232,3 +233,81 @@ class PxChartPathSettingsSerializer(serializers.ModelSerializer):
                 {"id": "Cannot update ID after creation."}
             )
         return super().update(instance, validated_data)
+
+
+# Batch editing: field validation only; references are resolved against the
+# chart snapshot in pxcharts.services.batch
+
+
+class PxChartBatchLayoutSerializer(serializers.Serializer):
+    position_x = serializers.FloatField()
+    position_y = serializers.FloatField()
+    height = serializers.FloatField()
+    width = serializers.FloatField()
+
+
+class PxChartBatchContainerSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    content = serializers.UUIDField(required=False, allow_null=True)
+    layout = PxChartBatchLayoutSerializer(required=False)
+
+
+class PxChartBatchEdgeSerializer(serializers.Serializer):
+    source = serializers.UUIDField(  # type: ignore[assignment]
+        required=False, allow_null=True
+    )
+    target = serializers.UUIDField(required=False, allow_null=True)
+    sourceHandle = serializers.CharField(
+        max_length=255, required=False, allow_blank=True
+    )
+    targetHandle = serializers.CharField(
+        max_length=255, required=False, allow_blank=True
+    )
+    bidirectional = serializers.BooleanField(required=False)
+
+
+class PxChartBatchLockSerializer(serializers.Serializer):
+    edge = serializers.UUIDField()
+    definition = serializers.UUIDField()
+    count = serializers.IntegerField()
+
+
+class PxChartBatchOperationSerializer(serializers.Serializer):
+    DATA_SERIALIZERS = {
+        "container": PxChartBatchContainerSerializer,
+        "layout": PxChartBatchLayoutSerializer,
+        "edge": PxChartBatchEdgeSerializer,
+        "lock": PxChartBatchLockSerializer,
+    }
+
+    op = serializers.ChoiceField(choices=["create", "update", "delete"])
+    type = serializers.ChoiceField(choices=list(DATA_SERIALIZERS))
+    # For layouts, the id of their container
+    id = serializers.UUIDField(required=False)
+    data = serializers.DictField(  # type: ignore[assignment]
+        required=False, default=dict
+    )
+
+    def validate(self, data):
+        if data["type"] == "layout" and data["op"] != "update":
+            raise serializers.ValidationError(
+                "Layouts are created and deleted with their container."
+            )
+        if data["op"] != "create" and "id" not in data:
+            raise serializers.ValidationError({"id": "This field is required."})
+        if data["op"] == "delete":
+            return data
+
+        serializer = self.DATA_SERIALIZERS[data["type"]](
+            data=data["data"], partial=data["op"] == "update"
+        )
+        if not serializer.is_valid():
+            raise serializers.ValidationError({"data": serializer.errors})
+        data["data"] = serializer.validated_data
+        return data
+
+
+class PxChartBatchSerializer(serializers.Serializer):
+    operations = serializers.ListField(
+        child=PxChartBatchOperationSerializer(), allow_empty=False, max_length=5000
+    )
@@ -0,0 +1,329 @@
+"""
+Batch edits of a chart.
+
+ChartBatch loads a chart's containers (with layouts), edges and lock
+assignments once. It then applies a list of operations validated by
+PxChartBatchSerializer in memory, in order, so an operation can refer to
+rows created earlier in the same batch. References are checked against
+this snapshot instead of one query per object. save() writes the result in
+one transaction: per model, one delete, one bulk_update per set of changed
+fields and one bulk_create. If any operation is invalid, nothing is written.
+
+Deletes mirror the database: deleting a container clears the source/target
+of its edges, and deleting an edge removes its lock assignments.
+"""
+
+import uuid
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from pxcharts.models import (
+    PxChartContainer,
+    PxChartContainerLayout,
+    PxChartEdge,
+    PxLockAssignment,
+)
+from pxnodes.models import PxLockDefinition, PxNode
+
+BATCH_WRITE_SIZE = 500
+
+
+class _Rows:
+    """One model's rows in the snapshot, with what the batch did to them."""
+
+    def __init__(self, model, label, key_field, objs):
+        self.model = model
+        self.label = label
+        self.key_field = key_field
+        self.by_key = objs
+        self.created = {}
+        self.changed = {}
+        self.deleted = set()
+
+    def get(self, key):
+        try:
+            return self.by_key[key]
+        except KeyError:
+            raise ValidationError(f"Unknown {self.label}: {key}")
+
+    def create(self, key, obj):
+        if key in self.by_key or key in self.deleted:
+            raise ValidationError(f"The {self.label} {key} already exists.")
+        self.by_key[key] = obj
+        self.created[key] = obj
+
+    def change(self, key, obj, fields):
+        for name, value in fields.items():
+            setattr(obj, name, value)
+        if key not in self.created and fields:
+            self.changed.setdefault(key, set()).update(fields)
+
+    def delete(self, key):
+        del self.by_key[key]
+        self.changed.pop(key, None)
+        if self.created.pop(key, None) is None:
+            self.deleted.add(key)
+
+    def save(self, now):
+        """Write deletes, then updates, then inserts."""
+        if self.deleted:
+            self.model.objects.filter(
+                **{f"{self.key_field}__in": self.deleted}
+            ).delete()
+
+        by_fields = {}
+        for key, fields in self.changed.items():
+            obj = self.by_key[key]
+            obj.updated_at = now
+            by_fields.setdefault(frozenset(fields), []).append(obj)
+        for fields, objs in by_fields.items():
+            self.model.objects.bulk_update(
+                objs, [*sorted(fields), "updated_at"], batch_size=BATCH_WRITE_SIZE
+            )
+
+        self.model.objects.bulk_create(
+            self.created.values(), batch_size=BATCH_WRITE_SIZE
+        )
+
+    def summary(self):
+        return {
+            "created": [str(key) for key in self.created],
+            "updated": len(self.changed),
+            "deleted": len(self.deleted),
+        }
+
+
+class ChartBatch:
+    def __init__(self, chart, user):
+        self.chart = chart
+        self.user = user
+
+        containers = PxChartContainer.objects.filter(
+            px_chart=chart, owner=user
+        ).select_related("layout")
+        layouts = {}
+        for container in containers:
+            if hasattr(container, "layout"):
+                layouts[container.pk] = container.layout
+
+        self.containers = _Rows(
+            PxChartContainer,
+            "container",
+            "pk",
+            {container.pk: container for container in containers},
+        )
+        self.layouts = _Rows(PxChartContainerLayout, "layout", "container_id", layouts)
+        self.edges = _Rows(
+            PxChartEdge,
+            "edge",
+            "pk",
+            {
+                edge.pk: edge
+                for edge in PxChartEdge.objects.filter(px_chart=chart, owner=user)
+            },
+        )
+        self.locks = _Rows(
+            PxLockAssignment,
+            "lock",
+            "pk",
+            {
+                lock.pk: lock
+                for lock in PxLockAssignment.objects.filter(px_chart=chart, owner=user)
+            },
+        )
+        self.node_ids = set()
+        self.definition_ids = set()
+
+    def apply(self, operations):
+        """Apply validated operations; errors are keyed by operation index."""
+        self._load_references(operations)
+        for index, operation in enumerate(operations):
+            handler = getattr(self, f"_{operation['op']}_{operation['type']}")
+            try:
+                if operation["op"] == "delete":
+                    handler(operation["id"])
+                else:
+                    handler(operation.get("id"), operation["data"])
+            except ValidationError as e:
+                raise ValidationError({"operations": {index: e.detail}})
+        self._check_unique_edges()
+
+    def save(self):
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                # Parents first, so inserts never refer to a missing row
+                for rows in (self.containers, self.layouts, self.edges, self.locks):
+                    rows.save(now)
+        except IntegrityError as e:
+            raise ValidationError(f"The batch conflicts with the chart: {e}")
+        return {
+            "containers": self.containers.summary(),
+            "layouts": self.layouts.summary(),
+            "edges": self.edges.summary(),
+            "locks": self.locks.summary(),
+        }
+
+    # References outside the chart are looked up once for the whole batch
+
+    def _load_references(self, operations):
+        node_ids = set()
+        definition_ids = set()
+        for operation in operations:
+            data = operation.get("data", {})
+            if operation["type"] == "container" and data.get("content"):
+                node_ids.add(data["content"])
+            if operation["type"] == "lock" and "definition" in data:
+                definition_ids.add(data["definition"])
+        if node_ids:
+            self.node_ids = set(
+                PxNode.objects.filter(
+                    project_id=self.chart.project_id, pk__in=node_ids
+                ).values_list("pk", flat=True)
+            )
+        if definition_ids:
+            self.definition_ids = set(
+                PxLockDefinition.objects.filter(
+                    owner=self.user, pk__in=definition_ids
+                ).values_list("pk", flat=True)
+            )
+
+    def _node_id(self, node_id):
+        if node_id is not None and node_id not in self.node_ids:
+            raise ValidationError(f"Unknown node: {node_id}")
+        return node_id
+
+    def _container_id(self, container_id):
+        if container_id is None:
+            return None
+        return self.containers.get(container_id).pk
+
+    def _definition_id(self, definition_id):
+        if definition_id not in self.definition_ids:
+            raise ValidationError(f"Unknown lock definition: {definition_id}")
+        return definition_id
+
+    # Containers
+
+    def _container_fields(self, data):
+        fields = {}
+        if "name" in data:
+            fields["name"] = data["name"]
+        if "content" in data:
+            fields["content_id"] = self._node_id(data["content"])
+        return fields
+
+    def _create_container(self, pk, data):
+        pk = pk or uuid.uuid4()
+        container = PxChartContainer(
+            id=pk,
+            px_chart=self.chart,
+            owner=self.user,
+            **self._container_fields(data),
+        )
+        self.containers.create(pk, container)
+        self.layouts.create(
+            pk, PxChartContainerLayout(container=container, **data.get("layout", {}))
+        )
+
+    def _update_container(self, pk, data):
+        container = self.containers.get(pk)
+        self.containers.change(pk, container, self._container_fields(data))
+        if "layout" in data:
+            self._update_layout(pk, data["layout"])
+
+    def _delete_container(self, pk):
+        self.containers.get(pk)
+        for edge_pk, edge in self.edges.by_key.items():
+            ends = {}
+            if edge.source_id == pk:
+                ends["source_id"] = None
+            if edge.target_id == pk:
+                ends["target_id"] = None
+            self.edges.change(edge_pk, edge, ends)
+        if pk in self.layouts.by_key:
+            self.layouts.delete(pk)
+        self.containers.delete(pk)
+
+    # Layouts, addressed by their container's id
+
+    def _update_layout(self, pk, data):
+        container = self.containers.get(pk)
+        if pk not in self.layouts.by_key:
+            # Containers from before layouts were created on save
+            self.layouts.create(pk, PxChartContainerLayout(container=container))
+        self.layouts.change(pk, self.layouts.by_key[pk], dict(data))
+
+    # Edges
+
+    def _edge_fields(self, data):
+        fields = {}
+        for name in ("source", "target"):
+            if name in data:
+                fields[f"{name}_id"] = self._container_id(data[name])
+        for name in ("sourceHandle", "targetHandle", "bidirectional"):
+            if name in data:
+                fields[name] = data[name]
+        return fields
+
+    def _create_edge(self, pk, data):
+        pk = pk or uuid.uuid4()
+        edge = PxChartEdge(
+            id=pk, px_chart=self.chart, owner=self.user, **self._edge_fields(data)
+        )
+        self.edges.create(pk, edge)
+
+    def _update_edge(self, pk, data):
+        self.edges.change(pk, self.edges.get(pk), self._edge_fields(data))
+
+    def _delete_edge(self, pk):
+        self.edges.get(pk)
+        for lock_pk in [
+            lock_pk for lock_pk, lock in self.locks.by_key.items() if lock.edge_id == pk
+        ]:
+            self.locks.delete(lock_pk)
+        self.edges.delete(pk)
+
+    def _check_unique_edges(self):
+        # Mirrors the unique_edge constraint; NULL ends never collide
+        keys = Counter(
+            (edge.source_id, edge.sourceHandle, edge.target_id, edge.targetHandle)
+            for edge in self.edges.by_key.values()
+            if edge.source_id is not None and edge.target_id is not None
+        )
+        duplicates = [key for key, count in keys.items() if count > 1]
+        if duplicates:
+            source, source_handle, target, target_handle = duplicates[0]
+            raise ValidationError(
+                f"Duplicate edge from {source} ({source_handle}) "
+                f"to {target} ({target_handle})."
+            )
+
+    # Lock assignments
+
+    def _lock_fields(self, data):
+        fields = {}
+        if "edge" in data:
+            fields["edge_id"] = self.edges.get(data["edge"]).pk
+        if "definition" in data:
+            fields["definition_id"] = self._definition_id(data["definition"])
+        if "count" in data:
+            fields["count"] = data["count"]
+        return fields
+
+    def _create_lock(self, pk, data):
+        pk = pk or uuid.uuid4()
+        lock = PxLockAssignment(
+            id=pk, px_chart=self.chart, owner=self.user, **self._lock_fields(data)
+        )
+        self.locks.create(pk, lock)
+
+    def _update_lock(self, pk, data):
+        self.locks.change(pk, self.locks.get(pk), self._lock_fields(data))
+
+    def _delete_lock(self, pk):
+        self.locks.get(pk)
+        self.locks.delete(pk)
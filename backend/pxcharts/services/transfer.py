@@ -5,104 +5,163 @@ from pxcharts.models import (
     PxChartEdge,
     PxLockAssignment,
 )
-from pxcharts.transfer_serializers import (
-    PxChartContainerLayoutSerializer,
-    PxChartContainerSerializer,
-    PxChartEdgeSerializer,
-    PxChartTransferSerializer,
-    PxLockAssignmentSerializer,
-)
-from services.transfer import import_objects
+from services.export_stream import ExportSection
+from services.transfer import ImportPlan, import_objects, resolve
 
 
-def export_project_data(project):
+def export_sections(project):
     pxcharts = PxChart.objects.filter(project=project)
 
-    pxchartcontainers = PxChartContainer.objects.filter(px_chart__in=pxcharts)
-    pxchartcontainerlayouts = PxChartContainerLayout.objects.filter(
-        container__in=pxchartcontainers
-    )
-    pxchartedges = PxChartEdge.objects.filter(px_chart__in=pxcharts)
-
-    pxLockAssignments = PxLockAssignment.objects.filter(px_chart__in=pxcharts)
+    return [
+        ExportSection(
+            "px_charts",
+            pxcharts,
+            {
+                "id": "id",
+                "name": "name",
+                "description": "description",
+                "associatedNode": "associatedNode_id",
+            },
+        ),
+        ExportSection(
+            "px_chart_containers",
+            PxChartContainer.objects.filter(px_chart__project=project),
+            {
+                "id": "id",
+                "px_chart": "px_chart_id",
+                "name": "name",
+                "content": "content_id",
+            },
+        ),
+        ExportSection(
+            "px_chart_container_layouts",
+            PxChartContainerLayout.objects.filter(container__px_chart__project=project),
+            {
+                "id": "id",
+                "container": "container_id",
+                "position_x": "position_x",
+                "position_y": "position_y",
+                "height": "height",
+                "width": "width",
+            },
+        ),
+        ExportSection(
+            "px_chart_edges",
+            PxChartEdge.objects.filter(px_chart__project=project),
+            {
+                "id": "id",
+                "px_chart": "px_chart_id",
+                "source": "source_id",
+                "sourceHandle": "sourceHandle",
+                "target": "target_id",
+                "targetHandle": "targetHandle",
+                "bidirectional": "bidirectional",
+            },
+        ),
+        ExportSection(
+            "px_lock_assignments",
+            PxLockAssignment.objects.filter(px_chart__project=project),
+            {
+                "id": "id",
+                "px_chart": "px_chart_id",
+                "edge": "edge_id",
+                "definition": "definition_id",
+                "count": "count",
+            },
+        ),
+    ]
 
-    return {
-        "px_charts": PxChartTransferSerializer(pxcharts, many=True).data,
-        "px_chart_containers": PxChartContainerSerializer(
-            pxchartcontainers, many=True
-        ).data,
-        "px_chart_container_layouts": PxChartContainerLayoutSerializer(
-            pxchartcontainerlayouts, many=True
-        ).data,
-        "px_chart_edges": PxChartEdgeSerializer(pxchartedges, many=True).data,
-        "px_lock_assignments": PxLockAssignmentSerializer(
-            pxLockAssignments, many=True
-        ).data,
-    }
 
+def import_project_data(
+    project, payload, user, node_map, lock_definition_map, plan=None
+):
+    save_now = plan is None
+    plan = plan or ImportPlan()
 
-def import_project_data(project, payload, user, node_map, lock_definition_map):
     chart_map = import_objects(
         payload.get("px_charts", []),
-        lambda d: PxChart.objects.create(
+        lambda d: PxChart(
             name=d["name"],
             description=d["description"],
             associatedNode=node_map.get(d["associatedNode"]),
             project=project,
             owner=user,
         ),
+        "px_chart",
     )
 
     container_map = import_objects(
         payload.get("px_chart_containers", []),
-        lambda d: PxChartContainer.objects.create(
+        lambda d: PxChartContainer(
             name=d["name"],
-            px_chart=chart_map[d["px_chart"]],
-            content=node_map[d["content"]],
+            px_chart=resolve(chart_map, d["px_chart"], "px_chart"),
+            content=resolve(node_map, d["content"], "px_node"),
             owner=user,
         ),
+        "px_chart_container",
     )
 
-    layout_map = {}
-
-    for d in payload.get("px_chart_container_layouts", []):
-        old_id = d["id"]
-        container = container_map[d["container"]]
-
-        layout, _created = PxChartContainerLayout.objects.update_or_create(
-            container=container,
-            defaults={
-                "position_x": d["position_x"],
-                "position_y": d["position_y"],
-                "width": d["width"],
-                "height": d["height"],
-            },
-        )
+    layout_map = import_objects(
+        payload.get("px_chart_container_layouts", []),
+        lambda d: PxChartContainerLayout(
+            container=resolve(container_map, d["container"], "px_chart_container"),
+            position_x=d["position_x"],
+            position_y=d["position_y"],
+            width=d["width"],
+            height=d["height"],
+        ),
+        "px_chart_container_layout",
+    )
 
-        layout_map[old_id] = layout
+    # One layout per container: the last exported one wins, as it did with
+    # update_or_create, and containers without one get the default layout
+    # the post_save signal would have created (bulk_create does not send it)
+    layouts_by_container = {
+        container.pk: PxChartContainerLayout(container=container)
+        for container in container_map.values()
+    }
+    for layout in layout_map.values():
+        layouts_by_container[layout.container.pk] = layout
 
     edge_map = import_objects(
         payload.get("px_chart_edges", []),
-        lambda d: PxChartEdge.objects.create(
+        lambda d: PxChartEdge(
             sourceHandle=d["sourceHandle"],
             targetHandle=d["targetHandle"],
             bidirectional=d["bidirectional"],
-            source=container_map[d["source"]],
-            target=container_map[d["target"]],
-            px_chart=chart_map[d["px_chart"]],
+            source=resolve(
+                container_map, d["source"], "px_chart_container", optional=True
+            ),
+            target=resolve(
+                container_map, d["target"], "px_chart_container", optional=True
+            ),
+            px_chart=resolve(chart_map, d["px_chart"], "px_chart"),
             owner=user,
         ),
+        "px_chart_edge",
     )
 
-    _ = import_objects(
+    lock_assignment_map = import_objects(
         payload.get("px_lock_assignments", []),
-        lambda d: PxLockAssignment.objects.create(
+        lambda d: PxLockAssignment(
             count=d["count"],
-            definition=lock_definition_map[d["definition"]],
-            edge=edge_map[d["edge"]],
-            px_chart=chart_map[d["px_chart"]],
+            definition=resolve(
+                lock_definition_map, d["definition"], "px_lock_definition"
+            ),
+            edge=resolve(edge_map, d["edge"], "px_chart_edge"),
+            px_chart=resolve(chart_map, d["px_chart"], "px_chart"),
             owner=user,
         ),
+        "px_lock_assignment",
     )
 
+    plan.add(PxChart, chart_map.values())
+    plan.add(PxChartContainer, container_map.values())
+    plan.add(PxChartContainerLayout, layouts_by_container.values())
+    plan.add(PxChartEdge, edge_map.values())
+    plan.add(PxLockAssignment, lock_assignment_map.values())
+
+    if save_now:
+        plan.save()
+
     return chart_map
@@ -1,3 +1,331 @@
-# from django.test import TestCase
+"""
+Tests for chart detail revalidation and batch edits.
+"""
 
-# Create your tests here.
+import uuid
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from pxcharts.models import (
+    PxChart,
+    PxChartContainer,
+    PxChartContainerLayout,
+    PxChartEdge,
+    PxLockAssignment,
+)
+from pxnodes.models import PxLockDefinition, PxNode
+
+
+class ChartTestCase(TestCase):
+    """Chart with containers for nodes 0 and 1, joined by an edge."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="charter", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            user=self.user, name="Charts", is_current=True
+        )
+        self.nodes = [
+            PxNode.objects.create(
+                name=f"node {i}", description="", owner=self.user, project=self.project
+            )
+            for i in range(3)
+        ]
+        self.chart = PxChart.objects.create(
+            name="chart",
+            description="",
+            associatedNode=self.nodes[2],
+            project=self.project,
+            owner=self.user,
+        )
+        self.containers = [
+            PxChartContainer.objects.create(
+                name=node.name, px_chart=self.chart, content=node, owner=self.user
+            )
+            for node in self.nodes[:2]
+        ]
+        self.edge = PxChartEdge.objects.create(
+            px_chart=self.chart,
+            source=self.containers[0],
+            sourceHandle="right",
+            target=self.containers[1],
+            targetHandle="left",
+            owner=self.user,
+        )
+        self.url = reverse("pxcharts-detail", args=[self.chart.pk])
+
+
+class ChartDetailETagTests(ChartTestCase):
+    def _etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def _assert_changes(self, change):
+        etag = self._etag()
+        change()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response
+
+    def test_unchanged_chart_is_not_modified(self):
+        etag = self._etag()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_edits_change_the_etag(self):
+        def edit_layout():
+            layout = self.containers[0].layout
+            layout.position_x = 50
+            layout.save()
+
+        self._assert_changes(edit_layout)
+        self._assert_changes(lambda: self.chart.save())
+
+    def test_deletes_change_the_etag(self):
+        response = self._assert_changes(lambda: self.containers[1].delete())
+
+        self.assertEqual(len(response.data["containers"]), 1)
+        # The edge's target was SET_NULL
+        self.assertIsNone(response.data["edges"][0]["target"])
+
+    def test_deleting_content_node_changes_the_etag(self):
+        response = self._assert_changes(lambda: self.nodes[0].delete())
+
+        contents = {c["id"]: c["content"] for c in response.data["containers"]}
+        self.assertIsNone(contents[str(self.containers[0].pk)])
+
+    def test_deleting_associated_node_changes_the_etag(self):
+        response = self._assert_changes(lambda: self.nodes[2].delete())
+
+        self.assertIsNone(response.data["associated_node_id"])
+
+
+class ChartBatchTests(ChartTestCase):
+    def setUp(self):
+        super().setUp()
+        self.definition = PxLockDefinition.objects.create(
+            name="door", soft_gate=False, unlock_mode="permanent", owner=self.user
+        )
+        self.lock = PxLockAssignment.objects.create(
+            px_chart=self.chart,
+            edge=self.edge,
+            definition=self.definition,
+            count=1,
+            owner=self.user,
+        )
+        self.batch_url = reverse("pxcharts-batch", args=[self.chart.pk])
+
+    def _batch(self, *operations):
+        return self.client.post(
+            self.batch_url, {"operations": list(operations)}, format="json"
+        )
+
+    def _snapshot(self):
+        return (
+            sorted(
+                PxChartContainer.objects.filter(px_chart=self.chart).values_list(
+                    "id", "name", "content", "updated_at"
+                )
+            ),
+            sorted(
+                PxChartContainerLayout.objects.filter(
+                    container__px_chart=self.chart
+                ).values_list("container", "position_x", "updated_at")
+            ),
+            sorted(
+                PxChartEdge.objects.filter(px_chart=self.chart).values_list(
+                    "id", "source", "target", "sourceHandle", "updated_at"
+                )
+            ),
+            sorted(
+                PxLockAssignment.objects.filter(px_chart=self.chart).values_list(
+                    "id", "edge", "count"
+                )
+            ),
+        )
+
+    def test_create_reference_update_chain(self):
+        container_id, edge_id = str(uuid.uuid4()), str(uuid.uuid4())
+        layout = {"position_x": 10, "position_y": 20, "height": 30, "width": 40}
+
+        response = self._batch(
+            {
+                "op": "create",
+                "type": "container",
+                "id": container_id,
+                "data": {"name": "new", "content": str(self.nodes[2].pk)},
+            },
+            {
+                "op": "create",
+                "type": "edge",
+                "id": edge_id,
+                "data": {
+                    "source": str(self.containers[1].pk),
+                    "sourceHandle": "right",
+                    "target": container_id,
+                    "targetHandle": "left",
+                },
+            },
+            {
+                "op": "create",
+                "type": "lock",
+                "data": {
+                    "edge": edge_id,
+                    "definition": str(self.definition.pk),
+                    "count": 2,
+                },
+            },
+            {"op": "update", "type": "layout", "id": container_id, "data": layout},
+            {
+                "op": "update",
+                "type": "container",
+                "id": container_id,
+                "data": {"name": "renamed"},
+            },
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["containers"]["created"], [container_id])
+        self.assertEqual(response.data["edges"]["created"], [edge_id])
+        self.assertEqual(len(response.data["locks"]["created"]), 1)
+        container = PxChartContainer.objects.select_related("layout").get(
+            pk=container_id
+        )
+        self.assertEqual(
+            (container.name, container.content, container.owner),
+            ("renamed", self.nodes[2], self.user),
+        )
+        self.assertEqual(
+            (container.layout.position_x, container.layout.width), (10, 40)
+        )
+        edge = PxChartEdge.objects.get(pk=edge_id)
+        self.assertEqual((edge.source, edge.target), (self.containers[1], container))
+        lock = PxLockAssignment.objects.get(edge=edge)
+        self.assertEqual((lock.definition, lock.count), (self.definition, 2))
+
+    def test_container_delete_clears_edge_ends(self):
+        response = self._batch(
+            {"op": "delete", "type": "container", "id": str(self.containers[0].pk)}
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["containers"]["deleted"], 1)
+        self.assertEqual(response.data["edges"]["updated"], 1)
+        self.edge.refresh_from_db()
+        self.assertIsNone(self.edge.source)
+        self.assertEqual(self.edge.target, self.containers[1])
+        self.assertFalse(
+            PxChartContainerLayout.objects.filter(
+                container_id=self.containers[0].pk
+            ).exists()
+        )
+
+    def test_edge_delete_cascades_to_locks(self):
+        response = self._batch(
+            {"op": "delete", "type": "edge", "id": str(self.edge.pk)}
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["locks"]["deleted"], 1)
+        self.assertFalse(PxChartEdge.objects.filter(pk=self.edge.pk).exists())
+        self.assertFalse(PxLockAssignment.objects.filter(pk=self.lock.pk).exists())
+
+    def test_duplicate_edge_is_rejected(self):
+        before = self._snapshot()
+
+        response = self._batch(
+            {
+                "op": "create",
+                "type": "edge",
+                "data": {
+                    "source": str(self.containers[0].pk),
+                    "sourceHandle": "right",
+                    "target": str(self.containers[1].pk),
+                    "targetHandle": "left",
+                },
+            }
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Duplicate edge", str(response.data))
+        self.assertEqual(self._snapshot(), before)
+
+    def test_errors_are_keyed_by_operation_index(self):
+        missing = str(uuid.uuid4())
+
+        response = self._batch(
+            {"op": "create", "type": "container", "data": {"name": "ok"}},
+            {"op": "update", "type": "container", "id": missing, "data": {}},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {"operations": {"1": [f"Unknown container: {missing}"]}}
+        )
+
+    def test_invalid_operation_rolls_back_the_batch(self):
+        before = self._snapshot()
+
+        response = self._batch(
+            {
+                "op": "update",
+                "type": "container",
+                "id": str(self.containers[0].pk),
+                "data": {"name": "renamed"},
+            },
+            {"op": "delete", "type": "edge", "id": str(self.edge.pk)},
+            {
+                "op": "create",
+                "type": "lock",
+                "data": {
+                    "edge": str(self.edge.pk),
+                    "definition": str(self.definition.pk),
+                    "count": 1,
+                },
+            },
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("2", response.json()["operations"])
+        self.assertEqual(self._snapshot(), before)
+
+    def test_updates_bump_updated_at_and_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        edge_updated_at = self.edge.updated_at
+        layout = self.containers[0].layout
+
+        response = self._batch(
+            {
+                "op": "update",
+                "type": "edge",
+                "id": str(self.edge.pk),
+                "data": {"bidirectional": True},
+            },
+            {
+                "op": "update",
+                "type": "layout",
+                "id": str(self.containers[0].pk),
+                "data": {"position_x": 5},
+            },
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.edge.refresh_from_db()
+        self.assertTrue(self.edge.bidirectional)
+        self.assertGreater(self.edge.updated_at, edge_updated_at)
+        updated_layout = PxChartContainerLayout.objects.get(pk=layout.pk)
+        self.assertGreater(updated_layout.updated_at, layout.updated_at)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
@@ -1,8 +1,13 @@
 import uuid
 
+from django.db.models import prefetch_related_objects
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from projects.utils import get_current_project
 from pxcharts.models import (
@@ -14,6 +19,7 @@ from pxcharts.models import (
 )
 from pxcharts.permissions import IsOwner
 from pxcharts.serializers import (
+    PxChartBatchSerializer,
     PxChartContainerDetailSerializer,
     PxChartContainerSerializer,
     PxChartDetailSerializer,
@@ -22,6 +28,8 @@ from pxcharts.serializers import (
     PxChartSerializer,
     PxLockAssignmentSerializer,
 )
+from pxcharts.services.batch import ChartBatch
+from pxcharts.services.detail import detail_prefetch, revision_etag, with_revision
 
 
 class PxChartViewSet(viewsets.ModelViewSet):
@@ -29,6 +37,16 @@ class PxChartViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsOwner]
 
     def get_queryset(self):
+        if self.action == "retrieve":
+            # The current project is joined rather than looked up, so a
+            # revalidated retrieve is a single query
+            return with_revision(
+                PxChart.objects.filter(
+                    owner=self.request.user,
+                    project__user=self.request.user,
+                    project__is_current=True,
+                )
+            )
         project = get_current_project(self.request.user)
         queryset = PxChart.objects.filter(owner=self.request.user)
         if project:
@@ -44,10 +62,37 @@ class PxChartViewSet(viewsets.ModelViewSet):
             return PxChartDetailSerializer
         return super().get_serializer_class()
 
+    def retrieve(self, request, *args, **kwargs):
+        chart = self.get_object()
+        etag = quote_etag(revision_etag(chart))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is None:
+            prefetch_related_objects([chart], *detail_prefetch())
+            response = Response(self.get_serializer(chart).data)
+        else:
+            response = not_modified
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
     def perform_create(self, serializer):
         project = get_current_project(self.request.user)
         serializer.save(id=uuid.uuid4(), owner=self.request.user, project=project)
 
+    @action(detail=True, methods=["post"], url_path="batch")
+    def batch(self, request, pk=None):
+        """
+        Apply create/update/delete operations on the chart's containers,
+        layouts, edges and lock assignments in one transaction.
+        """
+        chart = self.get_object()
+        serializer = PxChartBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        batch = ChartBatch(chart, request.user)
+        batch.apply(serializer.validated_data["operations"])
+        return Response(batch.save())
+
 
 class PxChartContainerViewSet(viewsets.ModelViewSet):
     serializer_class = PxChartContainerSerializer
@@ -101,7 +146,7 @@ class PxChartEdgeViewSet(viewsets.ModelViewSet):
             px_chart_id=chart_id,
             px_chart__owner=self.request.user,
             owner=self.request.user,
-        )
+        ).prefetch_related("pxlockassignment_set")
         if project:
             queryset = queryset.filter(px_chart__project=project)
         else:
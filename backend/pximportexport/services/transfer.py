@@ -0,0 +1,133 @@
+import time
+
+from pxcharts.models import (
+    PxChart,
+    PxChartContainer,
+    PxChartContainerLayout,
+    PxChartEdge,
+)
+from pxnodes.models import PxComponent, PxComponentDefinition, PxNode
+from services.transfer import ImportPlan, import_objects, resolve
+
+
+def import_pxdata(payload, user, project):
+    """
+    Add the nodes and charts of a pxexport payload to project.
+
+    Every row gets a new id; references inside the payload are remapped in
+    memory and each model is written with one bulk_create.
+    Build (validation and remapping) time is recorded in timings["build"].
+
+    Returns:
+        The ImportPlan, whose counts/timings describe what was written.
+    """
+    plan = ImportPlan()
+    started = time.perf_counter()
+
+    definition_map = import_objects(
+        payload.get("pxcomponentdefinitions", []),
+        lambda d: PxComponentDefinition(
+            name=d["name"], type=d["type"], owner=user, project=project
+        ),
+        "pxcomponentdefinition",
+    )
+
+    node_map = import_objects(
+        payload.get("pxnodes", []),
+        lambda d: PxNode(
+            name=d["name"], description=d["description"], owner=user, project=project
+        ),
+        "pxnode",
+    )
+
+    component_map = import_objects(
+        payload.get("pxcomponents", []),
+        lambda d: PxComponent(
+            node=resolve(node_map, d["node"], "pxnode"),
+            definition=resolve(
+                definition_map, d["definition"], "pxcomponentdefinition"
+            ),
+            value=d["value"],
+            owner=user,
+        ),
+        "pxcomponent",
+    )
+
+    chart_map = import_objects(
+        payload.get("pxcharts", []),
+        lambda d: PxChart(
+            name=d["name"],
+            description=d["description"],
+            associatedNode=resolve(
+                node_map, d.get("associatedNode"), "pxnode", optional=True
+            ),
+            project=project,
+            owner=user,
+        ),
+        "pxchart",
+    )
+
+    container_map = import_objects(
+        payload.get("pxchartcontainers", []),
+        lambda d: PxChartContainer(
+            name=d["name"],
+            px_chart=resolve(chart_map, d["px_chart"], "pxchart"),
+            content=node_map.get(d.get("content")),
+            owner=user,
+        ),
+        "pxchartcontainer",
+    )
+
+    layout_map = import_objects(
+        payload.get("pxchartcontainerlayouts", []),
+        lambda d: PxChartContainerLayout(
+            container=resolve(container_map, d["container"], "pxchartcontainer"),
+            position_x=d["position_x"],
+            position_y=d["position_y"],
+            height=d["height"],
+            width=d["width"],
+        ),
+        "pxchartcontainerlayout",
+    )
+
+    # One layout per container (last one wins); containers without one get
+    # the default layout their post_save signal would have created
+    layouts_by_container = {
+        container.pk: PxChartContainerLayout(container=container)
+        for container in container_map.values()
+    }
+    for layout in layout_map.values():
+        layouts_by_container[layout.container.pk] = layout
+
+    edge_map = import_objects(
+        payload.get("pxchartedges", []),
+        lambda d: PxChartEdge(
+            px_chart=resolve(chart_map, d["px_chart"], "pxchart"),
+            source=resolve(
+                container_map, d["source"], "pxchartcontainer", optional=True
+            ),
+            sourceHandle=d["sourceHandle"],
+            target=resolve(
+                container_map, d["target"], "pxchartcontainer", optional=True
+            ),
+            targetHandle=d["targetHandle"],
+            owner=user,
+        ),
+        "pxchartedge",
+    )
+
+    plan.timings["build"] = time.perf_counter() - started
+
+    plan.add(PxComponentDefinition, definition_map.values(), "pxcomponentdefinitions")
+    plan.add(PxNode, node_map.values(), "pxnodes")
+    plan.add(PxComponent, component_map.values(), "pxcomponents")
+    plan.add(PxChart, chart_map.values(), "pxcharts")
+    plan.add(PxChartContainer, container_map.values(), "pxchartcontainers")
+    plan.add(
+        PxChartContainerLayout,
+        layouts_by_container.values(),
+        "pxchartcontainerlayouts",
+    )
+    plan.add(PxChartEdge, edge_map.values(), "pxchartedges")
+    plan.save()
+    return plan
@@ -0,0 +1,203 @@
+"""
+Tests for the streamed /api/pxexport/ export and /api/pximport/.
+"""
+
+import json
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from pxcharts.models import (
+    PxChart,
+    PxChartContainer,
+    PxChartContainerLayout,
+    PxChartEdge,
+)
+from pxnodes.models import PxComponent, PxComponentDefinition, PxNode
+
+
+def _serializer(model_class, field_names):
+    class Serializer(serializers.ModelSerializer):
+        class Meta:
+            model = model_class
+            fields = field_names
+
+    return Serializer
+
+
+# The serializers the export was built from before it was streamed
+OLD_SECTIONS = [
+    ("pxnodes", PxNode, ["id", "name", "description"]),
+    ("pxcomponents", PxComponent, ["id", "node", "definition", "value"]),
+    ("pxcomponentdefinitions", PxComponentDefinition, ["id", "name", "type"]),
+    ("pxcharts", PxChart, ["id", "name", "description", "associatedNode"]),
+    ("pxchartcontainers", PxChartContainer, ["id", "px_chart", "name", "content"]),
+    (
+        "pxchartcontainerlayouts",
+        PxChartContainerLayout,
+        ["id", "container", "position_x", "position_y", "height", "width"],
+    ),
+    (
+        "pxchartedges",
+        PxChartEdge,
+        ["id", "px_chart", "source", "sourceHandle", "target", "targetHandle"],
+    ),
+]
+
+
+class PxTransferTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        project = Project.objects.create(user=self.user, name="Export")
+
+        definition = PxComponentDefinition.objects.create(
+            name="hp", type="number", owner=self.user, project=project
+        )
+        nodes = [
+            PxNode.objects.create(
+                name=f"node {i}", description="d", owner=self.user, project=project
+            )
+            for i in range(3)
+        ]
+        for node in nodes:
+            PxComponent.objects.create(
+                node=node, definition=definition, value={"hp": 10}, owner=self.user
+            )
+        chart = PxChart.objects.create(
+            name="chart",
+            description="",
+            associatedNode=nodes[0],
+            project=project,
+            owner=self.user,
+        )
+        containers = [
+            PxChartContainer.objects.create(
+                name=node.name, px_chart=chart, content=node, owner=self.user
+            )
+            for node in nodes
+        ]
+        PxChartEdge.objects.create(
+            px_chart=chart,
+            source=containers[0],
+            sourceHandle="right",
+            target=containers[1],
+            targetHandle="left",
+            owner=self.user,
+        )
+
+        other = User.objects.create_user(username="other", password="pw")
+        PxNode.objects.create(
+            name="not exported",
+            description="",
+            owner=other,
+            project=Project.objects.create(user=other),
+        )
+
+    def _export(self):
+        response = self.client.get(reverse("pxexports-pxdata"))
+
+        async def read():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        return json.loads(async_to_sync(read)())
+
+
+class PxExportTests(PxTransferTestCase):
+    def _expected(self):
+        querysets = {
+            "pxnodes": PxNode.objects.filter(owner=self.user),
+            "pxcomponents": PxComponent.objects.filter(owner=self.user),
+            "pxcomponentdefinitions": PxComponentDefinition.objects.filter(
+                owner=self.user
+            ),
+            "pxcharts": PxChart.objects.filter(owner=self.user),
+            "pxchartcontainers": PxChartContainer.objects.filter(owner=self.user),
+            "pxchartcontainerlayouts": PxChartContainerLayout.objects.filter(
+                container__owner=self.user
+            ),
+            "pxchartedges": PxChartEdge.objects.filter(owner=self.user),
+        }
+        data = {}
+        for key, model_class, field_names in OLD_SECTIONS:
+            serializer = _serializer(model_class, field_names)
+            data[key] = serializer(querysets[key], many=True).data
+        return json.loads(JSONRenderer().render(data))
+
+    def test_export_streams_the_serializer_output(self):
+        self.assertEqual(self._export(), self._expected())
+
+
+class PxImportTests(PxTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.payload = self._export()
+        self.importer = User.objects.create_user(username="importer", password="pw")
+        self.client.force_authenticate(self.importer)
+
+    def _import(self, payload):
+        return self.client.post(reverse("pximports-pxdata"), payload, format="json")
+
+    def test_import_adds_the_payload_to_the_current_project(self):
+        project = Project.objects.create(
+            user=self.importer, name="Target", is_current=True
+        )
+
+        response = self._import(self.payload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["counts"],
+            {
+                "pxcomponentdefinitions": 1,
+                "pxnodes": 3,
+                "pxcomponents": 3,
+                "pxcharts": 1,
+                "pxchartcontainers": 3,
+                "pxchartcontainerlayouts": 3,
+                "pxchartedges": 1,
+            },
+        )
+        self.assertIn("build", response.data["timings"])
+        self.assertTrue(set(response.data["counts"]) <= set(response.data["timings"]))
+
+        self.assertEqual(PxNode.objects.filter(project=project).count(), 3)
+        chart = PxChart.objects.get(project=project, owner=self.importer)
+        self.assertEqual(chart.associatedNode.name, "node 0")
+        edge = PxChartEdge.objects.get(px_chart=chart)
+        self.assertEqual((edge.source.name, edge.target.name), ("node 0", "node 1"))
+        self.assertEqual(
+            PxChartContainerLayout.objects.filter(container__px_chart=chart).count(), 3
+        )
+        self.assertEqual(
+            sorted(
+                PxComponent.objects.filter(owner=self.importer).values_list(
+                    "node__name", "value"
+                )
+            ),
+            [(f"node {i}", {"hp": 10}) for i in range(3)],
+        )
+
+    def test_import_without_current_project_is_rejected(self):
+        response = self._import(self.payload)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PxNode.objects.filter(owner=self.importer).exists())
+
+    def test_unknown_reference_is_rejected(self):
+        Project.objects.create(user=self.importer, name="Target", is_current=True)
+        self.payload["pxcomponents"][0]["node"] = "missing"
+
+        response = self._import(self.payload)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PxNode.objects.filter(owner=self.importer).exists())
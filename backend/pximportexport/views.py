@@ -1,10 +1,11 @@
-import uuid
-
 from django.db import transaction
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from projects.models import Project
+from projects.utils import get_current_project
 from pxcharts.models import (
     PxChart,
     PxChartContainer,
@@ -13,16 +14,9 @@ from pxcharts.models import (
 )
 from pxnodes.models import PxComponent, PxComponentDefinition, PxNode
 from pxnodes.permissions import IsOwnerPermission
+from services.export_stream import ExportSection, export_response
 
-from .serializers import (
-    PxChartContainerLayoutSerializer,
-    PxChartContainerSerializer,
-    PxChartEdgeSerializer,
-    PxChartSerializer,
-    PxComponentDefinitionSerializer,
-    PxComponentSerializer,
-    PxNodeSerializer,
-)
+from .services.transfer import import_pxdata
 
 
 class ExportDataView(APIView):
@@ -31,34 +25,74 @@ class ExportDataView(APIView):
     def get(self, request, *args, **kwargs):
         user = request.user
 
-        pxnodes = PxNode.objects.filter(owner=user)
-        pxcomponents = PxComponent.objects.filter(owner=user)
-        pxcomponentdefinitions = PxComponentDefinition.objects.filter(owner=user)
-
-        pxcharts = PxChart.objects.filter(owner=user)
-        pxchartcontainers = PxChartContainer.objects.filter(owner=user)
-        pxchartcontainerlayouts = PxChartContainerLayout.objects.filter(
-            container__in=pxchartcontainers
-        )
-        pxchartedges = PxChartEdge.objects.filter(owner=user)
-
-        data = {
-            "pxnodes": PxNodeSerializer(pxnodes, many=True).data,
-            "pxcomponents": PxComponentSerializer(pxcomponents, many=True).data,
-            "pxcomponentdefinitions": PxComponentDefinitionSerializer(
-                pxcomponentdefinitions, many=True
-            ).data,
-            "pxcharts": PxChartSerializer(pxcharts, many=True).data,
-            "pxchartcontainers": PxChartContainerSerializer(
-                pxchartcontainers, many=True
-            ).data,
-            "pxchartcontainerlayouts": PxChartContainerLayoutSerializer(
-                pxchartcontainerlayouts, many=True
-            ).data,
-            "pxchartedges": PxChartEdgeSerializer(pxchartedges, many=True).data,
-        }
+        sections = [
+            ExportSection(
+                "pxnodes",
+                PxNode.objects.filter(owner=user),
+                {"id": "id", "name": "name", "description": "description"},
+            ),
+            ExportSection(
+                "pxcomponents",
+                PxComponent.objects.filter(owner=user),
+                {
+                    "id": "id",
+                    "node": "node_id",
+                    "definition": "definition_id",
+                    "value": "value",
+                },
+            ),
+            ExportSection(
+                "pxcomponentdefinitions",
+                PxComponentDefinition.objects.filter(owner=user),
+                {"id": "id", "name": "name", "type": "type"},
+            ),
+            ExportSection(
+                "pxcharts",
+                PxChart.objects.filter(owner=user),
+                {
+                    "id": "id",
+                    "name": "name",
+                    "description": "description",
+                    "associatedNode": "associatedNode_id",
+                },
+            ),
+            ExportSection(
+                "pxchartcontainers",
+                PxChartContainer.objects.filter(owner=user),
+                {
+                    "id": "id",
+                    "px_chart": "px_chart_id",
+                    "name": "name",
+                    "content": "content_id",
+                },
+            ),
+            ExportSection(
+                "pxchartcontainerlayouts",
+                PxChartContainerLayout.objects.filter(container__owner=user),
+                {
+                    "id": "id",
+                    "container": "container_id",
+                    "position_x": "position_x",
+                    "position_y": "position_y",
+                    "height": "height",
+                    "width": "width",
+                },
+            ),
+            ExportSection(
+                "pxchartedges",
+                PxChartEdge.objects.filter(owner=user),
+                {
+                    "id": "id",
+                    "px_chart": "px_chart_id",
+                    "source": "source_id",
+                    "sourceHandle": "sourceHandle",
+                    "target": "target_id",
+                    "targetHandle": "targetHandle",
+                },
+            ),
+        ]
 
-        return Response(data)
+        return export_response(request, {}, sections)
 
 
 class ImportDataView(APIView):
@@ -66,116 +100,19 @@ class ImportDataView(APIView):
 
     @transaction.atomic
     def post(self, request, *args, **kwargs):
-        user = request.user
-        data = request.data
-
-        total_id_map = {}
-        for componentdefinition_data in data.get("pxcomponentdefinitions", []):
-            old_id = componentdefinition_data["id"]
-            new_id = uuid.uuid4()
-            obj, created = PxComponentDefinition.objects.update_or_create(
-                id=new_id,
-                owner=user,
-                defaults={
-                    k: v for k, v in componentdefinition_data.items() if k != "id"
+        try:
+            project = get_current_project(request.user)
+        except Project.DoesNotExist:
+            raise ValidationError("Select a project before importing.")
+
+        plan = import_pxdata(request.data, request.user, project)
+
+        return Response(
+            {
+                "status": "success",
+                "counts": plan.counts,
+                "timings": {
+                    label: round(seconds, 4) for label, seconds in plan.timings.items()
                 },
-            )
-            total_id_map[old_id] = new_id
-
-        for node_data in data.get("pxnodes", []):
-            old_id = node_data["id"]
-            new_id = uuid.uuid4()
-            obj, created = PxNode.objects.update_or_create(
-                id=new_id,
-                owner=user,
-                defaults={k: v for k, v in node_data.items() if k != "id"},
-            )
-            total_id_map[old_id] = new_id
-
-        for component_data in data.get("pxcomponents", []):
-            old_id = component_data["id"]
-            old_node_id = component_data["node"]
-            old_definition_id = component_data["definition"]
-            new_id = uuid.uuid4()
-            obj, created = PxComponent.objects.update_or_create(
-                id=new_id,
-                owner=user,
-                node_id=total_id_map[old_node_id],
-                definition_id=total_id_map[old_definition_id],
-                defaults={
-                    k: v
-                    for k, v in component_data.items()
-                    if k != "id" and k != "node" and k != "definition"
-                },
-            )
-            total_id_map[old_id] = new_id
-
-        for chart_data in data.get("pxcharts", []):
-            old_id = chart_data["id"]
-            old_node_id = chart_data["associatedNode"]
-            new_id = uuid.uuid4()
-            obj, created = PxChart.objects.update_or_create(
-                id=new_id,
-                owner=user,
-                associatedNode_id=total_id_map[old_node_id],
-                defaults={
-                    k: v
-                    for k, v in chart_data.items()
-                    if k != "id" and k != "associatedNode"
-                },
-            )
-            total_id_map[old_id] = new_id
-
-        for container_data in data.get("pxchartcontainers", []):
-            old_id = container_data["id"]
-            old_node_id = container_data["content"]
-            old_px_chart_id = container_data["px_chart"]
-            new_id = uuid.uuid4()
-            obj, created = PxChartContainer.objects.update_or_create(
-                id=new_id,
-                owner=user,
-                content_id=total_id_map.get(old_node_id),
-                px_chart_id=total_id_map[old_px_chart_id],
-                defaults={
-                    k: v
-                    for k, v in container_data.items()
-                    if k not in ["id", "content", "px_chart"]
-                },
-            )
-            total_id_map[old_id] = new_id
-
-        for containerlayout_data in data.get("pxchartcontainerlayouts", []):
-            old_id = containerlayout_data["id"]
-            old_container_id = containerlayout_data["container"]
-            new_id = uuid.uuid4()
-            obj, created = PxChartContainerLayout.objects.update_or_create(
-                container_id=total_id_map[old_container_id],
-                defaults={
-                    k: v
-                    for k, v in containerlayout_data.items()
-                    if k not in ["id", "container"]
-                },
-            )
-            total_id_map[old_id] = new_id
-
-        for edge_data in data.get("pxchartedges", []):
-            old_id = edge_data["id"]
-            old_px_chart_id = edge_data["px_chart"]
-            old_source_id = edge_data["source"]
-            old_target_id = edge_data["target"]
-            new_id = uuid.uuid4()
-            obj, created = PxChartEdge.objects.update_or_create(
-                id=new_id,
-                owner=user,
-                px_chart_id=total_id_map[old_px_chart_id],
-                source_id=total_id_map[old_source_id],
-                target_id=total_id_map[old_target_id],
-                defaults={
-                    k: v
-                    for k, v in edge_data.items()
-                    if k not in ["id", "source", "target", "px_chart"]
-                },
-            )
-            total_id_map[old_id] = new_id
-
-        return Response({"status": "success"})
+            }
+        )
@@ -33,6 +33,8 @@ class CoherenceDimensionAgent(BaseAgent):
     - prompt_template: LLM prompt template
     """
 
+    feature = "pxnodes.coherence"
+
     # Subclasses must define these
     dimension_name: str = ""
     prompt_template: str = ""
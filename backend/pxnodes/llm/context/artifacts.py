@@ -19,6 +19,7 @@ if TYPE_CHECKING:
 
 import logfire
 
+from llm.ledger import record_cache_hit
 from pxnodes.llm.context.change_detection import compute_node_content_hash
 from pxnodes.llm.context.shared.prompts import (
     ATOMIC_FACT_EXTRACTION_PROMPT,
@@ -42,7 +43,7 @@ from pxnodes.llm.context.structural_memory.triples import (
     extract_llm_triples_only_async,
     parse_llm_triples,
 )
-from pxnodes.models import ContextArtifact, PxNode
+from pxnodes.models import ArtifactEmbedding, ContextArtifact, PxNode
 
 # Fixed model for all artifact precompute operations.
 # This ensures consistent preprocessing across experiments regardless of
@@ -103,6 +104,40 @@ def compute_path_source_hash(
     return _hash_payload(payload)
 
 
+def record_artifact_embeddings(
+    artifacts: Iterable[ContextArtifact],
+    embedding_model: str,
+    embedding_dim: int,
+) -> int:
+    """
+    Record which embedding model/dimension an artifact was embedded with.
+
+    Existing rows for the same (artifact, model) are replaced so the table
+    tracks the latest embedding per model.
+
+    Returns:
+        Number of ArtifactEmbedding rows written.
+    """
+    unique = {artifact.pk: artifact for artifact in artifacts if artifact.pk}
+    if not unique:
+        return 0
+
+    ArtifactEmbedding.objects.filter(
+        artifact_id__in=list(unique), embedding_model=embedding_model
+    ).delete()
+    rows = [
+        ArtifactEmbedding(
+            artifact=artifact,
+            embedding_model=embedding_model,
+            embedding_dim=embedding_dim,
+            embedding_hash=_hash_text(f"{embedding_model}:{artifact.content_hash}"),
+        )
+        for artifact in unique.values()
+    ]
+    ArtifactEmbedding.objects.bulk_create(rows)
+    return len(rows)
+
+
 def get_cached_artifact(
     scope_type: str,
     scope_id: str,
@@ -150,6 +185,7 @@ def get_cached_artifact(
                 scope_id=scope_id,
                 artifact_type=artifact_type,
             )
+            record_cache_hit("pxnodes.structural_memory", artifact_type)
             return artifact.content
     except Exception as e:
         logfire.warning(
@@ -8,14 +8,22 @@ structural memory approach.
 
 import json
 import logging
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Optional, Protocol
+from typing import Any, AsyncIterator, Callable, Optional, Protocol
 
 import logfire
 
 from pxcharts.models import PxChart
-from pxnodes.llm.context.graph_retrieval import get_graph_slice
-from pxnodes.llm.context.retriever import (
+from pxnodes.llm.context.shared.concurrency import (
+    iter_concurrently,
+    run_concurrently,
+)
+from pxnodes.llm.context.shared.graph_retrieval import (
+    ChartSnapshot,
+    get_graph_slice,
+)
+from pxnodes.llm.context.structural_memory.retriever import (
     IterativeRetriever,
     RetrievalResult,
 )
@@ -50,6 +58,15 @@ class CoherenceIssue:
             "affected_nodes": self.affected_nodes,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CoherenceIssue":
+        return cls(
+            issue_type=data.get("type", "unknown"),
+            severity=data.get("severity", "info"),
+            description=data.get("description", ""),
+            affected_nodes=data.get("affected_nodes", []),
+        )
+
 
 @dataclass
 class NodeEvaluationResult:
@@ -72,6 +89,18 @@ class NodeEvaluationResult:
             "error": self.error,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "NodeEvaluationResult":
+        """Rebuild a result stored by to_dict() (e.g. when resuming a run)."""
+        return cls(
+            node_id=data["node_id"],
+            node_name=data.get("node_name", ""),
+            is_coherent=data.get("is_coherent", True),
+            issues=[CoherenceIssue.from_dict(i) for i in data.get("issues", [])],
+            context_used=data.get("context_used", ""),
+            error=data.get("error"),
+        )
+
     @property
     def error_count(self) -> int:
         return len([i for i in self.issues if i.severity == "error"])
@@ -178,17 +207,35 @@ class NodeCoherenceEvaluator:
             top_k_per_node: Max memories to retrieve per node
         """
         self.llm_provider = llm_provider
-        self.retriever = IterativeRetriever(
-            llm_provider=llm_provider,
-            embedding_model=embedding_model,
-        )
+        self.embedding_model = embedding_model
         self.retrieval_iterations = retrieval_iterations
         self.top_k_per_node = top_k_per_node
 
+        # Retrievers hold a vector store connection, so concurrent chart
+        # evaluation gives each worker thread its own.
+        self._local = threading.local()
+        self._retrievers: list[IterativeRetriever] = []
+        self._retrievers_lock = threading.Lock()
+        self.retriever = self._get_retriever()
+
+    def _get_retriever(self) -> IterativeRetriever:
+        """Return the calling thread's retriever, creating it on first use."""
+        retriever = getattr(self._local, "retriever", None)
+        if retriever is None:
+            retriever = IterativeRetriever(
+                llm_provider=self.llm_provider,
+                embedding_model=self.embedding_model,
+            )
+            self._local.retriever = retriever
+            with self._retrievers_lock:
+                self._retrievers.append(retriever)
+        return retriever
+
     def evaluate_node(
         self,
         node: PxNode,
         chart: PxChart,
+        snapshot: Optional[ChartSnapshot] = None,
     ) -> NodeEvaluationResult:
         """
         Evaluate a single node's coherence in context of its neighbors.
@@ -196,6 +243,7 @@ class NodeCoherenceEvaluator:
         Args:
             node: The target node to evaluate
             chart: The chart containing the node
+            snapshot: Optional preloaded chart topology (avoids per-node queries)
 
         Returns:
             NodeEvaluationResult with coherence assessment and issues
@@ -207,7 +255,10 @@ class NodeCoherenceEvaluator:
         ):
             try:
                 # Get graph slice (neighbors)
-                graph_slice = get_graph_slice(node, chart, depth=1)
+                if snapshot is not None:
+                    graph_slice = snapshot.graph_slice(node, depth=1)
+                else:
+                    graph_slice = get_graph_slice(node, chart, depth=1)
 
                 # Build retrieval query
                 query = self._build_retrieval_query(node)
@@ -220,7 +271,7 @@ class NodeCoherenceEvaluator:
                     all_node_ids.append(str(n.id))
 
                 # Retrieve memories for all relevant nodes
-                memories_by_node = self.retriever.retrieve_for_nodes(
+                memories_by_node = self._get_retriever().retrieve_for_nodes(
                     target_node_id=str(node.id),
                     neighbor_node_ids=neighbor_ids,
                     query=query,
@@ -273,14 +324,25 @@ class NodeCoherenceEvaluator:
         self,
         chart: PxChart,
         node_ids: Optional[list[str]] = None,
+        max_concurrency: Optional[int] = None,
+        completed: Optional[dict[str, NodeEvaluationResult]] = None,
+        on_result: Optional[Callable[[NodeEvaluationResult], None]] = None,
     ) -> ChartEvaluationResult:
         """
         Evaluate coherence for nodes in a chart.
 
+        The chart topology is loaded once and nodes are evaluated
+        concurrently (bounded by max_concurrency).
+
         Args:
             chart: The chart to evaluate
             node_ids: Optional list of specific node IDs to evaluate.
                      If None, evaluates all nodes in the chart.
+            max_concurrency: Max nodes evaluated at once
+                (CONTEXT_EVALUATION_CONCURRENCY if None)
+            completed: Results from an earlier partial run, keyed by node ID;
+                these nodes are not evaluated again
+            on_result: Called on the calling thread with each new node result
 
         Returns:
             ChartEvaluationResult with results for all evaluated nodes
@@ -295,26 +357,31 @@ class NodeCoherenceEvaluator:
                 chart_name=chart.name,
             )
 
-            # Get nodes to evaluate
-            if node_ids:
-                nodes = list(PxNode.objects.filter(id__in=node_ids))
-            else:
-                # Get all nodes in chart
-                container_node_ids = chart.containers.filter(
-                    content__isnull=False
-                ).values_list("content_id", flat=True)
-                nodes = list(PxNode.objects.filter(id__in=container_node_ids))
+            snapshot = ChartSnapshot.load(chart)
+            nodes = snapshot.resolve_nodes(node_ids)
+            completed = completed or {}
+            pending = [node for node in nodes if str(node.id) not in completed]
 
             logfire.info(
                 "evaluating_chart",
                 chart_id=str(chart.id),
                 node_count=len(nodes),
+                resumed_nodes=len(nodes) - len(pending),
             )
 
-            # Evaluate each node
-            for node in nodes:
-                node_result = self.evaluate_node(node, chart)
-                result.node_results.append(node_result)
+            finished = dict(completed)
+            for node, node_result in run_concurrently(
+                pending,
+                lambda node: self.evaluate_node(node, chart, snapshot=snapshot),
+                max_concurrency=max_concurrency,
+                on_result=(lambda _node, r: on_result(r)) if on_result else None,
+            ):
+                finished[str(node.id)] = node_result
+
+            # Keep chart order regardless of completion order
+            result.node_results = [
+                finished[str(node.id)] for node in nodes if str(node.id) in finished
+            ]
 
             logfire.info(
                 "chart_evaluation_complete",
@@ -325,6 +392,25 @@ class NodeCoherenceEvaluator:
 
             return result
 
+    async def iter_chart(
+        self,
+        snapshot: ChartSnapshot,
+        nodes: list[PxNode],
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[NodeEvaluationResult]:
+        """
+        Evaluate nodes concurrently, yielding each result as it completes.
+
+        Used for streaming progress; the snapshot must be loaded beforehand
+        (ChartSnapshot.load is synchronous ORM work).
+        """
+        async for _node, node_result in iter_concurrently(
+            nodes,
+            lambda node: self.evaluate_node(node, snapshot.chart, snapshot=snapshot),
+            max_concurrency=max_concurrency,
+        ):
+            yield node_result
+
     def _build_retrieval_query(self, node: PxNode) -> str:
         """Build a query for retrieving relevant memories."""
         parts = [f"Game node: {node.name}"]
@@ -491,4 +577,8 @@ class NodeCoherenceEvaluator:
 
     def close(self) -> None:
         """Close resources."""
-        self.retriever.close()
+        with self._retrievers_lock:
+            for retriever in self._retrievers:
+                retriever.close()
+            self._retrievers.clear()
+        self._local = threading.local()
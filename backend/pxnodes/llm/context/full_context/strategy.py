@@ -18,6 +18,10 @@ from pxnodes.llm.context.base.types import (
     StrategyType,
 )
 from pxnodes.llm.context.hierarchical_graph.layers import build_domain_layer
+from pxnodes.llm.context.shared.graph_retrieval import (
+    get_chart_containers,
+    get_chart_edges,
+)
 
 
 @StrategyRegistry.register(StrategyType.FULL_CONTEXT)
@@ -55,11 +59,9 @@ class FullContextStrategy(BaseContextStrategy):
             game_concept=scope.game_concept,
         )
 
-        containers = scope.chart.containers.select_related("content").all()
+        containers = get_chart_containers(scope.chart)
         nodes = [c.content for c in containers if c.content is not None]
-        edges = list(
-            scope.chart.edges.select_related("source__content", "target__content").all()
-        )
+        edges = get_chart_edges(scope.chart)
 
         node_lines: list[str] = []
         for node in nodes:
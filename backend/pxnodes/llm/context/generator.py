@@ -22,9 +22,12 @@ from pxnodes.llm.context.change_detection import (
     get_changed_nodes,
     update_processing_state,
 )
-from pxnodes.llm.context.embeddings import OpenAIEmbeddingGenerator
 from pxnodes.llm.context.facts import extract_atomic_facts
 from pxnodes.llm.context.llm_adapter import LLMProviderAdapter
+from pxnodes.llm.context.shared.embeddings import (
+    EmbeddingBackend,
+    get_embedding_backend,
+)
 from pxnodes.llm.context.triples import extract_llm_triples_only
 from pxnodes.llm.context.vector_store import VectorStore
 from pxnodes.models import PxNode
@@ -111,26 +114,30 @@ class StructuralMemoryGenerator:
     def __init__(
         self,
         llm_model: str = "gpt-4o-mini",
-        embedding_model: str = "text-embedding-3-small",
+        embedding_model: Optional[str] = None,
         skip_embeddings: bool = False,
         force_regenerate: bool = False,
+        embedding_backend: Optional[str] = None,
     ):
         """
         Initialize the generator.
 
         Args:
             llm_model: Model for atomic fact extraction
-            embedding_model: OpenAI embedding model
+            embedding_model: Embedding model (backend default if None)
             skip_embeddings: If True, skip embedding generation
             force_regenerate: If True, process all nodes regardless of changes
+            embedding_backend: Embedding backend name (EMBEDDING_BACKEND if None)
         """
         self.llm_provider = LLMProviderAdapter(
             model_name=llm_model,
             temperature=0,
         )
-        self.embedding_generator: Optional[OpenAIEmbeddingGenerator] = None
+        self.embedding_generator: Optional[EmbeddingBackend] = None
         if not skip_embeddings:
-            self.embedding_generator = OpenAIEmbeddingGenerator(model=embedding_model)
+            self.embedding_generator = get_embedding_backend(
+                backend=embedding_backend, model=embedding_model
+            )
 
         self.skip_embeddings = skip_embeddings
         self.force_regenerate = force_regenerate
@@ -427,6 +434,7 @@ class StructuralMemoryGenerator:
                     embedding=embedding,
                     chart_id=str(chart.id),
                     metadata=text_meta["metadata"],
+                    embedding_model=self.embedding_generator.model,
                 )
 
             logfire.info(
@@ -458,9 +466,10 @@ class StructuralMemoryGenerator:
 def generate_structural_memory(
     chart_ids: list[str],
     llm_model: str = "gpt-4o-mini",
-    embedding_model: str = "text-embedding-3-small",
+    embedding_model: Optional[str] = None,
     skip_embeddings: bool = False,
     force_regenerate: bool = False,
+    embedding_backend: Optional[str] = None,
 ) -> list[dict]:
     """
     Convenience function to generate structural memory for charts.
@@ -468,9 +477,10 @@ def generate_structural_memory(
     Args:
         chart_ids: List of chart UUIDs to process
         llm_model: Model for atomic fact extraction
-        embedding_model: OpenAI embedding model
+        embedding_model: Embedding model (backend default if None)
         skip_embeddings: If True, skip embedding generation
         force_regenerate: If True, process all nodes regardless of changes
+        embedding_backend: Embedding backend name (EMBEDDING_BACKEND if None)
 
     Returns:
         List of result dictionaries
@@ -482,6 +492,7 @@ def generate_structural_memory(
         embedding_model=embedding_model,
         skip_embeddings=skip_embeddings,
         force_regenerate=force_regenerate,
+        embedding_backend=embedding_backend,
     )
 
     try:
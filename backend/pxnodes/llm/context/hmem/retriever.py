@@ -22,7 +22,7 @@ from typing import Any, Optional
 
 import numpy as np
 
-from pxnodes.llm.context.shared.embeddings import OpenAIEmbeddingGenerator
+from pxnodes.llm.context.shared.embeddings import get_embedding_backend
 from pxnodes.models import HMEMLayerEmbedding
 
 logger = logging.getLogger(__name__)
@@ -84,19 +84,31 @@ class HMEMRetriever:
 
     def __init__(
         self,
-        embedding_model: str = "text-embedding-3-small",
-        embedding_dim: int = 1536,
+        embedding_model: Optional[str] = None,
+        embedding_dim: Optional[int] = None,
+        embedding_backend: Optional[str] = None,
     ):
         """
         Initialize the H-MEM retriever.
 
         Args:
-            embedding_model: OpenAI embedding model name
-            embedding_dim: Dimension of embeddings
+            embedding_model: Embedding model name (backend default if None)
+            embedding_dim: Dimension of embeddings (derived from the model
+                if None)
+            embedding_backend: Embedding backend name (EMBEDDING_BACKEND if None)
         """
-        self.embedding_generator = OpenAIEmbeddingGenerator(model=embedding_model)
-        self.embedding_model = embedding_model
-        self.embedding_dim = embedding_dim
+        self.embedding_generator = get_embedding_backend(
+            backend=embedding_backend, model=embedding_model
+        )
+        self.embedding_model = self.embedding_generator.model
+        self._embedding_dim = embedding_dim
+
+    @property
+    def embedding_dim(self) -> int:
+        """Vector dimension of the configured embedding model."""
+        if self._embedding_dim is None:
+            self._embedding_dim = self.embedding_generator.dimensions
+        return self._embedding_dim
 
     def retrieve(
         self,
@@ -276,6 +288,7 @@ class HMEMRetriever:
         existing = HMEMLayerEmbedding.objects.filter(
             positional_index=positional_index,
             content_hash=content_hash,
+            embedding_model=self.embedding_model,
         ).first()
 
         if existing:
@@ -297,7 +310,7 @@ class HMEMRetriever:
                 "content": content,
                 "embedding": embedding,
                 "embedding_model": self.embedding_model,
-                "embedding_dim": self.embedding_dim,
+                "embedding_dim": len(embedding),
                 "content_hash": content_hash,
                 "node": node,
                 "chart": chart,
@@ -528,6 +541,9 @@ class HMEMRetriever:
                     "chart_mechanic_"
                 ):
                     continue
+            if len(candidate.embedding) != len(query_np):
+                # Stored with a different embedding model; not comparable
+                continue
             candidate_embedding = np.array(candidate.embedding)
             similarity = self._cosine_similarity(query_np, candidate_embedding)
 
@@ -21,6 +21,8 @@ import logging
 import re
 from typing import Any, Optional
 
+from django.utils import timezone
+
 from pxnodes.llm.context.artifacts import (
     ARTIFACT_CHART_MECHANICS,
     ARTIFACT_CHART_OVERVIEW,
@@ -99,7 +101,8 @@ class HMEMStrategy(BaseContextStrategy):
     def __init__(
         self,
         llm_provider: Optional[LLMProvider] = None,
-        embedding_model: str = "text-embedding-3-small",
+        embedding_model: Optional[str] = None,
+        embedding_backend: Optional[str] = None,
         top_k_per_layer: int = 3,
         similarity_thresholds: Optional[dict[int, float]] = None,
         auto_embed: bool = True,
@@ -118,7 +121,9 @@ class HMEMStrategy(BaseContextStrategy):
         Args:
             llm_provider: Optional LLM for content summarization (ignored,
                 always uses PRECOMPUTE_MODEL)
-            embedding_model: OpenAI embedding model name (unchanged)
+            embedding_model: Embedding model name (backend default if None)
+            embedding_backend: Embedding backend name ("openai", "ollama",
+                "hashing"); EMBEDDING_BACKEND setting if None
             top_k_per_layer: Number of results to retrieve per layer
             similarity_thresholds: Optional per-layer similarity thresholds
                 (default 0.5)
@@ -139,7 +144,6 @@ class HMEMStrategy(BaseContextStrategy):
         else:
             super().__init__(llm_provider=None, **kwargs)
 
-        self.embedding_model = embedding_model
         self.top_k_per_layer = top_k_per_layer
         self.similarity_thresholds = similarity_thresholds or {
             1: 0.25,
@@ -150,7 +154,10 @@ class HMEMStrategy(BaseContextStrategy):
         self.auto_embed = auto_embed
         self.max_trace_paths = max(1, max_trace_paths)
         self.max_trace_length = max(2, max_trace_length)
-        self.retriever = HMEMRetriever(embedding_model=embedding_model)
+        self.retriever = HMEMRetriever(
+            embedding_model=embedding_model, embedding_backend=embedding_backend
+        )
+        self.embedding_model = self.retriever.embedding_model
         self._trace_summary_state_map: dict[str, Any] = {}
         self._trace_summary_chart: Optional[Any] = None
 
@@ -304,7 +311,6 @@ class HMEMStrategy(BaseContextStrategy):
                 }
             )
             l1_indices.append(l1_index)
-        l1_entries = self._store_embeddings_batch(l1_items)
 
         # L2: Category (Chart level) - split entries
         l2_items = []
@@ -328,12 +334,6 @@ class HMEMStrategy(BaseContextStrategy):
                 }
             )
             l2_indices.append(l2_index)
-        l2_entries = self._store_embeddings_batch(l2_items)
-
-        # Register all L2 as children of all L1 entries
-        for l1_entry in l1_entries:
-            for l2_index in l2_indices:
-                l1_entry.add_child(l2_index)
 
         # L3: Trace (Path level) - snippets + node summaries + milestones
         backward_path, forward_path = self._get_full_path(scope)
@@ -370,12 +370,6 @@ class HMEMStrategy(BaseContextStrategy):
                 }
             )
             l3_indices.append(l3_index)
-        l3_entries = self._store_embeddings_batch(l3_items)
-
-        # Register all L3 as children of all L2 entries
-        for l2_entry in l2_entries:
-            for l3_index in l3_indices:
-                l2_entry.add_child(l3_index)
 
         l3_parent_for_l4 = (
             l3_indices[0] if l3_indices else (l2_indices[0] if l2_indices else None)
@@ -389,30 +383,45 @@ class HMEMStrategy(BaseContextStrategy):
             chart_id=chart_id,
             node_id=node_id,
         )
-        # Store L4 embeddings (result not used, but method has side effects)
-        self._store_embeddings_batch(
-            [
-                {
-                    "content": l4_content,
-                    "layer": 4,
-                    "project_id": project_id,
-                    "chart_id": chart_id,
-                    "path_hash": "",
-                    "node_id": node_id,
-                    "node": scope.target_node,
-                    "chart": scope.chart,
-                    "parent_index": l3_parent_for_l4,  # Link to L3 (or L2)
-                    "positional_index": l4_index,
-                }
-            ]
+        l4_items = [
+            {
+                "content": l4_content,
+                "layer": 4,
+                "project_id": project_id,
+                "chart_id": chart_id,
+                "path_hash": "",
+                "node_id": node_id,
+                "node": scope.target_node,
+                "chart": scope.chart,
+                "parent_index": l3_parent_for_l4,  # Link to L3 (or L2)
+                "positional_index": l4_index,
+            }
+        ]
+
+        # Store all layers at once: one hash diff query, one embedding call
+        # for changed content and bulk writes (instead of one pass per layer)
+        entries = self._store_embeddings_batch(
+            l1_items + l2_items + l3_items + l4_items
         )
+        entries_by_layer: dict[int, list[HMEMLayerEmbedding]] = {}
+        for entry in entries:
+            entries_by_layer.setdefault(entry.layer, []).append(entry)
+        l1_entries = entries_by_layer.get(1, [])
+        l2_entries = entries_by_layer.get(2, [])
+        l3_entries = entries_by_layer.get(3, [])
+
+        # Register L2 under L1, L3 under L2 (written in bulk below)
+        child_links: list[tuple[HMEMLayerEmbedding, list[str]]] = [
+            (l1_entry, l2_indices) for l1_entry in l1_entries
+        ]
+        child_links.extend((l2_entry, l3_indices) for l2_entry in l2_entries)
+
         # Register L4 as child of all L3 entries (or L2 entries if no L3)
-        if l3_entries:
-            for l3_entry in l3_entries:
-                l3_entry.add_child(l4_index)
-        else:
-            for l2_entry in l2_entries:
-                l2_entry.add_child(l4_index)
+        l4_parents = l3_entries if l3_entries else l2_entries
+        child_links.extend((entry, [l4_index]) for entry in l4_parents)
+
+        # One bulk UPDATE for every parent whose pointers actually changed
+        HMEMLayerEmbedding.bulk_register_children(child_links)
 
     def _build_domain_entries(self, scope: EvaluationScope) -> list[tuple[str, str]]:
         """Build L1 entries for each game concept aspect and pillar."""
@@ -910,58 +919,124 @@ class HMEMStrategy(BaseContextStrategy):
     def _store_embeddings_batch(
         self, items: list[dict[str, Any]]
     ) -> list[HMEMLayerEmbedding]:
-        """Store embeddings in batches to reduce sequential API calls."""
+        """
+        Store embeddings for many layer entries with bounded round-trips.
+
+        All items are diffed against stored content hashes in one query.
+        Only new or changed texts are sent to the embedding API, de-duplicated
+        into a single batch call, and rows are persisted with
+        bulk_create/bulk_update. Chart evaluation runs nodes concurrently and
+        they share L1/L2 entries, so an index another worker inserted after
+        the diff is updated instead of failing the insert.
+
+        Returns:
+            One instance per distinct positional index, in order of first
+            appearance in items.
+        """
         if not items:
             return []
 
         generator = self.retriever.embedding_generator
         embedding_model = self.retriever.embedding_model
-        embedding_dim = self.retriever.embedding_dim
 
-        instances: list[HMEMLayerEmbedding] = []
+        # Later items win for duplicate positional indices
+        items_by_index: dict[str, dict[str, Any]] = {}
+        for item in items:
+            item["content_hash"] = hashlib.sha256(item["content"].encode()).hexdigest()[
+                :64
+            ]
+            items_by_index[item["positional_index"]] = item
+
+        existing_by_index = {
+            entry.positional_index: entry
+            for entry in HMEMLayerEmbedding.objects.filter(
+                positional_index__in=list(items_by_index)
+            )
+        }
+
+        instances: dict[str, HMEMLayerEmbedding] = {}
+        reparented: list[HMEMLayerEmbedding] = []
         to_embed: list[dict[str, Any]] = []
 
-        for item in items:
-            content = item["content"]
-            content_hash = hashlib.sha256(content.encode()).hexdigest()[:64]
-            positional_index = item["positional_index"]
-            existing = HMEMLayerEmbedding.objects.filter(
-                positional_index=positional_index,
-                content_hash=content_hash,
-            ).first()
-            if existing:
+        for positional_index, item in items_by_index.items():
+            existing = existing_by_index.get(positional_index)
+            if (
+                existing
+                and existing.content_hash == item["content_hash"]
+                and existing.embedding_model == embedding_model
+            ):
                 parent_index = item.get("parent_index")
                 if parent_index and existing.parent_index != parent_index:
                     existing.parent_index = parent_index
-                    existing.save(update_fields=["parent_index"])
-                instances.append(existing)
+                    reparented.append(existing)
+                instances[positional_index] = existing
             else:
-                item["content_hash"] = content_hash
                 to_embed.append(item)
 
+        if reparented:
+            HMEMLayerEmbedding.objects.bulk_update(reparented, ["parent_index"])
+
         if to_embed:
-            embeddings = generator.generate_embeddings_batch(
-                [item["content"] for item in to_embed]
+            # Identical texts across layers are embedded once
+            unique_texts = list(dict.fromkeys(item["content"] for item in to_embed))
+            vectors = dict(
+                zip(unique_texts, generator.generate_embeddings_batch(unique_texts))
             )
-            for item, embedding in zip(to_embed, embeddings):
-                instance, _ = HMEMLayerEmbedding.objects.update_or_create(
-                    positional_index=item["positional_index"],
-                    defaults={
-                        "layer": item["layer"],
-                        "content": item["content"],
-                        "embedding": embedding,
-                        "embedding_model": embedding_model,
-                        "embedding_dim": embedding_dim,
-                        "content_hash": item["content_hash"],
-                        "node": item.get("node"),
-                        "chart": item.get("chart"),
-                        "parent_index": item.get("parent_index"),
-                        "child_indices": [],
-                    },
+
+            now = timezone.now()
+            to_create: list[HMEMLayerEmbedding] = []
+            to_update: list[HMEMLayerEmbedding] = []
+            for item in to_embed:
+                positional_index = item["positional_index"]
+                entry = existing_by_index.get(positional_index)
+                if entry is None:
+                    entry = HMEMLayerEmbedding(positional_index=positional_index)
+                    to_create.append(entry)
+                else:
+                    entry.updated_at = now
+                    to_update.append(entry)
+
+                entry.layer = item["layer"]
+                entry.content = item["content"]
+                entry.embedding = vectors[item["content"]]
+                entry.embedding_model = embedding_model
+                entry.embedding_dim = len(entry.embedding)
+                entry.content_hash = item["content_hash"]
+                entry.node = item.get("node")
+                entry.chart = item.get("chart")
+                entry.parent_index = item.get("parent_index")
+                entry.child_indices = []
+                instances[positional_index] = entry
+
+            fields = [
+                "layer",
+                "content",
+                "embedding",
+                "embedding_model",
+                "embedding_dim",
+                "content_hash",
+                "node",
+                "chart",
+                "parent_index",
+                "child_indices",
+                "updated_at",
+            ]
+            if to_create:
+                HMEMLayerEmbedding.objects.bulk_create(
+                    to_create,
+                    update_conflicts=True,
+                    unique_fields=["positional_index"],
+                    update_fields=fields,
                 )
-                instances.append(instance)
+            if to_update:
+                HMEMLayerEmbedding.objects.bulk_update(to_update, fields)
+            logger.info(
+                f"H-MEM embeddings: {len(to_create)} created, "
+                f"{len(to_update)} updated, {len(instances) - len(to_embed)} reused "
+                f"({len(unique_texts)} texts embedded)"
+            )
 
-        return instances
+        return [instances[positional_index] for positional_index in items_by_index]
 
     def _format_context(self, layers: list[LayerContext]) -> str:
         """Format layers into H-MEM context string."""
@@ -6,11 +6,14 @@ structural memory system's LLMProvider protocol.
 """
 
 import logging
+import threading
 from typing import Any, Optional
 
 import logfire
 
+from llm.ledger import llm_call_context
 from llm.providers import ModelManager
+from pxnodes.llm.context.shared.llm_adapter import PerThreadUsage
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,10 @@ class LLMProviderAdapter:
     for generating atomic facts and knowledge triples.
     """
 
+    last_prompt_tokens = PerThreadUsage()
+    last_completion_tokens = PerThreadUsage()
+    last_total_tokens = PerThreadUsage()
+
     def __init__(
         self,
         model_manager: Optional[ModelManager] = None,
@@ -44,9 +51,7 @@ class LLMProviderAdapter:
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.last_prompt_tokens = 0
-        self.last_completion_tokens = 0
-        self.last_total_tokens = 0
+        self._usage = threading.local()
 
         # Auto-select model if not specified
         if not self.model_name:
@@ -89,13 +94,16 @@ class LLMProviderAdapter:
             prompt_length=len(prompt),
         ):
             try:
-                result = self.model_manager.generate_with_model(
-                    model_name=model_name,
-                    prompt=prompt,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    **kwargs,
-                )
+                with llm_call_context(
+                    feature="pxnodes.structural_memory", operation=operation
+                ):
+                    result = self.model_manager.generate_with_model(
+                        model_name=model_name,
+                        prompt=prompt,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        **kwargs,
+                    )
 
                 self.last_prompt_tokens = result.prompt_tokens
                 self.last_completion_tokens = result.completion_tokens
@@ -3,12 +3,17 @@ Shared utilities for context engineering strategies.
 
 These modules are used by multiple strategies:
 - embeddings: OpenAI embedding generation
+- embedding_cache: Persistent (model, text hash) embedding cache
 - vector_store: SQLite-vec storage and retrieval
 - graph_retrieval: Graph topology traversal
 - llm_adapter: LLM provider adapter
 - prompts: Shared prompt templates for extraction
 """
 
+from pxnodes.llm.context.shared.embedding_cache import (
+    EmbeddingCache,
+    get_embedding_cache,
+)
 from pxnodes.llm.context.shared.embeddings import OpenAIEmbeddingGenerator
 from pxnodes.llm.context.shared.graph_retrieval import (
     GraphSlice,
@@ -32,6 +37,8 @@ from pxnodes.llm.context.shared.vector_store import VectorStore, init_database
 __all__ = [
     # Embeddings
     "OpenAIEmbeddingGenerator",
+    "EmbeddingCache",
+    "get_embedding_cache",
     # Vector Store
     "VectorStore",
     "init_database",
@@ -0,0 +1,142 @@
+"""
+Bounded concurrent execution for per-node evaluation.
+
+Node evaluations are dominated by blocking I/O (embedding requests, vector
+KNN, LLM calls), so they run in a dedicated thread pool while an asyncio
+semaphore bounds how many are in flight. Results are yielded as soon as
+each node finishes, which lets callers stream progress.
+
+Async workflows hand their blocking ORM work to run_in_worker(), a shared
+pool separate from Django's single thread_sensitive sync thread, so
+concurrent evaluations don't serialize behind each other.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Optional, TypeVar
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_WORKER_THREADS = 16
+
+_worker_pool: Optional[ThreadPoolExecutor] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_max_concurrency(value: Optional[int] = None) -> int:
+    """Resolve a concurrency limit (falls back to CONTEXT_EVALUATION_CONCURRENCY)."""
+    if value is None:
+        value = getattr(
+            settings, "CONTEXT_EVALUATION_CONCURRENCY", DEFAULT_MAX_CONCURRENCY
+        )
+    return max(1, int(value))
+
+
+def _call_and_release(func: Callable[..., R], *args: Any) -> R:
+    try:
+        return func(*args)
+    finally:
+        # Worker threads open their own DB connections; don't leak them
+        connections.close_all()
+
+
+def get_worker_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool used by run_in_worker()."""
+    global _worker_pool
+
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            size = getattr(settings, "CONTEXT_WORKER_THREADS", DEFAULT_WORKER_THREADS)
+            _worker_pool = ThreadPoolExecutor(
+                max_workers=max(1, int(size)), thread_name_prefix="context-worker"
+            )
+        return _worker_pool
+
+
+async def run_in_worker(func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """
+    Run a blocking (ORM-bound) call from async code in the worker pool.
+
+    Unlike sync_to_async(thread_sensitive=True), calls from different
+    evaluations run in parallel. Each call must therefore be self-contained:
+    no open transaction is shared with the caller.
+    """
+    return await sync_to_async(
+        _call_and_release, thread_sensitive=False, executor=get_worker_pool()
+    )(functools.partial(func, *args, **kwargs))
+
+
+async def iter_concurrently(
+    items: Iterable[T],
+    func: Callable[[T], R],
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[tuple[T, R]]:
+    """
+    Run a blocking function over items with bounded parallelism.
+
+    Args:
+        items: Inputs to process
+        func: Blocking function called once per item in a worker thread
+        max_concurrency: Maximum calls in flight (setting default if None)
+
+    Yields:
+        (item, result) pairs in completion order
+    """
+    limit = get_max_concurrency(max_concurrency)
+    semaphore = asyncio.Semaphore(limit)
+    loop = asyncio.get_running_loop()
+
+    executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix="context-eval")
+
+    async def run(item: T) -> tuple[T, R]:
+        async with semaphore:
+            result = await loop.run_in_executor(executor, _call_and_release, func, item)
+            return item, result
+
+    tasks = [asyncio.ensure_future(run(item)) for item in items]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Closed early (e.g. an SSE client disconnected): don't block the
+        # event loop until in-flight calls finish; they complete in the
+        # background and their results are discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_concurrently(
+    items: Iterable[T],
+    func: Callable[[T], R],
+    max_concurrency: Optional[int] = None,
+    on_result: Optional[Callable[[T, R], None]] = None,
+) -> list[tuple[T, R]]:
+    """
+    Synchronous wrapper around iter_concurrently().
+
+    on_result is called on the calling thread as each item completes, so
+    it may safely use the ORM (e.g. to persist progress).
+
+    Returns:
+        (item, result) pairs in completion order
+    """
+
+    async def collect() -> list[tuple[T, R]]:
+        results = []
+        callback = sync_to_async(on_result) if on_result is not None else None
+        async for item, result in iter_concurrently(items, func, max_concurrency):
+            if callback is not None:
+                await callback(item, result)
+            results.append((item, result))
+        return results
+
+    return async_to_sync(collect)()
@@ -0,0 +1,202 @@
+"""
+Persistent embedding cache shared by all context strategies.
+
+Embeddings are keyed by (model, sha256(text)) and stored in a small
+SQLite table next to the vector database, so identical texts (pillars,
+game concept sections, repeated retrieval queries) are embedded once
+across requests, strategies and charts. A bounded in-process LRU sits in
+front of the table so repeat lookups within a worker avoid SQLite
+entirely.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of host parameters per statement
+LOOKUP_CHUNK_SIZE = 500
+DEFAULT_MEMORY_SIZE = 4096
+
+
+def hash_text(text: str) -> str:
+    """Return the cache key digest for a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(embedding: list[float]) -> bytes:
+    return struct.pack(f"{len(embedding)}f", *embedding)
+
+
+def _unpack(data: bytes) -> list[float]:
+    return list(struct.unpack(f"{len(data) // 4}f", data))
+
+
+class EmbeddingCache:
+    """Two-level (memory + SQLite) cache of text embeddings."""
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        memory_size: int = DEFAULT_MEMORY_SIZE,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite file to persist embeddings in (defaults to
+                EMBEDDING_CACHE_PATH, falling back to VECTOR_DB_PATH)
+            memory_size: Maximum number of embeddings kept in process memory
+        """
+        if db_path is None:
+            db_path = getattr(
+                settings,
+                "EMBEDDING_CACHE_PATH",
+                getattr(
+                    settings, "VECTOR_DB_PATH", Path(settings.BASE_DIR) / "vectors.db"
+                ),
+            )
+        self.db_path = str(db_path)
+        self.memory_size = max(0, memory_size)
+        self._memory: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    embedding BLOB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (model, text_hash)
+                ) WITHOUT ROWID
+            """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_many(self, model: str, texts: list[str]) -> dict[str, list[float]]:
+        """
+        Look up cached embeddings for many texts.
+
+        Returns:
+            Mapping of text -> embedding for every cache hit.
+        """
+        hashes = {text: hash_text(text) for text in texts}
+        found: dict[str, list[float]] = {}
+        missing: dict[str, str] = {}
+
+        with self._lock:
+            for text, digest in hashes.items():
+                cached = self._memory.get((model, digest))
+                if cached is not None:
+                    self._memory.move_to_end((model, digest))
+                    found[text] = cached
+                else:
+                    missing[digest] = text
+
+            if not missing:
+                return found
+
+            digests = list(missing)
+            try:
+                for start in range(0, len(digests), LOOKUP_CHUNK_SIZE):
+                    chunk = digests[start : start + LOOKUP_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self.conn.execute(
+                        "SELECT text_hash, embedding FROM embedding_cache "
+                        f"WHERE model = ? AND text_hash IN ({placeholders})",
+                        [model, *chunk],
+                    ).fetchall()
+                    for digest, blob in rows:
+                        embedding = _unpack(blob)
+                        found[missing[digest]] = embedding
+                        self._remember(model, digest, embedding)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache lookup failed: {e}")
+
+        return found
+
+    def set_many(self, model: str, embeddings: dict[str, list[float]]) -> None:
+        """Store embeddings for texts (text -> embedding)."""
+        if not embeddings:
+            return
+
+        rows = []
+        with self._lock:
+            for text, embedding in embeddings.items():
+                digest = hash_text(text)
+                self._remember(model, digest, embedding)
+                rows.append((model, digest, len(embedding), _pack(embedding)))
+            try:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache "
+                    "(model, text_hash, dim, embedding) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def clear(self, model: Optional[str] = None) -> None:
+        """Drop cached embeddings (for one model or all)."""
+        with self._lock:
+            if model is None:
+                self._memory.clear()
+                self.conn.execute("DELETE FROM embedding_cache")
+            else:
+                for key in [k for k in self._memory if k[0] == model]:
+                    del self._memory[key]
+                self.conn.execute(
+                    "DELETE FROM embedding_cache WHERE model = ?", (model,)
+                )
+            self.conn.commit()
+
+    def _remember(self, model: str, digest: str, embedding: list[float]) -> None:
+        if not self.memory_size:
+            return
+        self._memory[(model, digest)] = embedding
+        self._memory.move_to_end((model, digest))
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Return the process-wide embedding cache.
+
+    Returns None when disabled via the EMBEDDING_CACHE_ENABLED setting.
+    """
+    global _default_cache
+
+    if not getattr(settings, "EMBEDDING_CACHE_ENABLED", True):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache()
+        return _default_cache
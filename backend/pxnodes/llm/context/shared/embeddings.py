@@ -1,46 +1,106 @@
 """
-OpenAI Embedding Generation for Structural Memory.
+Embedding Generation for Structural Memory.
 
 Generates embeddings for Knowledge Triples and Atomic Facts
 for vector similarity search.
+
+Backends are pluggable via EmbeddingBackend:
+- openai: OpenAI embeddings API (default)
+- ollama: Local Ollama /api/embed endpoint (no per-call network hop to OpenAI)
+- hashing: Deterministic hashing-trick vectors for tests and benchmarks
+
+Select a backend with the EMBEDDING_BACKEND setting or per call via
+get_embedding_backend(backend=...).
 """
 
+import hashlib
 import logging
-from typing import Optional
+import math
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Optional
 
+import httpx
 import logfire
+from django.conf import settings
 from openai import OpenAI
 
+from pxnodes.llm.context.shared.embedding_cache import (
+    EmbeddingCache,
+    get_embedding_cache,
+)
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_EMBEDDING_BACKEND = "openai"
+
+# Known output dimensions per model. Models not listed here (e.g. custom
+# Ollama models) have their dimension recorded on first use.
+EMBEDDING_DIMENSIONS: dict[str, int] = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+    "nomic-embed-text": 768,
+    "mxbai-embed-large": 1024,
+    "all-minilm": 384,
+    "bge-m3": 1024,
+}
 
-class OpenAIEmbeddingGenerator:
-    """Generate embeddings using OpenAI's embedding API."""
+
+def get_embedding_dimensions(model: str) -> Optional[int]:
+    """Return the known vector dimension for a model, if any."""
+    return EMBEDDING_DIMENSIONS.get(model) or EMBEDDING_DIMENSIONS.get(
+        model.split(":")[0]
+    )
+
+
+class EmbeddingBackend(ABC):
+    """
+    Base class for embedding backends.
+
+    Subclasses implement _embed(); caching, deduplication and batching
+    are shared so every backend benefits from the embedding cache.
+    """
+
+    provider: str = ""
+    default_model: str = ""
+    default_batch_size: int = 100
 
     def __init__(
         self,
-        model: str = "text-embedding-3-small",
-        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        use_cache: bool = True,
     ):
         """
-        Initialize embedding generator.
+        Initialize the backend.
 
         Args:
-            model: OpenAI embedding model to use
-                - text-embedding-3-small (1536 dims, cost-effective)
-                - text-embedding-3-large (3072 dims, higher quality)
-            api_key: Optional API key (uses OPENAI_API_KEY env var if not provided)
+            model: Embedding model name (defaults to the backend's default)
+            use_cache: Whether to serve repeated texts from the embedding cache
         """
-        self.model = model
-        self.client = OpenAI(api_key=api_key) if api_key else OpenAI()
+        self.model = model or self.default_model
+        self.cache: Optional[EmbeddingCache] = (
+            get_embedding_cache() if use_cache else None
+        )
+        self._dimensions = get_embedding_dimensions(self.model)
 
-        # Determine embedding dimensions based on model
-        self.dimensions = 3072 if "large" in model else 1536
+    @property
+    def dimensions(self) -> int:
+        """Vector dimension produced by this backend's model."""
+        if self._dimensions is None:
+            # Unknown model: probe once and remember the result
+            self._dimensions = len(self._embed(["dimension probe"])[0])
+            EMBEDDING_DIMENSIONS[self.model] = self._dimensions
+        return self._dimensions
 
-        logger.info(
-            f"Initialized OpenAI embedding generator with model: {model} "
-            f"({self.dimensions} dimensions)"
-        )
+    @property
+    def cache_namespace(self) -> str:
+        """Cache key prefix; the same model name may differ per provider."""
+        return f"{self.provider}:{self.model}"
+
+    @abstractmethod
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of texts with the underlying service."""
 
     def generate_embedding(self, text: str) -> list[float]:
         """
@@ -52,75 +112,52 @@ class OpenAIEmbeddingGenerator:
         Returns:
             List of floats representing the embedding vector
         """
-        with logfire.span(
-            "openai.embeddings.single",
-            model=self.model,
-            text_length=len(text),
-        ):
-            try:
-                response = self.client.embeddings.create(
-                    model=self.model,
-                    input=text,
-                )
-
-                embedding = response.data[0].embedding
-
-                logfire.info(
-                    "openai.embeddings.single.complete",
-                    model=self.model,
-                    dimensions=len(embedding),
-                    text_preview=text[:100],
-                )
-
-                return embedding
-
-            except Exception as e:
-                logger.error(f"Failed to generate embedding: {e}")
-                logfire.error(
-                    "openai.embeddings.single.failed",
-                    error=str(e),
-                    model=self.model,
-                    text_preview=text[:100],
-                )
-                raise
+        return self.generate_embeddings_batch([text])[0]
 
     def generate_embeddings_batch(
         self,
         texts: list[str],
-        batch_size: int = 100,
+        batch_size: Optional[int] = None,
     ) -> list[list[float]]:
         """
         Generate embeddings for multiple texts in batches.
 
+        Cached texts are answered with one batched cache lookup; only the
+        remaining (deduplicated) texts are sent to the backend.
+
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts per batch (max 2048 for OpenAI)
+            batch_size: Number of texts per request (backend default if None)
 
         Returns:
             List of embeddings
         """
+        if not texts:
+            return []
+
+        batch_size = batch_size or self.default_batch_size
+        cached: dict[str, list[float]] = {}
+        if self.cache is not None:
+            cached = self.cache.get_many(self.cache_namespace, texts)
+        misses = [text for text in dict.fromkeys(texts) if text not in cached]
+
         with logfire.span(
-            "openai.embeddings.batch",
+            f"{self.provider}.embeddings.batch",
             model=self.model,
             total_texts=len(texts),
+            cache_hits=len(texts) - len(misses),
             batch_size=batch_size,
         ):
-            all_embeddings: list[list[float]] = []
+            fresh: dict[str, list[float]] = {}
 
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i : i + batch_size]
+            for i in range(0, len(misses), batch_size):
+                batch = misses[i : i + batch_size]
 
                 try:
-                    response = self.client.embeddings.create(
-                        model=self.model,
-                        input=batch,
-                    )
-
-                    batch_embeddings = [item.embedding for item in response.data]
-                    all_embeddings.extend(batch_embeddings)
+                    fresh.update(zip(batch, self._embed(batch)))
 
                     logfire.info(
-                        "openai.embeddings.batch.complete",
+                        f"{self.provider}.embeddings.batch.complete",
                         batch_num=i // batch_size + 1,
                         batch_size=len(batch),
                         model=self.model,
@@ -129,14 +166,226 @@ class OpenAIEmbeddingGenerator:
                 except Exception as e:
                     logger.error(f"Failed to generate batch embeddings: {e}")
                     logfire.error(
-                        "openai.embeddings.batch.failed",
+                        f"{self.provider}.embeddings.batch.failed",
                         error=str(e),
                         batch_num=i // batch_size + 1,
                         model=self.model,
                     )
                     raise
 
-            return all_embeddings
+            if fresh:
+                if self._dimensions is None:
+                    self._dimensions = len(next(iter(fresh.values())))
+                    EMBEDDING_DIMENSIONS.setdefault(self.model, self._dimensions)
+                if self.cache is not None:
+                    self.cache.set_many(self.cache_namespace, fresh)
+
+            cached.update(fresh)
+            return [cached[text] for text in texts]
+
+    def close(self) -> None:
+        """Release any network resources held by the backend."""
+
+
+class OpenAIEmbeddingGenerator(EmbeddingBackend):
+    """
+    Generate embeddings using OpenAI's embedding API.
+
+    Results are memoized in the shared EmbeddingCache keyed by
+    (model, sha256(text)), so only cache misses reach the API.
+    """
+
+    provider = "openai"
+    default_model = "text-embedding-3-small"
+
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        api_key: Optional[str] = None,
+        use_cache: bool = True,
+    ):
+        """
+        Initialize embedding generator.
+
+        Args:
+            model: OpenAI embedding model to use
+                - text-embedding-3-small (1536 dims, cost-effective)
+                - text-embedding-3-large (3072 dims, higher quality)
+            api_key: Optional API key (uses OPENAI_API_KEY env var if not provided)
+            use_cache: Whether to serve repeated texts from the embedding cache
+        """
+        super().__init__(model=model, use_cache=use_cache)
+        self.client = OpenAI(api_key=api_key) if api_key else OpenAI()
+
+        # Determine embedding dimensions based on model
+        if self._dimensions is None:
+            self._dimensions = 3072 if "large" in self.model else 1536
+
+        logger.info(
+            f"Initialized OpenAI embedding generator with model: {self.model} "
+            f"({self._dimensions} dimensions)"
+        )
+
+    @property
+    def cache_namespace(self) -> str:
+        return self.model
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+        )
+        return [item.embedding for item in response.data]
+
+
+class OllamaEmbeddingBackend(EmbeddingBackend):
+    """
+    Generate embeddings with a local Ollama server via /api/embed.
+
+    A single httpx client is kept per backend instance so consecutive
+    batches reuse the same connection.
+    """
+
+    provider = "ollama"
+    default_model = "nomic-embed-text"
+    default_batch_size = 64
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ):
+        """
+        Initialize the Ollama backend.
+
+        Args:
+            model: Ollama embedding model (default: nomic-embed-text)
+            base_url: Ollama API URL (defaults to the LLM orchestrator config)
+            timeout: Request timeout in seconds
+            use_cache: Whether to serve repeated texts from the embedding cache
+        """
+        super().__init__(model=model, use_cache=use_cache)
+        if base_url is None or timeout is None:
+            from llm.config import get_config
+
+            ollama_config = get_config().get_provider_config("ollama")
+            base_url = base_url or ollama_config["base_url"]
+            timeout = timeout or ollama_config["timeout_seconds"]
+        self.base_url = base_url
+        self.client = httpx.Client(base_url=base_url, timeout=timeout)
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        response = self.client.post(
+            "/api/embed",
+            json={"model": self.model, "input": texts},
+        )
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic hashing-trick embeddings.
+
+    Tokens are hashed into a fixed number of signed buckets and the
+    vector is L2-normalized, so texts sharing words have positive cosine
+    similarity. No network access; intended for tests and benchmarks.
+    """
+
+    provider = "hashing"
+    default_model = "hashing-256"
+    default_batch_size = 1000
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        dimensions: Optional[int] = None,
+        use_cache: bool = False,
+    ):
+        super().__init__(model=model, use_cache=use_cache)
+        if dimensions is None:
+            match = re.search(r"(\d+)$", self.model)
+            dimensions = int(match.group(1)) if match else 256
+        self._dimensions = dimensions
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> list[float]:
+        size = self.dimensions
+        vector = [0.0] * size
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(token.encode()).digest()
+            bucket = int.from_bytes(digest[:4], "little") % size
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+
+EMBEDDING_BACKENDS: dict[str, type[EmbeddingBackend]] = {
+    "openai": OpenAIEmbeddingGenerator,
+    "ollama": OllamaEmbeddingBackend,
+    "hashing": HashingEmbeddingBackend,
+}
+
+
+def get_embedding_backend(
+    backend: Optional[str] = None,
+    model: Optional[str] = None,
+    **kwargs: Any,
+) -> EmbeddingBackend:
+    """
+    Create an embedding backend.
+
+    Args:
+        backend: Backend name ("openai", "ollama", "hashing"); defaults to
+            the EMBEDDING_BACKEND setting
+        model: Embedding model; defaults to EMBEDDING_MODEL when the
+            configured backend is used, else the backend's default model
+        **kwargs: Backend-specific options
+
+    Returns:
+        Configured EmbeddingBackend instance
+    """
+    configured = getattr(settings, "EMBEDDING_BACKEND", DEFAULT_EMBEDDING_BACKEND)
+    name = (backend or configured).lower()
+    backend_cls = _backend_class(name)
+    if model is None and name == configured.lower():
+        model = getattr(settings, "EMBEDDING_MODEL", None)
+    if model is not None:
+        kwargs["model"] = model
+    return backend_cls(**kwargs)
+
+
+def get_configured_embedding_model() -> str:
+    """
+    Model that get_embedding_backend() embeds with by default.
+
+    EMBEDDING_MODEL when set, else the EMBEDDING_BACKEND's default model;
+    resolved from settings without creating the backend.
+    """
+    model = getattr(settings, "EMBEDDING_MODEL", None)
+    if model:
+        return str(model)
+    configured = getattr(settings, "EMBEDDING_BACKEND", DEFAULT_EMBEDDING_BACKEND)
+    return _backend_class(configured.lower()).default_model
+
+
+def _backend_class(name: str) -> type[EmbeddingBackend]:
+    backend_cls = EMBEDDING_BACKENDS.get(name)
+    if backend_cls is None:
+        raise ValueError(
+            f"Unknown embedding backend '{name}'. "
+            f"Must be one of: {sorted(EMBEDDING_BACKENDS)}"
+        )
+    return backend_cls
 
 
 # Convenience function for one-off embedding generation
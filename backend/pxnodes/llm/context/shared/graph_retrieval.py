@@ -3,13 +3,21 @@ Graph slice retrieval for PX Charts.
 
 Retrieves target node and its immediate neighbors (previous/next) from chart topology.
 Based on the context building strategy in structural_context_strategy.md.
+
+When a ChartSnapshot is attached to a chart (ChartSnapshot.attach()), every
+traversal below reads the snapshot instead of querying the database.
 """
 
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from typing import Optional
 
-from pxcharts.models import PxChart, PxChartContainer
-from pxnodes.models import PxNode
+from django.db.models import Prefetch, Q
+
+from pxcharts.models import PxChart, PxChartContainer, PxChartEdge
+from pxnodes.models import PxComponent, PxNode
+
+SNAPSHOT_ATTR = "_graph_snapshot"
 
 
 @dataclass
@@ -42,6 +50,57 @@ class GraphSlice:
         return containers
 
 
+def get_chart_snapshot(chart: PxChart) -> Optional["ChartSnapshot"]:
+    """Return the snapshot attached to this chart instance, if any."""
+    return getattr(chart, SNAPSHOT_ATTR, None)
+
+
+def get_chart_containers(chart: PxChart) -> list[PxChartContainer]:
+    """All containers of a chart, with their nodes loaded."""
+    snapshot = get_chart_snapshot(chart)
+    if snapshot is not None:
+        return list(snapshot.containers.values())
+    return list(chart.containers.select_related("content").all())
+
+
+def get_chart_edges(chart: PxChart) -> list[PxChartEdge]:
+    """All edges of a chart, with source/target nodes loaded."""
+    snapshot = get_chart_snapshot(chart)
+    if snapshot is not None:
+        return [edge for edge in snapshot.edges if edge.px_chart_id == chart.id]
+    return list(chart.edges.select_related("source__content", "target__content").all())
+
+
+def _node_containers(chart: PxChart, node: PxNode) -> list[PxChartContainer]:
+    """Containers in the chart holding the node."""
+    snapshot = get_chart_snapshot(chart)
+    if snapshot is not None:
+        return snapshot.containers_by_node.get(str(getattr(node, "id", None)), [])
+    return list(chart.containers.filter(content_id=getattr(node, "id", None)))
+
+
+def _source_containers(
+    chart: PxChart, container: PxChartContainer
+) -> list[PxChartContainer]:
+    """Containers with an edge into container (edge order)."""
+    snapshot = get_chart_snapshot(chart)
+    if snapshot is not None:
+        return snapshot.incoming.get(str(container.id), [])
+    edges = container.incoming_edges.select_related("source__content").all()
+    return [edge.source for edge in edges if edge.source]
+
+
+def _target_containers(
+    chart: PxChart, container: PxChartContainer
+) -> list[PxChartContainer]:
+    """Containers reached by an edge out of container (edge order)."""
+    snapshot = get_chart_snapshot(chart)
+    if snapshot is not None:
+        return snapshot.outgoing.get(str(container.id), [])
+    edges = container.outgoing_edges.select_related("target__content").all()
+    return [edge.target for edge in edges if edge.target]
+
+
 def get_graph_slice(
     target_node: PxNode,
     chart: PxChart,
@@ -58,12 +117,14 @@ def get_graph_slice(
     Returns:
         GraphSlice containing target and neighbor nodes
     """
+    snapshot = get_chart_snapshot(chart)
+    if snapshot is not None:
+        return snapshot.graph_slice(target_node, depth)
+
     slice_result = GraphSlice(target=target_node, chart=chart)
 
     # Find container(s) containing this node
-    target_containers = list(
-        chart.containers.filter(content_id=getattr(target_node, "id", None))
-    )
+    target_containers = _node_containers(chart, target_node)
 
     if not target_containers:
         # Node not in chart, return just the target
@@ -80,20 +141,18 @@ def get_graph_slice(
 
     for container in target_containers:
         # Previous nodes (incoming edges to this container)
-        for edge in container.incoming_edges.select_related("source__content").all():
-            if edge.source and edge.source.content:
-                if edge.source.content != target_node:
-                    previous_nodes_set.add(edge.source.content)
-                    if edge.source not in previous_containers:
-                        previous_containers.append(edge.source)
+        for source in _source_containers(chart, container):
+            if source.content and source.content != target_node:
+                previous_nodes_set.add(source.content)
+                if source not in previous_containers:
+                    previous_containers.append(source)
 
         # Next nodes (outgoing edges from this container)
-        for edge in container.outgoing_edges.select_related("target__content").all():
-            if edge.target and edge.target.content:
-                if edge.target.content != target_node:
-                    next_nodes_set.add(edge.target.content)
-                    if edge.target not in next_containers:
-                        next_containers.append(edge.target)
+        for target in _target_containers(chart, container):
+            if target.content and target.content != target_node:
+                next_nodes_set.add(target.content)
+                if target not in next_containers:
+                    next_containers.append(target)
 
     slice_result.previous_nodes = list(previous_nodes_set)
     slice_result.next_nodes = list(next_nodes_set)
@@ -126,7 +185,7 @@ def get_node_position_in_chart(node: PxNode, chart: PxChart) -> Optional[int]:
     Returns None if node not in chart, otherwise returns position index
     where 0 is the earliest node(s) with no incoming edges.
     """
-    containers = list(chart.containers.filter(content=node))
+    containers = _node_containers(chart, node)
     if not containers:
         return None
 
@@ -141,10 +200,9 @@ def get_node_position_in_chart(node: PxNode, chart: PxChart) -> Optional[int]:
         visited.add(str(c.id))
 
         max_depth = depth
-        for edge in c.incoming_edges.select_related("source").all():
-            if edge.source:
-                parent_depth = count_depth(edge.source, depth + 1)
-                max_depth = max(max_depth, parent_depth)
+        for source in _source_containers(chart, c):
+            parent_depth = count_depth(source, depth + 1)
+            max_depth = max(max_depth, parent_depth)
 
         return max_depth
 
@@ -176,7 +234,7 @@ def get_full_path(
     slice_result = GraphSlice(target=target_node, chart=chart)
 
     # Find container(s) containing this node
-    target_containers = list(chart.containers.filter(content=target_node))
+    target_containers = _node_containers(chart, target_node)
 
     if not target_containers:
         return slice_result
@@ -192,16 +250,16 @@ def get_full_path(
         if depth >= max_backward:
             return
 
-        for edge in container.incoming_edges.select_related("source__content").all():
-            if edge.source and edge.source.content:
-                node_id = str(edge.source.content.id)
+        for source in _source_containers(chart, container):
+            if source.content:
+                node_id = str(source.content.id)
                 if node_id not in visited_backward:
                     visited_backward.add(node_id)
                     # Insert at beginning to maintain path order
-                    previous_nodes.insert(0, edge.source.content)
-                    previous_containers.insert(0, edge.source)
+                    previous_nodes.insert(0, source.content)
+                    previous_containers.insert(0, source)
                     # Recursively get predecessors
-                    traverse_backward(edge.source, depth + 1)
+                    traverse_backward(source, depth + 1)
 
     # Traverse forward to find ALL successors (in order)
     next_nodes: list[PxNode] = []
@@ -212,15 +270,15 @@ def get_full_path(
         if depth >= max_forward:
             return
 
-        for edge in container.outgoing_edges.select_related("target__content").all():
-            if edge.target and edge.target.content:
-                node_id = str(edge.target.content.id)
+        for target in _target_containers(chart, container):
+            if target.content:
+                node_id = str(target.content.id)
                 if node_id not in visited_forward:
                     visited_forward.add(node_id)
-                    next_nodes.append(edge.target.content)
-                    next_containers.append(edge.target)
+                    next_nodes.append(target.content)
+                    next_containers.append(target)
                     # Recursively get successors
-                    traverse_forward(edge.target, depth + 1)
+                    traverse_forward(target, depth + 1)
 
     # Start traversal from target container
     for container in target_containers:
@@ -248,7 +306,7 @@ def get_all_paths_through_node(
     """
     paths: list[list[PxNode]] = []
 
-    containers = list(chart.containers.filter(content_id=getattr(node, "id", None)))
+    containers = _node_containers(chart, node)
     if not containers:
         return paths
 
@@ -264,12 +322,12 @@ def get_all_paths_through_node(
         backward_paths: list[list[PxNode]] = []
         has_incoming = False
 
-        for edge in c.incoming_edges.select_related("source__content").all():
-            if edge.source and edge.source.content:
+        for source in _source_containers(chart, c):
+            if source.content:
                 has_incoming = True
-                new_path = [edge.source.content] + path
+                new_path = [source.content] + path
                 backward_paths.extend(
-                    get_backward_paths(edge.source, new_path, remaining - 1)
+                    get_backward_paths(source, new_path, remaining - 1)
                 )
                 if max_paths is not None and len(backward_paths) >= max_paths:
                     break
@@ -289,13 +347,11 @@ def get_all_paths_through_node(
         forward_paths: list[list[PxNode]] = []
         has_outgoing = False
 
-        for edge in c.outgoing_edges.select_related("target__content").all():
-            if edge.target and edge.target.content:
+        for target in _target_containers(chart, c):
+            if target.content:
                 has_outgoing = True
-                new_path = path + [edge.target.content]
-                forward_paths.extend(
-                    get_forward_paths(edge.target, new_path, remaining - 1)
-                )
+                new_path = path + [target.content]
+                forward_paths.extend(get_forward_paths(target, new_path, remaining - 1))
                 if max_paths is not None and len(forward_paths) >= max_paths:
                     break
 
@@ -333,7 +389,7 @@ def get_backward_paths_to_node(
 ) -> list[list[PxNode]]:
     """Return backward paths that end at the target node."""
     paths: list[list[PxNode]] = []
-    containers = list(chart.containers.filter(content_id=getattr(node, "id", None)))
+    containers = _node_containers(chart, node)
     if not containers:
         return paths
     container = containers[0]
@@ -345,11 +401,11 @@ def get_backward_paths_to_node(
             paths.append(path)
             return
         has_incoming = False
-        for edge in c.incoming_edges.select_related("source__content").all():
-            if edge.source and edge.source.content:
+        for source in _source_containers(chart, c):
+            if source.content:
                 has_incoming = True
-                new_path = [edge.source.content] + path
-                walk(edge.source, new_path, remaining - 1)
+                new_path = [source.content] + path
+                walk(source, new_path, remaining - 1)
                 if max_paths is not None and len(paths) >= max_paths:
                     return
         if not has_incoming:
@@ -367,7 +423,7 @@ def get_forward_paths_from_node(
 ) -> list[list[PxNode]]:
     """Return forward paths that start at the target node."""
     paths: list[list[PxNode]] = []
-    containers = list(chart.containers.filter(content_id=getattr(node, "id", None)))
+    containers = _node_containers(chart, node)
     if not containers:
         return paths
     container = containers[0]
@@ -379,11 +435,11 @@ def get_forward_paths_from_node(
             paths.append(path)
             return
         has_outgoing = False
-        for edge in c.outgoing_edges.select_related("target__content").all():
-            if edge.target and edge.target.content:
+        for target in _target_containers(chart, c):
+            if target.content:
                 has_outgoing = True
-                new_path = path + [edge.target.content]
-                walk(edge.target, new_path, remaining - 1)
+                new_path = path + [target.content]
+                walk(target, new_path, remaining - 1)
                 if max_paths is not None and len(paths) >= max_paths:
                     return
         if not has_outgoing:
@@ -391,3 +447,146 @@ def get_forward_paths_from_node(
 
     walk(container, [node], max_length)
     return paths
+
+
+@dataclass
+class ChartSnapshot:
+    """
+    In-memory copy of a chart's topology for evaluating many nodes.
+
+    Loads containers (with their nodes and components) and edges once, so
+    graph slices for every node can be computed without further queries.
+    Evaluations running in worker threads share a snapshot instead of each
+    re-reading the chart.
+    """
+
+    chart: PxChart
+    containers: dict[str, PxChartContainer] = field(default_factory=dict)
+    incoming: dict[str, list[PxChartContainer]] = field(default_factory=dict)
+    outgoing: dict[str, list[PxChartContainer]] = field(default_factory=dict)
+    containers_by_node: dict[str, list[PxChartContainer]] = field(default_factory=dict)
+    edges: list[PxChartEdge] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, chart: PxChart) -> "ChartSnapshot":
+        """Load a chart's containers, nodes, components and edges."""
+        snapshot = cls(chart=chart)
+        containers = PxChartContainer.objects.filter(px_chart=chart).select_related(
+            "content"
+        )
+        containers = containers.prefetch_related(
+            Prefetch(
+                "content__components",
+                queryset=PxComponent.objects.select_related("definition"),
+            )
+        )
+        for container in containers:
+            container_id = str(container.id)
+            snapshot.containers[container_id] = container
+            if container.content_id:
+                snapshot.containers_by_node.setdefault(
+                    str(container.content_id), []
+                ).append(container)
+
+        edges = PxChartEdge.objects.filter(
+            Q(source__px_chart=chart) | Q(target__px_chart=chart)
+        ).select_related("source__content", "target__content")
+        for edge in edges.order_by("created_at"):
+            if edge.source is None or edge.target is None:
+                continue
+            source = snapshot.containers.get(str(edge.source_id), edge.source)
+            target = snapshot.containers.get(str(edge.target_id), edge.target)
+            edge.source, edge.target = source, target
+            snapshot.edges.append(edge)
+            snapshot.incoming.setdefault(str(target.id), []).append(source)
+            snapshot.outgoing.setdefault(str(source.id), []).append(target)
+        return snapshot
+
+    def attach(self) -> "ChartSnapshot":
+        """
+        Serve graph traversals on this chart instance from the snapshot.
+
+        Only the instance passed to load() is affected; other PxChart
+        objects for the same chart keep querying the database.
+        """
+        setattr(self.chart, SNAPSHOT_ATTR, self)
+        return self
+
+    def detach(self) -> None:
+        """Undo attach()."""
+        if get_chart_snapshot(self.chart) is self:
+            delattr(self.chart, SNAPSHOT_ATTR)
+
+    def nodes(self, node_ids: Optional[Iterable[str]] = None) -> list[PxNode]:
+        """Return the chart's nodes (optionally limited to node_ids)."""
+        wanted = {str(node_id) for node_id in node_ids} if node_ids else None
+        nodes = []
+        for node_id, containers in self.containers_by_node.items():
+            if wanted is None or node_id in wanted:
+                node = containers[0].content
+                if node is not None:
+                    nodes.append(node)
+        return nodes
+
+    def resolve_nodes(self, node_ids: Optional[Iterable[str]] = None) -> list[PxNode]:
+        """
+        Return nodes to evaluate, in chart order.
+
+        Requested nodes that are not in the chart are loaded from the
+        database (with components) so callers keep the old behavior of
+        evaluating any node ID they were given.
+        """
+        nodes = self.nodes(node_ids)
+        if node_ids:
+            found = {str(node.id) for node in nodes}
+            missing = [str(n) for n in node_ids if str(n) not in found]
+            if missing:
+                nodes.extend(
+                    PxNode.objects.filter(id__in=missing).prefetch_related(
+                        Prefetch(
+                            "components",
+                            queryset=PxComponent.objects.select_related("definition"),
+                        )
+                    )
+                )
+        return nodes
+
+    def graph_slice(self, target_node: PxNode, depth: int = 1) -> GraphSlice:
+        """Equivalent of get_graph_slice() computed from the snapshot."""
+        slice_result = GraphSlice(target=target_node, chart=self.chart)
+        target_containers = self.containers_by_node.get(str(target_node.id), [])
+        if not target_containers:
+            return slice_result
+
+        slice_result.target_container = target_containers[0]
+        previous_nodes_set: set[PxNode] = set()
+        next_nodes_set: set[PxNode] = set()
+
+        for container in target_containers:
+            for source in self.incoming.get(str(container.id), []):
+                if source.content and source.content != target_node:
+                    previous_nodes_set.add(source.content)
+                    if source not in slice_result.previous_containers:
+                        slice_result.previous_containers.append(source)
+            for target in self.outgoing.get(str(container.id), []):
+                if target.content and target.content != target_node:
+                    next_nodes_set.add(target.content)
+                    if target not in slice_result.next_containers:
+                        slice_result.next_containers.append(target)
+
+        slice_result.previous_nodes = list(previous_nodes_set)
+        slice_result.next_nodes = list(next_nodes_set)
+
+        if depth > 1:
+            for prev_node in list(slice_result.previous_nodes):
+                for n in self.graph_slice(prev_node, depth - 1).previous_nodes:
+                    if n not in previous_nodes_set and n != target_node:
+                        slice_result.previous_nodes.append(n)
+                        previous_nodes_set.add(n)
+            for next_node in list(slice_result.next_nodes):
+                for n in self.graph_slice(next_node, depth - 1).next_nodes:
+                    if n not in next_nodes_set and n != target_node:
+                        slice_result.next_nodes.append(n)
+                        next_nodes_set.add(n)
+
+        return slice_result
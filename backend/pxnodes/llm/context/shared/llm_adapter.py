@@ -6,15 +6,37 @@ structural memory system's LLMProvider protocol.
 """
 
 import logging
+import threading
 from typing import Any, Optional
 
 import logfire
 
+from llm.ledger import llm_call_context
 from llm.providers import ModelManager
 
 logger = logging.getLogger(__name__)
 
 
+class PerThreadUsage:
+    """
+    Token counter attribute tracked separately per thread.
+
+    One adapter is shared by strategies evaluated concurrently, so the
+    usage of "the last call" only makes sense for the calling thread.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> int:
+        if instance is None:
+            return 0
+        return getattr(instance._usage, self.name, 0)
+
+    def __set__(self, instance: Any, value: int) -> None:
+        setattr(instance._usage, self.name, value)
+
+
 class LLMProviderAdapter:
     """
     Adapter for ModelManager to work with LLMProvider protocol.
@@ -23,6 +45,10 @@ class LLMProviderAdapter:
     for generating atomic facts and knowledge triples.
     """
 
+    last_prompt_tokens = PerThreadUsage()
+    last_completion_tokens = PerThreadUsage()
+    last_total_tokens = PerThreadUsage()
+
     def __init__(
         self,
         model_manager: Optional[ModelManager] = None,
@@ -43,9 +69,7 @@ class LLMProviderAdapter:
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.last_prompt_tokens = 0
-        self.last_completion_tokens = 0
-        self.last_total_tokens = 0
+        self._usage = threading.local()
 
         # Auto-select model if not specified
         if not self.model_name:
@@ -86,13 +110,14 @@ class LLMProviderAdapter:
             prompt_length=len(prompt),
         ):
             try:
-                result = self.model_manager.generate_with_model(
-                    model_name=model_name,
-                    prompt=prompt,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    **kwargs,
-                )
+                with llm_call_context(feature="pxnodes.structural_memory"):
+                    result = self.model_manager.generate_with_model(
+                        model_name=model_name,
+                        prompt=prompt,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        **kwargs,
+                    )
 
                 self.last_prompt_tokens = result.prompt_tokens
                 self.last_completion_tokens = result.completion_tokens
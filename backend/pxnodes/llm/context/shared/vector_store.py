@@ -3,17 +3,28 @@ Vector store using sqlite-vec extension.
 
 Provides a separate SQLite database for storing embeddings of
 Knowledge Triples and Atomic Facts for similarity retrieval.
+
+Each (embedding model, dimension) pair gets its own vec0 table, created on
+first use and recorded in the vec_models registry, so vectors from models
+with different sizes (e.g. text-embedding-3-small vs -large) can coexist.
+An index may carry an int8 or binary quantized companion table used for a
+cheap first-pass KNN whose candidates are re-ranked with the float vectors.
 """
 
+import hashlib
 import json
 import logging
+import re
 import sqlite3
 import struct
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Optional, Union, cast
 
 from django.conf import settings
 
+from pxnodes.llm.context.shared.embeddings import get_configured_embedding_model
+
 logger = logging.getLogger(__name__)
 
 # Default path for vector database (separate from main Django DB)
@@ -24,6 +35,28 @@ VECTOR_DB_PATH = getattr(
 # Flag to track if sqlite-vec is available
 VEC_AVAILABLE = False
 
+# How long a connection waits for another writer (concurrent evaluations
+# open one connection per worker thread)
+BUSY_TIMEOUT_MS = 10_000
+
+# Dimension of the original single vec_memory vec0 table. Databases created
+# before per-model tables keep using it for unlabelled 1536-dim vectors.
+VEC_MEMORY_DIM = 1536
+LEGACY_VEC_TABLE = "vec_memory"
+
+# Quantized companion tables: vec0 column type and query/insert expression
+QUANTIZATIONS: dict[str, tuple[str, str]] = {
+    "int8": ("int8", "vec_quantize_int8(?, 'unit')"),
+    "binary": ("bit", "vec_quantize_binary(?)"),
+}
+
+# Candidates fetched from a quantized index per requested result
+RERANK_OVERSAMPLE = 4
+
+# KNN queries combined per statement by search_similar_batch() (SQLite's
+# default compound SELECT limit is 500)
+MAX_COMPOUND_QUERIES = 100
+
 # Try to import APSW (preferred) or fall back to sqlite3
 try:
     import apsw
@@ -47,6 +80,7 @@ def get_connection() -> ConnectionType:
     if USING_APSW:
         # APSW always supports extensions
         conn = apsw.Connection(str(VECTOR_DB_PATH))
+        conn.set_busy_timeout(BUSY_TIMEOUT_MS)
         try:
             # Enable extension loading (APSW requires explicit authorization)
             conn.config(apsw.SQLITE_DBCONFIG_ENABLE_LOAD_EXTENSION, 1)
@@ -63,7 +97,7 @@ def get_connection() -> ConnectionType:
             VEC_AVAILABLE = False
     else:
         # Standard sqlite3 - may not support extensions
-        conn = sqlite3.connect(str(VECTOR_DB_PATH))
+        conn = sqlite3.connect(str(VECTOR_DB_PATH), timeout=BUSY_TIMEOUT_MS / 1000)
         try:
             conn.enable_load_extension(True)
             import sqlite_vec
@@ -87,6 +121,21 @@ def get_connection() -> ConnectionType:
     return conn
 
 
+def _add_missing_columns(conn: ConnectionType) -> None:
+    """Add columns introduced after the initial schema to existing databases."""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(memory_embeddings)")
+    existing = {row[1] for row in cursor.fetchall()}
+    for column, column_type in (
+        ("embedding_model", "TEXT"),
+        ("embedding_dim", "INTEGER"),
+    ):
+        if column not in existing:
+            cursor.execute(
+                f"ALTER TABLE memory_embeddings ADD COLUMN {column} {column_type}"
+            )
+
+
 def init_database() -> bool:
     """
     Initialize the vector database schema.
@@ -95,6 +144,16 @@ def init_database() -> bool:
         True if sqlite-vec is available, False if running in fallback mode.
     """
     conn = get_connection()
+    _create_schema(conn)
+    # APSW auto-commits, sqlite3 needs explicit commit
+    if not USING_APSW and hasattr(conn, "commit"):
+        conn.commit()  # type: ignore[union-attr]
+    conn.close()
+    return VEC_AVAILABLE
+
+
+def _create_schema(conn: ConnectionType) -> None:
+    """Create (or upgrade) all vector database tables on a connection."""
     cursor = conn.cursor()
 
     # Create table for memory embeddings (metadata storage)
@@ -108,10 +167,13 @@ def init_database() -> bool:
             content TEXT NOT NULL,
             metadata TEXT,
             embedding BLOB,
+            embedding_model TEXT,
+            embedding_dim INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """
     )
+    _add_missing_columns(conn)
 
     # Create index for faster lookups
     cursor.execute(
@@ -128,34 +190,70 @@ def init_database() -> bool:
     """
     )
 
-    # Create vec0 virtual table for vector similarity search if sqlite-vec available
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_memory_model_dim
+        ON memory_embeddings(embedding_model, embedding_dim)
+    """
+    )
+
+    # Registry of vec0 tables, one per (embedding model, dimension)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vec_models (
+            table_name TEXT PRIMARY KEY,
+            embedding_model TEXT NOT NULL,
+            embedding_dim INTEGER NOT NULL,
+            quantization TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (embedding_model, embedding_dim)
+        )
+    """
+    )
+
     if VEC_AVAILABLE:
-        try:
-            # vec0 syntax: embedding float[dimension]
-            # +column for auxiliary columns that can be filtered
+        # Adopt the pre-registry vec_memory table for unlabelled vectors
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (LEGACY_VEC_TABLE,),
+        )
+        if cursor.fetchone():
             cursor.execute(
-                """
-                CREATE VIRTUAL TABLE IF NOT EXISTS vec_memory USING vec0(
-                    embedding float[1536],
-                    +node_id TEXT,
-                    +memory_type TEXT
-                )
-            """
+                "INSERT OR IGNORE INTO vec_models "
+                "(table_name, embedding_model, embedding_dim) VALUES (?, '', ?)",
+                (LEGACY_VEC_TABLE, VEC_MEMORY_DIM),
             )
-            logger.info("Vector database initialized with sqlite-vec support")
-        except Exception as e:
-            logger.warning(f"Failed to create vec0 table: {e}")
+        logger.info("Vector database initialized with sqlite-vec support")
     else:
         logger.info(
             "Vector database initialized in fallback mode (no vec). "
             "Vector similarity search will not be available."
         )
 
-    # APSW auto-commits, sqlite3 needs explicit commit
-    if not USING_APSW and hasattr(conn, "commit"):
-        conn.commit()  # type: ignore[union-attr]
-    conn.close()
-    return VEC_AVAILABLE
+
+def vec_table_name(embedding_model: Optional[str], embedding_dim: int) -> str:
+    """Return the vec0 table name for an embedding model and dimension."""
+    if not embedding_model:
+        return f"vec_memory_{embedding_dim}"
+    slug = re.sub(r"[^a-z0-9]+", "_", embedding_model.lower()).strip("_")[:40]
+    digest = hashlib.sha1(embedding_model.encode()).hexdigest()[:8]
+    return f"vec_memory_{embedding_dim}_{slug}_{digest}"
+
+
+@dataclass(frozen=True)
+class VecIndex:
+    """A registered vec0 table for one (embedding model, dimension) pair."""
+
+    table_name: str
+    embedding_model: str
+    embedding_dim: int
+    quantization: Optional[str] = None
+
+    @property
+    def quantized_table(self) -> Optional[str]:
+        if not self.quantization:
+            return None
+        return f"{self.table_name}_{self.quantization}"
 
 
 def serialize_embedding(embedding: list[float]) -> bytes:
@@ -177,13 +275,32 @@ def embedding_to_json(embedding: list[float]) -> str:
 class VectorStore:
     """Interface for storing and querying memory embeddings."""
 
-    def __init__(self) -> None:
+    def __init__(self, quantization: Optional[str] = None) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            quantization: Quantized companion index ("int8" or "binary")
+                to create alongside new vec0 tables. Defaults to the
+                VECTOR_QUANTIZATION setting; existing tables keep theirs.
+        """
         self._conn: Optional[ConnectionType] = None
+        if quantization is None:
+            quantization = getattr(settings, "VECTOR_QUANTIZATION", None)
+        if quantization and quantization not in QUANTIZATIONS:
+            raise ValueError(
+                f"Unknown vector quantization '{quantization}'. "
+                f"Must be one of: {sorted(QUANTIZATIONS)}"
+            )
+        self.quantization = quantization or None
+        self._indexes: Optional[dict[tuple[str, int], VecIndex]] = None
 
     @property
     def conn(self) -> ConnectionType:
         if self._conn is None:
             self._conn = get_connection()
+            _create_schema(self._conn)
+            self._commit()
         return self._conn
 
     @property
@@ -197,6 +314,150 @@ class VectorStore:
         if self._conn:
             self._conn.close()
             self._conn = None
+        self._indexes = None
+
+    def _commit(self) -> None:
+        # APSW auto-commits, sqlite3 needs explicit commit
+        if not USING_APSW and hasattr(self._conn, "commit"):
+            self._conn.commit()  # type: ignore[union-attr]
+
+    def list_indexes(self, embedding_dim: Optional[int] = None) -> list[VecIndex]:
+        """Return registered vec0 indexes, optionally for one dimension."""
+        if self._indexes is None:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT table_name, embedding_model, embedding_dim, quantization "
+                "FROM vec_models"
+            )
+            self._indexes = {}
+            for row in cursor.fetchall():
+                index = VecIndex(
+                    table_name=str(row[0]),
+                    embedding_model=str(row[1]),
+                    embedding_dim=int(cast(int, row[2])),
+                    quantization=str(row[3]) if row[3] else None,
+                )
+                self._indexes[(index.embedding_model, index.embedding_dim)] = index
+        return [
+            index
+            for index in self._indexes.values()
+            if embedding_dim is None or index.embedding_dim == embedding_dim
+        ]
+
+    def get_index(
+        self,
+        embedding_model: Optional[str],
+        embedding_dim: int,
+        create: bool = False,
+    ) -> Optional[VecIndex]:
+        """
+        Look up the vec0 index for a model/dimension, creating it if asked.
+
+        Unlabelled 1536-dim vectors map to the legacy vec_memory table when
+        the database predates per-model tables.
+        """
+        if not self.vec_enabled:
+            return None
+        model = embedding_model or ""
+        self.list_indexes()
+        assert self._indexes is not None
+        index = self._indexes.get((model, embedding_dim))
+        if index is None and create:
+            index = self._create_index(model, embedding_dim, self.quantization)
+        return index
+
+    def _create_index(
+        self,
+        embedding_model: str,
+        embedding_dim: int,
+        quantization: Optional[str] = None,
+        table_name: Optional[str] = None,
+    ) -> VecIndex:
+        index = VecIndex(
+            table_name=table_name or vec_table_name(embedding_model, embedding_dim),
+            embedding_model=embedding_model,
+            embedding_dim=embedding_dim,
+            quantization=quantization,
+        )
+        cursor = self.conn.cursor()
+        # vec0 syntax: embedding float[dimension]
+        # +column for auxiliary columns that can be filtered
+        cursor.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {index.table_name} USING vec0(
+                embedding float[{embedding_dim}],
+                +node_id TEXT,
+                +memory_type TEXT
+            )
+        """
+        )
+        self._create_quantized_table(index)
+        cursor.execute(
+            "INSERT OR REPLACE INTO vec_models "
+            "(table_name, embedding_model, embedding_dim, quantization) "
+            "VALUES (?, ?, ?, ?)",
+            (index.table_name, embedding_model, embedding_dim, quantization),
+        )
+        self._commit()
+        assert self._indexes is not None
+        self._indexes[(embedding_model, embedding_dim)] = index
+        logger.info(
+            f"Created vec0 index {index.table_name} "
+            f"({embedding_model or 'unlabelled'}, {embedding_dim} dims"
+            f"{', ' + quantization if quantization else ''})"
+        )
+        return index
+
+    def _create_quantized_table(self, index: VecIndex) -> None:
+        if not index.quantization or not index.quantized_table:
+            return
+        column_type = QUANTIZATIONS[index.quantization][0]
+        self.conn.cursor().execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {index.quantized_table} USING vec0(
+                embedding {column_type}[{index.embedding_dim}]
+            )
+        """
+        )
+
+    def _insert_vector(
+        self,
+        index: VecIndex,
+        rowid: int,
+        embedding: list[float],
+        node_id: str,
+        memory_type: str,
+    ) -> None:
+        cursor = self.conn.cursor()
+        # vec0 doesn't support INSERT OR REPLACE, so delete first
+        self._delete_vectors(index, [rowid])
+        # vec0 uses JSON for embedding input
+        embedding_json = embedding_to_json(embedding)
+        cursor.execute(
+            f"""
+            INSERT INTO {index.table_name}
+            (rowid, embedding, node_id, memory_type)
+            VALUES (?, ?, ?, ?)
+        """,
+            (rowid, embedding_json, node_id, memory_type),
+        )
+        if index.quantization and index.quantized_table:
+            quantize = QUANTIZATIONS[index.quantization][1]
+            cursor.execute(
+                f"INSERT INTO {index.quantized_table} (rowid, embedding) "
+                f"VALUES (?, {quantize})",
+                (rowid, embedding_json),
+            )
+
+    def _delete_vectors(self, index: VecIndex, rowids: list[int]) -> None:
+        cursor = self.conn.cursor()
+        placeholders = ",".join("?" * len(rowids))
+        for table in (index.table_name, index.quantized_table):
+            if table:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE rowid IN ({placeholders})",
+                    rowids,
+                )
 
     def store_memory(
         self,
@@ -207,8 +468,15 @@ class VectorStore:
         embedding: list[float],
         chart_id: Optional[str] = None,
         metadata: Optional[dict[str, Any]] = None,
+        embedding_model: Optional[str] = None,
     ) -> None:
-        """Store a memory with its embedding."""
+        """
+        Store a memory with its embedding.
+
+        The embedding model and vector dimension are recorded with the
+        memory, and the vector goes into that pair's vec0 table so vectors
+        from different models are never compared.
+        """
         cursor = self.conn.cursor()
 
         # Store metadata and embedding in main table
@@ -218,8 +486,9 @@ class VectorStore:
         cursor.execute(
             """
             INSERT OR REPLACE INTO memory_embeddings
-            (id, node_id, chart_id, memory_type, content, metadata, embedding)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            (id, node_id, chart_id, memory_type, content, metadata, embedding,
+             embedding_model, embedding_dim)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
             (
                 memory_id,
@@ -229,41 +498,27 @@ class VectorStore:
                 content,
                 metadata_json,
                 embedding_bytes,
+                embedding_model,
+                len(embedding),
             ),
         )
 
-        # Also store in vec0 table if available
-        if VEC_AVAILABLE:
+        # Also store in the model's vec0 table if available
+        if self.vec_enabled:
             try:
+                index = self.get_index(embedding_model, len(embedding), create=True)
                 # Get the rowid of the inserted/updated row
                 cursor.execute(
                     "SELECT rowid FROM memory_embeddings WHERE id = ?",
                     (memory_id,),
                 )
                 row = cursor.fetchone()
-                if row:
-                    rowid = row[0]
-                    # vec0 doesn't support INSERT OR REPLACE, so delete first
-                    cursor.execute(
-                        "DELETE FROM vec_memory WHERE rowid = ?",
-                        (rowid,),
-                    )
-                    # vec0 uses JSON for embedding input
-                    embedding_json = embedding_to_json(embedding)
-                    cursor.execute(
-                        """
-                        INSERT INTO vec_memory
-                        (rowid, embedding, node_id, memory_type)
-                        VALUES (?, ?, ?, ?)
-                    """,
-                        (rowid, embedding_json, node_id, memory_type),
-                    )
+                if row and index:
+                    self._insert_vector(index, row[0], embedding, node_id, memory_type)
             except Exception as e:
                 logger.warning(f"Failed to store in vec0 table: {e}")
 
-        # APSW auto-commits, sqlite3 needs explicit commit
-        if not USING_APSW and hasattr(self.conn, "commit"):
-            self.conn.commit()  # type: ignore[union-attr]
+        self._commit()
 
     def search_similar(
         self,
@@ -271,45 +526,184 @@ class VectorStore:
         limit: int = 10,
         memory_type: Optional[str] = None,
         node_ids: Optional[list[str]] = None,
+        embedding_model: Optional[str] = None,
+        use_quantized: bool = True,
     ) -> list[dict[str, Any]]:
         """
         Search for similar memories using vector similarity (KNN).
 
-        Uses sqlite-vec's MATCH operator for KNN search.
+        Uses sqlite-vec's MATCH operator for KNN search against the vec0
+        table for the query's model and dimension. embedding_model defaults
+        to the configured model (EMBEDDING_MODEL or the backend's default), so
+        vectors of other models with the same dimension are never mixed in.
+        Unlabelled vectors of the same dimension are always included.
+
+        When the index has a quantized companion and use_quantized is True,
+        candidates come from the quantized table and are re-ranked by exact
+        float distance.
+
         If sqlite-vec is not available, returns an empty list with a warning.
         """
-        if not VEC_AVAILABLE:
+        return self.search_similar_batch(
+            [query_embedding],
+            limit=limit,
+            memory_type=memory_type,
+            node_ids=[node_ids],
+            embedding_model=embedding_model,
+            use_quantized=use_quantized,
+        )[0]
+
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limit: int = 10,
+        memory_type: Optional[str] = None,
+        node_ids: Optional[list[Optional[list[str]]]] = None,
+        embedding_model: Optional[str] = None,
+        use_quantized: bool = True,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run search_similar() for many query vectors at once.
+
+        The per-query KNN searches are combined with UNION ALL, so each
+        index is scanned with one statement per MAX_COMPOUND_QUERIES
+        queries instead of one round trip per query.
+
+        Args:
+            query_embeddings: Query vectors (all of the same dimension)
+            limit: Results per query
+            memory_type: Optional memory type filter
+            node_ids: Optional node filter per query (same length as
+                query_embeddings; None entries are unfiltered)
+            embedding_model: Model whose index is searched (defaults to the
+                configured embedding model)
+
+        Returns:
+            One result list per query, in query order.
+        """
+        results: list[list[dict[str, Any]]] = [[] for _ in query_embeddings]
+        if not query_embeddings:
+            return results
+        if not self.vec_enabled:
             logger.warning(
                 "Vector similarity search unavailable. "
                 "Install sqlite-vec: pip install sqlite-vec"
             )
-            return []
+            return results
+
+        if embedding_model is None:
+            embedding_model = get_configured_embedding_model()
+        indexes = [
+            index
+            for index in self.list_indexes(len(query_embeddings[0]))
+            if index.embedding_model in (embedding_model, "")
+        ]
+        if not indexes:
+            return results
+
+        node_filters = node_ids or [None] * len(query_embeddings)
+        query_jsons = [embedding_to_json(e) for e in query_embeddings]
+        rows: list[list[Any]] = [[] for _ in query_embeddings]
+
+        for index in indexes:
+            for start in range(0, len(query_jsons), MAX_COMPOUND_QUERIES):
+                selects = []
+                params: list[Any] = []
+                for i in range(
+                    start, min(start + MAX_COMPOUND_QUERIES, len(query_jsons))
+                ):
+                    sql, select_params = self._knn_select(
+                        index,
+                        query_jsons[i],
+                        limit,
+                        memory_type,
+                        node_filters[i],
+                        use_quantized,
+                    )
+                    selects.append(f"SELECT {i} AS query_index, * FROM ({sql})")
+                    params.extend(select_params)
 
-        cursor = self.conn.cursor()
-        query_json = embedding_to_json(query_embedding)
+                try:
+                    cursor = self.conn.cursor()
+                    cursor.execute(" UNION ALL ".join(selects), params)
+                    for row in cursor.fetchall():
+                        rows[int(cast(int, row[0]))].append(row[1:])
+                except Exception as e:
+                    logger.warning(f"Vector search failed on {index.table_name}: {e}")
+
+        for i, query_rows in enumerate(rows):
+            query_rows.sort(key=lambda row: row[6])
+            results[i] = [
+                {
+                    "id": row[0],
+                    "node_id": row[1],
+                    "chart_id": row[2],
+                    "memory_type": row[3],
+                    "content": row[4],
+                    "metadata": json.loads(str(row[5])) if row[5] else None,
+                    "distance": row[6],
+                }
+                for row in query_rows[:limit]
+            ]
+
+        return results
 
-        # Build KNN query using vec0's MATCH syntax
+    def _knn_select(
+        self,
+        index: VecIndex,
+        query_json: str,
+        limit: int,
+        memory_type: Optional[str],
+        node_ids: Optional[list[str]],
+        use_quantized: bool,
+    ) -> tuple[str, list[Any]]:
+        """Build the KNN SELECT for one query vector against one index."""
         # Note: Cannot filter on vec0 auxiliary columns in WHERE clause
         # Must filter on the joined memory_embeddings table instead
-
-        # Build WHERE conditions for filtering on memory_embeddings
         where_conditions = []
-        params: list[Any] = [query_json, limit]
+        filter_params: list[Any] = []
 
         if memory_type:
             where_conditions.append("m.memory_type = ?")
-            params.append(memory_type)
+            filter_params.append(memory_type)
 
         if node_ids:
             placeholders = ",".join("?" * len(node_ids))
             where_conditions.append(f"m.node_id IN ({placeholders})")
-            params.extend(node_ids)
+            filter_params.extend(node_ids)
 
-        # Build the query
         where_clause = ""
         if where_conditions:
             where_clause = " AND " + " AND ".join(where_conditions)
 
+        if use_quantized and index.quantization and index.quantized_table:
+            quantize = QUANTIZATIONS[index.quantization][1]
+            query = f"""
+                SELECT
+                    m.id,
+                    m.node_id,
+                    m.chart_id,
+                    m.memory_type,
+                    m.content,
+                    m.metadata,
+                    vec_distance_l2(m.embedding, ?) AS distance
+                FROM (
+                    SELECT rowid FROM {index.quantized_table}
+                    WHERE embedding MATCH {quantize} AND k = ?
+                ) c
+                JOIN memory_embeddings m ON c.rowid = m.rowid
+                WHERE 1 = 1{where_clause}
+                ORDER BY distance
+                LIMIT ?
+            """
+            return query, [
+                query_json,
+                query_json,
+                limit * RERANK_OVERSAMPLE,
+                *filter_params,
+                limit,
+            ]
+
         query = f"""
             SELECT
                 m.id,
@@ -319,34 +713,72 @@ class VectorStore:
                 m.content,
                 m.metadata,
                 v.distance
-            FROM vec_memory v
+            FROM {index.table_name} v
             JOIN memory_embeddings m ON v.rowid = m.rowid
             WHERE v.embedding MATCH ?
               AND v.k = ?{where_clause}
             ORDER BY v.distance
         """
+        return query, [query_json, limit, *filter_params]
 
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-        except Exception as e:
-            logger.warning(f"Vector search failed: {e}")
-            return []
+    def rebuild_indexes(self, quantization: Optional[str] = None) -> dict[str, int]:
+        """
+        Rebuild every vec0 index from the stored float embeddings.
 
-        results = []
-        for row in rows:
-            result = {
-                "id": row[0],
-                "node_id": row[1],
-                "chart_id": row[2],
-                "memory_type": row[3],
-                "content": row[4],
-                "metadata": json.loads(str(row[5])) if row[5] else None,
-                "distance": row[6],
-            }
-            results.append(result)
+        Creates indexes for (model, dimension) pairs that have none yet
+        (e.g. vectors stored before per-model tables existed) and adds or
+        replaces quantized companions when quantization is given.
 
-        return results
+        Returns:
+            Mapping of vec0 table name -> number of vectors indexed.
+        """
+        if not self.vec_enabled:
+            return {}
+        if quantization and quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown vector quantization '{quantization}'")
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT DISTINCT COALESCE(embedding_model, ''), embedding_dim "
+            "FROM memory_embeddings WHERE embedding IS NOT NULL"
+        )
+        pairs = [
+            (str(row[0]), int(cast(int, row[1]))) for row in cursor.fetchall() if row[1]
+        ]
+
+        counts: dict[str, int] = {}
+        for model, dim in pairs:
+            existing = self.get_index(model, dim)
+            table_name = None
+            keep_quantization = None
+            if existing is not None:
+                table_name = existing.table_name
+                keep_quantization = existing.quantization
+                if existing.quantized_table:
+                    cursor.execute(f"DROP TABLE IF EXISTS {existing.quantized_table}")
+                cursor.execute(f"DELETE FROM {existing.table_name}")
+            index = self._create_index(
+                model, dim, quantization or keep_quantization, table_name=table_name
+            )
+
+            cursor.execute(
+                "SELECT rowid, node_id, memory_type, embedding FROM memory_embeddings "
+                "WHERE COALESCE(embedding_model, '') = ? AND embedding_dim = ?",
+                (model, dim),
+            )
+            rows = cursor.fetchall()
+            for rowid, node_id, memory_type, blob in rows:
+                self._insert_vector(
+                    index,
+                    int(cast(int, rowid)),
+                    deserialize_embedding(cast(bytes, blob)),
+                    str(node_id),
+                    str(memory_type),
+                )
+            counts[index.table_name] = len(rows)
+
+        self._commit()
+        return counts
 
     def get_memories_by_node(
         self,
@@ -386,6 +818,89 @@ class VectorStore:
             for row in rows
         ]
 
+    def copy_memories(self, node_ids: dict[str, str], chart_ids: dict[str, str]) -> int:
+        """
+        Duplicate the memories of some nodes onto other nodes/charts.
+
+        Used when a project is cloned: memories of every old node id in
+        node_ids are re-inserted for the mapped node (and mapped chart) with
+        their stored embeddings, so nothing is sent to the embedding API.
+        Memories scoped to a chart missing from chart_ids are skipped. New
+        ids follow the structural memory scheme,
+        md5("{node_id}:{chart_id}:{memory_type}:{content}").
+
+        Returns:
+            Number of memories copied.
+        """
+        if not node_ids:
+            return 0
+
+        cursor = self.conn.cursor()
+        old_ids = list(node_ids)
+        rows: list[Any] = []
+        for start in range(0, len(old_ids), 500):
+            batch = old_ids[start : start + 500]
+            cursor.execute(
+                "SELECT node_id, chart_id, memory_type, content, metadata, "
+                "embedding, embedding_model, embedding_dim FROM memory_embeddings "
+                f"WHERE node_id IN ({','.join('?' * len(batch))})",
+                batch,
+            )
+            rows.extend(cursor.fetchall())
+
+        copied = 0
+        for node_id, chart_id, memory_type, content, metadata, blob, model, dim in rows:
+            new_chart_id = None
+            if chart_id:
+                new_chart_id = chart_ids.get(str(chart_id))
+                if new_chart_id is None:
+                    continue
+            new_node_id = node_ids[str(node_id)]
+            memory_id = hashlib.md5(
+                f"{new_node_id}:{new_chart_id}:{memory_type}:{content}".encode()
+            ).hexdigest()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO memory_embeddings
+                (id, node_id, chart_id, memory_type, content, metadata, embedding,
+                 embedding_model, embedding_dim)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    memory_id,
+                    new_node_id,
+                    new_chart_id,
+                    memory_type,
+                    content,
+                    metadata,
+                    blob,
+                    model,
+                    dim,
+                ),
+            )
+            copied += 1
+
+            if blob is None or not self.vec_enabled:
+                continue
+            try:
+                embedding = deserialize_embedding(cast(bytes, blob))
+                index = self.get_index(
+                    cast(Optional[str], model), len(embedding), create=True
+                )
+                cursor.execute(
+                    "SELECT rowid FROM memory_embeddings WHERE id = ?", (memory_id,)
+                )
+                row = cursor.fetchone()
+                if row and index:
+                    self._insert_vector(
+                        index, row[0], embedding, new_node_id, str(memory_type)
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to store in vec0 table: {e}")
+
+        self._commit()
+        return copied
+
     def delete_memories_by_node(
         self, node_id: str, chart_id: Optional[str] = None
     ) -> int:
@@ -403,19 +918,16 @@ class VectorStore:
             cursor.execute(
                 "SELECT rowid FROM memory_embeddings WHERE node_id = ?", (node_id,)
             )
-        rowids = [row[0] for row in cursor.fetchall()]
+        rowids = [int(cast(int, row[0])) for row in cursor.fetchall()]
 
         if rowids:
-            # Delete from vec0 table if available
-            if VEC_AVAILABLE:
-                try:
-                    placeholders = ",".join("?" * len(rowids))
-                    cursor.execute(
-                        f"DELETE FROM vec_memory WHERE rowid IN ({placeholders})",
-                        rowids,
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to delete from vec0 table: {e}")
+            # Delete from every vec0 table if available
+            if self.vec_enabled:
+                for index in self.list_indexes():
+                    try:
+                        self._delete_vectors(index, rowids)
+                    except Exception as e:
+                        logger.warning(f"Failed to delete from {index.table_name}: {e}")
 
             # Delete from main table
             if chart_id:
@@ -428,7 +940,5 @@ class VectorStore:
                     "DELETE FROM memory_embeddings WHERE node_id = ?", (node_id,)
                 )
 
-        # APSW auto-commits, sqlite3 needs explicit commit
-        if not USING_APSW and hasattr(self.conn, "commit"):
-            self.conn.commit()  # type: ignore[union-attr]
+        self._commit()
         return len(rowids)
@@ -7,8 +7,10 @@ Supports strategy comparison for thesis research.
 
 import json
 import logging
+import threading
+import time
 from dataclasses import dataclass, field
-from typing import Any, Optional, Protocol
+from typing import Any, Callable, Optional, Protocol
 
 import logfire
 
@@ -20,6 +22,8 @@ from pxnodes.llm.context.base import (
     StrategyRegistry,
     StrategyType,
 )
+from pxnodes.llm.context.shared.concurrency import run_concurrently
+from pxnodes.llm.context.shared.graph_retrieval import ChartSnapshot
 from pxnodes.models import PxNode
 
 logger = logging.getLogger(__name__)
@@ -62,6 +66,10 @@ class StrategyEvaluationResult:
     issues: list[CoherenceIssue] = field(default_factory=list)
     context_result: Optional[ContextResult] = None
     error: Optional[str] = None
+    # Milliseconds spent per phase (context_ms, llm_ms, total_ms)
+    timings: dict[str, float] = field(default_factory=dict)
+    # Token counts (context_tokens estimate, prompt/completion/total_tokens)
+    usage: dict[str, int] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -73,6 +81,8 @@ class StrategyEvaluationResult:
             "context_metadata": (
                 self.context_result.metadata if self.context_result else {}
             ),
+            "timings": self.timings,
+            "usage": self.usage,
             "error": self.error,
         }
 
@@ -94,6 +104,8 @@ class ComparisonResult:
     results_by_strategy: dict[str, StrategyEvaluationResult] = field(
         default_factory=dict
     )
+    # Wall-clock time of the whole (concurrent) comparison
+    wall_time_ms: Optional[float] = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -117,6 +129,25 @@ class ComparisonResult:
                 set(v.is_coherent for v in self.results_by_strategy.values())
             )
             == 1,
+            "timings_by_strategy": {
+                k: v.timings for k, v in self.results_by_strategy.items()
+            },
+            "tokens_by_strategy": {
+                k: v.usage for k, v in self.results_by_strategy.items()
+            },
+            "total_tokens": sum(
+                v.usage.get("total_tokens", 0)
+                for v in self.results_by_strategy.values()
+            ),
+            "wall_time_ms": self.wall_time_ms,
+            # What running the strategies one after another would have cost
+            "sequential_time_ms": round(
+                sum(
+                    v.timings.get("total_ms", 0.0)
+                    for v in self.results_by_strategy.values()
+                ),
+                1,
+            ),
         }
 
 
@@ -239,7 +270,16 @@ class StrategyEvaluator:
         """
         self.llm_provider = llm_provider
         self.default_strategy = default_strategy
-        self._strategy_cache: dict[StrategyType, BaseContextStrategy] = {}
+        # Strategies keep per-instance state (retrievers, caches), so each
+        # thread evaluating nodes concurrently gets its own instances.
+        self._local = threading.local()
+
+    @property
+    def _strategy_cache(self) -> dict[StrategyType, BaseContextStrategy]:
+        cache = getattr(self._local, "strategies", None)
+        if cache is None:
+            cache = self._local.strategies = {}
+        return cache
 
     def _get_strategy(self, strategy_type: StrategyType) -> BaseContextStrategy:
         """Get or create a strategy instance."""
@@ -260,6 +300,7 @@ class StrategyEvaluator:
         strategy_type: Optional[StrategyType] = None,
         project_pillars: Optional[list] = None,
         game_concept: Optional[Any] = None,
+        scope: Optional[EvaluationScope] = None,
     ) -> StrategyEvaluationResult:
         """
         Evaluate a node's coherence using a specific strategy.
@@ -270,12 +311,15 @@ class StrategyEvaluator:
             strategy_type: Strategy to use (default if not specified)
             project_pillars: Optional project pillars for L1 context
             game_concept: Optional game concept for L1 context
+            scope: Prebuilt scope shared between strategies (overrides
+                node/chart/project_pillars/game_concept)
 
         Returns:
             StrategyEvaluationResult with coherence assessment
         """
         strategy_type = strategy_type or self.default_strategy
         strategy = self._get_strategy(strategy_type)
+        started = time.perf_counter()
 
         with logfire.span(
             "strategy_evaluator.evaluate_node",
@@ -284,16 +328,18 @@ class StrategyEvaluator:
         ):
             try:
                 # Build evaluation scope
-                scope = EvaluationScope(
-                    target_node=node,
-                    chart=chart,
-                    project=getattr(game_concept, "project", None),
-                    project_pillars=project_pillars,
-                    game_concept=game_concept,
-                )
+                if scope is None:
+                    scope = EvaluationScope(
+                        target_node=node,
+                        chart=chart,
+                        project=getattr(game_concept, "project", None),
+                        project_pillars=project_pillars,
+                        game_concept=game_concept,
+                    )
 
                 # Build context using strategy
                 context_result = strategy.build_context(scope)
+                context_ms = _elapsed_ms(started)
 
                 # Evaluate with LLM
                 result = self._evaluate_with_llm(
@@ -301,6 +347,15 @@ class StrategyEvaluator:
                     strategy_type=strategy_type,
                     context_result=context_result,
                 )
+                result.timings = {
+                    "context_ms": context_ms,
+                    **result.timings,
+                    "total_ms": _elapsed_ms(started),
+                }
+                result.usage = {
+                    "context_tokens": context_result.token_estimate,
+                    **result.usage,
+                }
 
                 logfire.info(
                     "strategy_evaluation_complete",
@@ -326,6 +381,7 @@ class StrategyEvaluator:
                     strategy=strategy_type.value,
                     is_coherent=False,
                     error=str(e),
+                    timings={"total_ms": _elapsed_ms(started)},
                 )
 
     def compare_strategies(
@@ -335,23 +391,31 @@ class StrategyEvaluator:
         strategies: Optional[list[StrategyType]] = None,
         project_pillars: Optional[list] = None,
         game_concept: Optional[Any] = None,
+        max_concurrency: Optional[int] = None,
     ) -> ComparisonResult:
         """
         Evaluate a node using multiple strategies for comparison.
 
         Useful for thesis research to compare strategy effectiveness.
 
+        The chart graph (with node components), pillars and game concept
+        are loaded once into a shared scope; strategies then build their
+        context and run their evaluation LLM call concurrently.
+
         Args:
             node: The target node to evaluate
             chart: The chart containing the node
             strategies: List of strategies to compare (default: all 4)
             project_pillars: Optional project pillars
             game_concept: Optional game concept
+            max_concurrency: Max strategies evaluated at once
+                (all of them if None)
 
         Returns:
             ComparisonResult with results from all strategies
         """
-        strategies = strategies or list(StrategyType)
+        strategies = list(dict.fromkeys(strategies or list(StrategyType)))
+        started = time.perf_counter()
 
         with logfire.span(
             "strategy_evaluator.compare_strategies",
@@ -363,21 +427,51 @@ class StrategyEvaluator:
                 node_name=node.name,
             )
 
+            # Import strategy modules here: first imports racing in worker
+            # threads can see partially initialized modules.
             for strategy_type in strategies:
-                result = self.evaluate_node(
-                    node=node,
+                StrategyRegistry.get(strategy_type)
+
+            snapshot = ChartSnapshot.load(chart).attach()
+            try:
+                target = next(iter(snapshot.resolve_nodes([str(node.id)])), node)
+                scope = EvaluationScope(
+                    target_node=target,
                     chart=chart,
-                    strategy_type=strategy_type,
-                    project_pillars=project_pillars,
+                    project=getattr(game_concept, "project", None),
+                    project_pillars=(
+                        list(project_pillars) if project_pillars is not None else None
+                    ),
                     game_concept=game_concept,
                 )
-                comparison.results_by_strategy[strategy_type.value] = result
+
+                completed = dict(
+                    run_concurrently(
+                        strategies,
+                        lambda strategy_type: self.evaluate_node(
+                            node=target,
+                            chart=chart,
+                            strategy_type=strategy_type,
+                            scope=scope,
+                        ),
+                        max_concurrency=max_concurrency or len(strategies),
+                    )
+                )
+            finally:
+                snapshot.detach()
+
+            for strategy_type in strategies:
+                comparison.results_by_strategy[strategy_type.value] = completed[
+                    strategy_type
+                ]
+            comparison.wall_time_ms = _elapsed_ms(started)
 
             logfire.info(
                 "strategy_comparison_complete",
                 node_id=str(node.id),
                 strategies_compared=len(strategies),
                 agreement=comparison._build_summary()["agreement"],
+                wall_time_ms=comparison.wall_time_ms,
             )
 
             return comparison
@@ -389,16 +483,24 @@ class StrategyEvaluator:
         node_ids: Optional[list[str]] = None,
         project_pillars: Optional[list] = None,
         game_concept: Optional[Any] = None,
+        max_concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[StrategyEvaluationResult], None]] = None,
     ) -> list[StrategyEvaluationResult]:
         """
         Evaluate all nodes in a chart using a strategy.
 
+        The chart is loaded once into a snapshot attached to chart, and
+        nodes are evaluated concurrently (bounded by max_concurrency).
+
         Args:
             chart: The chart to evaluate
             strategy_type: Strategy to use
             node_ids: Optional specific node IDs to evaluate
             project_pillars: Optional project pillars
             game_concept: Optional game concept
+            max_concurrency: Max nodes evaluated at once
+                (CONTEXT_EVALUATION_CONCURRENCY if None)
+            on_result: Called on the calling thread with each node result
 
         Returns:
             List of StrategyEvaluationResult for each node
@@ -410,28 +512,33 @@ class StrategyEvaluator:
             chart_id=str(chart.id),
             strategy=strategy_type.value,
         ):
-            results = []
-
-            # Get nodes to evaluate
-            if node_ids:
-                nodes = list(PxNode.objects.filter(id__in=node_ids))
-            else:
-                container_node_ids = chart.containers.filter(
-                    content__isnull=False
-                ).values_list("content_id", flat=True)
-                nodes = list(PxNode.objects.filter(id__in=container_node_ids))
-
-            for node in nodes:
-                result = self.evaluate_node(
-                    node=node,
-                    chart=chart,
-                    strategy_type=strategy_type,
-                    project_pillars=project_pillars,
-                    game_concept=game_concept,
+            StrategyRegistry.get(strategy_type)  # import before threads start
+
+            # Every node's graph traversals are served from one snapshot
+            snapshot = ChartSnapshot.load(chart).attach()
+            try:
+                nodes = snapshot.resolve_nodes(node_ids)
+                completed = dict(
+                    run_concurrently(
+                        nodes,
+                        lambda node: self.evaluate_node(
+                            node=node,
+                            chart=chart,
+                            strategy_type=strategy_type,
+                            project_pillars=project_pillars,
+                            game_concept=game_concept,
+                        ),
+                        max_concurrency=max_concurrency,
+                        on_result=(
+                            (lambda _node, r: on_result(r)) if on_result else None
+                        ),
+                    )
                 )
-                results.append(result)
+            finally:
+                snapshot.detach()
 
-            return results
+            # Keep chart order regardless of completion order
+            return [completed[node] for node in nodes]
 
     def _evaluate_with_llm(
         self,
@@ -444,8 +551,18 @@ class StrategyEvaluator:
             context=context_result.context_string
         )
 
+        started = time.perf_counter()
         try:
             response = self.llm_provider.generate(prompt)
+            timings = {"llm_ms": _elapsed_ms(started)}
+            # Per-thread counters, so concurrent strategies don't mix usage
+            usage = {
+                "prompt_tokens": getattr(self.llm_provider, "last_prompt_tokens", 0),
+                "completion_tokens": getattr(
+                    self.llm_provider, "last_completion_tokens", 0
+                ),
+                "total_tokens": getattr(self.llm_provider, "last_total_tokens", 0),
+            }
 
             # Parse JSON response
             json_str = response.strip()
@@ -496,6 +613,8 @@ class StrategyEvaluator:
                 is_coherent=is_coherent,
                 issues=issues,
                 context_result=context_result,
+                timings=timings,
+                usage=usage,
             )
 
         except json.JSONDecodeError as e:
@@ -508,9 +627,15 @@ class StrategyEvaluator:
                 issues=[],
                 context_result=context_result,
                 error=f"Failed to parse LLM response: {str(e)[:100]}",
+                timings=timings,
+                usage=usage,
             )
 
 
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
 def evaluate_node_with_strategy(
     node_id: str,
     chart_id: str,
@@ -5,7 +5,10 @@ Implements the iterative retrieval method from Zeng et al. (2024)
 "On the Structural Memory of LLM Agents".
 
 The retriever refines queries over N iterations to improve retrieval
-accuracy for coherence evaluation tasks.
+accuracy for coherence evaluation tasks. Many queries (e.g. one per node)
+are retrieved together: each round embeds all current queries in one
+batch, runs their KNN searches in one vector store pass and refines the
+queries in parallel.
 """
 
 import logging
@@ -14,7 +17,8 @@ from typing import Any, Optional, Protocol
 
 import logfire
 
-from pxnodes.llm.context.shared.embeddings import OpenAIEmbeddingGenerator
+from pxnodes.llm.context.shared.concurrency import run_concurrently
+from pxnodes.llm.context.shared.embeddings import get_embedding_backend
 from pxnodes.llm.context.shared.vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
@@ -82,6 +86,15 @@ class RetrievalResult:
         return "\n".join(lines)
 
 
+@dataclass
+class RetrievalQuery:
+    """One query of a batched retrieval."""
+
+    query: str
+    node_ids: Optional[list[str]] = None
+    iterations: int = 3
+
+
 # Query refinement prompt from Zeng et al.
 QUERY_REFINEMENT_PROMPT = """You are helping to refine a search query \
 for better memory retrieval.
@@ -107,7 +120,8 @@ class IterativeRetriever:
     The retriever:
     1. Performs initial retrieval with the query
     2. Uses LLM to refine the query based on retrieved memories
-    3. Repeats for N iterations
+    3. Repeats for N iterations, stopping early once a round surfaces
+       no new memories
     4. Returns accumulated unique memories
 
     This approach helps surface relevant information that might be missed
@@ -117,17 +131,22 @@ class IterativeRetriever:
     def __init__(
         self,
         llm_provider: LLMProvider,
-        embedding_model: str = "text-embedding-3-small",
+        embedding_model: Optional[str] = None,
+        embedding_backend: Optional[str] = None,
     ):
         """
         Initialize the retriever.
 
         Args:
             llm_provider: LLM for query refinement
-            embedding_model: OpenAI embedding model for query embedding
+            embedding_model: Embedding model for query embedding
+                (backend default if None)
+            embedding_backend: Embedding backend name (EMBEDDING_BACKEND if None)
         """
         self.llm_provider = llm_provider
-        self.embedding_generator = OpenAIEmbeddingGenerator(model=embedding_model)
+        self.embedding_generator = get_embedding_backend(
+            backend=embedding_backend, model=embedding_model
+        )
         self.vector_store = VectorStore()
 
     def retrieve(
@@ -146,72 +165,127 @@ class IterativeRetriever:
             query: Initial query for retrieval
             node_ids: Optional list of node IDs to filter by
             memory_type: Optional filter ("knowledge_triple" or "atomic_fact")
-            iterations: Number of refinement iterations
+            iterations: Maximum number of refinement iterations
             top_k: Number of memories to retrieve per iteration
 
         Returns:
             RetrievalResult with all retrieved memories
         """
+        return self.retrieve_batch(
+            [RetrievalQuery(query=query, node_ids=node_ids, iterations=iterations)],
+            memory_type=memory_type,
+            top_k=top_k,
+            max_distance=max_distance,
+        )[0]
+
+    def retrieve_batch(
+        self,
+        queries: list[RetrievalQuery],
+        memory_type: Optional[str] = None,
+        top_k: int = 10,
+        max_distance: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> list[RetrievalResult]:
+        """
+        Perform iterative retrieval for many queries at once.
+
+        Each round embeds every still-active query in one batch call,
+        searches the vector store for all of them in one pass and refines
+        them concurrently. A query stops once its iterations are used up,
+        a round returns no memories it hasn't seen, or refinement doesn't
+        change it.
+
+        Args:
+            queries: Queries with their node filter and iteration budget
+            memory_type: Optional filter ("knowledge_triple" or "atomic_fact")
+            top_k: Number of memories to retrieve per query and iteration
+            max_distance: Drop memories farther than this
+            max_concurrency: Max refinement LLM calls in flight
+
+        Returns:
+            One RetrievalResult per query, in query order
+        """
         with logfire.span(
             "retrieval.iterative.structural_memory",
-            query=query,
-            iterations=iterations,
+            queries=len(queries),
+            iterations=max((q.iterations for q in queries), default=0),
             top_k=top_k,
         ):
-            result = RetrievalResult(query=query)
-            seen_ids: set[str] = set()
-            current_query = query
-
-            for i in range(iterations):
+            results = [RetrievalResult(query=q.query) for q in queries]
+            seen_ids: list[set[str]] = [set() for _ in queries]
+            current = [q.query for q in queries]
+            active = [i for i, q in enumerate(queries) if q.iterations > 0]
+            round_num = 0
+
+            while active:
+                round_num += 1
                 with logfire.span(
                     "retrieval.iteration.structural_memory",
-                    iteration=i + 1,
-                    query=current_query,
+                    iteration=round_num,
+                    queries=len(active),
                 ):
-                    # Retrieve memories for current query
-                    new_memories = self._retrieve_single(
-                        current_query,
-                        node_ids=node_ids,
+                    # Retrieve memories for all current queries
+                    retrieved = self._retrieve_many(
+                        [current[i] for i in active],
+                        node_ids=[queries[i].node_ids for i in active],
                         memory_type=memory_type,
                         limit=top_k,
                         max_distance=max_distance,
                     )
 
-                    # Add only unseen memories
-                    for memory in new_memories:
-                        if memory.id not in seen_ids:
-                            seen_ids.add(memory.id)
-                            result.memories.append(memory)
-
-                    result.iterations_performed = i + 1
+                    to_refine: list[int] = []
+                    for i, memories in zip(active, retrieved):
+                        # Add only unseen memories
+                        new_count = 0
+                        for memory in memories:
+                            if memory.id not in seen_ids[i]:
+                                seen_ids[i].add(memory.id)
+                                results[i].memories.append(memory)
+                                new_count += 1
+                        results[i].iterations_performed = round_num
+
+                        # Refine for the next round unless converged
+                        if new_count and round_num < queries[i].iterations:
+                            to_refine.append(i)
 
                     logfire.info(
                         "retrieval.iteration.complete.structural_memory",
-                        iteration=i + 1,
-                        new_memories=len(new_memories),
-                        total_memories=len(result.memories),
+                        iteration=round_num,
+                        queries=len(active),
+                        refining=len(to_refine),
                     )
 
-                    # Refine query for next iteration (except last)
-                    if i < iterations - 1 and new_memories:
-                        refined = self._refine_query(current_query, new_memories)
-                        if refined and refined != current_query:
-                            result.refined_queries.append(refined)
-                            current_query = refined
-                            logfire.info(
-                                "retrieval.query_refined.structural_memory",
-                                iteration=i + 1,
-                                refined_query=refined[:100],
+                    memories_by_query = dict(zip(active, retrieved))
+                    refined = (
+                        dict(
+                            run_concurrently(
+                                to_refine,
+                                lambda i: self._refine_query(
+                                    current[i], memories_by_query[i]
+                                ),
+                                max_concurrency=max_concurrency or len(to_refine),
                             )
+                        )
+                        if to_refine
+                        else {}
+                    )
+
+                    active = []
+                    for i in to_refine:
+                        query = refined.get(i)
+                        if query and query != current[i]:
+                            results[i].refined_queries.append(query)
+                            current[i] = query
+                            active.append(i)
 
             logfire.info(
                 "retrieval.complete.structural_memory",
-                total_memories=len(result.memories),
-                iterations=result.iterations_performed,
-                refined_queries=len(result.refined_queries),
+                queries=len(queries),
+                total_memories=sum(len(r.memories) for r in results),
+                rounds=round_num,
             )
 
-            return result
+            return results
 
     def retrieve_for_nodes(
         self,
@@ -225,30 +299,29 @@ class IterativeRetriever:
         Retrieve memories for a target node and its neighbors.
 
         Returns a dict mapping node_id to RetrievalResult.
-        Useful for building evaluation context.
+        Useful for building evaluation context. All nodes are retrieved
+        in one batch.
         """
-        results: dict[str, RetrievalResult] = {}
-
-        # Retrieve for target node
-        results[target_node_id] = self.retrieve(
-            query=query,
-            node_ids=[target_node_id],
-            iterations=iterations,
-            top_k=top_k_per_node,
-        )
-
-        # Retrieve for each neighbor
+        # Adapt query for neighbor context
+        neighbor_query = f"Context for node connected to: {query}"
+        node_queries = {
+            target_node_id: RetrievalQuery(
+                query=query, node_ids=[target_node_id], iterations=iterations
+            )
+        }
         for neighbor_id in neighbor_node_ids:
-            # Adapt query for neighbor context
-            neighbor_query = f"Context for node connected to: {query}"
-            results[neighbor_id] = self.retrieve(
-                query=neighbor_query,
-                node_ids=[neighbor_id],
-                iterations=max(1, iterations - 1),  # Fewer iterations for neighbors
-                top_k=top_k_per_node,
+            node_queries.setdefault(
+                neighbor_id,
+                RetrievalQuery(
+                    query=neighbor_query,
+                    node_ids=[neighbor_id],
+                    # Fewer iterations for neighbors
+                    iterations=max(1, iterations - 1),
+                ),
             )
 
-        return results
+        results = self.retrieve_batch(list(node_queries.values()), top_k=top_k_per_node)
+        return dict(zip(node_queries, results))
 
     def _retrieve_single(
         self,
@@ -259,18 +332,42 @@ class IterativeRetriever:
         max_distance: Optional[float] = None,
     ) -> list[RetrievedMemory]:
         """Perform a single retrieval pass."""
-        # Generate query embedding
-        query_embedding = self.embedding_generator.generate_embedding(query)
+        return self._retrieve_many(
+            [query],
+            node_ids=[node_ids],
+            memory_type=memory_type,
+            limit=limit,
+            max_distance=max_distance,
+        )[0]
 
-        # Search vector store
-        raw_results = self.vector_store.search_similar(
-            query_embedding=query_embedding,
+    def _retrieve_many(
+        self,
+        queries: list[str],
+        node_ids: list[Optional[list[str]]],
+        memory_type: Optional[str] = None,
+        limit: int = 10,
+        max_distance: Optional[float] = None,
+    ) -> list[list[RetrievedMemory]]:
+        """Perform one retrieval pass for several queries."""
+        # One embedding batch and one vector store pass for all queries
+        query_embeddings = self.embedding_generator.generate_embeddings_batch(queries)
+        raw_batches = self.vector_store.search_similar_batch(
+            query_embeddings,
             limit=limit,
             memory_type=memory_type,
             node_ids=node_ids,
+            embedding_model=self.embedding_generator.model,
         )
+        return [
+            self._to_memories(raw_results, max_distance) for raw_results in raw_batches
+        ]
 
-        # Convert to RetrievedMemory objects
+    def _to_memories(
+        self,
+        raw_results: list[dict[str, Any]],
+        max_distance: Optional[float],
+    ) -> list[RetrievedMemory]:
+        """Convert vector store rows to RetrievedMemory objects."""
         memories = []
         for r in raw_results:
             distance = r.get("distance", 0.0)
@@ -32,6 +32,7 @@ from pxnodes.llm.context.artifacts import (
     ARTIFACT_TRIPLES,
     PRECOMPUTE_MODEL,
     ArtifactInventory,
+    record_artifact_embeddings,
 )
 from pxnodes.llm.context.base.registry import StrategyRegistry
 from pxnodes.llm.context.base.strategy import BaseContextStrategy, LLMProvider
@@ -42,6 +43,8 @@ from pxnodes.llm.context.base.types import (
     StrategyType,
     get_layer_name,
 )
+from pxnodes.llm.context.shared.concurrency import run_in_worker
+from pxnodes.llm.context.shared.graph_retrieval import get_chart_containers
 from pxnodes.llm.context.structural_memory.chunks import Chunk
 from pxnodes.llm.context.structural_memory.facts import AtomicFact
 from pxnodes.llm.context.structural_memory.summaries import Summary
@@ -76,7 +79,8 @@ class StructuralMemoryStrategy(BaseContextStrategy):
     preserving the benefits of iterative query refinement.
 
     Attributes:
-        embedding_model: OpenAI embedding model name
+        embedding_model: Embedding model name (backend default if None)
+        embedding_backend: Embedding backend name (EMBEDDING_BACKEND if None)
         retrieval_iterations: Number of query refinement iterations (paper default: 3)
         retrieval_top_k: Number of memories to retrieve per iteration (paper: T=50)
         use_iterative_retrieval: Enable iterative retrieval (vs direct extraction)
@@ -90,7 +94,8 @@ class StructuralMemoryStrategy(BaseContextStrategy):
     def __init__(
         self,
         llm_provider: Optional[LLMProvider] = None,
-        embedding_model: str = "text-embedding-3-small",
+        embedding_model: Optional[str] = None,
+        embedding_backend: Optional[str] = None,
         retrieval_iterations: int = 3,
         retrieval_top_k: int = 50,
         retrieval_max_distance: Optional[float] = 2.0,
@@ -114,7 +119,9 @@ class StructuralMemoryStrategy(BaseContextStrategy):
         Args:
             llm_provider: LLM for extraction and query refinement (ignored,
                 always uses PRECOMPUTE_MODEL)
-            embedding_model: OpenAI embedding model name (unchanged)
+            embedding_model: Embedding model name (backend default if None)
+            embedding_backend: Embedding backend name ("openai", "ollama",
+                "hashing"); EMBEDDING_BACKEND setting if None
             retrieval_iterations: Number of query refinement iterations (N in paper)
             retrieval_top_k: Memories to retrieve per iteration (T in paper, default 50)
             retrieval_max_distance: Maximum distance to keep retrieved memories
@@ -140,6 +147,7 @@ class StructuralMemoryStrategy(BaseContextStrategy):
             super().__init__(llm_provider=None, **kwargs)
 
         self.embedding_model = embedding_model
+        self.embedding_backend = embedding_backend
         self.retrieval_iterations = retrieval_iterations
         self.retrieval_top_k = retrieval_top_k
         self.retrieval_max_distance = retrieval_max_distance
@@ -181,7 +189,7 @@ class StructuralMemoryStrategy(BaseContextStrategy):
         # ============================================================
         # STAGE 1: Deterministic Graph Scoping (Full chart baseline)
         # ============================================================
-        containers = scope.chart.containers.select_related("content").all()
+        containers = get_chart_containers(scope.chart)
         all_nodes = [c.content for c in containers if c.content is not None]
         if scope.target_node not in all_nodes:
             all_nodes.append(scope.target_node)
@@ -478,6 +486,7 @@ class StructuralMemoryStrategy(BaseContextStrategy):
         retriever = IterativeRetriever(
             llm_provider=cast(RetrieverLLMProvider, self.llm_provider),
             embedding_model=self.embedding_model,
+            embedding_backend=self.embedding_backend,
         )
 
         try:
@@ -548,7 +557,7 @@ class StructuralMemoryStrategy(BaseContextStrategy):
         Iterative retrieval assumes knowledge triples and atomic facts exist
         in the vector store. If missing, generate and store them.
         """
-        from pxnodes.llm.context.shared.embeddings import OpenAIEmbeddingGenerator
+        from pxnodes.llm.context.shared.embeddings import get_embedding_backend
         from pxnodes.llm.context.shared.vector_store import VectorStore
 
         if not self.llm_provider:
@@ -556,6 +565,7 @@ class StructuralMemoryStrategy(BaseContextStrategy):
 
         vector_store = VectorStore()
         to_embed: list[dict[str, Any]] = []
+        embedded_artifacts: list[Any] = []
 
         from pxnodes.llm.context.change_detection import has_node_changed
 
@@ -616,11 +626,19 @@ class StructuralMemoryStrategy(BaseContextStrategy):
                             triple
                         )
 
+                embedded_artifacts.extend(
+                    artifact
+                    for artifact in edge_artifacts
+                    if artifact.artifact_type == ARTIFACT_EDGE_TRIPLES
+                )
+
                 for node in nodes_to_process:
                     node_id = str(node.id)
                     triples_data: list[dict[str, Any]] = []
                     facts_data: list[dict[str, Any]] = []
                     for artifact in node_artifacts.get(node_id, []):
+                        if artifact.artifact_type in (ARTIFACT_TRIPLES, ARTIFACT_FACTS):
+                            embedded_artifacts.append(artifact)
                         if artifact.artifact_type == ARTIFACT_TRIPLES:
                             triples_data = artifact.content or []
                         elif artifact.artifact_type == ARTIFACT_FACTS:
@@ -689,7 +707,9 @@ class StructuralMemoryStrategy(BaseContextStrategy):
                         )
 
             if to_embed:
-                generator = OpenAIEmbeddingGenerator(model=self.embedding_model)
+                generator = get_embedding_backend(
+                    backend=self.embedding_backend, model=self.embedding_model
+                )
                 embeddings = generator.generate_embeddings_batch(
                     [item["content"] for item in to_embed]
                 )
@@ -708,8 +728,15 @@ class StructuralMemoryStrategy(BaseContextStrategy):
                         embedding=embedding,
                         chart_id=item["chart_id"],
                         metadata=item["metadata"],
+                        embedding_model=generator.model,
                     )
 
+                record_artifact_embeddings(
+                    embedded_artifacts,
+                    embedding_model=generator.model,
+                    embedding_dim=generator.dimensions,
+                )
+
                 logfire.info(
                     "structural_memory.vector_store_populated",
                     stored_count=len(to_embed),
@@ -974,14 +1001,12 @@ class StructuralMemoryStrategy(BaseContextStrategy):
         Returns:
             ContextResult with all four memory structures
         """
-        import asyncio
-
         with logfire.span(
             "structural_memory.build_context_async",
             target_node=scope.target_node.name,
             chart=scope.chart.name,
         ):
-            return await asyncio.to_thread(self.build_context, scope, query)
+            return await run_in_worker(self.build_context, scope, query)
 
     def get_layer_context(
         self,
@@ -1637,7 +1662,7 @@ class SimpleStructuralMemoryStrategy(StructuralMemoryStrategy):
 
         Full-chart traversal + triples/facts only (no summaries/chunks).
         """
-        containers = scope.chart.containers.select_related("content").all()
+        containers = get_chart_containers(scope.chart)
         all_nodes = [c.content for c in containers if c.content is not None]
         if scope.target_node not in all_nodes:
             all_nodes.append(scope.target_node)
@@ -1706,9 +1731,7 @@ class SimpleStructuralMemoryStrategy(StructuralMemoryStrategy):
         scope: EvaluationScope,
         query: Optional[str] = None,
     ) -> ContextResult:
-        import asyncio
-
-        return await asyncio.to_thread(self.build_context, scope, query)
+        return await run_in_worker(self.build_context, scope, query)
 
     def _build_domain_layer(self, scope: EvaluationScope) -> LayerContext:
         """Build L1 Domain layer with facts/triples only (no summaries/chunks)."""
@@ -0,0 +1,212 @@
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from pxcharts.models import PxChart, PxChartContainer, PxChartEdge
+from pxnodes.llm.context.evaluator import (
+    ChartEvaluationResult,
+    NodeCoherenceEvaluator,
+    NodeEvaluationResult,
+)
+from pxnodes.llm.context.shared import vector_store
+from pxnodes.llm.context.shared.graph_retrieval import ChartSnapshot, get_graph_slice
+from pxnodes.models import ChartEvaluationRun, PxNode
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="eval", password="pw")
+
+
+@pytest.fixture
+def chart(user):
+    """Chart with a diamond a -> (b, c) -> d plus a container without content."""
+    project = Project.objects.create(user=user, name="p", is_current=True)
+    chart = PxChart.objects.create(name="c", description="", project=project)
+    chart.owner = user
+    chart.save()
+    containers = {}
+    for name in "abcd":
+        node = PxNode.objects.create(
+            name=name, description=f"node {name}", project=project, owner=user
+        )
+        containers[name] = PxChartContainer.objects.create(
+            name=name, px_chart=chart, content=node
+        )
+    PxChartContainer.objects.create(name="empty", px_chart=chart)
+    for source, target in ["ab", "ac", "bd", "cd"]:
+        PxChartEdge.objects.create(
+            px_chart=chart, source=containers[source], target=containers[target]
+        )
+    return chart
+
+
+def names(nodes):
+    return sorted(node.name for node in nodes)
+
+
+class FakeLLM:
+    def generate(self, prompt, **kwargs):
+        return '{"is_coherent": true, "issues": []}'
+
+
+@pytest.fixture
+def evaluator(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "VECTOR_DB_PATH", tmp_path / "vectors.db")
+    with override_settings(EMBEDDING_BACKEND="hashing"):
+        evaluator = NodeCoherenceEvaluator(llm_provider=FakeLLM())
+        yield evaluator
+        evaluator.close()
+
+
+@pytest.mark.django_db
+class TestChartSnapshot:
+    def test_graph_slice_matches_queries(self, chart):
+        snapshot = ChartSnapshot.load(chart)
+
+        for node in snapshot.nodes():
+            expected = get_graph_slice(node, chart, depth=2)
+            actual = snapshot.graph_slice(node, depth=2)
+            assert names(actual.previous_nodes) == names(expected.previous_nodes)
+            assert names(actual.next_nodes) == names(expected.next_nodes)
+
+    def test_slices_need_no_queries(self, chart, django_assert_num_queries):
+        snapshot = ChartSnapshot.load(chart)
+        (node_d,) = [n for n in snapshot.nodes() if n.name == "d"]
+
+        with django_assert_num_queries(0):
+            graph_slice = snapshot.graph_slice(node_d)
+            components = [list(n.components.all()) for n in graph_slice.all_nodes]
+
+        assert names(graph_slice.previous_nodes) == ["b", "c"]
+        assert components == [[], [], []]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentChartEvaluation:
+    def test_bounded_parallelism_and_chart_order(self, chart, evaluator):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def fake_evaluate(node, chart, snapshot=None):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return NodeEvaluationResult(str(node.id), node.name, is_coherent=True)
+
+        evaluator.evaluate_node = fake_evaluate
+        seen = []
+        result = evaluator.evaluate_chart(
+            chart, max_concurrency=2, on_result=lambda r: seen.append(r.node_name)
+        )
+
+        assert state["peak"] == 2
+        assert [r.node_name for r in result.node_results] == ["a", "b", "c", "d"]
+        assert sorted(seen) == ["a", "b", "c", "d"]
+
+    def test_resume_skips_completed_nodes(self, chart, evaluator):
+        evaluated = []
+
+        def fake_evaluate(node, chart, snapshot=None):
+            evaluated.append(node.name)
+            return NodeEvaluationResult(str(node.id), node.name, is_coherent=False)
+
+        evaluator.evaluate_node = fake_evaluate
+        node_a = PxNode.objects.get(name="a")
+        done = NodeEvaluationResult(str(node_a.id), "a", is_coherent=True)
+
+        result = evaluator.evaluate_chart(chart, completed={str(node_a.id): done})
+
+        assert sorted(evaluated) == ["b", "c", "d"]
+        assert result.node_results[0] is done
+        assert len(result.node_results) == 4
+
+    def test_full_evaluation_in_workers(self, chart, evaluator):
+        result = evaluator.evaluate_chart(chart, max_concurrency=3)
+
+        assert [r.node_name for r in result.node_results] == ["a", "b", "c", "d"]
+        assert all(r.is_coherent and r.error is None for r in result.node_results)
+
+
+@pytest.mark.django_db
+class TestCoherenceEvaluateView:
+    @pytest.fixture
+    def client(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_resume_run(self, client, chart, monkeypatch):
+        node_a = PxNode.objects.get(name="a")
+        run = ChartEvaluationRun.objects.create(
+            owner=chart.owner,
+            chart=chart,
+            params={"node_ids": None, "iterations": 1},
+            results={
+                str(node_a.id): NodeEvaluationResult(
+                    str(node_a.id), "a", is_coherent=True
+                ).to_dict()
+            },
+        )
+
+        def evaluate_chart(self, chart, **kwargs):
+            assert set(kwargs["completed"]) == {str(node_a.id)}
+            for node in PxNode.objects.exclude(name="a").order_by("name"):
+                kwargs["on_result"](
+                    NodeEvaluationResult(str(node.id), node.name, is_coherent=True)
+                )
+            return ChartEvaluationResult(str(chart.id), chart.name)
+
+        monkeypatch.setattr(NodeCoherenceEvaluator, "evaluate_chart", evaluate_chart)
+        with override_settings(EMBEDDING_BACKEND="hashing"):
+            response = client.post(
+                reverse("structural-memory-evaluate"),
+                {"chart_id": str(chart.id), "run_id": str(run.id)},
+                format="json",
+            )
+
+        assert response.status_code == 200
+        assert response.json()["run_id"] == str(run.id)
+        run.refresh_from_db()
+        assert run.status == ChartEvaluationRun.STATUS_COMPLETED
+        assert run.completed_nodes == 4
+
+        progress = client.get(
+            reverse("structural-memory-evaluate-run", args=[run.id])
+        ).json()
+        assert progress["status"] == "completed"
+        assert progress["completed"] == 4
+
+    @pytest.mark.django_db(transaction=True)
+    def test_stream_records_each_node(self, client, chart, evaluator, monkeypatch):
+        def fake_evaluate(self, node, chart, snapshot=None):
+            return NodeEvaluationResult(str(node.id), node.name, is_coherent=True)
+
+        monkeypatch.setattr(NodeCoherenceEvaluator, "evaluate_node", fake_evaluate)
+        with override_settings(EMBEDDING_BACKEND="hashing"):
+            response = client.post(
+                reverse("structural-memory-evaluate"),
+                {"chart_id": str(chart.id), "stream": True, "max_concurrency": 2},
+                format="json",
+            )
+
+            async def read():
+                return b"".join([chunk async for chunk in response.streaming_content])
+
+            body = async_to_sync(read)().decode()
+
+        events = [line[7:] for line in body.splitlines() if line.startswith("event: ")]
+        assert events == ["start", "node", "node", "node", "node", "complete"]
+        run = ChartEvaluationRun.objects.get()
+        assert run.status == ChartEvaluationRun.STATUS_COMPLETED
+        assert run.completed_nodes == 4
@@ -0,0 +1,60 @@
+import math
+
+import pytest
+from django.test import override_settings
+
+from pxnodes.llm.context.shared.embeddings import (
+    HashingEmbeddingBackend,
+    OllamaEmbeddingBackend,
+    get_embedding_backend,
+)
+
+
+class TestHashingEmbeddingBackend:
+    def test_deterministic_and_normalized(self):
+        backend = HashingEmbeddingBackend(dimensions=64)
+
+        first, second = backend.generate_embeddings_batch(["a sword", "a sword"])
+
+        assert first == second
+        assert len(first) == 64
+        assert math.isclose(sum(v * v for v in first), 1.0)
+
+    def test_dimension_from_model_name(self):
+        backend = HashingEmbeddingBackend(model="hashing-32")
+
+        assert backend.dimensions == 32
+        assert len(backend.generate_embedding("boss fight")) == 32
+
+    def test_shared_words_are_similar(self):
+        backend = HashingEmbeddingBackend()
+        base, related, unrelated = backend.generate_embeddings_batch(
+            ["jump over spikes", "jump over lava", "inventory menu"]
+        )
+
+        def cosine(a, b):
+            return sum(x * y for x, y in zip(a, b))
+
+        assert cosine(base, related) > cosine(base, unrelated)
+
+
+class TestGetEmbeddingBackend:
+    @override_settings(EMBEDDING_BACKEND="hashing", EMBEDDING_MODEL="hashing-16")
+    def test_uses_configured_backend_and_model(self):
+        backend = get_embedding_backend()
+
+        assert isinstance(backend, HashingEmbeddingBackend)
+        assert backend.dimensions == 16
+
+    @override_settings(EMBEDDING_BACKEND="hashing", EMBEDDING_MODEL="hashing-16")
+    def test_explicit_backend_ignores_configured_model(self):
+        backend = get_embedding_backend("ollama", base_url="http://ollama", timeout=1)
+
+        assert isinstance(backend, OllamaEmbeddingBackend)
+        assert backend.model == "nomic-embed-text"
+        assert backend.dimensions == 768
+        backend.close()
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown embedding backend"):
+            get_embedding_backend("nope")
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pxnodes.llm.context.shared.embedding_cache import EmbeddingCache
+from pxnodes.llm.context.shared.embeddings import OpenAIEmbeddingGenerator
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(db_path=tmp_path / "cache.db", memory_size=2)
+    yield cache
+    cache.close()
+
+
+def fake_response(texts):
+    return SimpleNamespace(
+        data=[SimpleNamespace(embedding=[float(len(t)), 0.5]) for t in texts]
+    )
+
+
+@pytest.fixture
+def generator(cache):
+    with patch("pxnodes.llm.context.shared.embeddings.OpenAI") as openai_cls:
+        client = MagicMock()
+        client.embeddings.create.side_effect = lambda model, input: fake_response(
+            input if isinstance(input, list) else [input]
+        )
+        openai_cls.return_value = client
+        generator = OpenAIEmbeddingGenerator(use_cache=False)
+    generator.cache = cache
+    return generator
+
+
+class TestEmbeddingCache:
+    def test_round_trip_is_keyed_by_model(self, cache):
+        cache.set_many("model-a", {"hello": [1.0, 2.0]})
+
+        assert cache.get_many("model-a", ["hello", "other"]) == {"hello": [1.0, 2.0]}
+        assert cache.get_many("model-b", ["hello"]) == {}
+
+    def test_persists_beyond_memory_layer(self, cache, tmp_path):
+        cache.set_many("m", {"a": [1.0], "b": [2.0], "c": [3.0]})
+
+        reopened = EmbeddingCache(db_path=tmp_path / "cache.db")
+        try:
+            assert reopened.get_many("m", ["a", "b", "c"]) == {
+                "a": [1.0],
+                "b": [2.0],
+                "c": [3.0],
+            }
+        finally:
+            reopened.close()
+
+
+class TestCachedGenerator:
+    def test_batch_only_sends_misses(self, generator, cache):
+        cache.set_many(generator.model, {"known": [9.0, 9.0]})
+
+        result = generator.generate_embeddings_batch(["known", "new", "new"])
+
+        generator.client.embeddings.create.assert_called_once_with(
+            model=generator.model, input=["new"]
+        )
+        assert result == [[9.0, 9.0], [3.0, 0.5], [3.0, 0.5]]
+
+    def test_repeat_single_query_hits_cache(self, generator):
+        first = generator.generate_embedding("query")
+        second = generator.generate_embedding("query")
+
+        assert first == second
+        assert generator.client.embeddings.create.call_count == 1
@@ -0,0 +1,175 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pxnodes.llm.context.hmem.strategy import HMEMStrategy
+from pxnodes.models import HMEMLayerEmbedding
+
+
+def make_entry(positional_index, layer=1, child_indices=None):
+    return HMEMLayerEmbedding.objects.create(
+        positional_index=positional_index,
+        layer=layer,
+        content=positional_index,
+        embedding=[0.0, 1.0],
+        embedding_dim=2,
+        content_hash=positional_index,
+        child_indices=child_indices or [],
+    )
+
+
+@pytest.mark.django_db
+class TestBulkRegisterChildren:
+    def test_merges_children_without_duplicates(self):
+        parent = make_entry("L1.p._.a._", child_indices=["L2.p.c.x._"])
+
+        changed = HMEMLayerEmbedding.bulk_register_children(
+            [
+                (parent, ["L2.p.c.x._", "L2.p.c.y._"]),
+                (parent, ["L2.p.c.y._", "L2.p.c.z._"]),
+            ]
+        )
+
+        parent.refresh_from_db()
+        assert changed == 1
+        assert parent.child_indices == ["L2.p.c.x._", "L2.p.c.y._", "L2.p.c.z._"]
+
+    def test_single_update_for_many_parents(self):
+        parents = [make_entry(f"L2.p.c.{i}._", layer=2) for i in range(5)]
+        children = [f"L3.p.c.path{i}._" for i in range(10)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            changed = HMEMLayerEmbedding.bulk_register_children(
+                (parent, children) for parent in parents
+            )
+
+        assert changed == 5
+        assert len(ctx.captured_queries) == 1
+        for parent in parents:
+            parent.refresh_from_db()
+            assert parent.child_indices == children
+
+    def test_no_write_when_unchanged(self):
+        parent = make_entry("L1.p._.b._", child_indices=["L2.p.c.x._"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            changed = HMEMLayerEmbedding.bulk_register_children(
+                [(parent, ["L2.p.c.x._"])]
+            )
+
+        assert changed == 0
+        assert ctx.captured_queries == []
+
+
+class FakeEmbeddingGenerator:
+    model = "fake-embedding"
+    dimensions = 2
+
+    def __init__(self, *args, **kwargs):
+        self.batches: list[list[str]] = []
+
+    def generate_embeddings_batch(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def make_item(positional_index, content, layer=1, parent_index=None):
+    return {
+        "content": content,
+        "layer": layer,
+        "positional_index": positional_index,
+        "parent_index": parent_index,
+        "node": None,
+        "chart": None,
+    }
+
+
+@pytest.fixture
+def strategy():
+    with patch(
+        "pxnodes.llm.context.hmem.retriever.get_embedding_backend",
+        FakeEmbeddingGenerator,
+    ):
+        yield HMEMStrategy()
+
+
+@pytest.mark.django_db
+class TestStoreEmbeddingsBatch:
+    def test_new_items_use_one_embedding_call(self, strategy):
+        items = [
+            make_item("L1.p._.a._", "domain"),
+            make_item("L2.p.c.b._", "category", layer=2, parent_index="L1.p._.a._"),
+            make_item("L3.p.c.d._", "domain", layer=3),
+        ]
+
+        entries = strategy._store_embeddings_batch(items)
+
+        generator = strategy.retriever.embedding_generator
+        assert generator.batches == [["domain", "category"]]
+        assert [e.positional_index for e in entries] == [
+            "L1.p._.a._",
+            "L2.p.c.b._",
+            "L3.p.c.d._",
+        ]
+        assert all(e.pk for e in entries)
+        assert HMEMLayerEmbedding.objects.count() == 3
+
+    def test_only_changed_content_is_embedded(self, strategy):
+        strategy._store_embeddings_batch(
+            [make_item("L1.p._.a._", "same"), make_item("L1.p._.b._", "old")]
+        )
+        generator = strategy.retriever.embedding_generator
+        generator.batches.clear()
+
+        entries = strategy._store_embeddings_batch(
+            [
+                make_item("L1.p._.a._", "same", parent_index="L0"),
+                make_item("L1.p._.b._", "new"),
+            ]
+        )
+
+        assert generator.batches == [["new"]]
+        by_index = {e.positional_index: e for e in entries}
+        assert by_index["L1.p._.a._"].parent_index == "L0"
+        stored = HMEMLayerEmbedding.objects.get(positional_index="L1.p._.b._")
+        assert stored.content == "new"
+        assert stored.embedding == [3.0, 1.0]
+
+    def test_unchanged_items_skip_embedding_and_writes(self, strategy):
+        items = [make_item("L1.p._.a._", "same")]
+        strategy._store_embeddings_batch(items)
+        generator = strategy.retriever.embedding_generator
+        generator.batches.clear()
+
+        with CaptureQueriesContext(connection) as ctx:
+            strategy._store_embeddings_batch([make_item("L1.p._.a._", "same")])
+
+        assert generator.batches == []
+        assert len(ctx.captured_queries) == 1
+
+    def test_index_inserted_concurrently_is_updated(self, strategy):
+        generator = strategy.retriever.embedding_generator
+        embed = generator.generate_embeddings_batch
+
+        def embed_while_another_worker_inserts(texts):
+            # Another node's evaluation stores the shared L1 entry after
+            # this one diffed against the table
+            make_entry("L1.p._.a._")
+            return embed(texts)
+
+        generator.generate_embeddings_batch = embed_while_another_worker_inserts
+        entries = strategy._store_embeddings_batch(
+            [make_item("L1.p._.a._", "domain"), make_item("L1.p._.b._", "other")]
+        )
+
+        stored = HMEMLayerEmbedding.objects.get(positional_index="L1.p._.a._")
+        assert HMEMLayerEmbedding.objects.count() == 2
+        assert stored.content == "domain"
+        assert stored.embedding_model == "fake-embedding"
+        assert [e.pk for e in entries] == list(
+            HMEMLayerEmbedding.objects.order_by("positional_index").values_list(
+                "pk", flat=True
+            )
+        )
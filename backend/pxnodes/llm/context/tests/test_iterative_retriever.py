@@ -0,0 +1,161 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+from django.test import override_settings
+
+from pxnodes.llm.context import retriever as legacy_retriever
+from pxnodes.llm.context.evaluator import NodeCoherenceEvaluator
+from pxnodes.llm.context.shared import vector_store as vector_store_module
+from pxnodes.llm.context.structural_memory.retriever import (
+    IterativeRetriever,
+    RetrievalQuery,
+)
+
+pytest.importorskip("sqlite_vec")
+
+MEMORIES = {
+    "node-a": ["the hero finds a sword", "the sword breaks the gate"],
+    "node-b": ["a dragon guards the bridge", "the bridge collapses"],
+}
+
+
+class RefiningLLM:
+    """Appends a keyword per refinement so each round asks something new."""
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, **kwargs):
+        with self._lock:
+            self.calls += 1
+        query = prompt.split("Original Query: ")[1].split("\n")[0]
+        word = next((k for k in self.keywords if k not in query), "")
+        return f"{query} {word}".strip()
+
+
+def _store_memories(retriever):
+    generator = retriever.embedding_generator
+    for node_id, texts in MEMORIES.items():
+        for i, (text, embedding) in enumerate(
+            zip(texts, generator.generate_embeddings_batch(texts))
+        ):
+            retriever.vector_store.store_memory(
+                memory_id=f"{node_id}-{i}",
+                node_id=node_id,
+                memory_type="atomic_fact",
+                content=text,
+                embedding=embedding,
+                embedding_model=generator.model,
+            )
+
+
+@pytest.fixture
+def retriever(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store_module, "VECTOR_DB_PATH", tmp_path / "v.db")
+    with override_settings(EMBEDDING_BACKEND="hashing", EMBEDDING_MODEL="hashing-64"):
+        retriever = IterativeRetriever(llm_provider=RefiningLLM(["gate", "bridge"]))
+    _store_memories(retriever)
+    generator = retriever.embedding_generator
+
+    batches = []
+    embed = generator.generate_embeddings_batch
+
+    def recording_batch(texts, batch_size=None):
+        batches.append(list(texts))
+        return embed(texts, batch_size)
+
+    generator.generate_embeddings_batch = recording_batch
+    retriever.batches = batches
+    yield retriever
+    retriever.close()
+
+
+@pytest.fixture
+def evaluator(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store_module, "VECTOR_DB_PATH", tmp_path / "v.db")
+    with override_settings(EMBEDDING_BACKEND="hashing", EMBEDDING_MODEL="hashing-64"):
+        evaluator = NodeCoherenceEvaluator(
+            llm_provider=RefiningLLM(["gate", "bridge"]),
+            embedding_model="hashing-64",
+        )
+    _store_memories(evaluator.retriever)
+    yield evaluator
+    evaluator.close()
+
+
+class TestBatchedRetrieval:
+    def test_one_embedding_batch_per_round(self, retriever):
+        results = retriever.retrieve_batch(
+            [
+                RetrievalQuery("sword", node_ids=["node-a"], iterations=3),
+                RetrievalQuery("dragon", node_ids=["node-b"], iterations=3),
+            ],
+            top_k=1,
+        )
+
+        # Round 1 embeds both queries together; later rounds only the
+        # queries still surfacing new memories
+        assert retriever.batches[0] == ["sword", "dragon"]
+        assert len(retriever.batches) == max(r.iterations_performed for r in results)
+        assert {m.node_id for m in results[0].memories} == {"node-a"}
+        assert {m.node_id for m in results[1].memories} == {"node-b"}
+
+    def test_stops_when_round_finds_nothing_new(self, retriever):
+        result = retriever.retrieve(
+            "sword", node_ids=["node-a"], iterations=10, top_k=5
+        )
+
+        # Everything for node-a comes back in round 1; round 2 adds nothing
+        assert len(result.memories) == 2
+        assert result.iterations_performed == 2
+        assert retriever.llm_provider.calls == 1
+
+    def test_retrieve_for_nodes_batches_target_and_neighbors(self, retriever):
+        results = retriever.retrieve_for_nodes(
+            target_node_id="node-a",
+            neighbor_node_ids=["node-b"],
+            query="sword",
+            iterations=2,
+            top_k_per_node=1,
+        )
+
+        assert set(results) == {"node-a", "node-b"}
+        assert results["node-b"].iterations_performed == 1
+        assert retriever.batches[0] == [
+            "sword",
+            "Context for node connected to: sword",
+        ]
+
+
+class TestCoherenceEvaluatorRetrieval:
+    def test_legacy_import_path_is_the_batched_retriever(self, evaluator):
+        assert legacy_retriever.IterativeRetriever is IterativeRetriever
+        assert isinstance(evaluator.retriever, IterativeRetriever)
+
+    def test_one_batched_query_per_iteration(self, evaluator):
+        store = evaluator.retriever.vector_store
+        searches = []
+        search_batch = store.search_similar_batch
+
+        def recording_search(query_embeddings, **kwargs):
+            searches.append(len(query_embeddings))
+            return search_batch(query_embeddings, **kwargs)
+
+        store.search_similar_batch = recording_search
+        store.search_similar = Mock(side_effect=AssertionError("per-node search"))
+
+        results = evaluator._get_retriever().retrieve_for_nodes(
+            target_node_id="node-a",
+            neighbor_node_ids=["node-b"],
+            query="sword",
+            iterations=3,
+            top_k_per_node=1,
+        )
+
+        # Round 1 searches the target and its neighbor in one query
+        rounds = max(r.iterations_performed for r in results.values())
+        assert searches[0] == 2
+        assert len(searches) == rounds
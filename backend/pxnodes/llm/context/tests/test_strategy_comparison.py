@@ -0,0 +1,196 @@
+import threading
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from projects.models import Project
+from pxcharts.models import PxChart, PxChartContainer, PxChartEdge
+from pxnodes.llm.context.base import StrategyType
+from pxnodes.llm.context.shared.graph_retrieval import (
+    ChartSnapshot,
+    get_all_paths_through_node,
+    get_backward_paths_to_node,
+    get_chart_edges,
+    get_chart_snapshot,
+    get_forward_paths_from_node,
+    get_full_path,
+)
+from pxnodes.llm.context.shared.llm_adapter import PerThreadUsage
+from pxnodes.llm.context.strategy_evaluator import (
+    StrategyEvaluationResult,
+    StrategyEvaluator,
+)
+from pxnodes.models import PxNode
+
+
+@pytest.fixture
+def chart():
+    """Chart with a diamond a -> (b, c) -> d."""
+    user = get_user_model().objects.create_user(username="cmp", password="pw")
+    project = Project.objects.create(user=user, name="p", is_current=True)
+    chart = PxChart.objects.create(name="c", description="", project=project)
+    containers = {}
+    for name in "abcd":
+        node = PxNode.objects.create(
+            name=name, description=f"node {name}", project=project, owner=user
+        )
+        containers[name] = PxChartContainer.objects.create(
+            name=name, px_chart=chart, content=node
+        )
+    for source, target in ["ab", "ac", "bd", "cd"]:
+        PxChartEdge.objects.create(
+            px_chart=chart, source=containers[source], target=containers[target]
+        )
+    return chart
+
+
+def path_names(paths):
+    return sorted("".join(node.name for node in path) for path in paths)
+
+
+class FakeLLM:
+    last_prompt_tokens = PerThreadUsage()
+    last_completion_tokens = PerThreadUsage()
+    last_total_tokens = PerThreadUsage()
+
+    def __init__(self):
+        self._usage = threading.local()
+
+    def generate(self, prompt, **kwargs):
+        self.last_prompt_tokens = len(prompt) // 4
+        self.last_completion_tokens = 10
+        self.last_total_tokens = self.last_prompt_tokens + 10
+        return '{"global_fit": {"score": 5, "issues": []}}'
+
+
+@pytest.mark.django_db
+class TestAttachedSnapshot:
+    def test_traversals_match_queries_without_queries(
+        self, chart, django_assert_num_queries
+    ):
+        node_b = PxNode.objects.get(name="b")
+        node_d = PxNode.objects.get(name="d")
+        expected = (
+            path_names(get_backward_paths_to_node(node_d, chart)),
+            path_names(get_forward_paths_from_node(node_b, chart)),
+            path_names(get_all_paths_through_node(node_b, chart)),
+            [n.name for n in get_full_path(node_d, chart).previous_nodes],
+        )
+
+        snapshot = ChartSnapshot.load(chart).attach()
+        with django_assert_num_queries(0):
+            actual = (
+                path_names(get_backward_paths_to_node(node_d, chart)),
+                path_names(get_forward_paths_from_node(node_b, chart)),
+                path_names(get_all_paths_through_node(node_b, chart)),
+                [n.name for n in get_full_path(node_d, chart).previous_nodes],
+            )
+            edges = get_chart_edges(chart)
+        snapshot.detach()
+
+        assert actual == expected
+        assert len(edges) == 4
+        assert not hasattr(chart, "_graph_snapshot")
+
+    def test_usage_counters_are_per_thread(self):
+        llm = FakeLLM()
+        llm.last_total_tokens = 5
+        seen = []
+        worker = threading.Thread(target=lambda: seen.append(llm.last_total_tokens))
+        worker.start()
+        worker.join()
+
+        assert seen == [0]
+        assert llm.last_total_tokens == 5
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCompareStrategies:
+    def test_strategies_run_concurrently_on_shared_scope(self, chart):
+        evaluator = StrategyEvaluator(llm_provider=FakeLLM())
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0, "scopes": set()}
+
+        def fake_evaluate(node, chart, strategy_type, scope):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                state["scopes"].add(id(scope))
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return StrategyEvaluationResult(
+                str(node.id),
+                node.name,
+                strategy_type.value,
+                is_coherent=True,
+                timings={"total_ms": 50.0},
+            )
+
+        evaluator.evaluate_node = fake_evaluate
+        strategies = [
+            StrategyType.HMEM,
+            StrategyType.FULL_CONTEXT,
+            StrategyType.SIMPLE_SM,
+        ]
+        result = evaluator.compare_strategies(
+            PxNode.objects.get(name="b"), chart, strategies=strategies
+        )
+
+        summary = result.to_dict()["summary"]
+        assert state["peak"] == 3
+        assert len(state["scopes"]) == 1
+        assert summary["strategies_compared"] == ["hmem", "full_context", "simple_sm"]
+        # peak == 3 shows the overlap; wall time also covers imports and
+        # thread startup, so it is not compared with the fake timings
+        assert summary["sequential_time_ms"] == 150.0
+        assert summary["wall_time_ms"] > 0
+
+    def test_timings_and_token_breakdown(self, chart):
+        evaluator = StrategyEvaluator(llm_provider=FakeLLM())
+
+        result = evaluator.compare_strategies(
+            PxNode.objects.get(name="d"),
+            chart,
+            strategies=[StrategyType.FULL_CONTEXT, StrategyType.HIERARCHICAL_GRAPH],
+        )
+
+        data = result.to_dict()
+        for strategy in ("full_context", "hierarchical_graph"):
+            entry = data["strategies"][strategy]
+            assert entry["error"] is None
+            assert set(entry["timings"]) == {"context_ms", "llm_ms", "total_ms"}
+            usage = entry["usage"]
+            assert usage["context_tokens"] > 0
+            assert usage["total_tokens"] == usage["prompt_tokens"] + 10
+        assert data["summary"]["total_tokens"] == sum(
+            data["strategies"][s]["usage"]["total_tokens"]
+            for s in ("full_context", "hierarchical_graph")
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEvaluateChart:
+    def test_nodes_share_one_attached_snapshot(self, chart):
+        evaluator = StrategyEvaluator(llm_provider=FakeLLM())
+        lock = threading.Lock()
+        snapshots = []
+
+        def fake_evaluate(node, chart, strategy_type, **kwargs):
+            with lock:
+                snapshots.append(get_chart_snapshot(chart))
+            return StrategyEvaluationResult(
+                str(node.id), node.name, strategy_type.value, is_coherent=True
+            )
+
+        evaluator.evaluate_node = fake_evaluate
+        results = evaluator.evaluate_chart(
+            chart, strategy_type=StrategyType.FULL_CONTEXT, max_concurrency=4
+        )
+
+        assert [r.node_name for r in results] == ["a", "b", "c", "d"]
+        assert len(snapshots) == 4
+        assert snapshots[0] is not None
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+        assert get_chart_snapshot(chart) is None
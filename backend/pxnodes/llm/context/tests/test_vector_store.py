@@ -0,0 +1,152 @@
+import pytest
+
+from pxnodes.llm.context.shared import vector_store as vector_store_module
+from pxnodes.llm.context.shared.embeddings import HashingEmbeddingBackend
+from pxnodes.llm.context.shared.vector_store import VectorStore
+
+pytest.importorskip("sqlite_vec")
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "vectors.db"
+    monkeypatch.setattr(vector_store_module, "VECTOR_DB_PATH", path)
+    return path
+
+
+def store_texts(store, backend, texts, node_id="node-1"):
+    for i, (text, embedding) in enumerate(
+        zip(texts, backend.generate_embeddings_batch(texts))
+    ):
+        store.store_memory(
+            memory_id=f"{backend.model}-{i}",
+            node_id=node_id,
+            memory_type="atomic_fact",
+            content=text,
+            embedding=embedding,
+            embedding_model=backend.model,
+        )
+
+
+TEXTS = ["jump over spikes", "collect the golden key", "boss fight in the castle"]
+
+
+class TestDimensionAwareIndexes:
+    def test_models_get_separate_tables(self, db_path):
+        small = HashingEmbeddingBackend(model="hashing-32")
+        large = HashingEmbeddingBackend(model="hashing-64")
+        store = VectorStore()
+        store_texts(store, small, TEXTS)
+        store_texts(store, large, TEXTS, node_id="node-2")
+
+        indexes = store.list_indexes()
+        assert sorted(index.embedding_dim for index in indexes) == [32, 64]
+
+        results = store.search_similar(
+            large.generate_embedding("golden key"),
+            limit=2,
+            embedding_model=large.model,
+        )
+        assert results[0]["content"] == "collect the golden key"
+        assert {r["node_id"] for r in results} == {"node-2"}
+        store.close()
+
+    def test_same_dimension_models_are_not_merged(self, db_path, settings):
+        settings.EMBEDDING_MODEL = "hashing-32"
+        configured = HashingEmbeddingBackend(model="hashing-32")
+        other = HashingEmbeddingBackend(model="other-hashing-32")
+        store = VectorStore()
+        store_texts(store, configured, TEXTS)
+        store_texts(store, other, TEXTS, node_id="node-2")
+        query = configured.generate_embedding("golden key")
+
+        assert len(store.list_indexes(32)) == 2
+        by_default = store.search_similar(query, limit=10)
+        assert {r["node_id"] for r in by_default} == {"node-1"}
+        assert by_default == store.search_similar(
+            query, limit=10, embedding_model=configured.model
+        )
+        by_other = store.search_similar(query, limit=10, embedding_model=other.model)
+        assert {r["node_id"] for r in by_other} == {"node-2"}
+        store.close()
+
+    def test_delete_removes_vectors_from_all_tables(self, db_path):
+        backend = HashingEmbeddingBackend(model="hashing-32")
+        store = VectorStore()
+        store_texts(store, backend, TEXTS)
+
+        assert store.delete_memories_by_node("node-1") == 3
+        assert (
+            store.search_similar(
+                backend.generate_embedding("key"), embedding_model=backend.model
+            )
+            == []
+        )
+        store.close()
+
+    @pytest.mark.parametrize("quantization", ["int8", "binary"])
+    def test_quantized_search_reranks_with_float_distance(self, db_path, quantization):
+        backend = HashingEmbeddingBackend(model="hashing-64")
+        store = VectorStore(quantization=quantization)
+        store_texts(store, backend, TEXTS)
+        query = backend.generate_embedding("boss fight")
+
+        quantized = store.search_similar(query, limit=3, embedding_model=backend.model)
+        exact = store.search_similar(
+            query, limit=3, embedding_model=backend.model, use_quantized=False
+        )
+
+        assert store.list_indexes()[0].quantization == quantization
+        assert quantized[0]["content"] == "boss fight in the castle"
+        assert [r["id"] for r in quantized] == [r["id"] for r in exact]
+        assert quantized[0]["distance"] == pytest.approx(exact[0]["distance"])
+        store.close()
+
+    def test_rebuild_adds_quantized_companion(self, db_path):
+        backend = HashingEmbeddingBackend(model="hashing-32")
+        store = VectorStore()
+        store_texts(store, backend, TEXTS)
+
+        counts = store.rebuild_indexes(quantization="int8")
+        store.close()
+
+        reopened = VectorStore()
+        (index,) = reopened.list_indexes()
+        assert counts == {index.table_name: 3}
+        assert index.quantization == "int8"
+        results = reopened.search_similar(
+            backend.generate_embedding("golden key"), embedding_model=backend.model
+        )
+        assert results[0]["content"] == "collect the golden key"
+        reopened.close()
+
+    def test_unknown_quantization(self, db_path):
+        with pytest.raises(ValueError):
+            VectorStore(quantization="pq")
+
+
+class TestBatchSearch:
+    @pytest.mark.parametrize("quantization", [None, "int8"])
+    def test_batch_matches_individual_searches(self, db_path, quantization):
+        backend = HashingEmbeddingBackend(model="hashing-64")
+        store = VectorStore(quantization=quantization)
+        store_texts(store, backend, TEXTS)
+        store_texts(store, backend, ["golden key vault"], node_id="node-2")
+        queries = backend.generate_embeddings_batch(
+            ["golden key", "boss fight castle", "key vault"]
+        )
+        filters = [None, ["node-1"], ["node-2"]]
+
+        batched = store.search_similar_batch(
+            queries, limit=2, node_ids=filters, embedding_model=backend.model
+        )
+        individual = [
+            store.search_similar(
+                query, limit=2, node_ids=node_ids, embedding_model=backend.model
+            )
+            for query, node_ids in zip(queries, filters)
+        ]
+
+        assert batched == individual
+        assert batched[1][0]["content"] == "boss fight in the castle"
+        store.close()
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from projects.models import Project
+from pxcharts.models import PxChart, PxChartContainer, PxChartEdge
+from pxnodes.llm.context.base import StrategyType
+from pxnodes.llm.context.shared.concurrency import iter_concurrently, run_in_worker
+from pxnodes.llm.workflows import (
+    PxNodesCoherenceMonolithicWorkflow,
+    PxNodesCoherenceWorkflow,
+)
+from pxnodes.models import PxComponent, PxComponentDefinition, PxNode
+
+DIMENSION = {"score": 5, "reasoning": "fine"}
+
+
+@pytest.fixture
+def chart():
+    """Chart a -> b -> c where b has a component."""
+    user = get_user_model().objects.create_user(username="wf", password="pw")
+    project = Project.objects.create(user=user, name="p", is_current=True)
+    chart = PxChart.objects.create(name="c", description="", project=project)
+    definition = PxComponentDefinition.objects.create(
+        name="Health", type="number", owner=user, project=project
+    )
+    containers = []
+    for name in "abc":
+        node = PxNode.objects.create(
+            name=name, description=f"node {name}", project=project, owner=user
+        )
+        containers.append(
+            PxChartContainer.objects.create(name=name, px_chart=chart, content=node)
+        )
+    PxComponent.objects.create(
+        node=containers[1].content, definition=definition, value=10, owner=user
+    )
+    for source, target in zip(containers, containers[1:]):
+        PxChartEdge.objects.create(px_chart=chart, source=source, target=target)
+    return chart
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return json.dumps(
+            {
+                "backward_coherence": DIMENSION,
+                "forward_coherence": DIMENSION,
+                "global_fit": DIMENSION,
+                "node_integrity": DIMENSION,
+            }
+        )
+
+
+def test_run_in_worker_calls_run_in_parallel():
+    # Both calls must be in flight at once to pass the barrier; on a single
+    # shared sync thread the second would never start.
+    barrier = threading.Barrier(2, timeout=5)
+
+    async def both():
+        return await asyncio.gather(
+            run_in_worker(barrier.wait), run_in_worker(barrier.wait)
+        )
+
+    assert sorted(asyncio.run(both())) == [0, 1]
+
+
+def test_closing_iter_concurrently_does_not_wait_for_running_calls():
+    release = threading.Event()
+    started = []
+
+    def evaluate(item):
+        started.append(item)
+        if item:
+            release.wait()
+        return item
+
+    async def read_first_and_close():
+        results = iter_concurrently(range(4), evaluate, max_concurrency=2)
+        first = await results.__anext__()
+        await results.aclose()
+        # Item 1 is still blocked in its worker when aclose() returns
+        return first, release.is_set()
+
+    # Unblocks the worker even if aclose() waits on it, so a regression
+    # fails instead of hanging
+    safety = threading.Timer(5, release.set)
+    safety.start()
+    try:
+        first, released = asyncio.run(read_first_and_close())
+    finally:
+        release.set()
+        safety.cancel()
+
+    assert first == (0, 0)
+    assert not released
+    assert 3 not in started
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWorkflowInputs:
+    def test_agentic_inputs_come_from_one_snapshot(
+        self, chart, django_assert_max_num_queries
+    ):
+        workflow = PxNodesCoherenceWorkflow(model_manager=None)
+        node_b = PxNode.objects.get(name="b")
+
+        with django_assert_max_num_queries(4):
+            snapshot, node, details, path_metadata = workflow._load_inputs(
+                node_b, chart
+            )
+        snapshot.detach()
+
+        assert details["components"] == [{"name": "Health", "value": 10}]
+        assert path_metadata["predecessors"] == {"a"}
+        assert path_metadata["successors"] == {"c"}
+
+    def test_concurrent_monolithic_evaluations(self, chart):
+        llm = FakeLLM()
+        workflow = PxNodesCoherenceMonolithicWorkflow(
+            model_manager=None,
+            strategy_type=StrategyType.FULL_CONTEXT,
+            llm_provider=llm,
+        )
+        nodes = list(PxNode.objects.order_by("name"))
+        charts = [PxChart.objects.get(id=chart.id) for _ in nodes]
+
+        async def evaluate_all():
+            return await asyncio.gather(
+                *(
+                    workflow.evaluate_node(node=node, chart=c)
+                    for node, c in zip(nodes, charts)
+                )
+            )
+
+        results = asyncio.run(evaluate_all())
+
+        assert [r.node_name for r in results] == ["a", "b", "c"]
+        assert all(r.overall_score == 5 for r in results)
+        assert any("- Health: 10" in prompt for prompt in llm.prompts)
+        assert not any(hasattr(c, "_graph_snapshot") for c in charts)
@@ -290,7 +290,12 @@ def _get_component_value(
 def _get_component_map(node: PxNode) -> dict[str, Any]:
     """Get a map of component definition names to values."""
     components: dict[str, Any] = {}
-    for comp in node.components.select_related("definition").all():
+    if "components" in getattr(node, "_prefetched_objects_cache", {}):
+        # Use components prefetched with their definitions (ChartSnapshot)
+        queryset = node.components.all()
+    else:
+        queryset = node.components.select_related("definition").all()
+    for comp in queryset:
         definition_name = comp.definition.name.lower().replace(" ", "_")
         components[definition_name] = comp.value
     return components
@@ -11,6 +11,10 @@ Coordinates 4 specialized dimension agents running in parallel:
 Monolithic Workflow:
 Single LLM call evaluating all 4 dimensions with unified prompt.
 Designed for thesis comparison between agentic vs monolithic approaches.
+
+Both workflows load the chart once (ChartSnapshot) and run all ORM-bound
+preparation through run_in_worker(), so concurrent evaluations don't queue
+behind Django's single thread_sensitive sync thread.
 """
 
 import asyncio
@@ -42,6 +46,8 @@ from pxnodes.llm.context.base import (
     StrategyRegistry,
     StrategyType,
 )
+from pxnodes.llm.context.shared.concurrency import run_in_worker
+from pxnodes.llm.context.shared.graph_retrieval import ChartSnapshot, get_chart_edges
 from pxnodes.models import PxNode
 
 logger = logging.getLogger(__name__)
@@ -338,7 +344,6 @@ class PxNodesCoherenceWorkflow:
             CoherenceAggregatedResult with all dimension scores
         """
         import logfire
-        from asgiref.sync import sync_to_async
 
         start_time = time.time()
         total_tokens = 0
@@ -356,41 +361,23 @@ class PxNodesCoherenceWorkflow:
             node_id=str(node.id),
             node_name=node.name,
         ):
-            # Build context using strategy
-            # Use async version for parallel extraction if available (StructuralMemory)
-            strategy = self._get_strategy()
-            scope = EvaluationScope(
-                target_node=node,
-                chart=chart,
-                project=project,
-                project_pillars=project_pillars,
-                game_concept=game_concept,
+            # One worker call loads the chart, target components and path
+            # metadata; strategies then read the attached snapshot.
+            snapshot, node, node_details, path_metadata = await run_in_worker(
+                self._load_inputs, node, chart
             )
-
-            # Use async build_context if available (for parallel extraction)
-            if hasattr(strategy, "build_context_async"):
-                with logfire.span(
-                    "context.build.async",
-                    strategy=self.strategy_type.value,
-                    target_node=node.name,
-                ):
-                    context_result = await strategy.build_context_async(scope)
-            else:
-                # Fallback to sync version wrapped in async
-                context_result = await sync_to_async(
-                    strategy.build_context, thread_sensitive=True
-                )(scope)
-
-            # Prepare shared context data for all agents
-            # Note: _extract_node_details contains Django ORM calls
-            # (node.components.all()). Wrap in sync_to_async to avoid
-            # SynchronousOnlyOperation errors.
-            node_details = await sync_to_async(
-                self._extract_node_details, thread_sensitive=True
-            )(node)
-            path_metadata = await sync_to_async(
-                self._build_path_metadata, thread_sensitive=True
-            )(node, chart)
+            try:
+                context_result = await self._build_context(
+                    EvaluationScope(
+                        target_node=node,
+                        chart=chart,
+                        project=project,
+                        project_pillars=project_pillars,
+                        game_concept=game_concept,
+                    )
+                )
+            finally:
+                snapshot.detach()
 
             base_data = {
                 "target_node_name": node.name,
@@ -486,6 +473,23 @@ class PxNodesCoherenceWorkflow:
                 total_tokens=total_tokens,
             )
 
+    def _load_inputs(
+        self, node: PxNode, chart: PxChart
+    ) -> tuple[ChartSnapshot, PxNode, Dict[str, Any], Dict[str, Any]]:
+        """Load the chart snapshot and everything derived from it (sync)."""
+        snapshot, node = _load_snapshot(node, chart)
+        return (
+            snapshot,
+            node,
+            self._extract_node_details(node),
+            self._build_path_metadata(node, chart),
+        )
+
+    async def _build_context(self, scope: EvaluationScope) -> Any:
+        return await _build_strategy_context(
+            self._get_strategy(), scope, self.strategy_type
+        )
+
     async def _run_dimension_agent(
         self,
         agent_class: Type[BaseAgent],
@@ -881,7 +885,7 @@ class PxNodesCoherenceWorkflow:
         if not node_id:
             return {"order": {}, "predecessors": set(), "successors": set()}
 
-        edges = chart.edges.select_related("source__content", "target__content").all()
+        edges = get_chart_edges(chart)
         forward: Dict[str, list[str]] = {}
         backward: Dict[str, list[str]] = {}
         name_map: Dict[str, str] = {node_id: getattr(node, "name", "")}
@@ -1137,7 +1141,6 @@ class PxNodesCoherenceMonolithicWorkflow:
             CoherenceAggregatedResult with all dimension scores
         """
         import logfire
-        from asgiref.sync import sync_to_async
 
         if self.llm_provider is None:
             raise ValueError("llm_provider is required for monolithic evaluation")
@@ -1153,29 +1156,23 @@ class PxNodesCoherenceMonolithicWorkflow:
             node_id=str(node.id),
             node_name=node.name,
         ):
-            # Build context using strategy
-            strategy = self._get_strategy()
-            scope = EvaluationScope(
-                target_node=node,
-                chart=chart,
-                project=project,
-                project_pillars=project_pillars,
-                game_concept=game_concept,
+            snapshot, node, node_details = await run_in_worker(
+                self._load_inputs, node, chart
             )
-
-            # Use async build_context if available (for parallel extraction)
-            if hasattr(strategy, "build_context_async"):
-                with logfire.span(
-                    "context.build.async",
-                    strategy=self.strategy_type.value,
-                    target_node=node.name,
-                ):
-                    context_result = await strategy.build_context_async(scope)
-            else:
-                # Fallback to sync version wrapped in async
-                context_result = await sync_to_async(
-                    strategy.build_context, thread_sensitive=True
-                )(scope)
+            try:
+                context_result = await _build_strategy_context(
+                    self._get_strategy(),
+                    EvaluationScope(
+                        target_node=node,
+                        chart=chart,
+                        project=project,
+                        project_pillars=project_pillars,
+                        game_concept=game_concept,
+                    ),
+                    self.strategy_type,
+                )
+            finally:
+                snapshot.detach()
 
             # Build dimension context (same as agentic version)
             dimension_context = await self._build_dimension_context(
@@ -1186,9 +1183,6 @@ class PxNodesCoherenceMonolithicWorkflow:
             )
 
             # Build the unified prompt
-            node_details = await sync_to_async(
-                self._extract_node_details, thread_sensitive=True
-            )(node)
             target_node_block = self._format_target_block(node_details)
 
             prompt = MONOLITHIC_COHERENCE_PROMPT.format(
@@ -1203,9 +1197,7 @@ class PxNodesCoherenceMonolithicWorkflow:
                 node_name=node.name,
                 prompt_length=len(prompt),
             ):
-                response = await sync_to_async(
-                    self.llm_provider.generate, thread_sensitive=False
-                )(prompt)
+                response = await run_in_worker(self.llm_provider.generate, prompt)
 
             # Parse response into dimension results
             dimension_results = self._parse_response(response)
@@ -1238,6 +1230,13 @@ class PxNodesCoherenceMonolithicWorkflow:
                 total_tokens=total_tokens,
             )
 
+    def _load_inputs(
+        self, node: PxNode, chart: PxChart
+    ) -> tuple[ChartSnapshot, PxNode, Dict[str, Any]]:
+        """Load the chart snapshot and the target node details (sync)."""
+        snapshot, node = _load_snapshot(node, chart)
+        return snapshot, node, self._extract_node_details(node)
+
     async def _build_dimension_context(
         self,
         node: PxNode,
@@ -1371,6 +1370,36 @@ class PxNodesCoherenceMonolithicWorkflow:
         return sum(scores) / len(scores) if scores else 3.0
 
 
+def _load_snapshot(node: PxNode, chart: PxChart) -> tuple[ChartSnapshot, PxNode]:
+    """
+    Load and attach a chart snapshot; return it with the prefetched node.
+
+    The returned node carries its components (with definitions), so
+    later reads of node.components.all() don't query.
+    """
+    snapshot = ChartSnapshot.load(chart).attach()
+    resolved = next(iter(snapshot.resolve_nodes([str(node.id)])), node)
+    return snapshot, resolved
+
+
+async def _build_strategy_context(
+    strategy: BaseContextStrategy,
+    scope: EvaluationScope,
+    strategy_type: StrategyType,
+) -> Any:
+    """Build context, preferring the strategy's async variant if it has one."""
+    import logfire
+
+    if hasattr(strategy, "build_context_async"):
+        with logfire.span(
+            "context.build.async",
+            strategy=strategy_type.value,
+            target_node=scope.target_node.name,
+        ):
+            return await strategy.build_context_async(scope)
+    return await run_in_worker(strategy.build_context, scope)
+
+
 def evaluate_node_agentic(
     node_id: str,
     chart_id: str,
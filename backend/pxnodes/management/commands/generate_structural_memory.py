@@ -10,9 +10,12 @@ import logfire
 from django.core.management.base import BaseCommand, CommandError
 
 from pxcharts.models import PxChart
-from pxnodes.llm.context.embeddings import OpenAIEmbeddingGenerator
 from pxnodes.llm.context.facts import extract_atomic_facts
 from pxnodes.llm.context.llm_adapter import LLMProviderAdapter
+from pxnodes.llm.context.shared.embeddings import (
+    EmbeddingBackend,
+    get_embedding_backend,
+)
 from pxnodes.llm.context.triples import extract_llm_triples_only
 from pxnodes.llm.context.vector_store import VectorStore
 from pxnodes.models import PxNode
@@ -56,8 +59,15 @@ class Command(BaseCommand):
         parser.add_argument(
             "--embedding-model",
             type=str,
-            default="text-embedding-3-small",
-            help="OpenAI embedding model (default: text-embedding-3-small)",
+            default=None,
+            help="Embedding model (default: the embedding backend's default)",
+        )
+        parser.add_argument(
+            "--embedding-backend",
+            type=str,
+            default=None,
+            choices=["openai", "ollama", "hashing"],
+            help="Embedding backend (default: EMBEDDING_BACKEND setting)",
         )
         parser.add_argument(
             "--skip-embeddings",
@@ -82,8 +92,9 @@ class Command(BaseCommand):
 
                 embedding_generator = None
                 if not options["skip_embeddings"]:
-                    embedding_generator = OpenAIEmbeddingGenerator(
-                        model=options["embedding_model"]
+                    embedding_generator = get_embedding_backend(
+                        backend=options["embedding_backend"],
+                        model=options["embedding_model"],
                     )
 
                 self.stdout.write(self.style.SUCCESS(f"\n{'='*70}"))
@@ -94,7 +105,8 @@ class Command(BaseCommand):
                 if embedding_generator:
                     self.stdout.write(
                         self.style.SUCCESS(
-                            f"Embedding Model: {options['embedding_model']}"
+                            f"Embedding Model: {embedding_generator.provider}/"
+                            f"{embedding_generator.model}"
                         )
                     )
                 self.stdout.write(self.style.SUCCESS(f"{'='*70}\n"))
@@ -209,7 +221,7 @@ class Command(BaseCommand):
         node: PxNode,
         chart: Optional[PxChart],
         llm_provider: LLMProviderAdapter,
-        embedding_generator: Optional[OpenAIEmbeddingGenerator],
+        embedding_generator: Optional[EmbeddingBackend],
         clear_existing: bool,
     ) -> dict:
         """Process a single node."""
@@ -288,7 +300,7 @@ class Command(BaseCommand):
         triples: list,
         derived: list,
         facts: list,
-        embedding_generator: OpenAIEmbeddingGenerator,
+        embedding_generator: EmbeddingBackend,
     ) -> int:
         """Generate and store embeddings for all memories."""
         with logfire.span("store_embeddings", node_id=str(node.id)):
@@ -313,6 +325,7 @@ class Command(BaseCommand):
                         "relation": triple.relation,
                         "tail": str(triple.tail),
                     },
+                    embedding_model=embedding_generator.model,
                 )
                 count += 1
 
@@ -331,6 +344,7 @@ class Command(BaseCommand):
                     metadata={
                         "source_field": fact.source_field,
                     },
+                    embedding_model=embedding_generator.model,
                 )
                 count += 1
 
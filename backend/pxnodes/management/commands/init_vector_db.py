@@ -1,6 +1,6 @@
 """Management command to initialize the vector database for structural memory."""
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 
 class Command(BaseCommand):
@@ -8,10 +8,24 @@ class Command(BaseCommand):
 
     help = "Initialize the sqlite-vec vector database for structural memory"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild-index",
+            action="store_true",
+            help="Rebuild the per-model vec0 tables from stored embeddings",
+        )
+        parser.add_argument(
+            "--quantization",
+            choices=["int8", "binary"],
+            default=None,
+            help="Add a quantized companion index when rebuilding",
+        )
+
     def handle(self, *args, **options):
         """Execute the command."""
-        from pxnodes.llm.context.vector_store import (
+        from pxnodes.llm.context.shared.vector_store import (
             VECTOR_DB_PATH,
+            VectorStore,
             init_database,
         )
 
@@ -34,3 +48,20 @@ class Command(BaseCommand):
                     "On macOS, use Homebrew Python: brew install python"
                 )
             )
+
+        if options["quantization"] and not options["rebuild_index"]:
+            raise CommandError("--quantization requires --rebuild-index")
+        if not options["rebuild_index"]:
+            return
+        if not vec_available:
+            raise CommandError("Cannot rebuild vec0 indexes without sqlite-vec")
+
+        vector_store = VectorStore()
+        try:
+            counts = vector_store.rebuild_indexes(quantization=options["quantization"])
+        finally:
+            vector_store.close()
+
+        for table_name, count in counts.items():
+            self.stdout.write(f"  {table_name}: {count} vectors")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(counts)} vector index(es)"))
@@ -65,8 +65,15 @@ class Command(BaseCommand):
         parser.add_argument(
             "--embedding-model",
             type=str,
-            default="text-embedding-3-small",
-            help="Embedding model to use (default: text-embedding-3-small)",
+            default=None,
+            help="Embedding model to use (default: the embedding backend's default)",
+        )
+        parser.add_argument(
+            "--embedding-backend",
+            type=str,
+            default=None,
+            choices=["openai", "ollama", "hashing"],
+            help="Embedding backend (default: EMBEDDING_BACKEND setting)",
         )
         parser.add_argument(
             "--no-llm",
@@ -119,6 +126,7 @@ class Command(BaseCommand):
         strategy = HMEMStrategy(
             llm_provider=llm_provider,
             embedding_model=options["embedding_model"],
+            embedding_backend=options["embedding_backend"],
             auto_embed=True,
         )
 
@@ -1,4 +1,5 @@
 import uuid
+from typing import Iterable
 
 from django.contrib.auth import get_user_model
 from django.db import models
@@ -242,6 +243,47 @@ class HMEMLayerEmbedding(models.Model):
             self.child_indices.remove(child_index)
             self.save(update_fields=["child_indices"])
 
+    @classmethod
+    def bulk_register_children(
+        cls,
+        links: Iterable[tuple["HMEMLayerEmbedding", Iterable[str]]],
+    ) -> int:
+        """
+        Register children for many parent entries with a single UPDATE batch.
+
+        Child pointers are merged in memory using a set per parent, so the
+        cost is linear in the number of links instead of one ``in`` check
+        and one ``save()`` per (parent, child) pair as with ``add_child``.
+
+        Args:
+            links: Pairs of (parent entry, child positional indices). A parent
+                may appear more than once; its children are merged.
+
+        Returns:
+            Number of parent rows whose child_indices changed.
+        """
+        parents: dict[int, "HMEMLayerEmbedding"] = {}
+        known: dict[int, set[str]] = {}
+        changed: dict[int, "HMEMLayerEmbedding"] = {}
+
+        for parent, child_indices in links:
+            if parent.pk not in parents:
+                parents[parent.pk] = parent
+                parent.child_indices = list(parent.child_indices or [])
+                known[parent.pk] = set(parent.child_indices)
+            seen = known[parent.pk]
+            for child_index in child_indices:
+                if child_index not in seen:
+                    seen.add(child_index)
+                    parent.child_indices.append(child_index)
+                    changed[parent.pk] = parent
+
+        if changed:
+            HMEMLayerEmbedding.objects.bulk_update(
+                list(changed.values()), ["child_indices"]
+            )
+        return len(changed)
+
     @classmethod
     def build_positional_index(
         cls,
@@ -386,6 +428,68 @@ class ArtifactEmbedding(models.Model):
         return f"ArtifactEmbedding({self.embedding_model}:{self.embedding_dim})"
 
 
+class ChartEvaluationRun(models.Model):
+    """
+    Progress of a chart-wide coherence evaluation.
+
+    Per-node results are stored as each node finishes, so clients can poll
+    progress and an interrupted run can be resumed without re-evaluating
+    completed nodes.
+    """
+
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    chart = models.ForeignKey(
+        "pxcharts.PxChart",
+        on_delete=models.CASCADE,
+        related_name="evaluation_runs",
+    )
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_RUNNING
+    )
+    # Request parameters (node_ids, iterations, llm_model, ...)
+    params = models.JSONField(default=dict, blank=True)
+    total_nodes = models.IntegerField(default=0)
+    # node_id -> serialized node result
+    results = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["chart", "status"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"ChartEvaluationRun({self.chart_id}:{self.status})"
+
+    @property
+    def completed_nodes(self) -> int:
+        return len(self.results)
+
+    def record_result(self, node_id: str, result: dict) -> None:
+        """Persist one node's result."""
+        self.results[str(node_id)] = result
+        self.save(update_fields=["results", "updated_at"])
+
+    def finish(self, error: str = "") -> None:
+        """Mark the run completed (or failed when an error is given)."""
+        self.status = self.STATUS_FAILED if error else self.STATUS_COMPLETED
+        self.error = error
+        self.save(update_fields=["status", "error", "updated_at"])
+
+
 class PxKeyDefinition(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
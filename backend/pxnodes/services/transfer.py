@@ -1,11 +1,3 @@
-from pxnodes.export_serializers import (
-    PxComponentDefinitionSerializer,
-    PxComponentSerializer,
-    PxKeyAssignmentSerializer,
-    PxKeyDefinitionSerializer,
-    PxLockDefinitionSerializer,
-    PxNodeSerializer,
-)
 from pxnodes.models import (
     PxComponent,
     PxComponentDefinition,
@@ -14,118 +6,215 @@ from pxnodes.models import (
     PxLockDefinition,
     PxNode,
 )
-from services.transfer import import_objects
-
-
-def export_project_data(project):
-    px_nodes = PxNode.objects.filter(project=project)
-
-    px_component_definitions = PxComponentDefinition.objects.filter(project=project)
-    px_component = PxComponent.objects.filter(node__in=px_nodes)
-    px_key_definition = PxKeyDefinition.objects.filter(owner=project.user)
-    px_key_assignment = PxKeyAssignment.objects.filter(owner=project.user)
-    px_lock_definition = PxLockDefinition.objects.filter(owner=project.user)
-
-    return {
-        "px_nodes": PxNodeSerializer(px_nodes, many=True).data,
-        "px_component_definitions": PxComponentDefinitionSerializer(
-            px_component_definitions, many=True
-        ).data,
-        "px_components": PxComponentSerializer(px_component, many=True).data,
-        "px_key_definitions": PxKeyDefinitionSerializer(
-            px_key_definition, many=True
-        ).data,
-        "px_key_assignments": PxKeyAssignmentSerializer(
-            px_key_assignment, many=True
-        ).data,
-        "px_lock_definitions": PxLockDefinitionSerializer(
-            px_lock_definition, many=True
-        ).data,
-    }
-
-
-def import_project_data(project, payload, user):
+from services.export_stream import ExportSection
+from services.transfer import ImportPlan, import_objects, resolve
+
+
+def export_sections(project):
+    # Key and lock definitions are per user; key assignments are limited to
+    # this project's nodes so the export only references exported nodes
+    return [
+        ExportSection(
+            "px_nodes",
+            PxNode.objects.filter(project=project),
+            {"id": "id", "name": "name", "description": "description"},
+        ),
+        ExportSection(
+            "px_component_definitions",
+            PxComponentDefinition.objects.filter(project=project),
+            {"id": "id", "name": "name", "type": "type"},
+        ),
+        ExportSection(
+            "px_components",
+            PxComponent.objects.filter(node__project=project),
+            {
+                "id": "id",
+                "node": "node_id",
+                "definition": "definition_id",
+                "value": "value",
+            },
+        ),
+        ExportSection(
+            "px_key_definitions",
+            PxKeyDefinition.objects.filter(owner=project.user),
+            {
+                "id": "id",
+                "name": "name",
+                "key_type": "key_type",
+                "consumable": "consumable",
+                "fixed": "fixed",
+                "unique": "unique",
+            },
+        ),
+        ExportSection(
+            "px_key_assignments",
+            PxKeyAssignment.objects.filter(owner=project.user, node__project=project),
+            {
+                "id": "id",
+                "node": "node_id",
+                "definition": "definition_id",
+                "count": "count",
+            },
+        ),
+        ExportSection(
+            "px_lock_definitions",
+            PxLockDefinition.objects.filter(owner=project.user),
+            {
+                "id": "id",
+                "name": "name",
+                "soft_gate": "soft_gate",
+                "unlock_mode": "unlock_mode",
+            },
+            m2m={
+                "unlocked_by": (
+                    PxLockDefinition.unlocked_by.through,
+                    "pxlockdefinition_id",
+                    "pxkeydefinition_id",
+                )
+            },
+        ),
+    ]
+
+
+def import_project_data(project, payload, user, plan=None):
+    save_now = plan is None
+    plan = plan or ImportPlan()
+
     nodes_map = import_objects(
         payload.get("px_nodes", []),
-        lambda d: PxNode.objects.create(
+        lambda d: PxNode(
             name=d["name"],
             description=d["description"],
             owner=user,
             project=project,
         ),
+        "px_node",
     )
 
     component_definitions_map = import_objects(
         payload.get("px_component_definitions", []),
-        lambda d: PxComponentDefinition.objects.create(
+        lambda d: PxComponentDefinition(
             name=d["name"],
             type=d["type"],
             owner=user,
             project=project,
         ),
+        "px_component_definition",
     )
 
-    _ = import_objects(
+    components_map = import_objects(
         payload.get("px_components", []),
-        lambda d: PxComponent.objects.create(
-            node=nodes_map[d["node"]],
-            definition=component_definitions_map[d["definition"]],
+        lambda d: PxComponent(
+            node=resolve(nodes_map, d["node"], "px_node"),
+            definition=resolve(
+                component_definitions_map, d["definition"], "px_component_definition"
+            ),
             value=d["value"],
             owner=user,
         ),
+        "px_component",
     )
 
-    key_definitions_map = {}
-
-    for d in payload.get("px_key_definitions", []):
-        old_id = d["id"]
-
-        definition, _created = PxKeyDefinition.objects.get_or_create(
-            owner=user,
-            name=d["name"],
-            defaults={
-                "key_type": d["key_type"],
-                "consumable": d["consumable"],
-                "fixed": d["fixed"],
-                "unique": d["unique"],
-            },
-        )
-
-        key_definitions_map[old_id] = definition
+    key_definitions = payload.get("px_key_definitions", [])
+    existing_keys = _existing_by_name(PxKeyDefinition, user, key_definitions)
+    existing_key_ids = {key.pk for key in existing_keys.values()}
+    key_definitions_map = import_objects(
+        key_definitions,
+        lambda d: existing_keys.setdefault(
+            d["name"],
+            PxKeyDefinition(
+                owner=user,
+                name=d["name"],
+                key_type=d["key_type"],
+                consumable=d["consumable"],
+                fixed=d["fixed"],
+                unique=d["unique"],
+            ),
+        ),
+        "px_key_definition",
+    )
 
-    _ = import_objects(
+    key_assignments_map = import_objects(
         payload.get("px_key_assignments", []),
-        lambda d: PxKeyAssignment.objects.create(
+        lambda d: PxKeyAssignment(
             count=d["count"],
-            node=nodes_map[d["node"]],
-            definition=key_definitions_map[d["definition"]],
+            node=resolve(nodes_map, d["node"], "px_node"),
+            definition=resolve(
+                key_definitions_map, d["definition"], "px_key_definition"
+            ),
             owner=user,
         ),
+        "px_key_assignment",
     )
 
     lock_definitions = payload.get("px_lock_definitions", [])
+    existing_locks = _existing_by_name(PxLockDefinition, user, lock_definitions)
+    existing_lock_ids = {lock.pk for lock in existing_locks.values()}
+    lock_definition_map = import_objects(
+        lock_definitions,
+        lambda d: existing_locks.setdefault(
+            d["name"],
+            PxLockDefinition(
+                owner=user,
+                name=d["name"],
+                soft_gate=d["soft_gate"],
+                unlock_mode=d["unlock_mode"],
+            ),
+        ),
+        "px_lock_definition",
+    )
 
-    lock_definition_map = {}
-
+    # unlocked_by is replaced like .set() would, through the M2M table in bulk
+    Through = PxLockDefinition.unlocked_by.through
+    unlocked_by = {}
     for d in lock_definitions:
-        old_id = d["id"]
+        lock = lock_definition_map[d["id"]]
+        unlocked_by[lock.pk] = {
+            resolve(key_definitions_map, old_key_id, "px_key_definition").pk
+            for old_key_id in d.get("unlocked_by", [])
+        }
+
+    plan.replace(Through.objects.filter(pxlockdefinition_id__in=existing_lock_ids))
+    plan.add(PxNode, nodes_map.values())
+    plan.add(PxComponentDefinition, component_definitions_map.values())
+    plan.add(PxComponent, components_map.values())
+    plan.add(
+        PxKeyDefinition,
+        _new_objects(key_definitions_map.values(), existing_key_ids),
+    )
+    plan.add(PxKeyAssignment, key_assignments_map.values())
+    plan.add(
+        PxLockDefinition,
+        _new_objects(lock_definition_map.values(), existing_lock_ids),
+    )
+    plan.add(
+        Through,
+        [
+            Through(pxlockdefinition_id=lock_id, pxkeydefinition_id=key_id)
+            for lock_id, key_ids in unlocked_by.items()
+            for key_id in key_ids
+        ],
+    )
 
-        lock, _created = PxLockDefinition.objects.get_or_create(
-            owner=user,
-            name=d["name"],
-            defaults={
-                "soft_gate": d["soft_gate"],
-                "unlock_mode": d["unlock_mode"],
-            },
-        )
+    if save_now:
+        plan.save()
 
-        lock_definition_map[old_id] = lock
+    return nodes_map, lock_definition_map
 
-    for d in lock_definitions:
-        lock = lock_definition_map[d["id"]]
 
-        lock.unlocked_by.set(
-            [key_definitions_map[old_key_id] for old_key_id in d.get("unlocked_by", [])]
-        )
+def _existing_by_name(model, user, data_list):
+    """Definitions the user already has, by name (get_or_create semantics)."""
+    names = {d.get("name") for d in data_list}
+    existing = {}
+    for obj in model.objects.filter(owner=user, name__in=names):
+        existing.setdefault(obj.name, obj)
+    return existing
 
-    return nodes_map, lock_definition_map
+
+def _new_objects(objs, existing_ids):
+    """Distinct instances that still need to be inserted."""
+    new = {}
+    for obj in objs:
+        if obj.pk not in existing_ids:
+            new.setdefault(obj.pk, obj)
+    return new.values()
@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     CoherenceEvaluateView,
+    CoherenceEvaluationRunView,
     ContextArtifactsPrecomputeView,
     ContextArtifactsResetView,
     ContextBuildView,
@@ -54,6 +55,11 @@ urlpatterns = [
         CoherenceEvaluateView.as_view(),
         name="structural-memory-evaluate",
     ),
+    path(
+        "structural-memory/evaluate/<uuid:run_id>/",
+        CoherenceEvaluationRunView.as_view(),
+        name="structural-memory-evaluate-run",
+    ),
     # Context Strategy API (thesis research)
     path(
         "context/strategies/",
@@ -1,7 +1,11 @@
+import json
 import logging
 import uuid
+from typing import AsyncGenerator
 
 import logfire
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
 from rest_framework import status, viewsets
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
@@ -16,11 +20,13 @@ from pxcharts.models import PxChart
 from pxnodes.llm.context.artifacts import ArtifactInventory
 from pxnodes.llm.context.base.types import StrategyType
 from pxnodes.llm.context.llm_adapter import LLMProviderAdapter
+from pxnodes.llm.context.shared.embeddings import EMBEDDING_BACKENDS
 from pxnodes.llm.context.shared.graph_retrieval import get_full_path
 from pxnodes.llm.context.strategy_needs import get_strategy_needs
 
 from .models import (
     ArtifactEmbedding,
+    ChartEvaluationRun,
     ContextArtifact,
     HMEMLayerEmbedding,
     PxComponent,
@@ -112,7 +118,8 @@ class StructuralMemoryGenerateView(APIView):
         "force_regenerate": false,  // optional, default false
         "skip_embeddings": false,   // optional, default false
         "llm_model": "gpt-4o-mini", // optional
-        "embedding_model": "text-embedding-3-small"  // optional
+        "embedding_model": "text-embedding-3-small",  // optional
+        "embedding_backend": "openai"  // optional: openai | ollama | hashing
     }
 
     Returns generation results per chart with statistics.
@@ -135,9 +142,13 @@ class StructuralMemoryGenerateView(APIView):
             force_regenerate = request.data.get("force_regenerate", False)
             skip_embeddings = request.data.get("skip_embeddings", False)
             llm_model = request.data.get("llm_model", "gpt-4o-mini")
-            embedding_model = request.data.get(
-                "embedding_model", "text-embedding-3-small"
-            )
+            embedding_model = request.data.get("embedding_model")
+            embedding_backend = request.data.get("embedding_backend")
+            if embedding_backend and embedding_backend not in EMBEDDING_BACKENDS:
+                return Response(
+                    {"error": f"Unknown embedding backend '{embedding_backend}'"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             project = get_current_project(request.user)
 
             # Verify user owns these charts
@@ -169,6 +180,7 @@ class StructuralMemoryGenerateView(APIView):
                     embedding_model=embedding_model,
                     skip_embeddings=skip_embeddings,
                     force_regenerate=force_regenerate,
+                    embedding_backend=embedding_backend,
                 )
 
                 results = generator.generate_for_charts(list(charts))
@@ -225,6 +237,7 @@ class StructuralMemoryGenerateView(APIView):
                         "skip_embeddings": skip_embeddings,
                         "llm_model": llm_model,
                         "embedding_model": embedding_model,
+                        "embedding_backend": embedding_backend,
                     },
                 )
                 return Response(
@@ -267,6 +280,8 @@ class ContextArtifactsPrecomputeView(APIView):
         "strategy": "structural_memory",
         "node_id": "uuid",  // optional, required if path artifacts needed
         "llm_model": "gpt-4o-mini",  // optional
+        "embedding_model": "text-embedding-3-small",  // optional
+        "embedding_backend": "openai",  // optional: openai | ollama | hashing
         "skip_llm": false  // optional
     }
     """
@@ -284,7 +299,8 @@ class ContextArtifactsPrecomputeView(APIView):
         strategy = request.data.get("strategy", StrategyType.STRUCTURAL_MEMORY.value)
         node_id = request.data.get("node_id")
         llm_model = request.data.get("llm_model", "gpt-4o-mini")
-        embedding_model = request.data.get("embedding_model", "text-embedding-3-small")
+        embedding_model = request.data.get("embedding_model")
+        embedding_backend = request.data.get("embedding_backend")
         skip_llm = request.data.get("skip_llm", False)
         scope = request.data.get("scope", "all")  # global | node | all
 
@@ -295,6 +311,11 @@ class ContextArtifactsPrecomputeView(APIView):
                 {"error": f"Unknown strategy '{strategy}'"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if embedding_backend and embedding_backend not in EMBEDDING_BACKENDS:
+            return Response(
+                {"error": f"Unknown embedding backend '{embedding_backend}'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         project = get_current_project(request.user)
         chart_filters = {"id": chart_id, "owner": request.user}
@@ -414,6 +435,7 @@ class ContextArtifactsPrecomputeView(APIView):
                     hmem_strategy = HMEMStrategy(
                         llm_provider=llm_provider,
                         embedding_model=embedding_model,
+                        embedding_backend=embedding_backend,
                     )
                     hmem_strategy._ensure_embeddings(scope)
                 elif strategy_type == StrategyType.STRUCTURAL_MEMORY:
@@ -438,6 +460,7 @@ class ContextArtifactsPrecomputeView(APIView):
                     sm_strategy = StructuralMemoryStrategy(
                         llm_provider=llm_provider,
                         embedding_model=embedding_model,
+                        embedding_backend=embedding_backend,
                     )
                     sm_strategy._ensure_vector_store_memories(scope, nodes)
 
@@ -553,17 +576,23 @@ class CoherenceEvaluateView(APIView):
 
     Uses iterative retrieval (Zeng et al. 2024) to gather context
     from knowledge triples and atomic facts, then evaluates nodes
-    for coherence issues.
+    for coherence issues. Nodes are evaluated concurrently and each
+    result is saved to a ChartEvaluationRun as it completes.
 
     POST /structural-memory/evaluate/
     {
         "chart_id": "uuid",
         "node_ids": ["uuid1", "uuid2"],  // optional, defaults to all
         "iterations": 3,  // optional, retrieval iterations
-        "llm_model": "gpt-4o-mini"  // optional
+        "llm_model": "gpt-4o-mini",  // optional
+        "max_concurrency": 4,  // optional, nodes evaluated in parallel
+        "stream": false,  // optional, stream per-node results as SSE
+        "run_id": "uuid"  // optional, resume a partially completed run
     }
 
-    Returns evaluation results per node with coherence issues.
+    Returns evaluation results per node with coherence issues. With
+    "stream": true the response is an event stream of "start", "node"
+    and "complete" (or "error") events.
     """
 
     permission_classes = [IsAuthenticated]
@@ -583,6 +612,9 @@ class CoherenceEvaluateView(APIView):
             node_ids = request.data.get("node_ids")
             iterations = request.data.get("iterations", 3)
             llm_model = request.data.get("llm_model", "gpt-4o-mini")
+            max_concurrency = request.data.get("max_concurrency")
+            stream = bool(request.data.get("stream", False))
+            run_id = request.data.get("run_id")
             project = get_current_project(request.user)
 
             # Verify user owns the chart
@@ -599,17 +631,52 @@ class CoherenceEvaluateView(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
+            if run_id:
+                try:
+                    run = ChartEvaluationRun.objects.get(
+                        id=uuid.UUID(str(run_id)), chart=chart, owner=request.user
+                    )
+                except (ChartEvaluationRun.DoesNotExist, ValueError):
+                    return Response(
+                        {"error": "Evaluation run not found"},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+                # Resume with the original parameters
+                node_ids = run.params.get("node_ids")
+                iterations = run.params.get("iterations", iterations)
+                llm_model = run.params.get("llm_model", llm_model)
+                run.status = ChartEvaluationRun.STATUS_RUNNING
+                run.save(update_fields=["status", "updated_at"])
+            else:
+                run = ChartEvaluationRun.objects.create(
+                    owner=request.user,
+                    chart=chart,
+                    params={
+                        "node_ids": (
+                            [str(node_id) for node_id in node_ids] if node_ids else None
+                        ),
+                        "iterations": iterations,
+                        "llm_model": llm_model,
+                    },
+                )
+
             logfire.info(
                 "structural_memory.api.evaluate.start",
                 chart_id=str(chart_id),
                 node_ids=node_ids,
                 iterations=iterations,
+                run_id=str(run.id),
+                resumed_nodes=run.completed_nodes,
             )
 
             try:
                 # Import here to avoid circular imports
-                from pxnodes.llm.context.evaluator import NodeCoherenceEvaluator
+                from pxnodes.llm.context.evaluator import (
+                    NodeCoherenceEvaluator,
+                    NodeEvaluationResult,
+                )
                 from pxnodes.llm.context.llm_adapter import LLMProviderAdapter
+                from pxnodes.llm.context.shared.graph_retrieval import ChartSnapshot
 
                 # Create LLM provider
                 llm_provider = LLMProviderAdapter(
@@ -623,9 +690,40 @@ class CoherenceEvaluateView(APIView):
                     retrieval_iterations=iterations,
                 )
 
+                completed = {
+                    node_id: NodeEvaluationResult.from_dict(data)
+                    for node_id, data in run.results.items()
+                }
+
+                if stream:
+                    snapshot = ChartSnapshot.load(chart)
+                    nodes = snapshot.resolve_nodes(node_ids)
+                    run.total_nodes = len(nodes)
+                    run.save(update_fields=["total_nodes", "updated_at"])
+                    response = StreamingHttpResponse(
+                        self._stream_evaluation(
+                            evaluator, run, snapshot, nodes, max_concurrency
+                        ),
+                        content_type="text/event-stream",
+                    )
+                    response["Cache-Control"] = "no-cache"
+                    response["X-Accel-Buffering"] = "no"
+                    return response
+
                 # Evaluate chart
-                result = evaluator.evaluate_chart(chart, node_ids=node_ids)
-                evaluator.close()
+                try:
+                    result = evaluator.evaluate_chart(
+                        chart,
+                        node_ids=node_ids,
+                        max_concurrency=max_concurrency,
+                        completed=completed,
+                        on_result=lambda r: run.record_result(r.node_id, r.to_dict()),
+                    )
+                finally:
+                    evaluator.close()
+                run.total_nodes = len(result.node_results)
+                run.save(update_fields=["total_nodes", "updated_at"])
+                run.finish()
 
                 logfire.info(
                     "structural_memory.api.evaluate.complete",
@@ -639,6 +737,7 @@ class CoherenceEvaluateView(APIView):
                 return Response(
                     {
                         "success": True,
+                        "run_id": str(run.id),
                         "evaluation": result.to_dict(),
                     }
                 )
@@ -649,6 +748,7 @@ class CoherenceEvaluateView(APIView):
                     "structural_memory.api.evaluate.failed",
                     error=str(e),
                 )
+                run.finish(error=str(e))
                 buffer_backend_session_log(
                     session_id=getattr(request, "pixe_session_id", ""),
                     level="error",
@@ -662,13 +762,115 @@ class CoherenceEvaluateView(APIView):
                         ),
                         "iterations": iterations,
                         "llm_model": llm_model,
+                        "run_id": str(run.id),
                     },
                 )
                 return Response(
-                    {"error": str(e)},
+                    {"error": str(e), "run_id": str(run.id)},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
+    async def _stream_evaluation(
+        self,
+        evaluator,
+        run: ChartEvaluationRun,
+        snapshot,
+        nodes: list,
+        max_concurrency,
+    ) -> AsyncGenerator[str, None]:
+        """Stream per-node results as they complete."""
+        from pxnodes.llm.context.evaluator import (
+            ChartEvaluationResult,
+            NodeEvaluationResult,
+        )
+
+        record_result = sync_to_async(run.record_result)
+        pending = [node for node in nodes if str(node.id) not in run.results]
+        yield self._format_sse(
+            "start",
+            {
+                "run_id": str(run.id),
+                "total": run.total_nodes,
+                "completed": run.completed_nodes,
+            },
+        )
+        try:
+            async for node_result in evaluator.iter_chart(
+                snapshot, pending, max_concurrency=max_concurrency
+            ):
+                await record_result(node_result.node_id, node_result.to_dict())
+                yield self._format_sse(
+                    "node",
+                    {
+                        "run_id": str(run.id),
+                        "completed": run.completed_nodes,
+                        "total": run.total_nodes,
+                        "result": node_result.to_dict(),
+                    },
+                )
+        except Exception as e:
+            logger.exception("Streaming coherence evaluation failed")
+            await sync_to_async(run.finish)(error=str(e))
+            yield self._format_sse("error", {"run_id": str(run.id), "message": str(e)})
+            return
+        finally:
+            await sync_to_async(evaluator.close, thread_sensitive=False)()
+
+        await sync_to_async(run.finish)()
+        chart_result = ChartEvaluationResult(
+            chart_id=str(snapshot.chart.id),
+            chart_name=snapshot.chart.name,
+            node_results=[
+                NodeEvaluationResult.from_dict(run.results[str(node.id)])
+                for node in nodes
+                if str(node.id) in run.results
+            ],
+        )
+        yield self._format_sse(
+            "complete",
+            {"run_id": str(run.id), "evaluation": chart_result.to_dict()},
+        )
+
+    @staticmethod
+    def _format_sse(event_type: str, data: dict) -> str:
+        """Format data as Server-Sent Event."""
+        return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+class CoherenceEvaluationRunView(APIView):
+    """
+    Progress of a chart coherence evaluation run.
+
+    GET /structural-memory/evaluate/<run_id>/
+
+    Returns status, completed/total node counts and the per-node results
+    recorded so far. Pass the run_id back to the evaluate endpoint to
+    resume an interrupted run.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, run_id):
+        try:
+            run = ChartEvaluationRun.objects.get(id=run_id, owner=request.user)
+        except ChartEvaluationRun.DoesNotExist:
+            return Response(
+                {"error": "Evaluation run not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(
+            {
+                "run_id": str(run.id),
+                "chart_id": str(run.chart_id),
+                "status": run.status,
+                "completed": run.completed_nodes,
+                "total": run.total_nodes,
+                "error": run.error or None,
+                "nodes": list(run.results.values()),
+            }
+        )
+
 
 class ContextStrategiesView(APIView):
     """
@@ -968,10 +1170,12 @@ class StrategyCompareView(APIView):
         "chart_id": "uuid",
         "node_id": "uuid",
         "strategies": ["structural_memory", "simple_sm"],  // optional, defaults to all
-        "llm_model": "gpt-4o-mini"  // optional
+        "llm_model": "gpt-4o-mini",  // optional
+        "max_concurrency": 2  // optional, defaults to all strategies at once
     }
 
-    Returns comparison results with all strategies.
+    Returns comparison results with all strategies, including per-strategy
+    timings and token usage.
     """
 
     permission_classes = [IsAuthenticated]
@@ -983,6 +1187,7 @@ class StrategyCompareView(APIView):
         node_id = request.data.get("node_id")
         strategies_list = request.data.get("strategies")
         llm_model = request.data.get("llm_model", "gpt-4o-mini")
+        max_concurrency = request.data.get("max_concurrency")
         project = get_current_project(request.user)
 
         with logfire.span(
@@ -1069,6 +1274,7 @@ class StrategyCompareView(APIView):
                     strategies=strategy_types,
                     project_pillars=pillars,
                     game_concept=game_concept,
+                    max_concurrency=max_concurrency,
                 )
 
                 logfire.info(
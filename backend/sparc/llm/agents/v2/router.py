@@ -7,6 +7,7 @@ Extracts relevant portions of game concepts for each aspect.
 import time
 from typing import Any, Dict, List
 
+from llm.ledger import llm_call_context
 from llm.types import AgentResult, ErrorInfo
 from sparc.llm.agents.v2.base import V2BaseAgent
 from sparc.llm.prompts.v2.router import ROUTER_PROMPT
@@ -84,7 +85,8 @@ class RouterAgent(V2BaseAgent):
         last_error = None
 
         for attempt in range(self.max_retries):
-            result = self.execute(context)
+            with llm_call_context(retry_count=attempt):
+                result = self.execute(context)
 
             if result.success:
                 return result
@@ -124,7 +126,8 @@ class RouterAgent(V2BaseAgent):
         total_tokens = 0
 
         for attempt in range(self.max_retries):
-            result = await self.run(context)
+            with llm_call_context(retry_count=attempt):
+                result = await self.run(context)
 
             if result.success:
                 return result